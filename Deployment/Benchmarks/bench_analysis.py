@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Analysis Benchmarks
+===================
+
+Statistics and export paths of EnergyDataAnalyzer (evaluate_energy_data.py)
+and EPEXDataExporter (export_epex_data.py), plus the shared building blocks
+(price statistics, streaming accumulators, table writers). The analyzers run
+against in-memory tables; exports are written to a temporary directory.
+
+The fetch.* benchmarks compare the SensorData read paths end to end on the
+client side (request signing, response parsing, conversion to numbers): the
+boto3 resource Table.query the scripts used before, and column_query.py.
+Their responses come from a MemoryEndpoint, so rows/s is items decoded per
+second without the network.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from datetime import timedelta
+
+import numpy as np
+
+from datasets import START, epex_items, epex_prices, power_series, sensor_items
+from harness import Case, benchmark
+from records import PriceBatch, SensorBatch
+from standins import ANALYSIS_DIR, MemoryEndpoint, MemoryTable
+
+if ANALYSIS_DIR not in sys.path:
+    sys.path.insert(0, ANALYSIS_DIR)
+
+INTERVAL_S = 10.0  # sensor_items spacing
+
+
+@contextlib.contextmanager
+def in_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _warmed(run) -> Case:
+    """Case for 'run' after one untimed call (fills the MemoryEndpoint response cache)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()
+    return Case(run)
+
+
+def _analyzer(rows: int, streaming: bool = False):
+    """EnergyDataAnalyzer on `rows` SensorData readings with one 4-cycle workload covering them"""
+    from column_query import ColumnQuery
+    from evaluate_energy_data import EnergyDataAnalyzer
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnergyDataAnalyzer(device_id='bench-device', streaming=streaming)
+    analyzer.table = MemoryTable('SensorData', 'device_id', 'timestamp').load(sensor_items(rows))
+    analyzer.power_query = ColumnQuery('SensorData', client=MemoryEndpoint(analyzer.table).client())
+
+    start = START.replace(tzinfo=None)
+    end = start + timedelta(seconds=rows * INTERVAL_S)
+    cycle = (end - start) / 8
+    iso = lambda t: t.strftime('%Y-%m-%dT%H:%M:%S')  # noqa: E731
+    analyzer.test_periods = {
+        'BENCH': {
+            'name': 'Benchmark Workload',
+            'start': iso(start),
+            'end': iso(end),
+            'duration_minutes': (end - start).total_seconds() / 60,
+            'description': 'Synthetic cyclic workload',
+            'pattern': 'cyclic',
+            'cycle_duration': cycle.total_seconds() / 60,
+            'cycle_pause': cycle.total_seconds() / 60,
+            'cycles': 4,
+            'active_periods': [(iso(start + 2 * i * cycle), iso(start + (2 * i + 1) * cycle)) for i in range(4)]
+        }
+    }
+    return analyzer
+
+
+@benchmark('analysis.cyclic_workload', max_size=10**6)
+def cyclic_workload(rows: int) -> Case:
+    """EnergyDataAnalyzer.analyze_cyclic_workload (query, statistics, 15-min profile)"""
+    analyzer = _analyzer(rows)
+    return _warmed(lambda: analyzer.analyze_cyclic_workload('BENCH'))
+
+
+@benchmark('analysis.continuous_workload', max_size=10**6)
+def continuous_workload(rows: int) -> Case:
+    """EnergyDataAnalyzer.analyze_continuous_workload over the whole range"""
+    analyzer = _analyzer(rows)
+    return _warmed(lambda: analyzer.analyze_continuous_workload('BENCH'))
+
+
+@benchmark('analysis.streaming_workload', max_size=10**6)
+def streaming_workload(rows: int) -> Case:
+    """EnergyDataAnalyzer.analyze_workload_streaming (paged query, online accumulators)"""
+    analyzer = _analyzer(rows, streaming=True)
+    return _warmed(lambda: analyzer.analyze_workload_streaming('BENCH'))
+
+
+@benchmark('analysis.export_results', max_size=10**6)
+def export_results(rows: int) -> Case:
+    """EnergyDataAnalyzer.export_results_to_files (JSON with raw series, LaTeX, CSV summary)"""
+    analyzer = _analyzer(rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {'BENCH': analyzer.analyze_cyclic_workload('BENCH')}
+    comparison = analyzer.generate_comparison_analysis(results)
+    directory = tempfile.mkdtemp(prefix='bench_export_')
+
+    def run():
+        with in_directory(directory):
+            analyzer.export_results_to_files(results, comparison)
+    return Case(run)
+
+
+def _sensor_endpoint(rows: int):
+    """MemoryEndpoint on `rows` SensorData readings, and the range covering them"""
+    table = MemoryTable('SensorData', 'device_id', 'timestamp').load(sensor_items(rows))
+    start = START.replace(tzinfo=None)
+    end = start + timedelta(seconds=rows * INTERVAL_S)
+    return MemoryEndpoint(table), start.strftime('%Y-%m-%dT%H:%M:%S'), end.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _resource_pages(table, start: str, end: str, **kwargs):
+    from boto3.dynamodb.conditions import Key
+    query_kwargs = dict(KeyConditionExpression=Key('device_id').eq('bench-device') & Key('timestamp').between(start, end),
+                        ReturnConsumedCapacity='TOTAL', **kwargs)
+    while True:
+        response = table.query(**query_kwargs)
+        yield response['Items']
+        if 'LastEvaluatedKey' not in response:
+            return
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+@benchmark('fetch.resource_query_full', max_size=10**6)
+def resource_query_full(rows: int) -> Case:
+    """Table.query of full items (all pages) + SensorBatch.from_items (query_time_range before column_query)"""
+    endpoint, start, end = _sensor_endpoint(rows)
+    table = endpoint.resource().Table('SensorData')
+
+    def run():
+        readings = SensorBatch()
+        for items in _resource_pages(table, start, end):
+            readings.extend_items(items)
+        return np.array(readings.current_power)
+    return _warmed(run)
+
+
+@benchmark('fetch.resource_query', max_size=10**6)
+def resource_query(rows: int) -> Case:
+    """Table.query projected to timestamp and power + SensorBatch.extend_items (load_power_series before)"""
+    endpoint, start, end = _sensor_endpoint(rows)
+    table = endpoint.resource().Table('SensorData')
+
+    def run():
+        readings = SensorBatch()
+        for items in _resource_pages(table, start, end, ProjectionExpression='#ts, current_power',
+                                     ExpressionAttributeNames={'#ts': 'timestamp'}):
+            readings.extend_items(items, require=('current_power',))
+        return readings.timestamp, np.array(readings.current_power)
+    return _warmed(run)
+
+
+@benchmark('fetch.column_query', max_size=10**6)
+def column_query(rows: int) -> Case:
+    """ColumnQuery.fetch of timestamp and power (low-level client, decoder into NumPy arrays)"""
+    from column_query import POWER_COLUMNS, ColumnQuery
+    endpoint, start, end = _sensor_endpoint(rows)
+    query = ColumnQuery('SensorData', client=endpoint.client())
+    return _warmed(lambda: query.fetch('bench-device', start, end, POWER_COLUMNS, require=('current_power',)))
+
+
+def _exporter():
+    from export_epex_data import EPEXDataExporter
+    with contextlib.redirect_stdout(io.StringIO()):
+        return EPEXDataExporter()
+
+
+@benchmark('epex.analyze_price_data', max_size=10**6)
+def analyze_price_data(rows: int) -> Case:
+    """EPEXDataExporter.analyze_price_data on a PriceBatch (arrays, grid check, statistics, local times)"""
+    exporter = _exporter()
+    prices = PriceBatch.from_items(epex_items(rows))
+    return Case(lambda: exporter.analyze_price_data(prices))
+
+
+@benchmark('epex.test_period_prices', max_size=10**6)
+def test_period_prices(rows: int) -> Case:
+    """EPEXDataExporter.get_prices_for_test_periods on a PriceBatch (local-day window join)"""
+    exporter = _exporter()
+    prices = PriceBatch.from_items(epex_items(rows))
+    return Case(lambda: exporter.get_prices_for_test_periods(prices))
+
+
+@benchmark('epex.export_to_files', max_size=10**6)
+def export_to_files(rows: int) -> Case:
+    """EPEXDataExporter.export_to_files (JSON, 15-min price table, test periods, LaTeX)"""
+    exporter = _exporter()
+    prices = PriceBatch.from_items(epex_items(rows))
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis = exporter.analyze_price_data(prices)
+        periods = exporter.get_prices_for_test_periods(prices)
+    directory = tempfile.mkdtemp(prefix='bench_export_')
+
+    def run():
+        with in_directory(directory):
+            exporter.export_to_files(analysis, periods)
+    return Case(run)
+
+
+@benchmark('stats.price_statistics', sizes=[10**3, 10**5, 10**7], max_size=10**7)
+def price_statistics(rows: int) -> Case:
+    """price_stats.price_statistics on a price array (all units)"""
+    from price_stats import price_statistics as statistics_for
+    prices = epex_prices(rows)
+    return Case(lambda: statistics_for(prices))
+
+
+@benchmark('stats.power_accumulator', sizes=[10**3, 10**4, 10**5], max_size=10**7)
+def power_accumulator(rows: int) -> Case:
+    """streaming_stats.PowerAccumulator.add per reading (mean/stdev + P² quantiles)"""
+    from streaming_stats import PowerAccumulator
+    power = power_series(rows).tolist()
+    timestamps = [f"2025-06-29T00:00:{i % 60:02d}.000000" for i in range(rows)]
+
+    def run():
+        accumulator = PowerAccumulator()
+        for timestamp, value in zip(timestamps, power):
+            accumulator.add(timestamp, value)
+        accumulator.quantile_summary()
+    return Case(run)
+
+
+@benchmark('writers.csv_columns', sizes=[10**3, 10**5, 10**6], max_size=10**7)
+def csv_columns(rows: int) -> Case:
+    """writers.open_table_writer + write_columns (CSV) for a 3-column batch"""
+    from writers import open_table_writer
+    batch = {
+        'Period_Key': ['BENCH'] * rows,
+        'Timestamp': np.arange(rows, dtype=np.int64) * 10_000,
+        'Power_W': power_series(rows)
+    }
+    directory = tempfile.mkdtemp(prefix='bench_writer_')
+
+    def run():
+        with in_directory(directory):
+            with open_table_writer('bench_readings', list(batch), 'csv') as writer:
+                writer.write_columns(batch)
+    return Case(run)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Lambda Handler Benchmarks
+=========================
+
+Per-message processing of the three ingest handlers and the shared timestamp
+normalization. Handlers run unchanged against in-memory tables (standins.py);
+one benchmark row is one MQTT message, price slot or OBIS measurement.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+from datasets import energylive_measurements, epex_response, power_series, tasmota_messages, timestamp_inputs
+from harness import Case, benchmark
+from standins import LAMBDA_DIR, MemoryTable, load_lambda
+
+
+@benchmark('lambda.process_mqtt', max_size=10**6)
+def process_mqtt(rows: int) -> Case:
+    """process-mqtt.py lambda_handler per Tasmota SENSOR message (transform + put_item)"""
+    table = MemoryTable('SensorData', 'device_id', 'timestamp')
+    handler = load_lambda('process-mqtt.py', table).lambda_handler
+    messages = tasmota_messages(rows)
+
+    def run():
+        for message in messages:
+            handler(message, None)
+    return Case(run, reset=lambda: table.items.clear())
+
+
+@benchmark('lambda.ensure_microsecond_timestamp', sizes=[10**3, 10**4, 10**5, 10**6], max_size=10**7)
+def ensure_microsecond_timestamp(rows: int) -> Case:
+    """timestamp_format.ensure_microsecond_timestamp on mixed epoch-ms / ISO inputs"""
+    if LAMBDA_DIR not in sys.path:
+        sys.path.insert(0, LAMBDA_DIR)
+    from timestamp_format import ensure_microsecond_timestamp as normalize
+    inputs = timestamp_inputs(rows)
+
+    def run():
+        for value in inputs:
+            normalize(value)
+    return Case(run)
+
+
+@benchmark('lambda.epex_collector', max_size=10**6)
+def epex_collector(rows: int) -> Case:
+    """epex-spot-collector.py lambda_handler: parse price slots and store new items"""
+    table = MemoryTable('EPEXSpotPrices', 'tariff', 'timestamp')
+    handler = load_lambda('epex-spot-collector.py', table, payload=epex_response(rows)).lambda_handler
+    return Case(lambda: handler({}, None), reset=lambda: table.items.clear())
+
+
+@benchmark('lambda.epex_collector_duplicates', sizes=[10**2], max_size=10**4)
+def epex_collector_duplicates(rows: int) -> Case:
+    """epex-spot-collector.py lambda_handler when every slot is already stored (conditional put fails)"""
+    table = MemoryTable('EPEXSpotPrices', 'tariff', 'timestamp')
+    handler = load_lambda('epex-spot-collector.py', table, payload=epex_response(rows)).lambda_handler
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler({}, None)  # Store every slot once; timed runs only hit duplicates
+    return Case(lambda: handler({}, None))
+
+
+@benchmark('lambda.energylive_collector', max_size=10**6)
+def energylive_collector(rows: int) -> Case:
+    """energylive-api-collector.py lambda_handler per OBIS measurement"""
+    os.environ.setdefault('API_KEY', 'benchmark')
+    os.environ.setdefault('DEVICE_UID', 'I-00000000-00000000')
+    table = MemoryTable('EnergyLiveData', 'device_id', 'timestamp')
+    handler = load_lambda('energylive-api-collector.py', table,
+                          payload=energylive_measurements(rows)).lambda_handler
+    return Case(lambda: handler({}, None), reset=lambda: table.items.clear())
+
+
+@benchmark('lambda.anomaly_detection', sizes=[10**3, 10**4, 10**5], max_size=10**6)
+def anomaly_detection(rows: int) -> Case:
+    """anomaly_detection.observe per power reading (EWMA, spike and flatline detectors, 4 devices)"""
+    table = MemoryTable('SensorData', 'device_id', 'timestamp')
+    load_lambda('process-mqtt.py', table)  # Wires the anomaly tables to the in-memory client
+    import anomaly_detection
+    power = power_series(rows).tolist()
+    readings = [(f"powermeter{i % 4}", f"2025-06-29T00:00:{i:08d}", power[i], i // 4 * 10.0)
+                for i in range(rows)]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for device_id, timestamp, value, now in readings:
+                anomaly_detection.observe(device_id, timestamp, value, now)
+
+    def reset():
+        anomaly_detection._states.clear()  # Every run starts with cold detectors
+    return Case(run, reset=reset)
+
+
+@benchmark('lambda.stage_timer', sizes=[10**3, 10**4, 10**5], max_size=10**6)
+def stage_timer(rows: int) -> Case:
+    """stage_timer.py overhead per invocation: @instrumented handler with four empty stages + EMF line"""
+    if LAMBDA_DIR not in sys.path:
+        sys.path.insert(0, LAMBDA_DIR)
+    from stage_timer import instrumented, stage
+
+    @instrumented('benchmark')
+    def handler(event, context):
+        for name in ('parse', 'convert', 'dynamodb_write', 'registry'):
+            with stage(name):
+                pass
+        return {'statusCode': 200}
+
+    def run():
+        for _ in range(rows):
+            handler(None, None)
+    return Case(run)
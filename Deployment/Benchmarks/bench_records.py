@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Record Type Benchmarks
+======================
+
+Conversions of the shared record types (Lambda/records.py) between DynamoDB
+items and columnar batches, and the power-column extraction the analysis
+scripts do on every query result, item dicts versus SensorBatch columns.
+One benchmark row is one full SensorData reading. record_footprint.py
+measures the memory side.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import numpy as np
+
+from datasets import sensor_batch
+from harness import Case, benchmark
+from records import SensorBatch, SensorReading
+
+
+@benchmark('records.batch_from_items', max_size=10**6)
+def batch_from_items(rows: int) -> Case:
+    """SensorBatch.from_items on resource items (Decimal numbers, Table.query pages)"""
+    items = sensor_batch(rows).to_items()
+    return Case(lambda: SensorBatch.from_items(items))
+
+
+@benchmark('records.batch_from_typed_items', max_size=10**6)
+def batch_from_typed_items(rows: int) -> Case:
+    """SensorBatch.from_typed_items on typed items ({'N': ...}, client.query pages)"""
+    items = sensor_batch(rows).to_typed_items()
+    return Case(lambda: SensorBatch.from_typed_items(items))
+
+
+@benchmark('records.batch_to_items', max_size=10**6)
+def batch_to_items(rows: int) -> Case:
+    """SensorBatch.to_items (Decimal conversion for Table.put_item / batch_writer)"""
+    batch = sensor_batch(rows)
+    return Case(batch.to_items)
+
+
+@benchmark('records.reading_to_item', max_size=10**6)
+def reading_to_item(rows: int) -> Case:
+    """SensorReading.to_item per reading (the process-mqtt.py write path)"""
+    readings = list(sensor_batch(rows))
+
+    def run():
+        for reading in readings:
+            reading.to_item()
+    return Case(run)
+
+
+@benchmark('records.power_from_items', max_size=10**6)
+def power_from_items(rows: int) -> Case:
+    """Power array from item dicts, as the analysis did before (float(Decimal) per item)"""
+    items = sensor_batch(rows).to_items()
+    return Case(lambda: np.asarray([float(item['current_power']) for item in items if 'current_power' in item]))
+
+
+@benchmark('records.power_from_batch', sizes=[10**3, 10**5, 10**6], max_size=10**7)
+def power_from_batch(rows: int) -> Case:
+    """Power array from a SensorBatch column (SensorBatch.present + zero-copy view)"""
+    batch = sensor_batch(rows)
+    return Case(lambda: np.asarray(batch.present('current_power').current_power))
+
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Lambda Cold Start Benchmark
+===========================
+
+Cold start of each handler, measured in fresh interpreters the way Lambda
+runs them:
+
+- import:  executing the handler module (the INIT phase)
+- first:   the first invocation (deferred imports, client creation, endpoint
+           and credential setup, the first DynamoDB requests)
+- warm:    the second invocation, for comparison
+
+DynamoDB calls go to a local endpoint that accepts every request
+(AWS_ENDPOINT_URL_DYNAMODB, dummy credentials), and the collectors' API calls
+return the synthetic payloads from datasets.py, so no network or AWS account
+is involved. Each run also records 'python -X importtime'; the report lists
+the packages with the most import time (self time summed per top-level
+package, over the import and the first invocation).
+
+--lambda-dir compares another checkout, e.g. before and after a change:
+
+    git worktree add /tmp/base HEAD~1
+    python cold_start.py --lambda-dir /tmp/base/Deployment/Lambda --output benchmark_results/cold_base.json
+    python cold_start.py --output benchmark_results/cold_new.json
+
+Usage:
+    python cold_start.py                        # all handlers, 5 runs each
+    python cold_start.py --handlers process-mqtt --runs 10 --top 15
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from datasets import energylive_measurements, epex_response, tasmota_messages
+from standins import LAMBDA_DIR
+
+# Handler name -> (file, event, API payload or None)
+HANDLERS = {
+    'process-mqtt': ('process-mqtt.py', lambda: tasmota_messages(1)[0], None),
+    'epex-spot-collector': ('epex-spot-collector.py', dict, lambda: epex_response(96)),
+    'energylive-api-collector': ('energylive-api-collector.py', dict, lambda: energylive_measurements(4))
+}
+
+# Runs in the fresh interpreter: import the handler, invoke it twice, print the timings.
+# Only stdlib modules the Lambda runtime itself loads are imported besides the handler.
+CHILD = r"""
+import contextlib, importlib.util, io, json, os, sys, time
+lambda_dir, filename, inputs_path = sys.argv[1:4]
+with open(inputs_path) as f:
+    inputs = json.load(f)
+
+started = time.perf_counter()
+sys.path.insert(0, lambda_dir)
+spec = importlib.util.spec_from_file_location('handler', os.path.join(lambda_dir, filename))
+module = importlib.util.module_from_spec(spec)
+with contextlib.redirect_stdout(io.StringIO()):
+    spec.loader.exec_module(module)
+imported = time.perf_counter()
+
+if inputs['payload'] is not None:
+    class Response:
+        def raise_for_status(self):
+            pass
+        def json(self):
+            return inputs['payload']
+    module.requests.get = lambda *args, **kwargs: Response()
+prepared = time.perf_counter()
+
+with contextlib.redirect_stdout(io.StringIO()):
+    status = module.lambda_handler(inputs['event'], None)['statusCode']
+first = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    module.lambda_handler(inputs['event'], None)
+warm = time.perf_counter()
+print('COLD_START ' + json.dumps({'import_s': imported - started, 'first_s': first - prepared,
+                                  'warm_s': warm - first, 'status': status}))
+"""
+
+
+class _AcceptAll(BaseHTTPRequestHandler):
+    """DynamoDB endpoint that answers every request with an empty success"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Self time (seconds) per top-level package from -X importtime output"""
+    packages = {}
+    for line in stderr.splitlines():
+        # 'import time:      1234 |       5678 |     botocore.client'
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+    return packages
+
+
+def run_once(lambda_dir: str, filename: str, inputs_path: str, endpoint: str) -> dict:
+    env = dict(os.environ,
+               AWS_DEFAULT_REGION='eu-central-1', AWS_ACCESS_KEY_ID='cold-start', AWS_SECRET_ACCESS_KEY='cold-start',
+               AWS_EC2_METADATA_DISABLED='true', AWS_ENDPOINT_URL_DYNAMODB=endpoint,
+               API_KEY='cold-start', DEVICE_UID='I-00000000-00000000')
+    env.pop('AWS_PROFILE', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD, lambda_dir, filename, inputs_path],
+                            capture_output=True, text=True, env=env, timeout=120)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('COLD_START ')]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"{filename} failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(lines[-1][len('COLD_START '):])
+    timings['imports'] = parse_importtime(result.stderr)
+    return timings
+
+
+def measure(lambda_dir: str, handlers, runs: int) -> dict:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _AcceptAll)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {}
+    try:
+        for handler in handlers:
+            filename, event, payload = HANDLERS[handler]
+            with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+                json.dump({'event': event(), 'payload': payload() if payload else None}, f)
+            try:
+                run_once(lambda_dir, filename, f.name, endpoint)  # Untimed: writes the __pycache__ files
+                samples = [run_once(lambda_dir, filename, f.name, endpoint) for _ in range(runs)]
+            finally:
+                os.remove(f.name)
+            entry = {key: statistics.median(sample[key] for sample in samples)
+                     for key in ('import_s', 'first_s', 'warm_s')}
+            entry['cold_s'] = entry['import_s'] + entry['first_s']
+            entry['status'] = samples[-1]['status']
+            packages = {package for sample in samples for package in sample['imports']}
+            entry['imports'] = dict(sorted(
+                ((package, statistics.median(sample['imports'].get(package, 0.0) for sample in samples))
+                 for package in packages), key=lambda item: -item[1]))
+            results[handler] = entry
+            print(f"   {handler:<26} import {entry['import_s'] * 1e3:7.1f} ms   first call {entry['first_s'] * 1e3:7.1f} ms"
+                  f"   warm call {entry['warm_s'] * 1e3:6.1f} ms   cold total {entry['cold_s'] * 1e3:7.1f} ms")
+    finally:
+        server.shutdown()
+    return results
+
+
+def print_imports(results: dict, top: int):
+    for handler, entry in results.items():
+        print(f"\n📦 {handler}: top {top} packages by import time")
+        for package, seconds in list(entry['imports'].items())[:top]:
+            print(f"   {package:<28} {seconds * 1e3:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold start (import and first invocation) of the Lambda handlers')
+    parser.add_argument('--handlers', nargs='+', choices=list(HANDLERS), default=list(HANDLERS),
+                        help='Handlers to measure (default: all)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per handler (default: 5)')
+    parser.add_argument('--top', type=int, default=10, help='Packages listed per handler (default: 10)')
+    parser.add_argument('--lambda-dir', default=LAMBDA_DIR, help='Lambda source directory (default: this checkout)')
+    parser.add_argument('--output', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    lambda_dir = os.path.abspath(args.lambda_dir)
+    print(f"🧊 Cold start of {len(args.handlers)} handler(s) from {lambda_dir}, median of {args.runs} runs")
+    results = measure(lambda_dir, args.handlers, args.runs)
+    print_imports(results, args.top)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({'lambda_dir': lambda_dir, 'python': sys.version.split()[0], 'runs': args.runs,
+                       'handlers': results}, f, indent=2)
+        print(f"\n📁 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Synthetic Benchmark Datasets
+============================
+
+Deterministic (seeded) inputs in the shapes the code really receives:
+
+- Tasmota tele/+/SENSOR messages as forwarded by the IoT rule
+  (SELECT *, topic() as topic, timestamp() as aws_timestamp)
+- smartENERGY EPEX price responses and EPEXSpotPrices items
+- energyLIVE latest-measurement responses (OBIS codes)
+- SensorData items as written by process-mqtt.py, and full readings as a
+  SensorBatch (records.py)
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List
+
+import numpy as np
+
+from standins import LAMBDA_DIR
+
+if LAMBDA_DIR not in sys.path:
+    sys.path.insert(0, LAMBDA_DIR)
+from records import SensorBatch  # noqa: E402
+
+SEED = 42
+START = datetime(2025, 6, 29, 0, 0, 0, tzinfo=timezone.utc)
+OBIS = ['0100010700', '0100010800', '0100020700', '0100020800']
+
+
+def power_series(n: int, seed: int = SEED) -> np.ndarray:
+    """Server power (W): idle level with load plateaus and measurement noise"""
+    rng = np.random.default_rng(seed)
+    plateau = np.where((np.arange(n) // 90) % 2 == 1, 180.0, 70.0)
+    return np.round(plateau + rng.normal(0, 3, n), 1)
+
+
+def tasmota_messages(n: int, devices: int = 4, interval_s: float = 10.0, seed: int = SEED) -> List[Dict]:
+    """IoT rule events for n Tasmota SENSOR messages, round-robin over devices"""
+    power = power_series(n, seed)
+    epoch_ms = int(START.timestamp() * 1000)
+    messages = []
+    total = 0.0
+    for i in range(n):
+        device = i % devices
+        timestamp_ms = epoch_ms + int(i // devices * interval_s * 1000) + device * 7
+        total += power[i] * interval_s / 3.6e6
+        messages.append({
+            'Time': datetime.fromtimestamp(timestamp_ms / 1000).strftime('%Y-%m-%dT%H:%M:%S'),
+            'ENERGY': {
+                'TotalStartTime': '2025-06-08T07:06:07',
+                'Total': round(total, 3),
+                'Yesterday': 1.234,
+                'Today': round(total, 3),
+                'Period': 0,
+                'Power': float(power[i]),
+                'ApparentPower': float(power[i] + 12),
+                'ReactivePower': 12.0,
+                'Factor': 0.93,
+                'Voltage': 231,
+                'Current': round(float(power[i]) / 231, 3)
+            },
+            'topic': f'tele/powermeter{device}/SENSOR',
+            'aws_timestamp': timestamp_ms
+        })
+    return messages
+
+
+def timestamp_inputs(n: int) -> List:
+    """Mixed ensure_microsecond_timestamp inputs: epoch ms, ISO with Z, ISO with microseconds"""
+    epoch_ms = int(START.timestamp() * 1000)
+    inputs = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            inputs.append(epoch_ms + i * 1000)
+        elif kind == 1:
+            inputs.append((START + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z')
+        else:
+            inputs.append((START + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%S.%f'))
+    return inputs
+
+
+def epex_prices(n: int, interval_minutes: int = 15, seed: int = SEED) -> np.ndarray:
+    """Day-ahead-like prices (ct/kWh): daily cycle plus noise, occasional negative prices"""
+    rng = np.random.default_rng(seed)
+    slot = np.arange(n)
+    hour = (slot * interval_minutes / 60) % 24
+    return np.round(9 + 4 * np.sin((hour - 8) / 24 * 2 * np.pi) + rng.normal(0, 1.5, n), 3)
+
+
+def epex_response(n: int, interval_minutes: int = 15) -> Dict:
+    """smartENERGY /market/v1/price response with n slots (local time with offset)"""
+    prices = epex_prices(n, interval_minutes)
+    local = timezone(timedelta(hours=2))
+    return {
+        'tariff': 'EPEXSPOTAT',
+        'unit': 'ct/kWh',
+        'interval': interval_minutes,
+        'data': [
+            {'date': (START + timedelta(minutes=i * interval_minutes)).astimezone(local).isoformat(),
+             'value': float(prices[i])}
+            for i in range(n)
+        ]
+    }
+
+
+def epex_items(n: int, interval_minutes: int = 15) -> List[Dict]:
+    """EPEXSpotPrices items as stored by epex-spot-collector.py"""
+    prices = epex_prices(n, interval_minutes)
+    epoch_ms = int(START.timestamp() * 1000)
+    step_ms = interval_minutes * 60 * 1000
+    return [
+        {
+            'tariff': 'EPEXSPOTAT',
+            'timestamp': Decimal(epoch_ms + i * step_ms),
+            'iso_timestamp': datetime.fromtimestamp((epoch_ms + i * step_ms) / 1000, tz=timezone.utc).isoformat(),
+            'price': Decimal(str(prices[i])),
+            'unit': 'ct/kWh',
+            'interval_minutes': Decimal(interval_minutes)
+        }
+        for i in range(n)
+    ]
+
+
+def energylive_measurements(n: int, seed: int = SEED) -> List[Dict]:
+    """energyLIVE measurements/latest response: OBIS readings, one per code per 5 s"""
+    rng = np.random.default_rng(seed)
+    epoch_ms = int(START.timestamp() * 1000)
+    energy = 1_250_000.0
+    measurements = []
+    for i in range(n):
+        code = OBIS[i % len(OBIS)]
+        power = float(np.round(400 + rng.normal(0, 50), 1))
+        if code.endswith('0800'):
+            energy += power * 5 / 3600
+            value = round(energy, 1)
+        else:
+            value = power if code == OBIS[0] else 0.0
+        measurements.append({'measurement': code, 'timestamp': epoch_ms + (i // len(OBIS)) * 5000, 'value': value})
+    return measurements
+
+
+def sensor_items(n: int, device_id: str = 'bench-device', interval_s: float = 10.0, seed: int = SEED) -> List[Dict]:
+    """SensorData items for one device as written by process-mqtt.py (UTC, microsecond keys)"""
+    power = power_series(n, seed)
+    start = START.replace(tzinfo=None)
+    return [
+        {
+            'device_id': device_id,
+            'timestamp': (start + timedelta(seconds=i * interval_s, microseconds=i % 1000)).strftime(
+                '%Y-%m-%dT%H:%M:%S.%f'),
+            'device_time': (start + timedelta(seconds=i * interval_s)).strftime('%Y-%m-%dT%H:%M:%S'),
+            'total_energy': Decimal('12.345'),
+            'current_power': Decimal(str(power[i])),
+            'apparent_power': Decimal(str(round(power[i] + 12, 1))),
+            'power_factor': Decimal('0.93'),
+            'voltage': Decimal('231'),
+            'current': Decimal(str(round(power[i] / 231, 3)))
+        }
+        for i in range(n)
+    ]
+
+
+def sensor_batch(n: int, device_id: str = 'bench-device', interval_s: float = 10.0, seed: int = SEED) -> SensorBatch:
+    """Readings with every attribute process-mqtt.py writes (no ANALOG), as a SensorBatch"""
+    power = power_series(n, seed)
+    offsets_us = (np.arange(n) * interval_s * 1e6).astype('timedelta64[us]')
+    start = np.datetime64(START.replace(tzinfo=None), 'us')
+    today = np.round(np.cumsum(power) * interval_s / 3.6e6, 3)
+    return SensorBatch.from_columns(
+        device_id=device_id,
+        timestamp=np.datetime_as_string(start + offsets_us + np.arange(n) % 1000, unit='us').tolist(),
+        device_time=np.datetime_as_string(start + offsets_us + np.timedelta64(2, 'h'), unit='s').tolist(),
+        total_energy=today + 12.345,
+        today_energy=today,
+        yesterday_energy=np.full(n, 1.234),
+        current_power=power,
+        apparent_power=np.round(power + 12, 1),
+        reactive_power=np.full(n, 12.0),
+        power_factor=np.full(n, 0.93),
+        voltage=np.full(n, 231.0),
+        current=np.round(power / 231, 3),
+        period=np.zeros(n),
+        total_start_time='2025-06-08T07:06:07'
+    )
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Synthetic Fleet Telemetry Generator
+===================================
+
+Generates multi-day telemetry for scale testing: N Tasmota power meters, the
+energyLIVE grid meter and EPEX day-ahead prices.
+
+Realism:
+- Tasmota power follows the WL1-WL5 profiles measured on 2025-06-29 (idle
+  ~172 W, CPU stress ~662 W in 15/15 min cycles, I/O stress ~318 W, reboot,
+  maintenance), scaled per device, with Gaussian noise, a 10 s TelePeriod
+  with jitter and IoT rule latency
+- Energy counters behave like Tasmota: Total accumulates, Today restarts at
+  local midnight (Yesterday keeps the previous day), and counter resets drop
+  Total/Today to 0 and move TotalStartTime
+- Faults: telemetry gaps (outages of minutes to hours) and duplicate
+  deliveries (same payload, later aws_timestamp)
+- energyLIVE: 5-minute polls of the four OBIS registers of a site meter whose
+  load includes the fleet, minus a PV feed-in around noon
+- EPEX: one 96-slot price curve per local day (morning/evening peaks, solar
+  dip with occasional negative prices, lower weekends)
+
+Exact item shapes: raw events (IoT rule messages, API payloads) are pushed
+through the unchanged Lambda handlers (process-mqtt.py,
+energylive-api-collector.py, epex-spot-collector.py). Their tables are
+replaced by sinks that forward the stored items in bulk to:
+- DynamoDB Local (--target dynamodb --endpoint-url ...): BatchWriteItem,
+  tables created from the terraform schema, DeviceRegistry entries and
+  optionally the coverage index
+- Columnar files (--target files --format csv|parquet|arrow)
+- In-memory MemoryTables (generate() from Python, e.g. for benchmarks)
+
+Today's volume is one device (8,640 messages/day); 100x is e.g.
+--devices 100 --days 1 or --devices 10 --days 10.
+
+Usage:
+    python generate_fleet.py --devices 10 --from 2025-06-01 --days 90 --target files --format parquet
+    python generate_fleet.py --devices 100 --days 1 --target dynamodb --endpoint-url http://localhost:8000 --coverage
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from standins import ANALYSIS_DIR, DEPLOYMENT_DIR, LAMBDA_DIR, MemoryTable, _conditional_check_failed, load_lambda
+
+sys.path.insert(0, os.path.join(DEPLOYMENT_DIR, 'Scripts'))
+for directory in (ANALYSIS_DIR, LAMBDA_DIR):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+from records import MeasurementBatch, PriceBatch, SensorBatch  # noqa: E402
+
+LOCAL_TIMEZONE = ZoneInfo('Europe/Vienna')
+ENERGYLIVE_UID = 'I-00000000-00000001'
+
+# Power levels (W) of the measured workloads on 2025-06-29 (output-sensor-data.txt)
+PROFILES = {
+    'WL1_CPU_Stress': {'power_w': 662, 'noise_w': 5, 'active_minutes': 15, 'pause_minutes': 15, 'cycles': 4},
+    'WL2_IO_Stress': {'power_w': 318, 'noise_w': 35, 'active_minutes': 15, 'pause_minutes': 15, 'cycles': 2},
+    'WL3_Reboot': {'power_w': 294, 'noise_w': 60, 'active_minutes': 5, 'pause_minutes': 0, 'cycles': 1},
+    'WL4_Maintenance': {'power_w': 205, 'noise_w': 30, 'active_minutes': 5, 'pause_minutes': 0, 'cycles': 1},
+    'WL5_Idle': {'power_w': 172, 'noise_w': 3}
+}
+
+# Daily probability and local start hour range of each workload
+SCHEDULE = {
+    'WL1_CPU_Stress': (0.4, (8, 18)),
+    'WL2_IO_Stress': (0.4, (8, 20)),
+    'WL3_Reboot': (0.1, (0, 24)),
+    'WL4_Maintenance': (0.5, (22.4, 22.7))
+}
+
+# Key schema and record batch type (attributes as written by the Lambdas, column order of file exports)
+TABLES = {
+    'SensorData': {
+        'keys': ('device_id', 'timestamp'),
+        'types': {'device_id': 'S', 'timestamp': 'S'},
+        'batch': SensorBatch
+    },
+    'EnergyLiveData': {
+        'keys': ('device_id', 'timestamp'),
+        'types': {'device_id': 'S', 'timestamp': 'N', 'obis_code': 'S', 'measurement_name': 'S'},
+        'indexes': {'ObisCodeIndex': 'obis_code', 'MeasurementNameIndex': 'measurement_name'},
+        'batch': MeasurementBatch
+    },
+    'EPEXSpotPrices': {
+        'keys': ('tariff', 'timestamp'),
+        'types': {'tariff': 'S', 'timestamp': 'N'},
+        'batch': PriceBatch
+    }
+}
+
+
+class FleetConfig(NamedTuple):
+    devices: int = 4
+    start_day: str = '2025-06-01'
+    days: int = 7
+    interval_s: float = 10.0
+    seed: int = 42
+    gap_rate: float = 0.2          # Outages per device and day
+    duplicate_rate: float = 0.002  # Share of messages delivered twice
+    reset_rate: float = 0.02       # Counter resets per device and day
+    energylive: bool = True
+    epex: bool = True
+
+
+class Device:
+    """Per-device constants and the counter state carried across days"""
+
+    def __init__(self, index: int, rng: np.random.Generator):
+        self.device_id = f"fleetmeter{index:03d}"
+        self.scale = float(rng.uniform(0.6, 1.4))   # Server size relative to the measured one
+        self.phase_s = float(rng.uniform(0, 10))    # TelePeriod phase
+        self.analog = int(rng.integers(0, 1025))
+        self.total_kwh = float(rng.uniform(0, 500))
+        self.today_kwh = 0.0
+        self.yesterday_kwh = float(rng.uniform(0, 10))
+        self.local_day = None
+        self.total_start_time = '2025-01-01T00:00:00'
+
+
+def _local_offset_s(day_start: datetime) -> int:
+    """UTC offset of the local timezone (CET/CEST) at noon of a UTC day"""
+    return int(LOCAL_TIMEZONE.utcoffset(day_start.replace(tzinfo=None) + timedelta(hours=12)).total_seconds())
+
+
+def device_power(device: Device, seconds: np.ndarray, offset_s: int, rng: np.random.Generator) -> np.ndarray:
+    """Power (W) of one device at the given seconds of a UTC day"""
+    idle = PROFILES['WL5_Idle']
+    power = idle['power_w'] + rng.normal(0, idle['noise_w'], seconds.size)
+
+    for workload, (probability, (first_hour, last_hour)) in SCHEDULE.items():
+        if rng.random() >= probability:
+            continue
+        profile = PROFILES[workload]
+        start = rng.uniform(first_hour, last_hour) * 3600 - offset_s
+        for cycle in range(profile['cycles']):
+            begin = start + cycle * (profile['active_minutes'] + profile['pause_minutes']) * 60
+            mask = (seconds >= begin) & (seconds < begin + profile['active_minutes'] * 60)
+            power[mask] = profile['power_w'] + rng.normal(0, profile['noise_w'], int(mask.sum()))
+            if workload == 'WL3_Reboot':
+                # Power supply off for the first minute of the reboot
+                power[mask & (seconds < begin + 60)] = rng.uniform(0, 3)
+
+    return np.clip(np.round(power * device.scale), 0, None)
+
+
+def tasmota_events(device: Device, day_start: datetime, config: FleetConfig,
+                   rng: np.random.Generator, stats: Dict) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+    """
+    IoT rule events of one device for one UTC day
+
+    Returns:
+        Tuple of (events in delivery order, sample seconds of the day, power in W).
+        Events have the shape of
+        SELECT *, topic() as topic, timestamp() as aws_timestamp FROM 'tele/+/SENSOR'
+    """
+    offset_s = _local_offset_s(day_start)
+    samples = int(86400 / config.interval_s)
+    seconds = np.arange(samples) * config.interval_s + device.phase_s + rng.normal(0, 0.05, samples)
+    seconds = np.clip(seconds, 0, 86399.999)
+    power = device_power(device, seconds, offset_s, rng)
+
+    # Energy accrues on the device even while telemetry is lost
+    energy_kwh = power * config.interval_s / 3.6e6
+    day_epoch = day_start.timestamp()
+    local_seconds = (day_epoch + seconds + offset_s).astype(np.int64)
+    local_days = local_seconds // 86400
+    device_times = local_seconds.astype('datetime64[s]').astype(str).tolist()
+
+    keep = np.ones(samples, dtype=bool)
+    for _ in range(rng.poisson(config.gap_rate)):
+        start = int(rng.integers(0, samples))
+        length = int(rng.exponential(20 * 60) / config.interval_s) + 1
+        keep[start:start + length] = False
+        stats['gaps'] += 1
+
+    resets = set()
+    for _ in range(rng.poisson(config.reset_rate)):
+        index = int(rng.integers(0, samples))
+        resets.add(index)
+        keep[index:index + int(rng.integers(3, 12))] = False  # Plug restarts
+        stats['resets'] += 1
+
+    voltage = np.round(rng.normal(231, 1.5, samples))
+    factor = np.where(power > 0, np.clip(0.90 + 0.08 * power / 700 + rng.normal(0, 0.005, samples), 0, 1), 0)
+    apparent = np.where(factor > 0, np.round(power / np.maximum(factor, 1e-9)), 0)
+    reactive = np.round(np.sqrt(np.maximum(apparent ** 2 - power ** 2, 0)))
+    latency_ms = rng.integers(40, 400, samples)
+    duplicates = rng.random(samples) < config.duplicate_rate
+
+    events = []
+    topic = f"tele/{device.device_id}/SENSOR"
+    for i in range(samples):
+        if i in resets:
+            device.total_kwh = device.today_kwh = 0.0
+            device.total_start_time = device_times[i]
+        if device.local_day != local_days[i]:
+            if device.local_day is not None:
+                device.yesterday_kwh = device.today_kwh
+                device.today_kwh = 0.0
+            device.local_day = local_days[i]
+        device.total_kwh += energy_kwh[i]
+        device.today_kwh += energy_kwh[i]
+        if not keep[i]:
+            continue
+
+        aws_timestamp = int((day_epoch + seconds[i]) * 1000) + int(latency_ms[i])
+        event = {
+            'Time': device_times[i],
+            'ANALOG': {'A0': device.analog},
+            'ENERGY': {
+                'TotalStartTime': device.total_start_time,
+                'Total': round(device.total_kwh, 3),
+                'Yesterday': round(device.yesterday_kwh, 3),
+                'Today': round(device.today_kwh, 3),
+                'Period': int(round(energy_kwh[i] * 1000)),
+                'Power': int(power[i]),
+                'ApparentPower': int(apparent[i]),
+                'ReactivePower': int(reactive[i]),
+                'Factor': round(float(factor[i]), 2),
+                'Voltage': int(voltage[i]),
+                'Current': round(float(apparent[i] / voltage[i]), 3)
+            },
+            'topic': topic,
+            'aws_timestamp': aws_timestamp
+        }
+        events.append(event)
+        if duplicates[i]:
+            events.append(dict(event, aws_timestamp=aws_timestamp + int(rng.integers(5, 900))))
+            stats['duplicates'] += 1
+    return events, seconds, power
+
+
+def site_load(seconds: np.ndarray, offset_s: int, fleet_w: np.ndarray, day_of_year: int,
+              rng: np.random.Generator) -> np.ndarray:
+    """Site load (W) at the grid meter: base + office hours + fleet, minus PV (negative = feed-in)"""
+    local_hours = ((seconds + offset_s) / 3600) % 24
+    office = 1500 * np.exp(-((local_hours - 13) / 3.5) ** 2)
+    base = 600 + office + rng.normal(0, 80, seconds.size)
+    season = 0.6 + 0.4 * np.cos((day_of_year - 172) / 365 * 2 * np.pi)
+    clouds = rng.uniform(0.3, 1.0)
+    pv = 4000 * season * clouds * np.clip(np.sin((local_hours - 6) / 14 * np.pi), 0, None)
+    return base + fleet_w - pv
+
+
+def energylive_polls(day_start: datetime, fleet_w: np.ndarray, fleet_seconds: np.ndarray,
+                     state: Dict, rng: np.random.Generator) -> List[List[Dict]]:
+    """energyLIVE measurements/latest payloads of one UTC day (one poll every 5 minutes)"""
+    offset_s = _local_offset_s(day_start)
+    polls = np.arange(0, 86400, 300, dtype=np.float64)
+    fleet = np.interp(polls, fleet_seconds, fleet_w)
+    load = site_load(polls, offset_s, fleet, day_start.timetuple().tm_yday, rng)
+    import_w, export_w = np.clip(load, 0, None), np.clip(-load, 0, None)
+
+    payloads = []
+    for i, poll in enumerate(polls):
+        state['import_wh'] += import_w[i] * 300 / 3600
+        state['export_wh'] += export_w[i] * 300 / 3600
+        measured_ms = int((day_start.timestamp() + poll - rng.integers(0, 12) * 5) * 1000)
+        payload = [
+            {'measurement': '0100010700', 'timestamp': measured_ms, 'value': round(float(import_w[i]), 1)},
+            {'measurement': '0100010800', 'timestamp': measured_ms, 'value': round(state['import_wh'], 1)},
+            {'measurement': '0100020700', 'timestamp': measured_ms - 20000, 'value': round(float(export_w[i]), 1)},
+            {'measurement': '0100020800', 'timestamp': measured_ms, 'value': round(state['export_wh'], 1)}
+        ]
+        if rng.random() < 0.1:
+            payload.append({'measurement': 'batteryVoltage', 'timestamp': measured_ms,
+                            'value': round(float(rng.uniform(2.9, 3.1)), 2)})
+        payloads.append(payload)
+    return payloads
+
+
+def epex_payload(local_day: date, rng: np.random.Generator) -> Dict:
+    """smartENERGY /market/v1/price response with the 96 quarter-hour prices of a local day"""
+    start = datetime(local_day.year, local_day.month, local_day.day, tzinfo=LOCAL_TIMEZONE)
+    slots = [start + timedelta(minutes=15 * i) for i in range(24 * 4 + 4)]
+    slots = [slot for slot in slots if slot.astimezone(LOCAL_TIMEZONE).date() == local_day]  # DST days
+    hours = np.array([slot.hour + slot.minute / 60 for slot in slots])
+    summer = 0.5 + 0.5 * np.cos((local_day.timetuple().tm_yday - 172) / 365 * 2 * np.pi)
+    level = 9 + rng.normal(0, 2) - (2.5 if local_day.weekday() >= 5 else 0)
+    prices = (level
+              + 3.5 * np.exp(-((hours - 8) / 1.5) ** 2)
+              + 5.0 * np.exp(-((hours - 19.5) / 2) ** 2)
+              - 9.0 * summer * np.exp(-((hours - 13) / 2.5) ** 2)
+              + rng.normal(0, 0.8, hours.size))
+    return {
+        'tariff': 'EPEXSPOTAT',
+        'unit': 'ct/kWh',
+        'interval': 15,
+        'data': [{'date': slot.isoformat(), 'value': round(float(price), 3)} for slot, price in zip(slots, prices)]
+    }
+
+
+class ItemSink:
+    """
+    Table stand-in for a Lambda handler that forwards stored items in bulk
+
+    Also tracks the first/last registry timestamp per partition key, so the
+    DeviceRegistry can be written once at the end instead of per item.
+    """
+
+    def __init__(self, name: str, write: Callable[[List[Dict]], None], batch_size: int = 10000,
+                 registry_value: Optional[Callable[[Dict], str]] = None):
+        self.name = name
+        self.partition_key, self.sort_key = TABLES[name]['keys']
+        self.write = write
+        self.batch_size = batch_size
+        self.registry_value = registry_value
+        self.buffer = []
+        self.count = 0
+        self.registry = {}  # key_id -> [first_seen, last_seen]
+        self._conditional_keys = set()
+
+    def put_item(self, Item: Dict, ConditionExpression: Optional[str] = None, **kwargs) -> Dict:
+        if ConditionExpression:
+            key = (Item[self.partition_key], Item[self.sort_key])
+            if key in self._conditional_keys:
+                raise _conditional_check_failed('PutItem')
+            self._conditional_keys.add(key)
+        self.buffer.append(Item)
+        if self.registry_value:
+            seen = self.registry_value(Item)
+            span = self.registry.setdefault(Item[self.partition_key], [seen, seen])
+            span[0], span[1] = min(span[0], seen), max(span[1], seen)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+        return {}
+
+    def flush(self):
+        if self.buffer:
+            self.write(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer = []
+
+
+# Timestamp each Lambda passes to register_key (see the handlers)
+REGISTRY_VALUES = {
+    'SensorData': lambda item: item['timestamp'],
+    'EnergyLiveData': lambda item: item['iso_timestamp'],
+    'EPEXSpotPrices': lambda item: datetime.fromtimestamp(int(item['timestamp']) / 1000,
+                                                          tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+}
+
+
+def generate(config: FleetConfig, writers: Dict[str, Callable[[List[Dict]], None]],
+             progress: Callable[[str], None] = print) -> Dict:
+    """
+    Generate fleet telemetry and push it through the Lambda handlers into the writers
+
+    Args:
+        config: Fleet size, date range, fault rates
+        writers: Table name -> function receiving batches of stored items
+        progress: Line printer for per-day progress
+
+    Returns:
+        Statistics (items per table, gaps, duplicates, resets) and 'registry':
+        table -> {key_id: [first_seen, last_seen]}
+    """
+    rng = np.random.default_rng(config.seed)
+    devices = [Device(i + 1, rng) for i in range(config.devices)]
+    sinks = {name: ItemSink(name, write, registry_value=REGISTRY_VALUES[name]) for name, write in writers.items()}
+    stats = {'messages': 0, 'gaps': 0, 'duplicates': 0, 'resets': 0}
+    energylive_state = {'import_wh': 12_500_000.0, 'export_wh': 3_100_000.0}
+
+    # The handlers run in UTC on Lambda (datetime.fromtimestamp, datetime.now)
+    previous_tz = os.environ.get('TZ')
+    os.environ['TZ'] = 'UTC'
+    time.tzset()
+    os.environ.setdefault('API_KEY', 'synthetic')
+    os.environ['DEVICE_UID'] = ENERGYLIVE_UID
+    current = {}
+    mqtt = load_lambda('process-mqtt.py', sinks['SensorData']) if 'SensorData' in sinks else None
+    energylive = (load_lambda('energylive-api-collector.py', sinks['EnergyLiveData'],
+                              payload=lambda: current['energylive'])
+                  if 'EnergyLiveData' in sinks and config.energylive else None)
+    epex = (load_lambda('epex-spot-collector.py', sinks['EPEXSpotPrices'], payload=lambda: current['epex'])
+            if 'EPEXSpotPrices' in sinks and config.epex else None)
+
+    try:
+        first_day = datetime.strptime(config.start_day, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        fleet_seconds = np.arange(0, 86400, config.interval_s)
+        for day_index in range(config.days):
+            day_start = first_day + timedelta(days=day_index)
+            started = time.perf_counter()
+            fleet_w = np.zeros(fleet_seconds.size)
+            day_messages = 0
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for device in devices:
+                    events, seconds, power = tasmota_events(device, day_start, config, rng, stats)
+                    day_messages += len(events)
+                    fleet_w += np.interp(fleet_seconds, seconds, power)
+                    if mqtt:
+                        for event in events:
+                            mqtt.lambda_handler(event, None)
+                if energylive:
+                    for payload in energylive_polls(day_start, fleet_w, fleet_seconds, energylive_state, rng):
+                        current['energylive'] = payload
+                        energylive.lambda_handler({}, None)
+                if epex:
+                    current['epex'] = epex_payload(day_start.date(), rng)
+                    epex.lambda_handler({}, None)
+            stats['messages'] += day_messages
+            progress(f"   {day_start.date()}: {day_messages:,} Tasmota messages from {len(devices)} device(s) "
+                     f"in {time.perf_counter() - started:.1f} s")
+        for sink in sinks.values():
+            sink.flush()
+    finally:
+        if previous_tz is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous_tz
+        time.tzset()
+
+    stats['items'] = {name: sink.count for name, sink in sinks.items()}
+    stats['registry'] = {name: sink.registry for name, sink in sinks.items()}
+    return stats
+
+
+def memory_tables(config: FleetConfig) -> Dict[str, MemoryTable]:
+    """Generate a fleet into in-memory tables (for benchmarks and tests)"""
+    tables = {name: MemoryTable(name, *spec['keys']) for name, spec in TABLES.items()}
+    generate(config, {name: table.load for name, table in tables.items()}, progress=lambda line: None)
+    return tables
+
+
+def file_writers(directory: str, fmt: str):
+    """Streaming table writers (one file per table) and their batch functions"""
+    from writers import open_table_writer
+    os.makedirs(directory, exist_ok=True)
+    handles = {name: open_table_writer(os.path.join(directory, name), list(spec['batch'].__slots__), fmt)
+               for name, spec in TABLES.items()}
+
+    def batch_writer(name):
+        batch_type = TABLES[name]['batch']
+
+        def write(items):
+            handles[name].write_columns(batch_type.from_items(items).columns())
+        return write
+    return handles, {name: batch_writer(name) for name in TABLES}
+
+
+def create_tables(dynamodb):
+    """Create the data and registry tables with the terraform key schema (if missing)"""
+    existing = set(dynamodb.meta.client.list_tables()['TableNames'])
+    schemas = dict(TABLES, DeviceRegistry={'keys': ('source', 'key_id'), 'types': {'source': 'S', 'key_id': 'S'}},
+                   DataCoverage={'keys': ('device_id', 'hour'), 'types': {'device_id': 'S', 'hour': 'S'}})
+    for name, spec in schemas.items():
+        if name in existing:
+            continue
+        partition_key, sort_key = spec['keys']
+        kwargs = {}
+        if spec.get('indexes'):
+            kwargs['GlobalSecondaryIndexes'] = [
+                {'IndexName': index, 'Projection': {'ProjectionType': 'ALL'},
+                 'KeySchema': [{'AttributeName': attribute, 'KeyType': 'HASH'},
+                               {'AttributeName': sort_key, 'KeyType': 'RANGE'}]}
+                for index, attribute in spec['indexes'].items()
+            ]
+        dynamodb.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': partition_key, 'KeyType': 'HASH'},
+                       {'AttributeName': sort_key, 'KeyType': 'RANGE'}],
+            AttributeDefinitions=[{'AttributeName': attribute, 'AttributeType': kind}
+                                  for attribute, kind in spec['types'].items()],
+            BillingMode='PAY_PER_REQUEST',
+            **kwargs
+        ).wait_until_exists()
+        print(f"   Created table {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic fleet telemetry for scale testing')
+    parser.add_argument('--devices', type=int, default=4, help='Number of Tasmota devices (default: 4)')
+    parser.add_argument('--from', dest='start_day', default='2025-06-01', help='First UTC day (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, default=7, help='Number of days (default: 7)')
+    parser.add_argument('--interval', type=float, default=10.0, help='Tasmota TelePeriod in seconds (default: 10)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--gap-rate', type=float, default=0.2, help='Telemetry outages per device and day')
+    parser.add_argument('--duplicate-rate', type=float, default=0.002, help='Share of duplicated messages')
+    parser.add_argument('--reset-rate', type=float, default=0.02, help='Energy counter resets per device and day')
+    parser.add_argument('--no-energylive', action='store_true', help='Skip energyLIVE readings')
+    parser.add_argument('--no-epex', action='store_true', help='Skip EPEX prices')
+    parser.add_argument('--target', choices=['files', 'dynamodb'], default='files', help='Output target')
+    parser.add_argument('--format', dest='export_format', choices=['csv', 'parquet', 'arrow'], default='parquet',
+                        help='File format for --target files (parquet and arrow need pyarrow)')
+    parser.add_argument('--output-dir', default='fleet_data', help='Directory for --target files')
+    parser.add_argument('--endpoint-url', help='DynamoDB Local endpoint for --target dynamodb '
+                                               '(e.g. http://localhost:8000)')
+    parser.add_argument('--coverage', action='store_true',
+                        help='Rebuild the DataCoverage index for every device after loading (--target dynamodb)')
+    args = parser.parse_args()
+
+    config = FleetConfig(devices=args.devices, start_day=args.start_day, days=args.days, interval_s=args.interval,
+                         seed=args.seed, gap_rate=args.gap_rate, duplicate_rate=args.duplicate_rate,
+                         reset_rate=args.reset_rate, energylive=not args.no_energylive, epex=not args.no_epex)
+
+    handles = {}
+    dynamodb = None
+    if args.target == 'dynamodb':
+        if not args.endpoint_url:
+            # Never bulk-load synthetic data into the real tables
+            print("❌ --target dynamodb requires --endpoint-url (DynamoDB Local)")
+            sys.exit(2)
+        import boto3
+        from table_maintenance import batch_write
+        dynamodb = boto3.resource('dynamodb', endpoint_url=args.endpoint_url)
+        create_tables(dynamodb)
+
+        def table_writer(name):
+            table = dynamodb.Table(name)
+            return lambda items: batch_write(table, [{'PutRequest': {'Item': item}} for item in items])
+        writers = {name: table_writer(name) for name in TABLES}
+        destination = args.endpoint_url
+    else:
+        handles, writers = file_writers(args.output_dir, args.export_format)
+        destination = args.output_dir
+
+    print(f"🏭 Generating {args.days} day(s) for {args.devices} device(s) from {args.start_day} -> {destination}")
+    started = time.perf_counter()
+    try:
+        stats = generate(config, writers)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    if dynamodb is not None:
+        now = datetime.utcnow().isoformat()
+        with dynamodb.Table('DeviceRegistry').batch_writer() as batch:
+            for source, keys in stats['registry'].items():
+                for key_id, (first_seen, last_seen) in keys.items():
+                    batch.put_item(Item={'source': source, 'key_id': key_id, 'first_seen': first_seen,
+                                         'last_seen': last_seen, 'updated_at': now})
+        if args.coverage:
+            from coverage import CoverageIndex
+            index = CoverageIndex(dynamodb=dynamodb)
+            last_day = (datetime.strptime(args.start_day, '%Y-%m-%d') + timedelta(days=args.days - 1)).date()
+            for device_id in stats['registry'].get('SensorData', {}):
+                index.rebuild(device_id, args.start_day, last_day.isoformat())
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Generated in {elapsed:.1f} s ({stats['messages'] / elapsed:,.0f} messages/s)")
+    for name, count in stats['items'].items():
+        print(f"   {name}: {count:,} items")
+    print(f"   Faults: {stats['gaps']} gaps, {stats['duplicates']} duplicates, {stats['resets']} counter resets")
+    for handle in handles.values():
+        print(f"   📁 {handle.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness
+=================
+
+Registry, timer and result comparison for the micro-benchmarks.
+
+A benchmark is a setup function registered with @benchmark. It receives the
+row count and returns a Case: the timed 'run' callable and an optional
+untimed 'reset' called before every repetition (e.g. to empty a stand-in
+table). Setup (dataset generation, imports) is never timed.
+
+Results are stored as JSON:
+    {"created": ..., "commit": ..., "python": ..., "machine": ...,
+     "benchmarks": {name: {rows: {"times_s": [...], "min_s", "median_s", "rows_per_s"}}}}
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5]
+
+
+class Case(NamedTuple):
+    run: Callable[[], object]
+    reset: Optional[Callable[[], None]] = None
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[int], Case]
+    sizes: List[int]
+    max_size: int
+    description: str
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, sizes: List[int] = None, max_size: int = 10**6):
+    """
+    Register a benchmark setup function
+
+    Args:
+        name: Dotted benchmark name (e.g. 'lambda.process_mqtt')
+        sizes: Default row counts
+        max_size: Largest row count the benchmark accepts (memory bound)
+    """
+    def register(setup):
+        description = (setup.__doc__ or '').strip().splitlines()[0] if setup.__doc__ else ''
+        BENCHMARKS[name] = Benchmark(name, setup, sizes or DEFAULT_SIZES, max_size, description)
+        return setup
+    return register
+
+
+def time_case(case: Case, repeat: int = 5, budget_s: float = 10.0) -> List[float]:
+    """
+    Time a case; stops early once the budget is used (at least one run)
+
+    Output of the code under test (the Lambda handlers print per message) is
+    discarded and garbage collection is disabled while timing.
+    """
+    times = []
+    sink = io.StringIO()
+    for _ in range(repeat):
+        if case.reset:
+            case.reset()
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(sink):
+                started = time.perf_counter()
+                case.run()
+                times.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+        sink.seek(0)
+        sink.truncate()
+        if sum(times) > budget_s:
+            break
+    return times
+
+
+def run_benchmarks(names: List[str], sizes: Optional[List[int]] = None, repeat: int = 5,
+                   budget_s: float = 10.0, progress: Callable[[str], None] = print) -> Dict:
+    """
+    Run benchmarks and return the results document
+
+    Args:
+        names: Benchmark names to run
+        sizes: Row counts overriding the benchmark defaults (capped at max_size)
+        repeat: Repetitions per size
+        budget_s: Time budget per size after which repetitions stop
+        progress: Line printer for progress output
+    """
+    results = {}
+    for name in names:
+        bench = BENCHMARKS[name]
+        results[name] = {}
+        for rows in sizes or bench.sizes:
+            if rows > bench.max_size:
+                progress(f"   {name} [{rows:>10,}]: skipped (max {bench.max_size:,} rows)")
+                continue
+            case = bench.setup(rows)
+            times = time_case(case, repeat, budget_s)
+            median = statistics.median(times)
+            results[name][str(rows)] = {
+                'rows': rows,
+                'repeats': len(times),
+                'times_s': [round(t, 6) for t in times],
+                'min_s': round(min(times), 6),
+                'median_s': round(median, 6),
+                'rows_per_s': round(rows / median, 1) if median > 0 else None
+            }
+            progress(f"   {name} [{rows:>10,}]: median {format_seconds(median)}, "
+                     f"{rows / median:,.0f} rows/s ({len(times)} runs)")
+            del case
+            gc.collect()
+    return {
+        'created': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': f"{platform.platform()} ({os.cpu_count()} CPUs)",
+        'benchmarks': results
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
+
+
+def save_results(document: Dict, path: str) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10, statistic: str = 'median_s',
+                    min_seconds: float = 0.001) -> List[Dict]:
+    """
+    Compare two results documents
+
+    A benchmark size is a regression when the current time exceeds the
+    baseline by more than 'threshold' (relative) and by more than
+    'min_seconds' (absolute, so microsecond jitter is not flagged).
+
+    Returns:
+        One row per benchmark size present in both documents, with the
+        status 'regression', 'improvement' or 'ok'
+    """
+    rows = []
+    for name, sizes in current['benchmarks'].items():
+        for rows_key, result in sizes.items():
+            base = baseline['benchmarks'].get(name, {}).get(rows_key)
+            if not base:
+                continue
+            before, after = base[statistic], result[statistic]
+            change = (after - before) / before if before > 0 else 0.0
+            if change > threshold and after - before > min_seconds:
+                status = 'regression'
+            elif change < -threshold and before - after > min_seconds:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'benchmark': name, 'rows': int(rows_key), 'baseline_s': before, 'current_s': after,
+                         'change_percent': round(change * 100, 1), 'status': status})
+    return rows
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Record Memory Footprint
+=======================
+
+Memory of N SensorData readings (every attribute process-mqtt.py writes) held
+three ways, measured with tracemalloc:
+
+- items:    boto3 resource items as Table.query returns them (dicts of Decimal,
+            deserialized with boto3's TypeDeserializer like the resource does)
+- records:  SensorReading objects (__slots__, float attributes)
+- batch:    one SensorBatch (array('d') columns, string lists)
+
+plus the time to get a power array from each. Conversion speed is covered by
+the records.* benchmarks (run_benchmarks.py run --only records. --sizes 1e6).
+
+Usage:
+    python record_footprint.py                      # 10^6 readings
+    python record_footprint.py --rows 1e5 --output footprint.json
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import numpy as np
+from boto3.dynamodb.types import TypeDeserializer
+
+from datasets import sensor_batch
+from records import SensorBatch
+
+CHUNK_ROWS = 10000
+
+
+def traced(build):
+    """Run build() under tracemalloc; returns (result, bytes still allocated by it)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def timed(run, repeat: int = 3) -> float:
+    """Best of 'repeat' runs in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def resource_items(source: SensorBatch):
+    """Items as the boto3 resource layer returns them (fresh Decimal/str objects per attribute)"""
+    deserializer = TypeDeserializer()
+    items = []
+    for start in range(0, len(source), CHUNK_ROWS):
+        chunk = source.take(range(start, min(start + CHUNK_ROWS, len(source))))
+        items.extend({name: deserializer.deserialize(value) for name, value in item.items()}
+                     for item in chunk.to_typed_items())
+    return items
+
+
+def measure(rows: int) -> dict:
+    source = sensor_batch(rows)
+
+    print(f"📏 {rows:,} SensorData readings ({len(SensorBatch.RECORD.FIELDS)} attributes, no ANALOG)")
+    items, items_bytes = traced(lambda: resource_items(source))
+    batch, batch_bytes = traced(lambda: SensorBatch.from_items(items))
+    items_power_s = timed(lambda: np.asarray([float(item['current_power']) for item in items
+                                              if 'current_power' in item]))
+    del items
+    records, records_bytes = traced(lambda: list(batch))
+    records_power_s = timed(lambda: np.asarray([record.current_power for record in records]))
+    del records
+    batch_power_s = timed(lambda: np.asarray(batch.present('current_power').current_power))
+
+    results = {
+        'rows': rows,
+        'items': {'bytes': items_bytes, 'power_array_s': items_power_s},
+        'records': {'bytes': records_bytes, 'power_array_s': records_power_s},
+        'batch': {'bytes': batch_bytes, 'power_array_s': batch_power_s}
+    }
+
+    print(f"\n{'Layout':<10} {'Total':>10} {'Per reading':>12} {'vs items':>9} {'Power array':>12}")
+    for layout in ('items', 'records', 'batch'):
+        entry = results[layout]
+        print(f"{layout:<10} {entry['bytes'] / 2**20:>8.1f} MB {entry['bytes'] / rows:>10.0f} B "
+              f"{items_bytes / entry['bytes']:>8.1f}x {entry['power_array_s'] * 1e3:>9.1f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the memory of readings as items, records and batches')
+    parser.add_argument('--rows', type=lambda text: int(float(text)), default=10**6,
+                        help='Number of readings (default: 1e6)')
+    parser.add_argument('--output', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    results = measure(args.rows)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
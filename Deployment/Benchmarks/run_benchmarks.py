@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark Runner
+======================
+
+Runs the hot-path benchmarks (Lambda handlers, timestamp normalization,
+record conversions, energy/price analysis and exports) on synthetic datasets against local
+stand-ins and stores the timings as JSON; 'compare' flags regressions
+between two result files.
+
+Usage:
+    python run_benchmarks.py list
+    python run_benchmarks.py run                                  # default sizes (10^3-10^5)
+    python run_benchmarks.py run --only lambda. --sizes 1e3,1e4,1e5,1e6
+    python run_benchmarks.py run --sizes 1e7 --only stats.        # largest sizes
+    python run_benchmarks.py compare benchmark_results/base.json benchmark_results/new.json
+
+'compare' exits with status 1 if any benchmark got slower than --threshold,
+so it can gate a change in CI.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import bench_analysis  # noqa: F401  (registers benchmarks)
+import bench_lambda  # noqa: F401  (registers benchmarks)
+import bench_records  # noqa: F401  (registers benchmarks)
+from harness import BENCHMARKS, compare_results, format_seconds, run_benchmarks, save_results
+
+DEFAULT_RESULTS_DIR = 'benchmark_results'
+
+
+def parse_sizes(text: str):
+    """'1e3,10000,1e5' -> [1000, 10000, 100000]"""
+    return [int(float(size)) for size in text.split(',') if size.strip()]
+
+
+def select(only):
+    if not only:
+        return list(BENCHMARKS)
+    return [name for name in BENCHMARKS if any(name.startswith(prefix) for prefix in only)]
+
+
+def command_list(args):
+    for name, bench in BENCHMARKS.items():
+        sizes = ', '.join(f"{size:,}" for size in bench.sizes)
+        print(f"{name:<40} {bench.description}")
+        print(f"{'':<40} default rows: {sizes} (max {bench.max_size:,})")
+
+
+def command_run(args):
+    names = select(args.only)
+    if not names:
+        print(f"❌ No benchmark matches {args.only}")
+        sys.exit(2)
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    print(f"⏱️  Running {len(names)} benchmark(s), {args.repeat} repetitions per size")
+    document = run_benchmarks(names, sizes=args.sizes, repeat=args.repeat, budget_s=args.budget)
+    save_results(document, output)
+    print(f"\n📁 Results saved to {output} (commit {document['commit'] or 'unknown'})")
+
+
+def command_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    if (baseline.get('machine'), baseline.get('python')) != (current.get('machine'), current.get('python')):
+        print(f"⚠️  Different environments: {baseline.get('machine')} / Python {baseline.get('python')} vs "
+              f"{current.get('machine')} / Python {current.get('python')}")
+
+    statistic = f"{args.statistic}_s"
+    rows = compare_results(baseline, current, threshold=args.threshold, statistic=statistic,
+                           min_seconds=args.min_seconds)
+    if not rows:
+        print("No common benchmarks to compare")
+        return
+
+    print(f"Comparing {args.statistic} times: {baseline.get('commit')} -> {current.get('commit')} "
+          f"(threshold {args.threshold:.0%})\n")
+    print(f"{'Benchmark':<40} {'Rows':>10} {'Baseline':>12} {'Current':>12} {'Change':>9}")
+    markers = {'regression': '❌ REGRESSION', 'improvement': '✅ faster', 'ok': ''}
+    for row in rows:
+        print(f"{row['benchmark']:<40} {row['rows']:>10,} {format_seconds(row['baseline_s']):>12} "
+              f"{format_seconds(row['current_s']):>12} {row['change_percent']:>+8.1f}% {markers[row['status']]}")
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    print(f"\n{len(regressions)} regression(s), "
+          f"{sum(row['status'] == 'improvement' for row in rows)} improvement(s) in {len(rows)} comparison(s)")
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run and compare the micro-benchmark suite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List benchmarks and their default sizes').set_defaults(handler=command_list)
+
+    run = subparsers.add_parser('run', help='Run benchmarks and save the results as JSON')
+    run.add_argument('--only', nargs='+', metavar='PREFIX', help='Only run benchmarks starting with these prefixes')
+    run.add_argument('--sizes', type=parse_sizes,
+                     help='Comma-separated row counts, e.g. 1e3,1e5,1e7 (default: per benchmark)')
+    run.add_argument('--repeat', type=int, default=5, help='Repetitions per size (default: 5)')
+    run.add_argument('--budget', type=float, default=10.0,
+                     help='Seconds per size after which repetitions stop (default: 10)')
+    run.add_argument('--output', help=f'Results file (default: {DEFAULT_RESULTS_DIR}/<timestamp>.json)')
+    run.set_defaults(handler=command_run)
+
+    compare = subparsers.add_parser('compare', help='Compare two result files and flag regressions')
+    compare.add_argument('baseline', help='Baseline results JSON')
+    compare.add_argument('current', help='Current results JSON')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative slowdown flagged as regression (default: 0.10)')
+    compare.add_argument('--min-seconds', type=float, default=0.001,
+                         help='Ignore differences below this many seconds (default: 0.001)')
+    compare.add_argument('--statistic', choices=['median', 'min'], default='median',
+                         help='Timing statistic to compare (default: median)')
+    compare.set_defaults(handler=command_compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
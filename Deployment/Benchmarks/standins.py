@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Local Stand-ins for Benchmarks
+==============================
+
+In-memory replacements for the AWS resources used by the Lambda handlers and
+the analysis scripts, so benchmarks measure our code instead of the network:
+
+- MemoryTable: DynamoDB Table with put_item (incl. attribute_not_exists
+  conditions), get_item, update_item, batch_writer and paginated query on the boto3
+  Key() conditions the repo uses (eq, between, gte, lt, begins_with, and), plus
+  segmented paginated scan and a meta.client with describe_table,
+  batch_get_item and batch_write_item (the calls of Scripts/table_maintenance.py)
+- MemoryClient: low-level DynamoDB client (put_item/get_item/update_item with
+  typed items) that routes each call by TableName to a MemoryTable, storing the
+  items in resource form (Decimal numbers) like Table.query returns them
+- MemoryEndpoint: answers the Query requests of real boto3 clients and
+  resources from MemoryTables, so botocore's request signing and response
+  parsing are measured too (the read paths of the analysis scripts)
+- load_lambda: imports a hyphenated handler module (e.g. process-mqtt.py)
+  with its table, registry/coverage tables and HTTP calls pointed at stand-ins
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import bisect
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+DEPLOYMENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LAMBDA_DIR = os.path.join(DEPLOYMENT_DIR, 'Lambda')
+ANALYSIS_DIR = os.path.join(DEPLOYMENT_DIR, 'Energy-Analysis')
+
+# boto3 clients and resources need a region, never credentials
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+_client = None
+
+
+def _conditional_check_failed(operation: str) -> ClientError:
+    """The modeled exception boto3 raises for a failed ConditionExpression"""
+    global _client
+    if _client is None:
+        _client = boto3.client('dynamodb')
+    return _client.exceptions.ConditionalCheckFailedException(
+        {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+        operation)
+
+
+def _key_conditions(condition) -> Dict:
+    """Flatten a boto3 Key() condition into {attribute: (operator, values)}"""
+    expression = condition.get_expression()
+    if expression['operator'] == 'AND':
+        flattened = {}
+        for value in expression['values']:
+            flattened.update(_key_conditions(value))
+        return flattened
+    return {expression['values'][0].name: (expression['operator'], expression['values'][1:])}
+
+
+class MemoryTable:
+    """In-memory DynamoDB Table (partition key + sort key) for local benchmarks"""
+
+    def __init__(self, name: str, partition_key: str, sort_key: str, page_size: int = 3000):
+        """
+        Initialize the table
+
+        Args:
+            name: Table name
+            partition_key: Partition key attribute
+            sort_key: Sort key attribute
+            page_size: Items per query page (about 1 MB of SensorData items)
+        """
+        self.name = self.table_name = name
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.page_size = page_size
+        self.items = {}       # partition value -> {sort value: item}
+        self._sorted = {}     # partition value -> sorted sort values (rebuilt after writes)
+        self.key_schema = [{'AttributeName': partition_key, 'KeyType': 'HASH'},
+                           {'AttributeName': sort_key, 'KeyType': 'RANGE'}]
+        self.writes = 0
+        self.updates = 0
+        self.scans = 0
+        self.meta = SimpleNamespace(client=_TableClient(self))
+        self._lock = threading.Lock()  # scan and batch_write_item run from several threads
+
+    def load(self, items: List[Dict]) -> 'MemoryTable':
+        """Bulk-load items without counting them as writes"""
+        for item in items:
+            self.items.setdefault(item[self.partition_key], {})[item[self.sort_key]] = item
+        self._sorted.clear()
+        return self
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.items.values())
+
+    def put_item(self, Item: Dict, ConditionExpression: Optional[str] = None, **kwargs) -> Dict:
+        partition = self.items.setdefault(Item[self.partition_key], {})
+        if ConditionExpression and 'attribute_not_exists' in ConditionExpression and Item[self.sort_key] in partition:
+            raise _conditional_check_failed('PutItem')
+        if Item[self.sort_key] not in partition:
+            self._sorted.pop(Item[self.partition_key], None)
+        partition[Item[self.sort_key]] = Item
+        self.writes += 1
+        return {}
+
+    def get_item(self, Key: Dict, **kwargs) -> Dict:
+        item = self.items.get(Key[self.partition_key], {}).get(Key[self.sort_key])
+        return {'Item': item} if item is not None else {}
+
+    def update_item(self, **kwargs) -> Dict:
+        self.updates += 1
+        return {}
+
+    def batch_writer(self, **kwargs) -> '_BatchWriter':
+        return _BatchWriter(self)
+
+    def query(self, KeyConditionExpression, ScanIndexForward: bool = True, Limit: Optional[int] = None,
+              ExclusiveStartKey: Optional[Dict] = None, **kwargs) -> Dict:
+        conditions = _key_conditions(KeyConditionExpression)
+        partition_value = conditions[self.partition_key][1][0]
+        partition = self.items.get(partition_value, {})
+        keys = self._sorted.get(partition_value)
+        if keys is None:
+            keys = self._sorted[partition_value] = sorted(partition)
+
+        lo, hi = 0, len(keys)
+        if self.sort_key in conditions:
+            operator, values = conditions[self.sort_key]
+            if operator == 'BETWEEN':
+                lo, hi = bisect.bisect_left(keys, values[0]), bisect.bisect_right(keys, values[1])
+            elif operator == '=':
+                lo, hi = bisect.bisect_left(keys, values[0]), bisect.bisect_right(keys, values[0])
+            elif operator == '>=':
+                lo = bisect.bisect_left(keys, values[0])
+            elif operator == '<':
+                hi = bisect.bisect_left(keys, values[0])
+            elif operator == 'begins_with':
+                lo = bisect.bisect_left(keys, values[0])
+                hi = lo
+                while hi < len(keys) and str(keys[hi]).startswith(values[0]):
+                    hi += 1
+
+        page = min(Limit or self.page_size, self.page_size)
+        if ScanIndexForward:
+            if ExclusiveStartKey:
+                lo = max(lo, bisect.bisect_right(keys, ExclusiveStartKey[self.sort_key]))
+            selected = keys[lo:min(hi, lo + page)]
+            more = lo + page < hi
+        else:
+            if ExclusiveStartKey:
+                hi = min(hi, bisect.bisect_left(keys, ExclusiveStartKey[self.sort_key]))
+            selected = keys[max(lo, hi - page):hi][::-1]
+            more = hi - page > lo
+
+        response = {'Items': [partition[key] for key in selected], 'Count': len(selected)}
+        if kwargs.get('ReturnConsumedCapacity'):
+            response['ConsumedCapacity'] = {'TableName': self.name, 'CapacityUnits': max(1, len(selected) // 12) * 0.5}
+        if more and selected:
+            response['LastEvaluatedKey'] = {self.partition_key: partition_value, self.sort_key: selected[-1]}
+        return response
+
+
+    def scan(self, Segment: int = 0, TotalSegments: int = 1, Limit: Optional[int] = None,
+             ExclusiveStartKey: Optional[Dict] = None, ProjectionExpression: Optional[str] = None,
+             ExpressionAttributeNames: Optional[Dict] = None, **kwargs) -> Dict:
+        # Partitions are assigned to segments by a stable hash, pages follow (partition, sort) order
+        with self._lock:
+            self.scans += 1
+            keys = sorted((partition_value, sort_value)
+                          for partition_value, partition in self.items.items()
+                          if zlib.crc32(str(partition_value).encode()) % TotalSegments == Segment
+                          for sort_value in partition)
+            start = 0
+            if ExclusiveStartKey:
+                start = bisect.bisect_right(keys, (ExclusiveStartKey[self.partition_key],
+                                                   ExclusiveStartKey[self.sort_key]))
+            selected = keys[start:start + min(Limit or self.page_size, self.page_size)]
+            items = [self.items[partition_value][sort_value] for partition_value, sort_value in selected]
+
+        if ProjectionExpression:
+            names = ExpressionAttributeNames or {}
+            attributes = [names.get(name.strip(), name.strip()) for name in ProjectionExpression.split(',')]
+            items = [{name: item[name] for name in attributes if name in item} for item in items]
+        response = {'Items': items, 'Count': len(items), 'ScannedCount': len(items)}
+        if kwargs.get('ReturnConsumedCapacity'):
+            response['ConsumedCapacity'] = {'TableName': self.name, 'CapacityUnits': max(1, len(items) // 12) * 0.5}
+        if start + len(selected) < len(keys):
+            response['LastEvaluatedKey'] = {self.partition_key: selected[-1][0], self.sort_key: selected[-1][1]}
+        return response
+
+
+class _TableClient:
+    """Table.meta.client stand-in (plain Python values, like a resource's client)"""
+
+    def __init__(self, table: MemoryTable):
+        self.table = table
+
+    def describe_table(self, TableName: str) -> Dict:
+        return {'Table': {'TableName': TableName, 'KeySchema': self.table.key_schema}}
+
+    def batch_get_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        table = self.table
+        with table._lock:
+            items = [table.items.get(key[table.partition_key], {}).get(key[table.sort_key])
+                     for key in RequestItems[table.name]['Keys']]
+        return {'Responses': {table.name: [item for item in items if item is not None]}, 'UnprocessedKeys': {}}
+
+    def batch_write_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        table = self.table
+        requests = RequestItems[table.name]
+        with table._lock:
+            for request in requests:
+                if 'PutRequest' in request:
+                    item = request['PutRequest']['Item']
+                    table.items.setdefault(item[table.partition_key], {})[item[table.sort_key]] = item
+                    table._sorted.pop(item[table.partition_key], None)
+                    table.writes += 1
+                else:
+                    key = request['DeleteRequest']['Key']
+                    table.items.get(key[table.partition_key], {}).pop(key[table.sort_key], None)
+                    table._sorted.pop(key[table.partition_key], None)
+        response = {'UnprocessedItems': {}}
+        if kwargs.get('ReturnConsumedCapacity'):
+            response['ConsumedCapacity'] = [{'TableName': table.name, 'CapacityUnits': float(len(requests))}]
+        return response
+
+
+class _BatchWriter:
+    """Table.batch_writer() stand-in (context manager)"""
+
+    def __init__(self, table: MemoryTable):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def put_item(self, Item: Dict):
+        self.table.put_item(Item=Item)
+
+    def delete_item(self, Key: Dict):
+        self.table.items.get(Key[self.table.partition_key], {}).pop(Key[self.table.sort_key], None)
+        self.table._sorted.pop(Key[self.table.partition_key], None)
+
+
+_deserialize = TypeDeserializer().deserialize
+
+
+def _resource_item(item: Dict) -> Dict:
+    """Typed item -> resource item (strings and numbers directly, other types via TypeDeserializer)"""
+    resource_item = {}
+    for name, value in item.items():
+        if 'S' in value:
+            resource_item[name] = value['S']
+        elif 'N' in value:
+            resource_item[name] = Decimal(value['N'])
+        else:
+            resource_item[name] = _deserialize(value)
+    return resource_item
+
+
+class MemoryClient:
+    """
+    Low-level DynamoDB client stand-in (the handlers' dynamodb_client.get_client())
+
+    The typed -> resource item conversion (about 10 us per SensorData item) is
+    part of the lambda.* timings, in place of the request serialization the
+    real client does.
+    """
+
+    def __init__(self):
+        self.tables = {}  # TableName -> MemoryTable (or any object with put_item/update_item)
+
+    def put_item(self, TableName: str, Item: Dict, **kwargs) -> Dict:
+        return self.tables[TableName].put_item(Item=_resource_item(Item), **kwargs)
+
+    def get_item(self, TableName: str, Key: Dict, **kwargs) -> Dict:
+        response = self.tables[TableName].get_item(Key=_resource_item(Key))
+        if 'Item' in response:
+            return {'Item': {name: _serialize(value) for name, value in response['Item'].items()}}
+        return response
+
+    def update_item(self, TableName: str, **kwargs) -> Dict:
+        return self.tables[TableName].update_item(**kwargs)
+
+
+# Clauses of a KeyConditionExpression, e.g. '(#n0 = :v0 AND #n1 BETWEEN :v1 AND :v2)'
+_KEY_CLAUSE = re.compile(r'begins_with\(([#:\w]+), ([#:\w]+)\)|([#:\w]+) BETWEEN ([#:\w]+) AND ([#:\w]+)'
+                         r'|([#:\w]+) (=|<|>=) ([#:\w]+)')
+_KEY_OPERATORS = {'=': 'eq', '<': 'lt', '>=': 'gte'}
+_serialize = TypeSerializer().serialize
+
+
+class _Body:
+    """urllib3 response stand-in (AWSResponse reads the content through stream())"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def stream(self, **kwargs):
+        yield self.content
+
+
+class MemoryEndpoint:
+    """
+    DynamoDB endpoint stand-in for real boto3 clients (Query only)
+
+    Registered as the clients' 'before-send' handler: botocore serializes and
+    signs each request as usual, and instead of a network call the handler
+    answers with the DynamoDB JSON body of a MemoryTable.query page (with
+    ProjectionExpression, Limit and ExclusiveStartKey applied). Bodies are
+    cached per request, so after one untimed run a benchmark measures only
+    the client side: request building, signing and response parsing.
+    """
+
+    def __init__(self, *tables: MemoryTable):
+        self.tables = {table.name: table for table in tables}
+        self._bodies = {}  # request body -> response body
+
+    def client(self):
+        """New low-level DynamoDB client served by this endpoint (dummy credentials)"""
+        client = boto3.client('dynamodb', aws_access_key_id='benchmark', aws_secret_access_key='benchmark')
+        client.meta.events.register('before-send.dynamodb', self._send)
+        return client
+
+    def resource(self):
+        """New DynamoDB resource served by this endpoint (dummy credentials)"""
+        resource = boto3.resource('dynamodb', aws_access_key_id='benchmark', aws_secret_access_key='benchmark')
+        resource.meta.client.meta.events.register('before-send.dynamodb', self._send)
+        return resource
+
+    def _send(self, request, **kwargs) -> AWSResponse:
+        if not request.headers.get('X-Amz-Target', b'').endswith(b'.Query'):
+            raise NotImplementedError(f"MemoryEndpoint only answers Query, not {request.headers.get('X-Amz-Target')}")
+        body = self._bodies.get(request.body)
+        if body is None:
+            body = self._bodies[request.body] = self._query(json.loads(request.body))
+        return AWSResponse(request.url, 200, {'Content-Type': 'application/x-amz-json-1.0'}, _Body(body))
+
+    def _query(self, params: Dict) -> bytes:
+        table = self.tables[params['TableName']]
+        names = params.get('ExpressionAttributeNames', {})
+        values = {key: _deserialize(value) for key, value in params.get('ExpressionAttributeValues', {}).items()}
+        condition = None
+        for match in _KEY_CLAUSE.finditer(params['KeyConditionExpression']):
+            if match.group(1):
+                clause = Key(names.get(match.group(1), match.group(1))).begins_with(values[match.group(2)])
+            elif match.group(3):
+                clause = Key(names.get(match.group(3), match.group(3))).between(values[match.group(4)],
+                                                                               values[match.group(5)])
+            else:
+                key = Key(names.get(match.group(6), match.group(6)))
+                clause = getattr(key, _KEY_OPERATORS[match.group(7)])(values[match.group(8)])
+            condition = clause if condition is None else condition & clause
+
+        start_key = params.get('ExclusiveStartKey')
+        response = table.query(KeyConditionExpression=condition, ScanIndexForward=params.get('ScanIndexForward', True),
+                               Limit=params.get('Limit'), ReturnConsumedCapacity=params.get('ReturnConsumedCapacity'),
+                               ExclusiveStartKey={name: _deserialize(value) for name, value in start_key.items()}
+                               if start_key else None)
+
+        attributes = None
+        if params.get('ProjectionExpression'):
+            attributes = [names.get(name.strip(), name.strip()) for name in params['ProjectionExpression'].split(',')]
+        document = {
+            'Count': response['Count'],
+            'ScannedCount': response['Count'],
+            'Items': [{name: _serialize(value) for name, value in item.items()
+                       if attributes is None or name in attributes} for item in response['Items']]
+        }
+        if 'LastEvaluatedKey' in response:
+            document['LastEvaluatedKey'] = {name: _serialize(value) for name, value in response['LastEvaluatedKey'].items()}
+        if 'ConsumedCapacity' in response:
+            document['ConsumedCapacity'] = response['ConsumedCapacity']
+        return json.dumps(document).encode('utf-8')
+
+
+class FakeResponse:
+    """requests.Response stand-in with a fixed JSON payload"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def load_lambda(filename: str, table: MemoryTable, payload=None):
+    """
+    Import a Lambda handler module wired to local stand-ins
+
+    The shared DynamoDB client becomes a MemoryClient that sends the
+    module's table_name to 'table' and the registry, coverage and anomaly
+    tables to fresh MemoryTables; if a payload is given, requests.get is
+    replaced too. The registry, coverage and anomaly detection logic itself
+    runs unchanged. Handlers loaded earlier keep their tables (one client per
+    process, like the container).
+
+    Args:
+        filename: Handler file in Deployment/Lambda (e.g. 'process-mqtt.py')
+        table: Stand-in for the module's data table
+        payload: JSON payload returned by requests.get, or a function returning
+                 the payload of each call
+
+    Returns:
+        The imported module
+    """
+    if LAMBDA_DIR not in sys.path:
+        sys.path.insert(0, LAMBDA_DIR)
+    import anomaly_detection
+    import data_coverage
+    import device_registry
+    import dynamodb_client
+    if not isinstance(dynamodb_client._client, MemoryClient):
+        dynamodb_client._client = MemoryClient()
+    client = dynamodb_client._client
+    client.tables[device_registry.REGISTRY_TABLE] = MemoryTable('DeviceRegistry', 'source', 'key_id')
+    client.tables[data_coverage.COVERAGE_TABLE] = MemoryTable('DataCoverage', 'device_id', 'hour')
+    client.tables[anomaly_detection.EVENTS_TABLE] = MemoryTable('AnomalyEvents', 'device_id', 'timestamp')
+    client.tables[anomaly_detection.STATE_TABLE] = MemoryTable('AnomalyState', 'device_id', 'metric')
+
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", os.path.join(LAMBDA_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    client.tables[module.table_name] = table
+    if payload is not None:
+        respond = payload if callable(payload) else (lambda: payload)
+        module.requests = SimpleNamespace(get=lambda *args, **kwargs: FakeResponse(respond()),
+                                          exceptions=module.requests.exceptions)
+    return module
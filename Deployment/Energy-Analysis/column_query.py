@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Column Query
+============
+
+Fast read path from DynamoDB into NumPy for the analysis scripts. The
+resource API (Table.query) costs about 25 us per SensorData reading before
+the analysis sees a number:
+
+- botocore's response parser walks every attribute of every item through the
+  AttributeValue shape model (most of the time)
+- TypeDeserializer turns each number into a Decimal, which the analysis then
+  converts to float again
+
+ColumnQuery queries with the low-level client instead, projected to the
+requested attributes only, and decodes the items itself:
+
+- A 'before-parse' hook hands the response body to json.loads and takes the
+  items out before botocore parses the rest (Count, LastEvaluatedKey,
+  ConsumedCapacity); this only happens for ColumnQuery's own requests
+- Numbers go from their wire strings ({'N': '172.5'}) through float() into
+  one float64 array per column and page, allocated once with the page's item
+  count (np.fromiter); no Decimal is created
+- Strings (the timestamp sort key) become NumPy string arrays
+
+The result is the same readings as the resource path, about 8x faster per
+item (benchmark fetch.column_query against fetch.resource_query).
+
+The client must be a plain boto3.client: a resource's meta.client converts
+request and response values to and from Python types itself.
+low_level_client() creates one with a resource's region and endpoint.
+
+Usage:
+    query = ColumnQuery('SensorData')
+    columns = query.fetch('serverpowermeter', '2025-06-01T00:00:00', '2025-06-02T00:00:00',
+                          POWER_COLUMNS, require=('current_power',))
+    columns['timestamp'], columns['current_power']   # str and float64 arrays
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import json
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import boto3
+import numpy as np
+
+NUMBER, STRING = 'N', 'S'
+
+# The columns of the power analyses
+POWER_COLUMNS = {'timestamp': STRING, 'current_power': NUMBER}
+
+_pending = threading.local()  # items taken from the running ColumnQuery request (per thread)
+
+
+def _take_items(response_dict, **kwargs):
+    """
+    before-parse.dynamodb.Query handler: decode the body, keep the items from botocore's parser
+
+    Only active while a ColumnQuery request is running on this thread; error
+    responses are parsed by botocore as usual (retries, ClientError).
+    """
+    if not getattr(_pending, 'active', False) or response_dict['status_code'] != 200:
+        return
+    document = json.loads(response_dict['body'])
+    _pending.items = document.pop('Items', [])
+    response_dict['body'] = json.dumps(document).encode('utf-8')
+
+
+def decode_columns(items: List[Dict], columns: Dict[str, str], require: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    Decode typed items (DynamoDB JSON) into NumPy columns
+
+    Args:
+        items: Typed items, e.g. {'timestamp': {'S': ...}, 'current_power': {'N': '172.5'}}
+        columns: Attribute -> NUMBER (float64 array) or STRING (str array)
+        require: Attributes an item must have to be kept
+
+    Returns:
+        Dictionary of attribute -> array; missing numbers are NaN, missing
+        strings None (the column is then an object array)
+    """
+    count = len(items)
+    decoded = {}
+    for name, kind in columns.items():
+        try:
+            if kind == NUMBER:
+                values = np.fromiter((float(item[name]['N']) for item in items), np.float64, count)
+            else:
+                values = np.array([item[name]['S'] for item in items], dtype=str)
+        except KeyError:
+            # Attribute missing on some items (optional fields); fill those rows
+            if kind == NUMBER:
+                values = np.fromiter((float(item[name]['N']) if name in item else np.nan for item in items),
+                                     np.float64, count)
+            else:
+                values = np.array([item[name]['S'] if name in item else None for item in items], dtype=object)
+        decoded[name] = values
+
+    if require and count:
+        keep = np.ones(count, dtype=bool)
+        for name in require:
+            values = decoded[name]
+            keep &= ~np.isnan(values) if values.dtype == np.float64 else np.not_equal(values, None)
+        if not keep.all():
+            decoded = {name: values[keep] for name, values in decoded.items()}
+    return decoded
+
+
+def low_level_client(dynamodb=None):
+    """New DynamoDB client, with the region and endpoint of boto3 resource 'dynamodb' if given"""
+    if dynamodb is None:
+        return boto3.client('dynamodb')
+    meta = dynamodb.meta.client.meta
+    return boto3.client('dynamodb', region_name=meta.region_name, endpoint_url=meta.endpoint_url)
+
+
+def _typed(value) -> Dict:
+    return {'S': value} if isinstance(value, str) else {'N': str(value)}
+
+
+class ColumnQuery:
+    """Range queries on a partition key + sort key table, decoded into NumPy columns"""
+
+    def __init__(self, table_name: str, partition_key: str = 'device_id', sort_key: str = 'timestamp',
+                 client=None):
+        """
+        Initialize the query
+
+        Args:
+            table_name: DynamoDB table name
+            partition_key: Partition key attribute
+            sort_key: Sort key attribute (string or number)
+            client: Optional boto3 DynamoDB client to reuse (not a resource's
+                    meta.client, see module docstring)
+        """
+        self.table_name = table_name
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.client = client or boto3.client('dynamodb')
+        self.client.meta.events.register('before-parse.dynamodb.Query', _take_items,
+                                         unique_id='column_query.take_items')
+        self.consumed_read_units = 0.0  # ConsumedCapacity of all queries
+
+    def _query(self, request: Dict):
+        _pending.active, _pending.items = True, None
+        try:
+            response = self.client.query(**request)
+        finally:
+            _pending.active = False
+        items, _pending.items = _pending.items, None
+        if items is None:
+            items = response.get('Items', [])  # Client without the hook (e.g. a stubbed client)
+        self.consumed_read_units += float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+        return response, items
+
+    def iter_pages(self, partition_value, start, end, columns: Dict[str, str], require: Sequence[str] = (),
+                   page_size: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Query sort key range [start, end] page by page
+
+        Args:
+            partition_value: Partition key value (e.g. the device id)
+            start: First sort key value (inclusive)
+            end: Last sort key value (inclusive)
+            columns: Attribute -> NUMBER or STRING; only these are projected
+            require: Attributes a reading must have to be kept
+            page_size: Optional Limit per request (default: DynamoDB's 1 MB pages)
+
+        Yields:
+            One dictionary of attribute -> array per page, in sort key order
+
+        Raises:
+            botocore.exceptions.ClientError: If a request fails
+        """
+        names = {'#pk': self.partition_key, '#sk': self.sort_key}
+        projection = []
+        for i, name in enumerate(columns):
+            names[f"#c{i}"] = name
+            projection.append(f"#c{i}")
+        request = {
+            'TableName': self.table_name,
+            'KeyConditionExpression': '#pk = :pk AND #sk BETWEEN :start AND :end',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': {':pk': _typed(partition_value), ':start': _typed(start), ':end': _typed(end)},
+            'ProjectionExpression': ', '.join(projection),
+            'ScanIndexForward': True,
+            'ReturnConsumedCapacity': 'TOTAL'
+        }
+        if page_size:
+            request['Limit'] = page_size
+
+        while True:
+            response, items = self._query(request)
+            yield decode_columns(items, columns, require)
+            if 'LastEvaluatedKey' not in response:
+                return
+            request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def fetch(self, partition_value, start, end, columns: Dict[str, str],
+              require: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+        """All pages of iter_pages concatenated into one array per attribute"""
+        pages = list(self.iter_pages(partition_value, start, end, columns, require))
+        if len(pages) == 1:
+            return pages[0]
+        return {name: np.concatenate([page[name] for page in pages]) for name in columns}
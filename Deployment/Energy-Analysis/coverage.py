@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Data Coverage Index
+===================
+
+Reads, builds and repairs the per-device coverage index in the DataCoverage
+table and finds gaps in the telemetry with vectorized NumPy run detection.
+
+The index is maintained by the MQTT Lambda (Deployment/Lambda/data_coverage.py):
+one item per device and UTC hour ('YYYY-MM-DDTHH' sort key) whose 'minutes'
+number set holds the minutes (0-59) that received data. Items stay small, so
+every update costs one write unit. Reads turn the items of a day range into
+a (days x 1440) boolean matrix. The repair merges minutes found in SensorData
+into the same sets with ADD, so it never overwrites concurrent ingest updates.
+
+Usage:
+    python coverage.py --device-id serverpowermeter --from 2025-06-01 --to 2025-06-30
+    python coverage.py --device-id serverpowermeter --from 2025-06-01 --to 2025-06-30 --rebuild
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import boto3
+import numpy as np
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+MINUTES_PER_DAY = 1440
+
+
+def minutes_from_timestamps(timestamps, first_day: date, days: int) -> np.ndarray:
+    """
+    Build a (days x 1440) coverage matrix from ISO timestamps
+
+    Args:
+        timestamps: ISO timestamp strings or datetime64 values (UTC)
+        first_day: Day corresponding to row 0
+        days: Number of rows
+
+    Returns:
+        Boolean matrix with True for every minute that has at least one reading
+    """
+    coverage = np.zeros(days * MINUTES_PER_DAY, dtype=bool)
+    values = np.asarray(timestamps).astype('datetime64[m]')
+    if values.size:
+        offsets = (values - np.datetime64(first_day, 'm')).astype(np.int64)
+        offsets = offsets[(offsets >= 0) & (offsets < coverage.size)]
+        coverage[offsets] = True
+    return coverage.reshape(days, MINUTES_PER_DAY)
+
+
+def find_gaps(coverage: np.ndarray, min_minutes: int = 1) -> List[Tuple[int, int]]:
+    """
+    Find runs of missing minutes in a flattened coverage array
+
+    Args:
+        coverage: Boolean array (any shape; flattened in row order)
+        min_minutes: Only report gaps of at least this many minutes
+
+    Returns:
+        List of (start_minute, end_minute_exclusive) offsets into the flattened array
+    """
+    missing = ~np.asarray(coverage, dtype=bool).ravel()
+    edges = np.diff(np.concatenate(([0], missing.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_minutes
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+def _day_range(start_day: str, end_day: str) -> Tuple[date, int]:
+    first = datetime.strptime(start_day, '%Y-%m-%d').date()
+    last = datetime.strptime(end_day, '%Y-%m-%d').date()
+    if last < first:
+        raise ValueError("End day must not be before start day")
+    return first, (last - first).days + 1
+
+
+class CoverageIndex:
+    """Read and maintain the DataCoverage table"""
+
+    def __init__(self, table_name: str = 'DataCoverage', data_table_name: str = 'SensorData', dynamodb=None):
+        """
+        Initialize the coverage index
+
+        Args:
+            table_name: Name of the coverage table
+            data_table_name: Data table used to build or repair coverage
+            dynamodb: Optional boto3 DynamoDB resource to reuse
+        """
+        self.dynamodb = dynamodb or boto3.resource('dynamodb')
+        self.table = self.dynamodb.Table(table_name)
+        self.data_table = self.dynamodb.Table(data_table_name)
+
+    def read(self, device_id: str, start_day: str, end_day: str) -> np.ndarray:
+        """
+        Read coverage for a day range with one Query
+
+        Returns:
+            Boolean matrix (days x 1440); days without an index item are all False
+        """
+        first, days = _day_range(start_day, end_day)
+        coverage = np.zeros((days, MINUTES_PER_DAY), dtype=bool)
+
+        query_kwargs = {
+            'KeyConditionExpression': Key('device_id').eq(device_id) &
+                                      Key('hour').between(f"{start_day}T00", f"{end_day}T23")
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response['Items']:
+                hour = item['hour']
+                row = (datetime.strptime(hour[:10], '%Y-%m-%d').date() - first).days
+                offset = int(hour[11:13]) * 60
+                if 'minutes' in item:
+                    minutes = np.fromiter((int(m) for m in item['minutes']), dtype=np.int64)
+                    coverage[row, offset + minutes] = True
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        return coverage
+
+    def summarize(self, device_id: str, start_day: str, end_day: str, min_gap_minutes: int = 5) -> Dict:
+        """Coverage ratio per day plus all gaps of at least min_gap_minutes"""
+        first, days = _day_range(start_day, end_day)
+        coverage = self.read(device_id, start_day, end_day)
+        origin = datetime.combine(first, datetime.min.time())
+
+        gaps = [
+            {
+                'start': (origin + timedelta(minutes=start)).strftime('%Y-%m-%dT%H:%M'),
+                'end': (origin + timedelta(minutes=end)).strftime('%Y-%m-%dT%H:%M'),
+                'minutes': end - start
+            }
+            for start, end in find_gaps(coverage, min_gap_minutes)
+        ]
+        ratios = coverage.mean(axis=1)
+        return {
+            'device_id': device_id,
+            'coverage_percent': round(float(coverage.mean()) * 100, 2),
+            'days': {
+                (first + timedelta(days=i)).isoformat(): round(float(ratio) * 100, 2)
+                for i, ratio in enumerate(ratios)
+            },
+            'gaps': gaps
+        }
+
+    def rebuild(self, device_id: str, start_day: str, end_day: str) -> np.ndarray:
+        """
+        Build or repair coverage from the data table
+
+        Reads only the sort keys of SensorData (paginated) and builds the
+        coverage matrix in one vectorized pass. Only hours with minutes
+        missing from the index are written, each with one UpdateItem that
+        ADDs the missing minutes to the hour's set: the merge is idempotent
+        and keeps minutes the Lambda adds concurrently.
+
+        Returns:
+            The repaired coverage matrix
+        """
+        first, days = _day_range(start_day, end_day)
+        coverage = np.zeros((days, MINUTES_PER_DAY), dtype=bool)
+
+        query_kwargs = {
+            'KeyConditionExpression': Key('device_id').eq(device_id) &
+                                      Key('timestamp').between(f"{start_day}T00:00:00", f"{end_day}T23:59:59.999999"),
+            'ProjectionExpression': '#ts',
+            'ExpressionAttributeNames': {'#ts': 'timestamp'}
+        }
+        pages = 0
+        while True:
+            response = self.data_table.query(**query_kwargs)
+            pages += 1
+            timestamps = [item['timestamp'] for item in response['Items']]
+            coverage |= minutes_from_timestamps(timestamps, first, days)
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        indexed = self.read(device_id, start_day, end_day)
+        missing = (coverage & ~indexed).reshape(days * 24, 60)
+
+        updates = 0
+        for slot in np.flatnonzero(missing.any(axis=1)):
+            day, hour = divmod(int(slot), 24)
+            self.table.update_item(
+                Key={'device_id': device_id, 'hour': f"{(first + timedelta(days=day)).isoformat()}T{hour:02d}"},
+                UpdateExpression='ADD minutes :m',
+                ExpressionAttributeValues={':m': set(np.flatnonzero(missing[slot]).tolist())}
+            )
+            updates += 1
+
+        print(f"Rebuilt coverage for {device_id}: {days} day(s) from {pages} data page(s), "
+              f"{updates} hour(s) repaired")
+        return coverage | indexed
+
+
+def main():
+    """Print coverage and gaps for a device, optionally rebuilding the index first"""
+    parser = argparse.ArgumentParser(description='Inspect or rebuild the per-device data coverage index')
+    parser.add_argument('--device-id', required=True, help='Device ID (SensorData partition key)')
+    parser.add_argument('--from', dest='start_day', required=True, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end_day', required=True, help='Last day (YYYY-MM-DD)')
+    parser.add_argument('--min-gap', type=int, default=5, help='Only report gaps of at least N minutes')
+    parser.add_argument('--rebuild', action='store_true', help='Build/repair the index from SensorData first')
+    args = parser.parse_args()
+
+    index = CoverageIndex()
+    try:
+        if args.rebuild:
+            index.rebuild(args.device_id, args.start_day, args.end_day)
+        summary = index.summarize(args.device_id, args.start_day, args.end_day, args.min_gap)
+    except ClientError as e:
+        print(f"❌ Coverage lookup failed: {e.response['Error']['Message']}")
+        return
+
+    print(f"\n📅 Coverage for {args.device_id}: {summary['coverage_percent']}%")
+    for day, percent in summary['days'].items():
+        print(f"   {day}: {percent}%")
+    print(f"\n🕳️  Gaps of at least {args.min_gap} minutes: {len(summary['gaps'])}")
+    for gap in summary['gaps']:
+        print(f"   {gap['start']} - {gap['end']} ({gap['minutes']} min)")
+
+
+if __name__ == "__main__":
+    main()
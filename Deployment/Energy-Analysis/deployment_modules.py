@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Deployment Modules
+==================
+
+Access to the modules the analysis scripts share with the other Deployment
+directories. This is the only place that extends sys.path for them.
+
+- Record types of Lambda/records.py (SensorBatch, PriceBatch, MISSING_INT),
+  re-exported here: records.py is deployed with the Lambda functions, and
+  the analysis scripts read the same attribute definitions
+- capacity_planner(): Scripts/capacity_planner.py, imported on first use.
+  Only --plan/--check-plan need it, so the analysis scripts import and run
+  without the maintenance scripts next to them.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import os
+import sys
+
+DEPLOYMENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LAMBDA_DIR = os.path.join(DEPLOYMENT_DIR, 'Lambda')
+SCRIPTS_DIR = os.path.join(DEPLOYMENT_DIR, 'Scripts')
+
+
+def _add_path(directory: str) -> None:
+    # Appended, so modules of the analysis directory are never shadowed
+    if directory not in sys.path:
+        sys.path.append(directory)
+
+
+_add_path(LAMBDA_DIR)
+from records import MISSING_INT, PriceBatch, SensorBatch  # noqa: E402,F401
+
+
+def capacity_planner():
+    """Return the Scripts/capacity_planner module (imported on the first call)"""
+    _add_path(SCRIPTS_DIR)
+    import capacity_planner as planner
+    return planner
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Energy Cost Join Engine
+=======================
+
+Joins the SensorData power series with the EPEXSpotPrices price curve and
+computes electricity cost per device, per workload and per workload cycle.
+
+- Energy per sample: power x hold time (sample-and-hold, capped at max_hold),
+  or the increase of the Tasmota 'total_energy' counter (--source counter)
+- Price per sample: as-of join on the price curve (last price at or before the
+  sample that is still within its delivery interval), via np.searchsorted;
+  prices are read through the per-day cache in price_cache.py
+- Window totals (workloads, cycles, days, 15-minute slots) come from prefix
+  sums and bincount over the whole series; there are no per-sample loops
+
+Usage:
+    python energy_cost.py --from 2025-06-01 --to 2025-06-30
+    python energy_cost.py --device-id serverpowermeter --from 2025-06-29 --to 2025-06-29 --workloads
+    python energy_cost.py --device-id serverpowermeter --from 2025-06-29 --to 2025-06-30 --markers workload_results
+    python energy_cost.py --device-id a --device-id b --from 2025-06-01 --to 2025-08-31 --slots-csv
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import argparse
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import boto3
+import numpy as np
+from botocore.exceptions import ClientError
+
+from column_query import NUMBER, STRING, ColumnQuery, low_level_client
+from price_cache import PriceCache
+from registry_client import DeviceRegistryClient
+from resampling import grid_to_iso, make_grid, to_epoch_seconds
+from workload_markers import load_runs, runs_to_test_periods
+
+
+class PriceCurve:
+    """Sorted EPEX price curve with as-of lookup"""
+
+    def __init__(self, timestamps_ms, prices_cent_kwh, interval_minutes=15):
+        """
+        Initialize the price curve
+
+        Args:
+            timestamps_ms: Delivery interval starts (epoch milliseconds)
+            prices_cent_kwh: Prices in Euro cent per kWh
+            interval_minutes: Delivery interval length (scalar or per price)
+        """
+        order = np.argsort(np.asarray(timestamps_ms, dtype=np.int64), kind='stable')
+        self.starts = np.asarray(timestamps_ms, dtype=np.int64)[order] / 1000.0
+        self.prices = np.asarray(prices_cent_kwh, dtype=np.float64)[order]
+        intervals = np.broadcast_to(np.asarray(interval_minutes, dtype=np.float64), order.shape)
+        self.ends = self.starts + intervals[order] * 60
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def price_at(self, epoch_s: np.ndarray) -> np.ndarray:
+        """
+        As-of price for every time (epoch seconds); NaN where no interval covers it
+        """
+        epoch_s = np.asarray(epoch_s, dtype=np.float64)
+        index = np.searchsorted(self.starts, epoch_s, side='right') - 1
+        valid = index >= 0
+        index = np.clip(index, 0, None)
+        if len(self.prices):
+            valid &= epoch_s < self.ends[index]
+            return np.where(valid, self.prices[index], np.nan)
+        return np.full(epoch_s.shape, np.nan)
+
+
+def sample_energy_kwh(epoch_s: np.ndarray, power_w: np.ndarray,
+                      max_hold: Optional[float] = None) -> np.ndarray:
+    """
+    Energy of each sample interval from power readings (sample-and-hold)
+
+    Each reading holds until the next one, at most max_hold seconds
+    (default: 3 x median sampling interval), so gaps do not count as load.
+    """
+    epoch_s = np.asarray(epoch_s, dtype=np.float64)
+    power_w = np.asarray(power_w, dtype=np.float64)
+    if epoch_s.size == 0:
+        return np.zeros(0)
+    if max_hold is None:
+        max_hold = 3 * float(np.median(np.diff(epoch_s))) if epoch_s.size > 1 else 0.0
+    hold = np.minimum(np.diff(epoch_s, append=epoch_s[-1] + max_hold), max_hold)
+    return power_w * hold / 3.6e6
+
+
+def counter_energy_kwh(total_kwh: np.ndarray) -> np.ndarray:
+    """
+    Energy of each sample interval from a cumulative kWh counter
+
+    The increase between reading i and i+1 is attributed to reading i; a
+    decreasing counter is treated as a reset to zero.
+    """
+    total_kwh = np.asarray(total_kwh, dtype=np.float64)
+    energy = np.zeros(total_kwh.size)
+    if total_kwh.size > 1:
+        increments = np.diff(total_kwh)
+        resets = increments < 0
+        increments[resets] = total_kwh[1:][resets]  # Counter restarted from zero
+        energy[:-1] = increments
+    return energy
+
+
+class CostSeries:
+    """Per-sample energy and cost of one device, with fast window totals"""
+
+    def __init__(self, epoch_s: np.ndarray, energy_kwh: np.ndarray, prices: PriceCurve):
+        self.epoch_s = np.asarray(epoch_s, dtype=np.float64)
+        self.energy_kwh = np.asarray(energy_kwh, dtype=np.float64)
+        self.price_cent_kwh = prices.price_at(self.epoch_s)
+        priced = ~np.isnan(self.price_cent_kwh)
+        self.cost_cent = np.where(priced, self.energy_kwh * np.nan_to_num(self.price_cent_kwh), 0.0)
+        self.unpriced_kwh = np.where(priced, 0.0, self.energy_kwh)
+
+        self._energy_prefix = np.concatenate(([0.0], np.cumsum(self.energy_kwh)))
+        self._cost_prefix = np.concatenate(([0.0], np.cumsum(self.cost_cent)))
+        self._unpriced_prefix = np.concatenate(([0.0], np.cumsum(self.unpriced_kwh)))
+
+    def window_totals(self, starts, ends) -> Dict[str, np.ndarray]:
+        """
+        Energy and cost of [start, end) windows (any time format of to_epoch_seconds)
+
+        Returns:
+            Dict of arrays: energy_kwh, cost_cent, unpriced_kwh, data_points
+        """
+        lo = np.searchsorted(self.epoch_s, to_epoch_seconds(starts), side='left')
+        hi = np.maximum(np.searchsorted(self.epoch_s, to_epoch_seconds(ends), side='left'), lo)
+        return {
+            'energy_kwh': self._energy_prefix[hi] - self._energy_prefix[lo],
+            'cost_cent': self._cost_prefix[hi] - self._cost_prefix[lo],
+            'unpriced_kwh': self._unpriced_prefix[hi] - self._unpriced_prefix[lo],
+            'data_points': hi - lo
+        }
+
+    def slot_totals(self, step_seconds: float = 900) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Energy and cost per UTC-aligned slot (default: 15-minute EPEX slots)
+
+        Returns:
+            Tuple of (slot starts in epoch seconds, energy_kwh, cost_cent)
+        """
+        if self.epoch_s.size == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        grid = make_grid(self.epoch_s[0], self.epoch_s[-1] + step_seconds, step_seconds)
+        index = np.floor((self.epoch_s - grid[0]) / step_seconds).astype(np.int64)
+        energy = np.bincount(index, weights=self.energy_kwh, minlength=len(grid))
+        cost = np.bincount(index, weights=self.cost_cent, minlength=len(grid))
+        return grid, energy, cost
+
+    def summary(self) -> Dict:
+        """Totals for the whole series"""
+        return cost_summary(float(self._energy_prefix[-1]), float(self._cost_prefix[-1]),
+                            float(self._unpriced_prefix[-1]), int(self.epoch_s.size))
+
+
+def cost_summary(energy_kwh: float, cost_cent: float, unpriced_kwh: float, data_points: int) -> Dict:
+    """Rounded result dictionary shared by device, day, workload and cycle totals"""
+    priced_energy_kwh = energy_kwh - unpriced_kwh
+    return {
+        'data_points': data_points,
+        'energy_kwh': round(energy_kwh, 6),
+        'cost_cent': round(cost_cent, 4),
+        'cost_eur': round(cost_cent / 100, 6),
+        'avg_price_cent_kwh': round(cost_cent / priced_energy_kwh, 3) if priced_energy_kwh > 0 else None,
+        'unpriced_kwh': round(unpriced_kwh, 6)
+    }
+
+
+class EnergyCostEngine:
+    """Load power series and prices from DynamoDB and compute costs"""
+
+    def __init__(self, sensor_table: str = 'SensorData', price_table: str = 'EPEXSpotPrices',
+                 tariff: str = 'EPEXSPOTAT', dynamodb=None):
+        """
+        Initialize the cost engine
+
+        Args:
+            sensor_table: Name of the power data table
+            price_table: Name of the EPEX price table
+            tariff: EPEX tariff to price with
+            dynamodb: Optional boto3 DynamoDB resource to reuse
+        """
+        self.dynamodb = dynamodb or boto3.resource('dynamodb')
+        self.sensor_table = self.dynamodb.Table(sensor_table)
+        self.sensor_query = ColumnQuery(sensor_table, 'device_id', 'timestamp', client=low_level_client(self.dynamodb))
+        self.price_cache = PriceCache(price_table, dynamodb=self.dynamodb)
+        self.tariff = tariff
+
+    def load_price_curve(self, start_time: str, end_time: str) -> PriceCurve:
+        """
+        Load prices covering [start_time, end_time] (ISO, UTC) through the price cache
+
+        One extra hour before start_time is included so the first samples have an as-of price.
+        """
+        first_day = grid_to_iso(to_epoch_seconds([start_time]) - 3600)[0][:10]
+        curve = self.price_cache.get_range(self.tariff, first_day, end_time[:10])
+        return PriceCurve(curve['timestamps_ms'], curve['prices_cent_kwh'], curve['interval_minutes'])
+
+    def load_power_series(self, device_id: str, start_time: str, end_time: str,
+                          source: str = 'power') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load one device's readings as arrays
+
+        Args:
+            device_id: SensorData partition key
+            start_time: Range start (ISO, UTC)
+            end_time: Range end (ISO, UTC)
+            source: 'power' for current_power (W) or 'counter' for total_energy (kWh)
+
+        Returns:
+            Tuple of (epoch seconds, values)
+        """
+        attribute = 'current_power' if source == 'power' else 'total_energy'
+        columns = self.sensor_query.fetch(device_id, start_time, end_time,
+                                          {'timestamp': STRING, attribute: NUMBER}, require=(attribute,))
+        if not len(columns[attribute]):
+            return np.zeros(0), np.zeros(0)
+        return to_epoch_seconds(columns['timestamp']), columns[attribute]
+
+    def device_costs(self, device_id: str, start_time: str, end_time: str, prices: PriceCurve,
+                     source: str = 'power') -> Tuple[Dict, CostSeries]:
+        """
+        Cost of one device over a time range, with a per-day (UTC) breakdown
+
+        Returns:
+            Tuple of (result dictionary, CostSeries for further window queries)
+        """
+        epoch_s, values = self.load_power_series(device_id, start_time, end_time, source)
+        energy = sample_energy_kwh(epoch_s, values) if source == 'power' else counter_energy_kwh(values)
+        series = CostSeries(epoch_s, energy, prices)
+
+        result = series.summary()
+        if epoch_s.size:
+            days = make_grid(epoch_s[0], epoch_s[-1] + 1, 86400)
+            totals = series.window_totals(days, days + 86400)
+            result['days'] = {
+                day[:10]: cost_summary(float(totals['energy_kwh'][i]), float(totals['cost_cent'][i]),
+                                       float(totals['unpriced_kwh'][i]), int(totals['data_points'][i]))
+                for i, day in enumerate(grid_to_iso(days))
+            }
+        return result, series
+
+    def workload_costs(self, series: CostSeries, test_periods: Dict) -> Dict:
+        """
+        Cost per workload and per active cycle
+
+        Args:
+            series: CostSeries of the device under test
+            test_periods: TEST_PERIODS-style definitions (evaluate_energy_data.py)
+                          ('start'/'end' and 'active_periods' in UTC ISO)
+        """
+        results = {}
+        for period_key, period in test_periods.items():
+            cycles = period.get('active_periods', [])
+            starts = [period['start']] + [start for start, _ in cycles]
+            ends = [period['end']] + [end for _, end in cycles]
+            totals = series.window_totals(starts, ends)
+
+            def summary_at(i):
+                return cost_summary(float(totals['energy_kwh'][i]), float(totals['cost_cent'][i]),
+                                    float(totals['unpriced_kwh'][i]), int(totals['data_points'][i]))
+
+            results[period_key] = {
+                'name': period['name'],
+                'period': summary_at(0),
+                'cycles': [
+                    dict(cycle=i + 1, start=start, end=end, **summary_at(i + 1))
+                    for i, (start, end) in enumerate(cycles)
+                ]
+            }
+        return results
+
+
+def write_slot_csv(path: str, device_series: Dict[str, CostSeries]) -> None:
+    """Write 15-minute energy/cost slots of all devices, one device at a time"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Device_ID', 'Slot_Start_UTC', 'Energy_kWh', 'Cost_Cent'])
+        for device_id, series in device_series.items():
+            grid, energy, cost = series.slot_totals()
+            for slot, slot_energy, slot_cost in zip(grid_to_iso(grid), energy, cost):
+                writer.writerow([device_id, str(slot), round(float(slot_energy), 6), round(float(slot_cost), 4)])
+
+
+def _range_bound(value: str, end: bool) -> str:
+    """Accept YYYY-MM-DD (whole day) or a full ISO timestamp"""
+    if len(value) == 10:
+        return f"{value}T23:59:59.999999" if end else f"{value}T00:00:00"
+    return value
+
+
+def main():
+    """Compute electricity cost for devices over a time range"""
+    parser = argparse.ArgumentParser(description='Join SensorData power with EPEX prices to compute energy cost')
+    parser.add_argument('--device-id', action='append',
+                        help='Device to cost (repeatable; default: all devices in the registry)')
+    parser.add_argument('--from', dest='start', required=True, help='Range start (YYYY-MM-DD or ISO, UTC)')
+    parser.add_argument('--to', dest='end', required=True, help='Range end (YYYY-MM-DD or ISO, UTC)')
+    parser.add_argument('--tariff', default='EPEXSPOTAT', help='EPEX tariff (default: EPEXSPOTAT)')
+    parser.add_argument('--source', choices=['power', 'counter'], default='power',
+                        help='Integrate current_power (default) or use total_energy counter deltas')
+    parser.add_argument('--workloads', action='store_true',
+                        help='Also cost the WL1-WL5 test periods and cycles of evaluate_energy_data.py')
+    parser.add_argument('--markers', metavar='PATH',
+                        help='Cost the runs recorded by Scripts/workload_runner.py (results directory or run file) '
+                             'instead of the default test periods')
+    parser.add_argument('--output', default='energy_cost_results.json', help='Result JSON file')
+    parser.add_argument('--slots-csv', nargs='?', const='energy_cost_15min.csv', default=None, metavar='FILE',
+                        help='Also write 15-minute energy/cost slots per device')
+    args = parser.parse_args()
+
+    start_time = _range_bound(args.start, end=False)
+    end_time = _range_bound(args.end, end=True)
+    engine = EnergyCostEngine(tariff=args.tariff)
+
+    device_ids = args.device_id
+    if not device_ids:
+        entries = DeviceRegistryClient(dynamodb=engine.dynamodb).try_list_keys(engine.sensor_table.name)
+        device_ids = [entry['key_id'] for entry in entries]
+    if not device_ids:
+        print("❌ No devices given and none found in the device registry")
+        return
+
+    test_periods = None
+    if args.markers:
+        test_periods = runs_to_test_periods(load_runs(args.markers))
+        if not test_periods:
+            print(f"❌ No workload runs with finished phases found in {args.markers}")
+            return
+    elif args.workloads:
+        from evaluate_energy_data import TEST_PERIODS
+        test_periods = TEST_PERIODS
+
+    try:
+        prices = engine.load_price_curve(start_time, end_time)
+        print(f"💰 Loaded {len(prices)} {args.tariff} prices for {start_time} - {end_time}")
+        print(f"   {engine.price_cache.report()}")
+
+        results = {}
+        device_series = {}
+        for device_id in device_ids:
+            result, series = engine.device_costs(device_id, start_time, end_time, prices, args.source)
+            results[device_id] = result
+            if args.slots_csv:
+                device_series[device_id] = series
+            print(f"   ✅ {device_id}: {result['energy_kwh']} kWh, {result['cost_eur']} EUR "
+                  f"({result['data_points']} readings)")
+
+            if test_periods:
+                result['workloads'] = engine.workload_costs(series, test_periods)
+                for period_key, workload in result['workloads'].items():
+                    print(f"      {period_key}: {workload['period']['energy_kwh']} kWh, "
+                          f"{workload['period']['cost_cent']} cent")
+    except ClientError as e:
+        print(f"❌ Cost computation failed: {e.response['Error']['Message']}")
+        return
+
+    output = {
+        'export_date': datetime.now().isoformat(),
+        'tariff': args.tariff,
+        'source': args.source,
+        'start': start_time,
+        'end': end_time,
+        'fleet': cost_summary(
+            sum(r['energy_kwh'] for r in results.values()),
+            sum(r['cost_cent'] for r in results.values()),
+            sum(r['unpriced_kwh'] for r in results.values()),
+            sum(r['data_points'] for r in results.values())
+        ),
+        'devices': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    if args.slots_csv:
+        write_slot_csv(args.slots_csv, device_series)
+
+    print(f"\n📁 Energy cost results exported to {args.output}"
+          + (f" and {args.slots_csv}" if args.slots_csv else ""))
+
+
+if __name__ == "__main__":
+    main()
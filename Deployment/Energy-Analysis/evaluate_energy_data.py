@@ -17,105 +17,169 @@ Test Periods (29.06.2025):
 Author: Generated for G1-S2-INENI Project
 """
 
+import argparse
 import boto3
+import copy
 import json
 import statistics
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-import pandas as pd
 from botocore.exceptions import ClientError
+from streaming_stats import PowerAccumulator, RunningStats, peak_rss_mb
+from results_io import aggregates_only, write_results_with_sidecar
+from segmentation import detect_active_windows, windows_to_active_periods
+from registry_client import DeviceRegistryClient, covers_day
+from coverage import CoverageIndex
+from column_query import POWER_COLUMNS, ColumnQuery
+from deployment_modules import SensorBatch, capacity_planner
+from resampling import resample, grid_to_iso
+from writers import FORMATS, open_table_writer, write_table
+from workload_markers import energy_per_operation, load_runs, runs_to_test_periods
+
+TEST_DATE = "2025-06-29"
+
+# Default test periods of TEST_DATE - Converted to UTC (subtract 2 hours from local times)
+# Local times -> UTC times: 16:45 -> 14:45, 18:45 -> 16:45, etc.
+TEST_PERIODS = {
+    'WL1_CPU_Stress': {
+        'name': 'Maximum Computational Load',
+        'start': f"{TEST_DATE}T14:45:00",  # 16:45 local -> 14:45 UTC
+        'end': f"{TEST_DATE}T16:45:00",    # 18:45 local -> 16:45 UTC
+        'duration_minutes': 120,
+        'description': 'CPU stress testing with stress-ng (4 cycles: 15min stress + 15min pause)',
+        'pattern': 'cyclic',
+        'cycle_duration': 15,  # 15 minutes active stress
+        'cycle_pause': 15,     # 15 minutes pause
+        'cycles': 4,
+        'active_periods': [
+            (f"{TEST_DATE}T14:45:00", f"{TEST_DATE}T15:00:00"),  # Cycle 1: 16:45-17:00 local
+            (f"{TEST_DATE}T15:15:00", f"{TEST_DATE}T15:30:00"),  # Cycle 2: 17:15-17:30 local
+            (f"{TEST_DATE}T15:45:00", f"{TEST_DATE}T16:00:00"),  # Cycle 3: 17:45-18:00 local
+            (f"{TEST_DATE}T16:15:00", f"{TEST_DATE}T16:30:00"),  # Cycle 4: 18:15-18:30 local
+        ]
+    },
+    'WL2_IO_Stress': {
+        'name': 'I/O Stress Testing',
+        'start': f"{TEST_DATE}T16:45:00",  # 18:45 local -> 16:45 UTC
+        'end': f"{TEST_DATE}T17:45:00",    # 19:45 local -> 17:45 UTC
+        'duration_minutes': 60,
+        'description': 'FIO I/O stress testing (4 cycles: 15min I/O stress + 15min pause)',
+        'pattern': 'cyclic',
+        'cycle_duration': 15,  # 15 minutes active I/O
+        'cycle_pause': 15,     # 15 minutes pause
+        'cycles': 4,
+        'active_periods': [
+            (f"{TEST_DATE}T16:45:00", f"{TEST_DATE}T17:00:00"),  # Cycle 1: 18:45-19:00 local
+            (f"{TEST_DATE}T17:15:00", f"{TEST_DATE}T17:30:00"),  # Cycle 2: 19:15-19:30 local
+            # Note: Only 2 full cycles fit in 1 hour with 15min pause
+        ]
+    },
+    'WL3_Reboot': {
+        'name': 'System Reboot Cycle',
+        'start': f"{TEST_DATE}T18:35:00",  # 20:35 local -> 18:35 UTC
+        'end': f"{TEST_DATE}T18:40:00",    # 20:40 local -> 18:40 UTC
+        'duration_minutes': 5,
+        'description': 'Full system reboot cycle',
+        'pattern': 'single',
+        'active_periods': [
+            (f"{TEST_DATE}T18:35:00", f"{TEST_DATE}T18:40:00"),
+        ]
+    },
+    'WL4_Maintenance': {
+        'name': 'Maintenance Operations',
+        'start': f"{TEST_DATE}T20:30:00",  # 22:30 local -> 20:30 UTC
+        'end': f"{TEST_DATE}T20:35:00",    # 22:35 local -> 20:35 UTC
+        'duration_minutes': 5,
+        'description': 'System maintenance and updates',
+        'pattern': 'single',
+        'active_periods': [
+            (f"{TEST_DATE}T20:30:00", f"{TEST_DATE}T20:35:00"),
+        ]
+    },
+    'WL5_Idle': {
+        'name': 'Idle State',
+        'start': f"{TEST_DATE}T20:50:00",  # 22:50 local -> 20:50 UTC
+        'end': f"{TEST_DATE}T21:50:00",    # 23:50 local -> 21:50 UTC
+        'duration_minutes': 60,
+        'description': 'System idle state baseline',
+        'pattern': 'continuous',
+        'active_periods': [
+            (f"{TEST_DATE}T20:50:00", f"{TEST_DATE}T21:50:00"),
+        ]
+    }
+}
+
 
 class EnergyDataAnalyzer:
     """Class to analyze energy consumption data from DynamoDB"""
     
-    def __init__(self, table_name: str = 'SensorData', device_id: str = None):
+    def __init__(self, table_name: str = 'SensorData', device_id: str = None, streaming: bool = False,
+                 raw_format: str = 'json', auto_segment: bool = False, plot_dir: str = None,
+                 export_format: str = 'csv', export_readings: bool = False):
         """
         Initialize the analyzer
         
         Args:
             table_name: Name of the DynamoDB table
             device_id: Device ID to filter data (if None, uses first found device)
+            streaming: If True, consume query pages through online accumulators
+                       instead of keeping every reading in memory
+            raw_format: 'json' to embed raw series in the results JSON,
+                        'npy' to write them to a memory-mappable sidecar directory
+            auto_segment: If True, replace the hand-coded active windows of
+                          cyclic/single workloads with windows detected from the data
+            plot_dir: If set, render decimated per-workload figures into this directory
+            export_format: Format of tabular exports ('csv', 'parquet' or 'arrow')
+            export_readings: If True, stream every analyzed reading to
+                             energy_readings.<format> as it is read
         """
         self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table(table_name)
+        # Power readings are read through the low-level client into NumPy (column_query.py)
+        self.power_query = ColumnQuery(table_name, 'device_id', 'timestamp')
+        self.registry = DeviceRegistryClient(dynamodb=self.dynamodb)
+        self.coverage = CoverageIndex(data_table_name=table_name, dynamodb=self.dynamodb)
         self.device_id = device_id
-        self.test_date = "2025-06-29"
-        
-        # Define test periods - Converted to UTC (subtract 2 hours from local times)
-        # Local times -> UTC times: 16:45 -> 14:45, 18:45 -> 16:45, etc.
-        self.test_periods = {
-            'WL1_CPU_Stress': {
-                'name': 'Maximum Computational Load',
-                'start': f"{self.test_date}T14:45:00",  # 16:45 local -> 14:45 UTC
-                'end': f"{self.test_date}T16:45:00",    # 18:45 local -> 16:45 UTC
-                'duration_minutes': 120,
-                'description': 'CPU stress testing with stress-ng (4 cycles: 15min stress + 15min pause)',
-                'pattern': 'cyclic',
-                'cycle_duration': 15,  # 15 minutes active stress
-                'cycle_pause': 15,     # 15 minutes pause
-                'cycles': 4,
-                'active_periods': [
-                    (f"{self.test_date}T14:45:00", f"{self.test_date}T15:00:00"),  # Cycle 1: 16:45-17:00 local
-                    (f"{self.test_date}T15:15:00", f"{self.test_date}T15:30:00"),  # Cycle 2: 17:15-17:30 local
-                    (f"{self.test_date}T15:45:00", f"{self.test_date}T16:00:00"),  # Cycle 3: 17:45-18:00 local
-                    (f"{self.test_date}T16:15:00", f"{self.test_date}T16:30:00"),  # Cycle 4: 18:15-18:30 local
-                ]
-            },
-            'WL2_IO_Stress': {
-                'name': 'I/O Stress Testing',
-                'start': f"{self.test_date}T16:45:00",  # 18:45 local -> 16:45 UTC
-                'end': f"{self.test_date}T17:45:00",    # 19:45 local -> 17:45 UTC
-                'duration_minutes': 60,
-                'description': 'FIO I/O stress testing (4 cycles: 15min I/O stress + 15min pause)',
-                'pattern': 'cyclic',
-                'cycle_duration': 15,  # 15 minutes active I/O
-                'cycle_pause': 15,     # 15 minutes pause
-                'cycles': 4,
-                'active_periods': [
-                    (f"{self.test_date}T16:45:00", f"{self.test_date}T17:00:00"),  # Cycle 1: 18:45-19:00 local
-                    (f"{self.test_date}T17:15:00", f"{self.test_date}T17:30:00"),  # Cycle 2: 19:15-19:30 local
-                    # Note: Only 2 full cycles fit in 1 hour with 15min pause
-                ]
-            },
-            'WL3_Reboot': {
-                'name': 'System Reboot Cycle',
-                'start': f"{self.test_date}T18:35:00",  # 20:35 local -> 18:35 UTC
-                'end': f"{self.test_date}T18:40:00",    # 20:40 local -> 18:40 UTC
-                'duration_minutes': 5,
-                'description': 'Full system reboot cycle',
-                'pattern': 'single',
-                'active_periods': [
-                    (f"{self.test_date}T18:35:00", f"{self.test_date}T18:40:00"),
-                ]
-            },
-            'WL4_Maintenance': {
-                'name': 'Maintenance Operations',
-                'start': f"{self.test_date}T20:30:00",  # 22:30 local -> 20:30 UTC
-                'end': f"{self.test_date}T20:35:00",    # 22:35 local -> 20:35 UTC
-                'duration_minutes': 5,
-                'description': 'System maintenance and updates',
-                'pattern': 'single',
-                'active_periods': [
-                    (f"{self.test_date}T20:30:00", f"{self.test_date}T20:35:00"),
-                ]
-            },
-            'WL5_Idle': {
-                'name': 'Idle State',
-                'start': f"{self.test_date}T20:50:00",  # 22:50 local -> 20:50 UTC
-                'end': f"{self.test_date}T21:50:00",    # 23:50 local -> 21:50 UTC
-                'duration_minutes': 60,
-                'description': 'System idle state baseline',
-                'pattern': 'continuous',
-                'active_periods': [
-                    (f"{self.test_date}T20:50:00", f"{self.test_date}T21:50:00"),
-                ]
-            }
-        }
+        self.streaming = streaming
+        self.raw_format = raw_format
+        self.auto_segment = auto_segment
+        self.plot_dir = plot_dir
+        self.export_format = export_format
+        self.export_readings = export_readings
+        self.readings_writer = None
+        self.test_date = TEST_DATE
+        self.test_periods = copy.deepcopy(TEST_PERIODS)  # Auto-segmentation refines the copy in place
+    
+    @property
+    def consumed_read_units(self) -> float:
+        """ConsumedCapacity of the data queries"""
+        return self.power_query.consumed_read_units
     
     def discover_device_id(self) -> Optional[str]:
-        """Discover the device ID by scanning the table and check timestamp format"""
+        """
+        Discover the device ID
+        
+        Uses the device registry (one Query, cached) and picks the most recently
+        seen device whose first_seen/last_seen span covers test_date, or the
+        most recently seen device if none does. Falls back to scanning the
+        table if the registry is empty.
+        """
+        devices = self.registry.try_list_keys(self.table.name)
+        if devices:
+            covering = [d for d in devices if covers_day(d, self.test_date)]
+            device = covering[0] if covering else devices[0]
+            device_id = device['key_id']
+            print(f"Discovered device ID: {device_id} (registry, seen {device['first_seen']} - {device['last_seen']})")
+            if not covering:
+                print(f"   ⚠️  No registered device covers {self.test_date}; "
+                      f"run Scripts/backfillRegistry.py if older devices are missing")
+            others = [d['key_id'] for d in devices if d is not device]
+            if others:
+                print(f"   Other devices: {', '.join(others)}")
+            return device_id
+        
         try:
             response = self.table.scan(
                 Limit=5  # Get a few samples to check timestamp format
@@ -146,7 +210,7 @@ class EnergyDataAnalyzer:
             print(f"Error discovering device ID: {e}")
             return None
     
-    def query_time_range(self, start_time: str, end_time: str, debug: bool = False) -> List[Dict]:
+    def query_time_range(self, start_time: str, end_time: str, debug: bool = False) -> SensorBatch:
         """
         Query data for a specific time range
         
@@ -156,45 +220,282 @@ class EnergyDataAnalyzer:
             debug: If True, print debug information
             
         Returns:
-            List of data points
+            SensorBatch of the readings (columnar; timestamp and current_power only)
         """
         if not self.device_id:
             self.device_id = self.discover_device_id()
             if not self.device_id:
-                return []
+                return SensorBatch()
         
         if debug:
             print(f"🔍 Querying range: {start_time} to {end_time}")
         
         try:
-            # Query DynamoDB for the time range
-            response = self.table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('device_id').eq(self.device_id) &
-                                     boto3.dynamodb.conditions.Key('timestamp').between(start_time, end_time),
-                ScanIndexForward=True  # Sort by timestamp ascending
-            )
+            # All pages, projected to timestamp and power (see column_query.py)
+            columns = self.power_query.fetch(self.device_id, start_time, end_time, POWER_COLUMNS)
             
-            items = response['Items']
+            readings = SensorBatch.from_columns(timestamp=columns['timestamp'].tolist(),
+                                                current_power=columns['current_power'])
             
-            if debug and items:
-                print(f"📊 Found {len(items)} items in range")
-                print(f"First item timestamp: {items[0].get('timestamp')}")
-                print(f"Last item timestamp: {items[-1].get('timestamp')}")
-                print(f"First item power: {items[0].get('current_power')}")
-                print(f"Last item power: {items[-1].get('current_power')}")
+            if debug and readings:
+                print(f"📊 Found {len(readings)} items in range")
+                print(f"First item timestamp: {readings.timestamp[0]}")
+                print(f"Last item timestamp: {readings.timestamp[-1]}")
+                print(f"First item power: {readings.current_power[0]}")
+                print(f"Last item power: {readings.current_power[-1]}")
                 
                 # Check for any high power values
-                power_values = [float(item.get('current_power', 0)) for item in items if 'current_power' in item]
+                power_values = readings.present('current_power').current_power
                 if power_values:
                     max_power = max(power_values)
                     min_power = min(power_values)
                     print(f"Power range in this period: {min_power:.1f}W - {max_power:.1f}W")
             
-            return items
+            return readings
             
         except ClientError as e:
             print(f"Error querying data for {start_time} - {end_time}: {e}")
+            return SensorBatch()
+    
+    def iter_power_readings(self, start_time: str, end_time: str):
+        """
+        Stream (timestamp, power) readings for a time range page by page
+        
+        Follows LastEvaluatedKey and only projects the attributes needed, so
+        at most one DynamoDB page is held in memory at any time.
+        
+        Args:
+            start_time: Start time in ISO format (YYYY-MM-DDTHH:MM:SS)
+            end_time: End time in ISO format (YYYY-MM-DDTHH:MM:SS)
+            
+        Yields:
+            Tuples of (timestamp string, power in W)
+        """
+        if not self.device_id:
+            self.device_id = self.discover_device_id()
+            if not self.device_id:
+                return
+        
+        pages = self.power_query.iter_pages(self.device_id, start_time, end_time, POWER_COLUMNS,
+                                            require=('current_power',))
+        while True:
+            try:
+                columns = next(pages, None)
+            except ClientError as e:
+                print(f"Error querying data for {start_time} - {end_time}: {e}")
+                return
+            if columns is None:
+                return
+            yield from zip(columns['timestamp'].tolist(), columns['current_power'].tolist())
+    
+    def analyze_workload_streaming(self, period_key: str) -> Dict:
+        """
+        Analyze a workload period in constant memory
+        
+        Produces the same result structure as the cyclic/continuous analyses
+        (without 'raw_data' and per-cycle 'power_values') and adds streaming
+        quantile estimates to 'power_stats'.
+        """
+        period = self.test_periods[period_key]
+        pattern = period.get('pattern', 'continuous')
+        
+        overall = PowerAccumulator()
+        active_periods_data = []
+        
+        for i, (start_time, end_time) in enumerate(period['active_periods']):
+            print(f"   📈 Streaming active period {i+1}: {start_time} - {end_time}")
+            cycle = RunningStats()
+            
+            for timestamp, power_w in self.iter_power_readings(start_time, end_time):
+                cycle.add(power_w)
+                overall.add(timestamp, power_w)
+                if self.readings_writer:
+                    self.readings_writer.write_row((period_key, timestamp, power_w))
+            
+            if cycle.count:
+                active_periods_data.append({
+                    'period': i+1,
+                    'start': start_time,
+                    'end': end_time,
+                    'avg_power': cycle.mean,
+                    'peak_power': cycle.max,
+                    'data_points': cycle.count
+                })
+                print(f"     ✅ Active period {i+1}: {cycle.count} points, avg {cycle.mean:.1f}W")
+        
+        if not overall.count:
+            print(f"   ⚠️  No power data found for period {period_key}")
+            return {
+                'period': period_key,
+                'name': period['name'],
+                'data_points': 0,
+                'error': 'No power data found'
+            }
+        
+        stats = overall.stats
+        avg_power = stats.mean
+        power_stability = (stats.stdev / avg_power * 100) if avg_power > 0 else 0
+        
+        power_stats = {
+            'average_w': round(avg_power, 2),
+            'peak_w': round(stats.max, 2),
+            'minimum_w': round(stats.min, 2),
+            'std_deviation_w': round(stats.stdev, 2),
+            'stability_cv_percent': round(power_stability, 2)
+        }
+        power_stats.update(overall.quantile_summary())
+        
+        results = {
+            'period': period_key,
+            'name': period['name'],
+            'description': period['description'],
+            'pattern': pattern,
+            'start_time': period['start'],
+            'end_time': period['end'],
+            'data_points': stats.count,
+            'first_timestamp': overall.first_timestamp,
+            'last_timestamp': overall.last_timestamp,
+            'power_stats': power_stats
+        }
+        
+        if pattern == 'cyclic':
+            active_duration_minutes = len(period['active_periods']) * period.get('cycle_duration', 15)
+            active_duration_hours = active_duration_minutes / 60
+            energy_kwh = (avg_power * active_duration_hours) / 1000
+            results.update({
+                'total_duration_minutes': period['duration_minutes'],
+                'active_duration_minutes': active_duration_minutes,
+                'cycle_duration_minutes': period.get('cycle_duration', 15),
+                'cycles': len(period['active_periods']),
+                'energy_consumption': {
+                    'total_kwh': round(energy_kwh, 6),
+                    'active_duration_hours': round(active_duration_hours, 2),
+                    'kwh_per_cycle': round(energy_kwh / len(period['active_periods']), 6)
+                },
+                'cycle_details': active_periods_data
+            })
+        else:
+            duration_hours = period['duration_minutes'] / 60
+            energy_kwh = (avg_power * duration_hours) / 1000
+            results.update({
+                'duration_minutes': period['duration_minutes'],
+                'energy_consumption': {
+                    'total_kwh': round(energy_kwh, 6),
+                    'duration_hours': round(duration_hours, 2)
+                }
+            })
+        
+        print(f"   ✅ Streamed {stats.count} power measurements")
+        print(f"   📈 Average Power: {avg_power:.1f} W")
+        print(f"   ⚡ Peak Power: {stats.max:.1f} W")
+        print(f"   🔋 Energy Consumption: {energy_kwh:.6f} kWh")
+        
+        return results
+    
+    def segment_time_range(self, start_time: str, end_time: str, **kwargs) -> List[Dict]:
+        """
+        Detect active load windows in a time range from the power series
+        
+        Args:
+            start_time: Start time in ISO format (YYYY-MM-DDTHH:MM:SS)
+            end_time: End time in ISO format (YYYY-MM-DDTHH:MM:SS)
+            **kwargs: Options passed to segmentation.detect_active_windows
+            
+        Returns:
+            List of detected windows (see segmentation.detect_active_windows)
+        """
+        timestamps = []
+        power_values = []
+        for timestamp, power_w in self.iter_power_readings(start_time, end_time):
+            timestamps.append(timestamp)
+            power_values.append(power_w)
+        
+        if not power_values:
+            return []
+        return detect_active_windows(timestamps, power_values, **kwargs)
+    
+    def refine_active_periods(self, **kwargs) -> Dict:
+        """
+        Replace hand-coded active windows with windows detected from the data
+        
+        Only cyclic and single workloads are refined; continuous periods (idle
+        baseline) keep their full range. Cyclic workloads get the detected
+        windows and mean cycle length, single workloads the detected
+        start/end/duration_minutes (the span of their detected windows). The idle baseline is taken from the
+        continuous period if available so short windows are classified against
+        the real idle level.
+        
+        Returns:
+            Dictionary of period key -> detected windows
+        """
+        if 'baseline_w' not in kwargs:
+            for period in self.test_periods.values():
+                if period.get('pattern') == 'continuous':
+                    readings = [p for _, p in self.iter_power_readings(period['start'], period['end'])]
+                    if readings:
+                        kwargs['baseline_w'] = statistics.median(readings)
+                    break
+        
+        detected = {}
+        for period_key, period in self.test_periods.items():
+            if period.get('pattern') not in ('cyclic', 'single'):
+                continue
+            
+            windows = self.segment_time_range(period['start'], period['end'], **kwargs)
+            detected[period_key] = windows
+            
+            if not windows:
+                print(f"   ⚠️  {period_key}: no active windows detected, keeping configured windows")
+                continue
+            
+            period['active_periods'] = windows_to_active_periods(windows)
+            if period.get('pattern') == 'cyclic':
+                period['cycle_duration'] = round(statistics.mean(w['duration_minutes'] for w in windows), 1)
+            else:
+                # Single workloads are analyzed (and billed) over start/end/duration_minutes
+                period['start'] = windows[0]['start']
+                period['end'] = windows[-1]['end']
+                period['duration_minutes'] = round(
+                    (windows[-1]['start_epoch'] - windows[0]['start_epoch']) / 60 + windows[-1]['duration_minutes'], 1)
+            
+            print(f"   🔎 {period_key}: detected {len(windows)} active window(s)")
+            for window in windows:
+                print(f"      {window['start']} - {window['end']} ({window['mean_power']:.1f}W avg)")
+        
+        return detected
+    
+    def load_markers(self, path: str) -> int:
+        """
+        Replace the hand-coded test periods with runs recorded by workload_runner.py
+        
+        Args:
+            path: Run record file or results directory of the workload runner
+            
+        Returns:
+            Number of runs loaded
+        """
+        runs = load_runs(path)
+        if not runs:
+            return 0
+        self.test_periods = runs_to_test_periods(runs)
+        self.test_date = runs[0]['started'][:10]
+        return len(runs)
+    
+    def build_power_profile(self, timestamps: List[str], power_values: List[float],
+                            freq: str = '15min') -> List[Dict]:
+        """
+        Time-weighted average power per regular slot (aligned to EPEX 15-minute slots)
+        
+        Slots without readings (e.g. pauses between cycles) are omitted.
+        """
+        if not power_values:
             return []
+        grid, values = resample(timestamps, power_values, freq=freq, how='time_weighted')
+        return [
+            {'slot_start': str(slot), 'avg_power_w': round(float(value), 2)}
+            for slot, value in zip(grid_to_iso(grid), values)
+            if value == value  # Skip NaN (no data in slot)
+        ]
     
     def analyze_workload_period(self, period_key: str) -> Dict:
         """
@@ -212,6 +513,8 @@ class EnergyDataAnalyzer:
         print(f"   Period: {period['start']} - {period['end']}")
         print(f"   Pattern: {period.get('pattern', 'continuous')}")
         
+        if self.streaming:
+            return self.analyze_workload_streaming(period_key)
         if period.get('pattern') == 'cyclic':
             return self.analyze_cyclic_workload(period_key)
         else:
@@ -235,13 +538,10 @@ class EnergyDataAnalyzer:
             active_data = self.query_time_range(start_time, end_time, debug=debug_mode)
             
             if active_data:
-                active_power_values = []
-                for point in active_data:
-                    if 'current_power' in point:
-                        power_w = float(point['current_power'])
-                        active_power_values.append(power_w)
-                        all_power_values.append(power_w)
-                        all_timestamps.append(point['timestamp'])
+                readings = active_data.present('current_power')
+                active_power_values = readings.current_power.tolist()
+                all_power_values.extend(active_power_values)
+                all_timestamps.extend(readings.timestamp)
                 
                 if active_power_values:
                     active_periods_data.append({
@@ -271,7 +571,7 @@ class EnergyDataAnalyzer:
         min_power = min(all_power_values)
         std_dev = statistics.stdev(all_power_values) if len(all_power_values) > 1 else 0
         
-        # Calculate energy consumption for active periods only (15 minutes per cycle)
+        # Calculate energy consumption for active periods only (cycle_duration minutes per cycle)
         active_duration_minutes = len(period['active_periods']) * period.get('cycle_duration', 15)
         active_duration_hours = active_duration_minutes / 60
         energy_kwh = (avg_power * active_duration_hours) / 1000
@@ -288,6 +588,7 @@ class EnergyDataAnalyzer:
             'end_time': period['end'],
             'total_duration_minutes': period['duration_minutes'],
             'active_duration_minutes': active_duration_minutes,
+            'cycle_duration_minutes': period.get('cycle_duration', 15),
             'cycles': len(period['active_periods']),
             'data_points': len(all_power_values),
             'power_stats': {
@@ -300,9 +601,10 @@ class EnergyDataAnalyzer:
             'energy_consumption': {
                 'total_kwh': round(energy_kwh, 6),
                 'active_duration_hours': round(active_duration_hours, 2),
-                'kwh_per_15min': round(energy_kwh / len(period['active_periods']), 6)
+                'kwh_per_cycle': round(energy_kwh / len(period['active_periods']), 6)
             },
             'cycle_details': active_periods_data,
+            'profile_15min': self.build_power_profile(all_timestamps, all_power_values),
             'raw_data': {
                 'timestamps': all_timestamps,
                 'power_values': all_power_values
@@ -313,7 +615,8 @@ class EnergyDataAnalyzer:
         print(f"   📈 Average Power (active periods): {avg_power:.1f} W")
         print(f"   ⚡ Peak Power: {max_power:.1f} W")
         print(f"   🔋 Energy Consumption (active only): {energy_kwh:.6f} kWh")
-        print(f"   ⏱️  Active Duration: {active_duration_minutes} minutes ({len(period['active_periods'])} × 15min)")
+        print(f"   ⏱️  Active Duration: {active_duration_minutes} minutes "
+              f"({len(period['active_periods'])} × {period.get('cycle_duration', 15):g}min)")
         
         return results
     
@@ -333,15 +636,10 @@ class EnergyDataAnalyzer:
                 'error': 'No data found'
             }
         
-        # Extract power values (convert Decimal to float)
-        power_values = []
-        timestamps = []
-        
-        for point in data_points:
-            if 'current_power' in point:
-                power_w = float(point['current_power'])
-                power_values.append(power_w)
-                timestamps.append(point['timestamp'])
+        # Extract power values (readings without current_power are skipped)
+        readings = data_points.present('current_power')
+        power_values = readings.current_power.tolist()
+        timestamps = list(readings.timestamp)
         
         if not power_values:
             print(f"   ⚠️  No power data found for period {period_key}")
@@ -385,6 +683,7 @@ class EnergyDataAnalyzer:
                 'total_kwh': round(energy_kwh, 6),
                 'duration_hours': round(duration_hours, 2)
             },
+            'profile_15min': self.build_power_profile(timestamps, power_values),
             'raw_data': {
                 'timestamps': timestamps,
                 'power_values': power_values
@@ -408,10 +707,15 @@ class EnergyDataAnalyzer:
         if not valid_results:
             return {'error': 'No valid data for comparison'}
         
-        # Find baseline (idle state)
+        # Find baseline (idle state; marker runs have no WL5_Idle key)
         baseline_power = None
         if 'WL5_Idle' in valid_results:
             baseline_power = valid_results['WL5_Idle']['power_stats']['average_w']
+        else:
+            for results in valid_results.values():
+                if results.get('pattern') == 'continuous':
+                    baseline_power = results['power_stats']['average_w']
+                    break
         
         comparison = {
             'baseline_power_w': baseline_power,
@@ -445,8 +749,9 @@ class EnergyDataAnalyzer:
     def export_results_to_files(self, all_results: Dict, comparison: Dict):
         """Export results to various output formats"""
         
-        # Create results summary for LaTeX
-        latex_output = self.generate_latex_summary(all_results, comparison)
+        # LaTeX and summary tables only need aggregates, never the raw series
+        aggregates = aggregates_only(all_results)
+        latex_output = self.generate_latex_summary(aggregates, comparison)
         
         # Create detailed JSON report
         json_output = {
@@ -458,19 +763,26 @@ class EnergyDataAnalyzer:
         }
         
         # Write files
-        with open('energy_analysis_results.json', 'w') as f:
-            json.dump(json_output, f, indent=2, default=str)
+        sidecar_path = None
+        if self.raw_format == 'npy':
+            sidecar_path = write_results_with_sidecar(json_output, 'energy_analysis_results.json')
+        else:
+            with open('energy_analysis_results.json', 'w') as f:
+                json.dump(json_output, f, indent=2, default=str)
         
         with open('energy_analysis_latex.txt', 'w') as f:
             f.write(latex_output)
         
-        # Create CSV for spreadsheet analysis
-        self.create_csv_export(all_results)
+        # Create summary table for spreadsheet analysis
+        summary_path = self.create_csv_export(aggregates)
         
         print(f"\n📁 Results exported to:")
         print(f"   - energy_analysis_results.json (detailed data)")
+        if sidecar_path:
+            print(f"   - {sidecar_path} (raw power series)")
         print(f"   - energy_analysis_latex.txt (LaTeX values)")
-        print(f"   - energy_analysis_summary.csv (spreadsheet data)")
+        if summary_path:
+            print(f"   - {summary_path} (spreadsheet data)")
     
     def generate_latex_summary(self, all_results: Dict, comparison: Dict) -> str:
         """Generate LaTeX-ready values for the paper"""
@@ -502,11 +814,12 @@ class EnergyDataAnalyzer:
                 # For cyclic workloads, show both total and per-cycle data
                 cycles = results.get('cycles', 0)
                 active_duration = results.get('active_duration_minutes', 0)
-                kwh_per_15min = energy.get('kwh_per_15min', 0)
+                cycle_duration = results.get('cycle_duration_minutes', 15)
+                kwh_per_cycle = energy.get('kwh_per_cycle', 0)
                 
                 latex_content += f"% Total energy consumption ({cycles} cycles): {energy['total_kwh']} kWh\n"
-                latex_content += f"% Energy consumption per 15-min cycle: {kwh_per_15min} kWh\n"
-                latex_content += f"% Active duration: {active_duration} minutes ({cycles} × 15min cycles)\n"
+                latex_content += f"% Energy consumption per {cycle_duration:g}-min cycle: {kwh_per_cycle} kWh\n"
+                latex_content += f"% Active duration: {active_duration} minutes ({cycles} × {cycle_duration:g}min cycles)\n"
                 latex_content += f"% Total test duration: {results.get('total_duration_minutes', 0)} minutes\n"
                 
                 # Add cycle details
@@ -542,7 +855,7 @@ class EnergyDataAnalyzer:
 % Replace [X] placeholders with the values above.
 % 
 % For cyclic workloads (WL1, WL2):
-%   - Use "Energy consumption per 15-min cycle" for individual cycle energy
+%   - Use "Energy consumption per N-min cycle" for individual cycle energy
 %   - Use "Total energy consumption" for entire test period
 %   - Mention the cyclic nature in descriptions
 %
@@ -557,8 +870,8 @@ class EnergyDataAnalyzer:
         
         return latex_content
     
-    def create_csv_export(self, all_results: Dict):
-        """Create CSV file for spreadsheet analysis"""
+    def create_csv_export(self, all_results: Dict) -> Optional[str]:
+        """Create the summary table (CSV, Parquet or Arrow) for spreadsheet analysis"""
         
         csv_data = []
         for period_key, results in all_results.items():
@@ -571,7 +884,7 @@ class EnergyDataAnalyzer:
                 total_duration = results.get('total_duration_minutes', 0)
                 active_duration = results.get('active_duration_minutes', 0)
                 cycles = results.get('cycles', 0)
-                kwh_per_cycle = results['energy_consumption'].get('kwh_per_15min', 0)
+                kwh_per_cycle = results['energy_consumption'].get('kwh_per_cycle', 0)
             else:
                 total_duration = results.get('duration_minutes', 0)
                 active_duration = total_duration
@@ -594,15 +907,49 @@ class EnergyDataAnalyzer:
                 'Energy_Per_Cycle_kWh': kwh_per_cycle,
                 'Power_Stability_CV%': results['power_stats']['stability_cv_percent']
             })
+            if 'energy_per_operation' in results:
+                per_operation = results['energy_per_operation']
+                csv_data[-1].update({
+                    'Joules_Per_Bogo_Op': per_operation.get('j_per_bogo_op'),
+                    'Joules_Per_IO': per_operation.get('j_per_io'),
+                    'Joules_Per_MiB': per_operation.get('j_per_mib')
+                })
         
-        if csv_data:
-            df = pd.DataFrame(csv_data)
-            df.to_csv('energy_analysis_summary.csv', index=False)
+        # Rows of marker runs may carry per-operation columns the first row lacks
+        columns = []
+        for row in csv_data:
+            columns.extend(column for column in row if column not in columns)
+        return write_table('energy_analysis_summary', csv_data, columns=columns or None, fmt=self.export_format)
+    
+    def check_coverage_index(self) -> bool:
+        """
+        Check telemetry coverage of the test date from the coverage index
+        
+        Returns:
+            True if the index had coverage for the test date (no probing needed)
+        """
+        try:
+            summary = self.coverage.summarize(self.device_id, self.test_date, self.test_date)
+        except ClientError as e:
+            print(f"Coverage index unavailable ({e.response['Error']['Code']})")
+            return False
+        
+        if summary['coverage_percent'] == 0:
+            return False
+        
+        print(f"✅ Coverage index: {summary['coverage_percent']}% of minutes on {self.test_date} have data")
+        for gap in summary['gaps']:
+            print(f"   ⚠️  Gap: {gap['start']} - {gap['end']} ({gap['minutes']} min)")
+        return True
     
     def check_available_data_around_test_date(self):
         """Check what data is available around the test date"""
         print(f"\n🔍 Checking available data around test date {self.test_date}...")
         
+        # One small read of the coverage index replaces the probing queries
+        if self.check_coverage_index():
+            return
+        
         # Check a broader range around the test date
         start_check = f"{self.test_date}T00:00:00"
         end_check = f"{self.test_date}T23:59:59"
@@ -646,6 +993,32 @@ class EnergyDataAnalyzer:
         except ClientError as e:
             print(f"Error checking data: {e}")
 
+    def plan_capacity(self) -> Optional['CapacityEstimate']:
+        """
+        Predict the read capacity of the analysis queries
+        
+        Samples each queried window with a few small queries instead of reading
+        it (see Scripts/capacity_planner.py).
+        
+        Returns:
+            CapacityEstimate, or None if no device was found
+        """
+        if not self.device_id:
+            self.device_id = self.discover_device_id()
+            if not self.device_id:
+                return None
+        
+        planner = capacity_planner()
+        estimate = planner.CapacityEstimate(f"energy analysis of {self.device_id} in {self.table.name}")
+        for period in self.test_periods.values():
+            windows = list(period['active_periods'])
+            if self.auto_segment and period.get('pattern') in ('cyclic', 'single'):
+                windows.append((period['start'], period['end']))  # Read once more for segmentation
+            for start_time, end_time in windows:
+                estimate.add(planner.estimate_query(self.table, 'device_id', self.device_id, 'timestamp',
+                                                    start_time, end_time, planner.ISO_KEYS, strata=2, limit=50))
+        return estimate
+    
     def run_complete_analysis(self):
         """Run the complete analysis for all workload periods"""
         
@@ -665,18 +1038,43 @@ class EnergyDataAnalyzer:
         # Check what data is available around the test date
         self.check_available_data_around_test_date()
         
+        # Detect active windows from the data instead of the hand-coded schedule
+        if self.auto_segment:
+            print("\n🔎 Detecting workload windows from the power series...")
+            self.refine_active_periods()
+        
         # Analyze each workload period
+        if self.export_readings:
+            self.readings_writer = open_table_writer('energy_readings', ['Period_Key', 'Timestamp', 'Power_W'],
+                                                     self.export_format)
         all_results = {}
-        for period_key in self.test_periods.keys():
-            try:
-                results = self.analyze_workload_period(period_key)
-                all_results[period_key] = results
-            except Exception as e:
-                print(f"❌ Error analyzing {period_key}: {e}")
-                all_results[period_key] = {
-                    'period': period_key,
-                    'error': str(e)
-                }
+        try:
+            for period_key in self.test_periods.keys():
+                try:
+                    results = self.analyze_workload_period(period_key)
+                    per_operation = energy_per_operation(results, self.test_periods[period_key])
+                    if per_operation:
+                        results['energy_per_operation'] = per_operation
+                        self.print_energy_per_operation(per_operation)
+                    all_results[period_key] = results
+                    if self.readings_writer and 'raw_data' in results:
+                        raw_data = results['raw_data']
+                        self.readings_writer.write_columns({
+                            'Period_Key': [period_key] * len(raw_data['timestamps']),
+                            'Timestamp': raw_data['timestamps'],
+                            'Power_W': raw_data['power_values']
+                        })
+                except Exception as e:
+                    print(f"❌ Error analyzing {period_key}: {e}")
+                    all_results[period_key] = {
+                        'period': period_key,
+                        'error': str(e)
+                    }
+        finally:
+            if self.readings_writer:
+                self.readings_writer.close()
+                print(f"\n📝 Streamed {self.readings_writer.rows_written} readings to {self.readings_writer.path}")
+                self.readings_writer = None
         
         # Generate comparison analysis
         print("\n🔄 Generating comparison analysis...")
@@ -686,11 +1084,34 @@ class EnergyDataAnalyzer:
         print("\n💾 Exporting results...")
         self.export_results_to_files(all_results, comparison)
         
+        # Render figures (matplotlib is only imported here)
+        if self.plot_dir:
+            print("\n🖼️  Rendering workload figures...")
+            from plotting import render_workload_plots
+            paths = render_workload_plots(all_results, self.plot_dir)
+            if not paths:
+                print("   ⚠️  No raw series available to plot (streaming mode or no data)")
+        
         # Print summary
         self.print_summary(all_results, comparison)
         
+        if self.streaming:
+            peak_rss = peak_rss_mb()
+            if peak_rss is not None:
+                print(f"🧠 Peak RSS (streaming mode): {peak_rss} MB")
+        
         return all_results, comparison
     
+    def print_energy_per_operation(self, per_operation: Dict):
+        """Print joules per bogo-op / IO of a marker run"""
+        print(f"   🔬 Energy (marker phases): {per_operation['energy_j']:.0f} J over "
+              f"{per_operation['active_seconds']:.0f} s")
+        if 'j_per_bogo_op' in per_operation:
+            print(f"   🔬 {per_operation['bogo_ops']} bogo-ops: {per_operation['j_per_bogo_op'] * 1e6:.3f} µJ/bogo-op")
+        if 'j_per_io' in per_operation:
+            print(f"   🔬 {per_operation['total_ios']} IOs: {per_operation['j_per_io'] * 1e3:.3f} mJ/IO, "
+                  f"{per_operation['j_per_mib']:.3f} J/MiB")
+    
     def print_summary(self, all_results: Dict, comparison: Dict):
         """Print a summary of the analysis results"""
         
@@ -710,15 +1131,16 @@ class EnergyDataAnalyzer:
                 total_duration = results.get('total_duration_minutes', 0)
                 active_duration = results.get('active_duration_minutes', 0)
                 cycles = results.get('cycles', 0)
+                cycle_duration = results.get('cycle_duration_minutes', 15)
                 
                 print(f"   Total Duration: {total_duration} minutes")
-                print(f"   Active Duration: {active_duration} minutes ({cycles} × 15min cycles)")
+                print(f"   Active Duration: {active_duration} minutes ({cycles} × {cycle_duration:g}min cycles)")
                 print(f"   Average Power (active): {results['power_stats']['average_w']} W")
                 print(f"   Peak Power: {results['power_stats']['peak_w']} W")
                 print(f"   Total Energy (active): {results['energy_consumption']['total_kwh']} kWh")
                 
-                if 'kwh_per_15min' in results['energy_consumption']:
-                    print(f"   Energy per 15-min cycle: {results['energy_consumption']['kwh_per_15min']} kWh")
+                if 'kwh_per_cycle' in results['energy_consumption']:
+                    print(f"   Energy per {cycle_duration:g}-min cycle: {results['energy_consumption']['kwh_per_cycle']} kWh")
                     
                 print(f"   Data Points: {results['data_points']} (across {cycles} cycles)")
             else:
@@ -728,6 +1150,9 @@ class EnergyDataAnalyzer:
                 print(f"   Peak Power: {results['power_stats']['peak_w']} W")
                 print(f"   Total Energy: {results['energy_consumption']['total_kwh']} kWh")
                 print(f"   Data Points: {results['data_points']}")
+            
+            if 'energy_per_operation' in results:
+                self.print_energy_per_operation(results['energy_per_operation'])
         
         # Print comparison if available
         if 'workload_comparison' in comparison and comparison['baseline_power_w']:
@@ -744,18 +1169,65 @@ class EnergyDataAnalyzer:
 def main():
     """Main function to run the energy data analysis"""
     
+    parser = argparse.ArgumentParser(description='Analyze energy consumption data from DynamoDB')
+    parser.add_argument('--device-id', help='Device ID to analyze (default: first device found)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Constant-memory mode: stream query pages into online accumulators')
+    parser.add_argument('--raw-format', choices=['json', 'npy'], default='json',
+                        help='Store raw power series inline in the JSON (default) or in a sidecar directory of .npy files')
+    parser.add_argument('--auto-segment', action='store_true',
+                        help='Detect active windows of cyclic/single workloads from the power series')
+    parser.add_argument('--plots', nargs='?', const='plots', default=None, metavar='DIR',
+                        help='Render decimated per-workload figures (default directory: plots)')
+    parser.add_argument('--format', dest='export_format', choices=list(FORMATS), default='csv',
+                        help='Format of the summary/readings tables (parquet and arrow need pyarrow)')
+    parser.add_argument('--export-readings', action='store_true',
+                        help='Stream every analyzed reading to energy_readings.<format>')
+    parser.add_argument('--plan', action='store_true',
+                        help='Only predict read units and time from small samples, then exit')
+    parser.add_argument('--check-plan', action='store_true',
+                        help='Predict read units first and compare them with the consumed capacity afterwards')
+    parser.add_argument('--plan-rate', type=float,
+                        help='Read rate (RCU/s) used to predict the time (default: the table cap)')
+    parser.add_argument('--markers', metavar='PATH',
+                        help='Analyze runs recorded by Scripts/workload_runner.py (results directory or run file) '
+                             'instead of the configured test periods')
+    args = parser.parse_args()
+    
     # Initialize analyzer
-    analyzer = EnergyDataAnalyzer()
+    analyzer = EnergyDataAnalyzer(device_id=args.device_id, streaming=args.streaming,
+                                  raw_format=args.raw_format, auto_segment=args.auto_segment,
+                                  plot_dir=args.plots, export_format=args.export_format,
+                                  export_readings=args.export_readings)
+    
+    if args.markers:
+        runs = analyzer.load_markers(args.markers)
+        if not runs:
+            print(f"❌ No workload runs with finished phases found in {args.markers}")
+            return
+        print(f"🏷️  Loaded {runs} workload run(s) from {args.markers}")
+    
+    estimate = None
+    if args.plan or args.check_plan:
+        estimate = analyzer.plan_capacity()
+        if estimate:
+            plan_rate = args.plan_rate or capacity_planner().default_rates(analyzer.table.name)[0]
+            print(estimate.report(plan_rate, table_name=analyzer.table.name))
+        if args.plan:
+            return
     
     try:
         # Run complete analysis
+        started = time.perf_counter()
         results, comparison = analyzer.run_complete_analysis()
+        if estimate:
+            print(estimate.compare(analyzer.consumed_read_units, actual_seconds=time.perf_counter() - started))
         
         print("\n🎉 Analysis completed successfully!")
         print("📁 Check the generated files for detailed results:")
         print("   - energy_analysis_results.json")
         print("   - energy_analysis_latex.txt") 
-        print("   - energy_analysis_summary.csv")
+        print(f"   - energy_analysis_summary{FORMATS[args.export_format]}")
         
     except Exception as e:
         print(f"❌ Analysis failed: {e}")
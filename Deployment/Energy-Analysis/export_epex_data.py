@@ -8,37 +8,61 @@ for analysis and correlation with energy consumption measurements.
 
 Features:
 - Export EPEX spot prices for specific date ranges
+- Export multi-day/multi-month ranges with concurrent, paginated queries
 - Convert UTC timestamps to local time
 - Calculate price statistics and variations
-- Export to multiple formats (JSON, CSV, LaTeX)
+- Export to multiple formats (JSON, CSV, Parquet/Arrow, LaTeX)
 - Correlate prices with energy consumption test periods
 
 Author: Generated for G1-S2-INENI Project
 """
 
+import argparse
 import boto3
 import json
 import statistics
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
-import pandas as pd
+import numpy as np
+from zoneinfo import ZoneInfo
 from botocore.exceptions import ClientError
+from deployment_modules import MISSING_INT, PriceBatch, capacity_planner
+from registry_client import DeviceRegistryClient
+from interval_join import (LOCAL_TIMEZONE, format_local, local_days, local_window_bounds, match_windows,
+                           window_indices)
+from price_cache import PriceCache
+from price_stats import GROUPINGS, UNITS, period_statistics, price_statistics
+from resampling import resample
+from streaming_stats import RunningStats
+from writers import FORMATS, open_table_writer, output_path, write_table
+
+PRICE_COLUMNS = ['Timestamp_UTC', 'Timestamp_Local', 'Price_Cent_kWh', 'Price_EUR_kWh',
+                 'Price_EUR_MWh', 'Hour', 'Quarter_Hour']
 
 class EPEXDataExporter:
     """Class to export and analyze EPEX spot price data from DynamoDB"""
     
-    def __init__(self, table_name: str = 'EPEXSpotPrices', tariff: str = 'EPEXSPOTAT'):
+    def __init__(self, table_name: str = 'EPEXSpotPrices', tariff: str = 'EPEXSPOTAT', export_format: str = 'csv'):
         """
         Initialize the EPEX data exporter
         
         Args:
             table_name: Name of the DynamoDB table
             tariff: Tariff type to filter (default: EPEXSPOTAT for Austria)
+            export_format: Format of tabular exports ('csv', 'parquet' or 'arrow')
         """
         self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table(table_name)
+        self.registry = DeviceRegistryClient(dynamodb=self.dynamodb)
         self.tariff = tariff
+        self.export_format = export_format
+        self.price_cache = PriceCache(table_name, dynamodb=self.dynamodb)
+        self.local_timezone = LOCAL_TIMEZONE
         self.test_date = "2025-06-29"
         
         # Define test periods (in local time for reference)
@@ -81,7 +105,18 @@ class EPEXDataExporter:
         }
     
     def discover_available_tariffs(self) -> List[str]:
-        """Discover what tariffs are available in the table"""
+        """
+        Discover what tariffs are available in the table
+        
+        Uses the tariff registry (one Query, cached) and falls back to a
+        table scan if the registry is empty.
+        """
+        entries = self.registry.try_list_keys(self.table.name)
+        if entries:
+            tariffs = [entry['key_id'] for entry in entries]
+            print(f"Available tariffs: {tariffs} (registry)")
+            return tariffs
+        
         try:
             response = self.table.scan(
                 ProjectionExpression='tariff',
@@ -114,45 +149,280 @@ class EPEXDataExporter:
         except ClientError as e:
             print(f"Error getting sample data: {e}")
     
-    def query_prices_for_date(self, date: str) -> List[Dict]:
+    def _utc_day_bounds(self, day: str) -> Tuple[int, int]:
+        """Epoch milliseconds of [day 00:00 UTC, next day 00:00 UTC)"""
+        start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return int(start.timestamp() * 1000), int((start + timedelta(days=1)).timestamp() * 1000)
+    
+    def query_prices_for_date(self, date: str) -> PriceBatch:
         """
         Query EPEX prices for a specific date
         
         Args:
-            date: Date in YYYY-MM-DD format
+            date: Date in YYYY-MM-DD format (UTC day)
             
         Returns:
-            List of price data points
+            PriceBatch of the price slots
         """
         try:
-            # Create timestamp range for the entire day (UTC)
-            start_timestamp = int(datetime.strptime(f"{date}T00:00:00", "%Y-%m-%dT%H:%M:%S").timestamp() * 1000)
-            end_timestamp = int(datetime.strptime(f"{date}T23:59:59", "%Y-%m-%dT%H:%M:%S").timestamp() * 1000)
+            # Timestamp range for the entire UTC day
+            start_timestamp, end_timestamp = self._utc_day_bounds(date)
             
             print(f"🔍 Querying EPEX prices for {date}")
             print(f"   Tariff: {self.tariff}")
-            print(f"   Timestamp range: {start_timestamp} - {end_timestamp}")
-            
-            # Query DynamoDB for the date range
-            response = self.table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('tariff').eq(self.tariff) &
-                                     boto3.dynamodb.conditions.Key('timestamp').between(start_timestamp, end_timestamp),
-                ScanIndexForward=True  # Sort by timestamp ascending
-            )
+            print(f"   Timestamp range: {start_timestamp} - {end_timestamp - 1}")
             
-            items = response['Items']
-            print(f"   ✅ Found {len(items)} price data points")
+            prices = self.price_cache.get_batch(self.tariff, date)
+            print(f"   ✅ Found {len(prices)} price data points")
             
-            return items
+            return prices
             
         except ClientError as e:
             print(f"Error querying EPEX data: {e}")
-            return []
+            return PriceBatch()
+    
+    def split_date_range(self, start_day: str, end_day: str, slice_by: str = 'month') -> List[Tuple[str, str, str]]:
+        """
+        Split an inclusive UTC day range into day or month slices
+        
+        Returns:
+            List of (label, first_day, last_day) with inclusive YYYY-MM-DD bounds, in time order
+        """
+        first = datetime.strptime(start_day, "%Y-%m-%d").date()
+        last = datetime.strptime(end_day, "%Y-%m-%d").date()
+        if last < first:
+            raise ValueError("End day must not be before start day")
+        if slice_by not in ('day', 'month'):
+            raise ValueError("slice_by must be 'day' or 'month'")
+        
+        slices = []
+        current = first
+        while current <= last:
+            if slice_by == 'day':
+                following = current + timedelta(days=1)
+                label = current.isoformat()
+            else:
+                following = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+                label = current.strftime("%Y-%m")
+            following = min(following, last + timedelta(days=1))
+            slices.append((label, current.isoformat(), (following - timedelta(days=1)).isoformat()))
+            current = following
+        return slices
+    
+    def _fetch_slice(self, bounds: Tuple[str, str, str]) -> Tuple[str, Dict]:
+        """Fetch the price curve of one slice through the price cache (memory tier bypassed)"""
+        label, first_day, last_day = bounds
+        return label, self.price_cache.get_range(self.tariff, first_day, last_day, remember=False)
+    
+    def export_price_range(self, start_day: str, end_day: str, slice_by: str = 'month',
+                           max_workers: int = 8, output_prefix: str = 'epex_prices') -> Dict:
+        """
+        Export prices for a multi-day UTC range with concurrent slice queries
+        
+        The range is split into day or month slices that are read in parallel
+        through the price cache (missing days are queried following
+        LastEvaluatedKey). At most max_workers slices are submitted at a time;
+        they are consumed in time order and written to the output table (CSV,
+        Parquet or Arrow) one batch at a time, and the next slice is submitted
+        only when the oldest one is taken for writing. Fetched days are not kept in
+        the cache's memory tier, so memory stays bounded by the in-flight
+        slices; statistics are merged per slice.
+        
+        Args:
+            start_day: First day (YYYY-MM-DD, UTC)
+            end_day: Last day, inclusive (YYYY-MM-DD, UTC)
+            slice_by: 'day' or 'month'
+            max_workers: Number of concurrent slice queries
+            output_prefix: Prefix of the output files (<prefix>_<from>_<to>.<format> and .json)
+            
+        Returns:
+            Summary dictionary (also written as <prefix>_<from>_<to>.json)
+        """
+        slices = self.split_date_range(start_day, end_day, slice_by)
+        stem = f"{output_prefix}_{start_day}_{end_day}"
+        table_path = output_path(stem, self.export_format)
+        json_path = f"{stem}.json"
+        
+        print(f"🔍 Exporting EPEX prices {start_day} - {end_day} ({self.tariff})")
+        print(f"   {len(slices)} {slice_by} slice(s), {max_workers} concurrent queries")
+        
+        started = time.perf_counter()
+        stats = RunningStats()
+        slice_counts = {}
+        first_local = last_local = None
+        
+        with open_table_writer(stem, PRICE_COLUMNS, self.export_format) as writer, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Sliding window of max_workers futures, consumed in submission (= time)
+            # order: taking the oldest slice submits the next one, and each slice
+            # is converted column-wise and flushed before the next is taken
+            pending = deque()
+            remaining = iter(slices)
+            for bounds in islice(remaining, max_workers):
+                pending.append(executor.submit(self._fetch_slice, bounds))
+            while pending:
+                label, curve = pending.popleft().result()
+                for bounds in islice(remaining, 1):
+                    pending.append(executor.submit(self._fetch_slice, bounds))
+                timestamps_ms = curve['timestamps_ms']
+                prices = curve['prices_cent_kwh']
+                slice_counts[label] = len(timestamps_ms)
+                if not len(timestamps_ms):
+                    continue
+                
+                local_times = format_local(timestamps_ms, self.local_timezone)
+                utc_times = np.datetime_as_string(timestamps_ms.astype('datetime64[ms]').astype('datetime64[s]'))
+                writer.write_columns({
+                    'Timestamp_UTC': np.char.replace(utc_times, 'T', ' '),
+                    'Timestamp_Local': local_times,
+                    'Price_Cent_kWh': np.round(prices * UNITS['cent_kwh'][0], UNITS['cent_kwh'][1]),
+                    'Price_EUR_kWh': np.round(prices * UNITS['eur_kwh'][0], UNITS['eur_kwh'][1]),
+                    'Price_EUR_MWh': np.round(prices * UNITS['eur_mwh'][0], UNITS['eur_mwh'][1]),
+                    'Hour': [local_time[11:13] for local_time in local_times],
+                    'Quarter_Hour': [local_time[11:16] for local_time in local_times]
+                })
+                
+                stats.merge(RunningStats.from_array(prices))
+                first_local = first_local or local_times[0]
+                last_local = local_times[-1]
+        
+        elapsed = time.perf_counter() - started
+        summary = {
+            'export_date': datetime.now().isoformat(),
+            'tariff': self.tariff,
+            'from': start_day,
+            'to': end_day,
+            'slice_by': slice_by,
+            'data_points': stats.count,
+            'slices': slice_counts,
+            'time_range': {
+                'first_timestamp': first_local or 'N/A',
+                'last_timestamp': last_local or 'N/A'
+            },
+            'export_seconds': round(elapsed, 2),
+            'table_file': table_path
+        }
+        if stats.count:
+            summary['price_stats_cent_kwh'] = {
+                'min_price': round(stats.min, 3),
+                'max_price': round(stats.max, 3),
+                'avg_price': round(stats.mean, 3),
+                'std_dev': round(stats.stdev, 3)
+            }
+        
+        with open(json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        
+        print(f"   ✅ Exported {stats.count} price data points in {elapsed:.2f}s")
+        print(f"   {self.price_cache.report()}")
+        print(f"\n📁 EPEX price range exported to:")
+        print(f"   - {table_path} (all prices)")
+        print(f"   - {json_path} (summary)")
+        return summary
+    
+    def export_price_statistics(self, start_day: str, end_day: str, groupings: List[str] = GROUPINGS,
+                                tariffs: Optional[List[str]] = None, unit: str = 'cent_kwh',
+                                output_path: Optional[str] = None) -> Dict:
+        """
+        Price statistics for a UTC day range, grouped by local day/week/month/year
+        
+        Works on one NumPy price array per tariff (see price_stats.py); prices
+        are read through the price cache.
+        
+        Args:
+            start_day: First day (YYYY-MM-DD, UTC)
+            end_day: Last day, inclusive (YYYY-MM-DD, UTC)
+            groupings: Any of 'day', 'week', 'month', 'year'
+            tariffs: Tariffs to summarize (default: self.tariff)
+            unit: Unit of the grouped statistics ('cent_kwh', 'eur_kwh', 'eur_mwh')
+            output_path: Result JSON (default: epex_price_stats_<from>_<to>.json)
+            
+        Returns:
+            Dictionary with overall and grouped statistics per tariff
+        """
+        tariffs = tariffs or [self.tariff]
+        output_path = output_path or f"epex_price_stats_{start_day}_{end_day}.json"
+        
+        started = time.perf_counter()
+        results = {}
+        for tariff in tariffs:
+            curve = self.price_cache.get_range(tariff, start_day, end_day, remember=False)
+            if not len(curve['prices_cent_kwh']):
+                results[tariff] = {'error': 'No price data available'}
+                print(f"   ⚠️  {tariff}: no price data for {start_day} - {end_day}")
+                continue
+            
+            results[tariff] = {
+                'data_points': int(len(curve['prices_cent_kwh'])),
+                **price_statistics(curve['prices_cent_kwh']),
+                'unit': unit,
+                'groups': period_statistics(curve['timestamps_ms'], curve['prices_cent_kwh'],
+                                            groupings, unit, self.local_timezone)
+            }
+            stats = results[tariff]['price_stats_cent_kwh']
+            print(f"   ✅ {tariff}: {results[tariff]['data_points']} prices, avg {stats['avg_price']} cent/kWh "
+                  f"({stats['min_price']} - {stats['max_price']})")
+            for by, groups in results[tariff]['groups'].items():
+                print(f"      {by}: {len(groups)} group(s)")
+        elapsed = time.perf_counter() - started
+        
+        output = {
+            'export_date': datetime.now().isoformat(),
+            'from': start_day,
+            'to': end_day,
+            'timezone': self.local_timezone,
+            'groupings': list(groupings),
+            'tariffs': results,
+            'compute_seconds': round(elapsed, 3)
+        }
+        with open(output_path, 'w') as f:
+            json.dump(output, f, indent=2)
+        
+        print(f"   ⏱️  Statistics computed in {elapsed:.3f}s ({self.price_cache.report()})")
+        print(f"\n📁 EPEX price statistics exported to {output_path}")
+        return output
+    
+    def plan_capacity(self, start_day: str, end_day: str, tariffs: List[str] = None) -> 'CapacityEstimate':
+        """
+        Predict the read capacity of fetching a range of UTC days
+        
+        Only days the price cache would query are counted; each tariff's
+        uncached span is sampled with a few small queries.
+        
+        Args:
+            start_day: First UTC day (YYYY-MM-DD)
+            end_day: Last UTC day (YYYY-MM-DD)
+            tariffs: Tariffs to fetch (default: the exporter's tariff)
+            
+        Returns:
+            CapacityEstimate
+        """
+        first = datetime.strptime(start_day, '%Y-%m-%d').date()
+        last = datetime.strptime(end_day, '%Y-%m-%d').date()
+        planner = capacity_planner()
+        estimate = planner.CapacityEstimate(f"EPEX prices {start_day} to {end_day} from {self.table.name}")
+        for tariff in tariffs or [self.tariff]:
+            missing = self.price_cache.missing_days(tariff, first, last)
+            cached = (last - first).days + 1 - len(missing)
+            if cached:
+                estimate.notes.append(f"{tariff}: {cached} day(s) served from the price cache")
+            if not missing:
+                continue
+            span_start = self._utc_day_bounds(missing[0].isoformat())[0]
+            span_end = self._utc_day_bounds(missing[-1].isoformat())[1] - 1
+            part = planner.estimate_query(self.table, 'tariff', tariff, 'timestamp', span_start, span_end,
+                                          planner.MILLISECOND_KEYS, strata=min(4, len(missing)), limit=100)
+            # Cached days inside the sampled span are not read
+            share = len(missing) / ((missing[-1] - missing[0]).days + 1)
+            part.items *= share
+            part.read_units *= share
+            estimate.add(part)
+        return estimate
     
     def convert_timestamp_to_local(self, timestamp_ms: int) -> str:
-        """Convert Unix timestamp (ms) to local time string"""
-        dt_utc = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
-        dt_local = dt_utc + timedelta(hours=2)  # Convert UTC to CET/CEST
+        """Convert Unix timestamp (ms) to local time string (CET/CEST via zoneinfo)"""
+        dt_utc = datetime.fromtimestamp(int(timestamp_ms) / 1000, tz=timezone.utc)
+        dt_local = dt_utc.astimezone(ZoneInfo(self.local_timezone))
         return dt_local.strftime("%Y-%m-%d %H:%M:%S")
     
     def convert_price_units(self, price_cent_per_kwh: float) -> Dict[str, float]:
@@ -171,107 +441,94 @@ class EPEXDataExporter:
             'eur_per_mwh': round(price_cent_per_kwh * 10, 2)  # 1 MWh = 1000 kWh, so cent/kWh * 10 = EUR/MWh
         }
     
-    def analyze_price_data(self, price_data: List[Dict]) -> Dict:
-        """Analyze the price data and calculate statistics"""
+    def _price_arrays(self, price_data) -> Tuple[PriceBatch, np.ndarray, np.ndarray]:
+        """PriceBatch (converted from item dicts if needed) and its epoch-ms and price (cent/kWh) arrays"""
+        batch = price_data if isinstance(price_data, PriceBatch) else PriceBatch.from_items(price_data)
+        timestamps_ms = np.array(batch.timestamp, dtype=np.int64)
+        timestamps_ms[timestamps_ms == MISSING_INT] = 0
+        prices = np.nan_to_num(np.array(batch.price, dtype=np.float64), nan=0.0)
+        return batch, timestamps_ms, prices
+    
+    def analyze_price_data(self, price_data) -> Dict:
+        """Analyze the price data (PriceBatch or EPEXSpotPrices items) and calculate statistics"""
         
         if not price_data:
             return {'error': 'No price data available'}
         
-        # Extract prices (in Euro cent per kWh) and convert to different units
-        prices_cent_kwh = []
-        prices_eur_mwh = []
-        prices_eur_kwh = []
-        timestamps_local = []
+        # One price array (Euro cent per kWh); other units are derived by scaling
+        batch, timestamps_ms, prices = self._price_arrays(price_data)
+        timestamps_local = format_local(timestamps_ms, self.local_timezone)
         
-        for item in price_data:
-            price_cent_kwh = float(item.get('price', 0))  # Original format: Euro cent per kWh
-            timestamp_ms = item.get('timestamp', 0)
-            local_time = self.convert_timestamp_to_local(timestamp_ms)
-            
-            # Convert to different units
-            price_units = self.convert_price_units(price_cent_kwh)
-            
-            prices_cent_kwh.append(price_units['cent_per_kwh'])
-            prices_eur_kwh.append(price_units['eur_per_kwh'])
-            prices_eur_mwh.append(price_units['eur_per_mwh'])
-            timestamps_local.append(local_time)
-        
-        if not prices_cent_kwh:
+        if not prices.size:
             return {'error': 'No valid price data found'}
         
+        # Place prices on the regular delivery grid to detect missing slots
+        interval_minutes = batch.interval_minutes[0] if batch.interval_minutes[0] != MISSING_INT else 15
+        slot_grid, slot_prices = resample(timestamps_ms, prices, freq=interval_minutes * 60, how='last')
+        missing_slots = int(np.isnan(slot_prices).sum())
+        
         # Calculate statistics for different units
         analysis = {
-            'data_points': len(prices_cent_kwh),
-            'data_interval': '15 minutes',
-            'price_stats_cent_kwh': {
-                'min_price': round(min(prices_cent_kwh), 3),
-                'max_price': round(max(prices_cent_kwh), 3),
-                'avg_price': round(statistics.mean(prices_cent_kwh), 3),
-                'median_price': round(statistics.median(prices_cent_kwh), 3),
-                'std_dev': round(statistics.stdev(prices_cent_kwh) if len(prices_cent_kwh) > 1 else 0, 3)
-            },
-            'price_stats_eur_kwh': {
-                'min_price': round(min(prices_eur_kwh), 5),
-                'max_price': round(max(prices_eur_kwh), 5),
-                'avg_price': round(statistics.mean(prices_eur_kwh), 5),
-                'median_price': round(statistics.median(prices_eur_kwh), 5),
-                'std_dev': round(statistics.stdev(prices_eur_kwh) if len(prices_eur_kwh) > 1 else 0, 5)
-            },
-            'price_stats_eur_mwh': {
-                'min_price': round(min(prices_eur_mwh), 2),
-                'max_price': round(max(prices_eur_mwh), 2),
-                'avg_price': round(statistics.mean(prices_eur_mwh), 2),
-                'median_price': round(statistics.median(prices_eur_mwh), 2),
-                'std_dev': round(statistics.stdev(prices_eur_mwh) if len(prices_eur_mwh) > 1 else 0, 2)
-            },
-            'price_range': {
-                'variation_cent_kwh': round(max(prices_cent_kwh) - min(prices_cent_kwh), 3),
-                'variation_eur_mwh': round(max(prices_eur_mwh) - min(prices_eur_mwh), 2),
-                'variation_percent': round(((max(prices_cent_kwh) - min(prices_cent_kwh)) / statistics.mean(prices_cent_kwh)) * 100, 1) if statistics.mean(prices_cent_kwh) > 0 else 0
+            'data_points': int(prices.size),
+            'data_interval': f'{interval_minutes} minutes',
+            'grid': {
+                'interval_minutes': interval_minutes,
+                'expected_slots': len(slot_grid),
+                'missing_slots': missing_slots
             },
+            **price_statistics(prices),
             'time_range': {
                 'first_timestamp': timestamps_local[0] if timestamps_local else 'N/A',
                 'last_timestamp': timestamps_local[-1] if timestamps_local else 'N/A'
             },
             'raw_data': {
-                'prices_cent_kwh': prices_cent_kwh,
-                'prices_eur_kwh': prices_eur_kwh,
-                'prices_eur_mwh': prices_eur_mwh,
+                'prices_cent_kwh': np.round(prices * UNITS['cent_kwh'][0], UNITS['cent_kwh'][1]).tolist(),
+                'prices_eur_kwh': np.round(prices * UNITS['eur_kwh'][0], UNITS['eur_kwh'][1]).tolist(),
+                'prices_eur_mwh': np.round(prices * UNITS['eur_mwh'][0], UNITS['eur_mwh'][1]).tolist(),
                 'timestamps_local': timestamps_local,
-                'original_data': price_data
+                'original_data': batch.to_dicts()
             }
         }
         
         return analysis
     
-    def get_prices_for_test_periods(self, price_data: List[Dict]) -> Dict:
-        """Get price data for specific test periods"""
+    def get_prices_for_test_periods(self, price_data) -> Dict:
+        """
+        Get price data for specific test periods
+        
+        Timestamps are converted to local time once (zoneinfo, DST-aware) and
+        each period's local window is matched on every local day of the data by
+        binary search on the sorted timestamps (see interval_join.py).
+        """
         
         test_period_prices = {}
         
+        _, timestamps_ms, prices = self._price_arrays(price_data)
+        order = np.argsort(timestamps_ms, kind='stable')
+        timestamps_ms, prices = timestamps_ms[order], prices[order]
+        days = local_days(timestamps_ms, self.local_timezone)
+        
         for period_key, period_info in self.test_periods.items():
             print(f"\n📊 Analyzing prices for {period_info['name']}")
             print(f"   Local time: {period_info['local_start']} - {period_info['local_end']}")
             
-            # Find prices that fall within this test period (using local time)
-            period_prices = []
+            # Find prices that fall within this test period (window end inclusive)
+            window_starts, window_ends = local_window_bounds(
+                days, period_info['local_start'], period_info['local_end'], self.local_timezone)
+            lo, hi = match_windows(timestamps_ms, window_starts, window_ends)
+            matched = window_indices(lo, hi)
             
-            for item in price_data:
-                timestamp_ms = item.get('timestamp', 0)
-                local_time = self.convert_timestamp_to_local(timestamp_ms)
-                local_hour_min = local_time.split()[1][:5]  # Extract HH:MM
-                
-                # Check if this price falls within the test period
-                if period_info['local_start'] <= local_hour_min <= period_info['local_end']:
-                    price_cent_kwh = float(item.get('price', 0))
-                    price_units = self.convert_price_units(price_cent_kwh)
-                    
+            period_prices = []
+            if matched.size:
+                local_times = format_local(timestamps_ms[matched], self.local_timezone)
+                for index, local_time in zip(matched, local_times):
+                    price_units = self.convert_price_units(float(prices[index]))
                     period_prices.append({
                         'price_cent_kwh': price_units['cent_per_kwh'],
                         'price_eur_kwh': price_units['eur_per_kwh'], 
                         'price_eur_mwh': price_units['eur_per_mwh'],
                         'local_time': local_time,
-                        'timestamp_ms': timestamp_ms
+                        'timestamp_ms': int(timestamps_ms[index])
                     })
             
             if period_prices:
@@ -318,29 +575,22 @@ class EPEXDataExporter:
         with open('epex_price_analysis.json', 'w') as f:
             json.dump(export_data, f, indent=2, default=str)
         
-        # Export to CSV (15-minute prices)
-        if 'raw_data' in analysis:
-            df_data = []
-            for i, (price_cent, price_eur_kwh, price_eur_mwh, timestamp) in enumerate(zip(
-                analysis['raw_data']['prices_cent_kwh'],
-                analysis['raw_data']['prices_eur_kwh'],
-                analysis['raw_data']['prices_eur_mwh'],
-                analysis['raw_data']['timestamps_local']
-            )):
-                df_data.append({
-                    'Timestamp_Local': timestamp,
-                    'Price_Cent_kWh': price_cent,
-                    'Price_EUR_kWh': price_eur_kwh,
-                    'Price_EUR_MWh': price_eur_mwh,
-                    'Hour': timestamp.split()[1][:2],
-                    'Quarter_Hour': timestamp.split()[1][:5]
+        # Export 15-minute prices, streamed column-wise from the raw arrays
+        prices_path = None
+        if 'raw_data' in analysis and analysis['raw_data']['timestamps_local']:
+            raw = analysis['raw_data']
+            with open_table_writer('epex_prices_15min', PRICE_COLUMNS[1:], self.export_format) as writer:
+                writer.write_columns({
+                    'Timestamp_Local': raw['timestamps_local'],
+                    'Price_Cent_kWh': raw['prices_cent_kwh'],
+                    'Price_EUR_kWh': raw['prices_eur_kwh'],
+                    'Price_EUR_MWh': raw['prices_eur_mwh'],
+                    'Hour': [timestamp[11:13] for timestamp in raw['timestamps_local']],
+                    'Quarter_Hour': [timestamp[11:16] for timestamp in raw['timestamps_local']]
                 })
-            
-            if df_data:
-                df = pd.DataFrame(df_data)
-                df.to_csv('epex_prices_15min.csv', index=False)
+            prices_path = writer.path
         
-        # Export test period summary to CSV
+        # Export test period summary
         test_period_data = []
         for period_key, data in test_period_prices.items():
             if 'error' not in data:
@@ -355,20 +605,24 @@ class EPEXDataExporter:
                     'Min_Price_EUR_MWh': data['min_price_eur_mwh'],
                     'Max_Price_EUR_MWh': data['max_price_eur_mwh']
                 })
+        periods_path = write_table('epex_prices_test_periods', test_period_data, fmt=self.export_format)
         
-        if test_period_data:
-            df_periods = pd.DataFrame(test_period_data)
-            df_periods.to_csv('epex_prices_test_periods.csv', index=False)
-        
-        # Generate LaTeX summary
-        latex_output = self.generate_latex_summary(analysis, test_period_prices)
+        # Generate LaTeX summary from aggregates only
+        aggregates = {key: value for key, value in analysis.items() if key != 'raw_data'}
+        test_period_aggregates = {
+            key: {name: value for name, value in data.items() if name != 'price_data'}
+            for key, data in test_period_prices.items()
+        }
+        latex_output = self.generate_latex_summary(aggregates, test_period_aggregates)
         with open('epex_price_analysis_latex.txt', 'w') as f:
             f.write(latex_output)
         
         print(f"\n📁 EPEX price data exported to:")
         print(f"   - epex_price_analysis.json (complete data)")
-        print(f"   - epex_prices_15min.csv (15-minute interval prices)")
-        print(f"   - epex_prices_test_periods.csv (test period summary)")
+        if prices_path:
+            print(f"   - {prices_path} (15-minute interval prices)")
+        if periods_path:
+            print(f"   - {periods_path} (test period summary)")
         print(f"   - epex_price_analysis_latex.txt (LaTeX values)")
     
     def generate_latex_summary(self, analysis: Dict, test_period_prices: Dict) -> str:
@@ -472,6 +726,7 @@ class EPEXDataExporter:
         
         # Print summary
         self.print_summary(analysis, test_period_prices)
+        print(f"\n🗄️  {self.price_cache.report()}")
         
         return analysis, test_period_prices
     
@@ -520,18 +775,76 @@ class EPEXDataExporter:
 def main():
     """Main function to run the EPEX price analysis"""
     
+    parser = argparse.ArgumentParser(description='Export and analyze EPEX spot prices from DynamoDB')
+    parser.add_argument('--tariff', action='append',
+                        help='Tariff to export (repeatable for --stats; default: EPEXSPOTAT)')
+    parser.add_argument('--from', dest='start_day', help='Export a range starting at this UTC day (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end_day', help='Last UTC day of the range export (default: --from)')
+    parser.add_argument('--slice', choices=['day', 'month'], default='month',
+                        help='Size of the concurrently queried slices (default: month)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent slice queries (default: 8)')
+    parser.add_argument('--stats', nargs='+', choices=GROUPINGS, metavar='GROUPING',
+                        help='Instead of exporting rows, compute price statistics for the range '
+                             'grouped by day/week/month/year')
+    parser.add_argument('--unit', choices=list(UNITS), default='cent_kwh',
+                        help='Unit of the grouped statistics (default: cent_kwh)')
+    parser.add_argument('--format', dest='export_format', choices=list(FORMATS), default='csv',
+                        help='Format of the price tables (parquet and arrow need pyarrow)')
+    parser.add_argument('--plan', action='store_true',
+                        help='Only predict read units and time from small samples, then exit')
+    parser.add_argument('--check-plan', action='store_true',
+                        help='Predict read units first and compare them with the consumed capacity afterwards')
+    parser.add_argument('--plan-rate', type=float,
+                        help='Read rate (RCU/s) used to predict the time (default: the table cap)')
+    args = parser.parse_args()
+    tariffs = args.tariff or ['EPEXSPOTAT']
+    if len(tariffs) > 1 and not args.stats:
+        parser.error('more than one --tariff requires --stats')
+    
     # Initialize exporter
-    exporter = EPEXDataExporter()
+    exporter = EPEXDataExporter(tariff=tariffs[0], export_format=args.export_format)
+    
+    start_day = args.start_day or exporter.test_date
+    end_day = args.end_day or start_day
+    estimate = None
+    if args.plan or args.check_plan:
+        try:
+            estimate = exporter.plan_capacity(start_day, end_day, tariffs)
+        except (ClientError, ValueError) as e:
+            print(f"❌ Capacity planning failed: {e}")
+            return
+        plan_rate = args.plan_rate or capacity_planner().default_rates(exporter.table.name)[0]
+        print(estimate.report(plan_rate, table_name=exporter.table.name))
+        if args.plan:
+            return
+    started = time.perf_counter()
+    
+    if args.start_day:
+        try:
+            if args.stats:
+                exporter.export_price_statistics(args.start_day, end_day, args.stats, tariffs, args.unit)
+            else:
+                exporter.export_price_range(args.start_day, end_day,
+                                            slice_by=args.slice, max_workers=args.workers)
+        except (ClientError, ValueError) as e:
+            print(f"❌ Range export failed: {e}")
+        if estimate:
+            print(estimate.compare(exporter.price_cache.stats['read_units'],
+                                   actual_seconds=time.perf_counter() - started))
+        return
     
     try:
         # Run complete analysis
         analysis, test_period_prices = exporter.run_complete_analysis()
+        if estimate:
+            print(estimate.compare(exporter.price_cache.stats['read_units'],
+                                   actual_seconds=time.perf_counter() - started))
         
         print("\n🎉 EPEX price analysis completed successfully!")
         print("📁 Check the generated files for detailed results:")
         print("   - epex_price_analysis.json")
-        print("   - epex_prices_15min.csv")
-        print("   - epex_prices_test_periods.csv")
+        print(f"   - epex_prices_15min{FORMATS[args.export_format]}")
+        print(f"   - epex_prices_test_periods{FORMATS[args.export_format]}")
         print("   - epex_price_analysis_latex.txt")
         
     except Exception as e:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Timezone-Aware Interval Join
+============================
+
+Vectorized matching of time windows against sorted timestamp arrays, used by
+export_epex_data.py to find the prices inside each test period.
+
+- Epoch timestamps are converted to local wall-clock time once, with the real
+  zoneinfo UTC offsets (CET/CEST), so windows stay correct across DST changes
+- Local windows like '22:50' - '00:30' are turned into UTC epoch bounds per
+  local day; windows that cross midnight end on the following day
+- Windows are matched with np.searchsorted on the sorted timestamps, so
+  W windows against N prices cost O(W log N) instead of O(W x N)
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Tuple
+
+import numpy as np
+from zoneinfo import ZoneInfo
+
+LOCAL_TIMEZONE = 'Europe/Vienna'
+
+
+def _offset_seconds(epoch_s: float, zone: ZoneInfo) -> int:
+    moment = datetime.fromtimestamp(epoch_s, tz=timezone.utc)
+    return int(moment.astimezone(zone).utcoffset().total_seconds())
+
+
+def utc_offsets(epoch_ms: np.ndarray, tz: str = LOCAL_TIMEZONE) -> np.ndarray:
+    """
+    UTC offset in seconds for every timestamp
+
+    zoneinfo is only consulted once per UTC day, plus once per minute on the
+    (rare) days whose offset changes, instead of once per timestamp.
+
+    Args:
+        epoch_ms: Epoch milliseconds (any order)
+        tz: IANA timezone name
+
+    Returns:
+        Integer offsets (seconds) with the same shape as epoch_ms
+    """
+    zone = ZoneInfo(tz)
+    epoch_s = np.asarray(epoch_ms, dtype=np.int64) // 1000
+    if epoch_s.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    first_day = int(epoch_s.min()) // 86400
+    last_day = int(epoch_s.max()) // 86400
+    day_edges = np.arange(first_day, last_day + 2) * 86400
+    edge_offsets = np.array([_offset_seconds(edge, zone) for edge in day_edges], dtype=np.int64)
+
+    day_index = epoch_s // 86400 - first_day
+    offsets = edge_offsets[day_index]
+
+    # Days with a DST transition: resolve per minute
+    for day in np.flatnonzero(edge_offsets[:-1] != edge_offsets[1:]):
+        minute_edges = day_edges[day] + np.arange(1440) * 60
+        minute_offsets = np.array([_offset_seconds(edge, zone) for edge in minute_edges], dtype=np.int64)
+        in_day = day_index == day
+        offsets[in_day] = minute_offsets[(epoch_s[in_day] - day_edges[day]) // 60]
+
+    return offsets
+
+
+def to_local_datetime64(epoch_ms: np.ndarray, tz: str = LOCAL_TIMEZONE) -> np.ndarray:
+    """Local wall-clock times as datetime64[ms] (timezone-naive)"""
+    epoch_ms = np.asarray(epoch_ms, dtype=np.int64)
+    return (epoch_ms + utc_offsets(epoch_ms, tz) * 1000).astype('datetime64[ms]')
+
+
+def format_local(epoch_ms: np.ndarray, tz: str = LOCAL_TIMEZONE) -> List[str]:
+    """Local times as 'YYYY-MM-DD HH:MM:SS' strings"""
+    local = to_local_datetime64(epoch_ms, tz).astype('datetime64[s]')
+    return [text.replace('T', ' ') for text in np.datetime_as_string(local)]
+
+
+def local_days(epoch_ms: np.ndarray, tz: str = LOCAL_TIMEZONE) -> List[date]:
+    """All local calendar days touched by the timestamps, in order"""
+    if len(epoch_ms) == 0:
+        return []
+    local = to_local_datetime64(epoch_ms, tz).astype('datetime64[D]')
+    first, last = local.min().astype(date), local.max().astype(date)
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def local_window_bounds(days: Iterable[date], local_start: str, local_end: str,
+                        tz: str = LOCAL_TIMEZONE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    UTC bounds of a daily local wall-clock window
+
+    Args:
+        days: Local days on which the window starts
+        local_start: Window start 'HH:MM' (local time)
+        local_end: Window end 'HH:MM' (local time); if not after local_start
+                   the window ends on the following day
+        tz: IANA timezone name
+
+    Returns:
+        Tuple of (start_ms, end_ms) arrays, one entry per day
+    """
+    zone = ZoneInfo(tz)
+    start_time = time.fromisoformat(local_start)
+    end_time = time.fromisoformat(local_end)
+    crosses_midnight = end_time <= start_time
+
+    starts, ends = [], []
+    for day in days:
+        end_day = day + timedelta(days=1) if crosses_midnight else day
+        starts.append(datetime.combine(day, start_time, tzinfo=zone).timestamp() * 1000)
+        ends.append(datetime.combine(end_day, end_time, tzinfo=zone).timestamp() * 1000)
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def match_windows(timestamps_ms: np.ndarray, window_starts: np.ndarray, window_ends: np.ndarray,
+                  include_end: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index ranges of sorted timestamps inside each window
+
+    Args:
+        timestamps_ms: Sorted epoch milliseconds
+        window_starts: Window starts (epoch ms, inclusive)
+        window_ends: Window ends (epoch ms)
+        include_end: Whether a timestamp equal to the window end is inside
+
+    Returns:
+        Tuple of (lo, hi) arrays; window i covers timestamps_ms[lo[i]:hi[i]]
+    """
+    lo = np.searchsorted(timestamps_ms, window_starts, side='left')
+    hi = np.searchsorted(timestamps_ms, window_ends, side='right' if include_end else 'left')
+    return lo, np.maximum(hi, lo)
+
+
+def window_indices(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Concatenated indices lo[0]:hi[0], lo[1]:hi[1], ... without a Python loop"""
+    lengths = hi - lo
+    if lengths.sum() == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.repeat(lo - offsets, lengths) + np.arange(lengths.sum())
+
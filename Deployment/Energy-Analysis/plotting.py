@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Workload Plotting
+=================
+
+Headless plotting stage for evaluate_energy_data.py.
+
+- matplotlib is imported only when a figure is actually rendered, and always
+  with the non-interactive Agg backend
+- Series are downsampled before rendering, either with
+  Largest-Triangle-Three-Buckets (LTTB) or min/max per pixel column, so the
+  plot cost depends on the figure width instead of the number of readings
+- The per-workload figures are rendered in parallel worker processes
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_WIDTH_PX = 1200
+DEFAULT_HEIGHT_PX = 500
+DPI = 100
+
+
+def _load_pyplot():
+    """Import pyplot lazily under the Agg backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previously selected point and the average of
+    the next bucket. Peaks and steps of the power series survive.
+
+    Args:
+        x: Sorted x values (e.g. epoch seconds)
+        y: y values
+        n_out: Number of output points
+
+    Returns:
+        Tuple of downsampled (x, y)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return x[selected], y[selected]
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample to the minimum and maximum of each pixel column
+
+    Fully vectorized: every bucket contributes its min and max (in time order),
+    so a line plot at that width looks identical to the full-resolution one.
+    """
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    starts = np.linspace(0, n, n_buckets, endpoint=False).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(n_buckets), np.diff(np.append(starts, n)))
+
+    # Sort by (bucket, value) once to find min and max positions of each bucket
+    order = np.lexsort((y, bucket_ids))
+    ends = np.append(starts[1:], n) - 1
+    min_idx = order[starts]
+    max_idx = order[ends]
+
+    first = np.minimum(min_idx, max_idx)
+    second = np.maximum(min_idx, max_idx)
+    idx = np.column_stack((first, second)).ravel()
+    return x[idx], y[idx]
+
+
+def decimate(x: np.ndarray, y: np.ndarray, width_px: int = DEFAULT_WIDTH_PX,
+             method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a series for a figure that is width_px pixels wide"""
+    if method == 'minmax':
+        return minmax_decimate(x, y, width_px)
+    if method == 'lttb':
+        return lttb(x, y, 2 * width_px)
+    raise ValueError(f"Unknown decimation method: {method}")
+
+
+def _render_figure(job: Dict) -> str:
+    """Render one workload figure (runs in a worker process)"""
+    plt = _load_pyplot()
+
+    fig, ax = plt.subplots(figsize=(job['width_px'] / DPI, job['height_px'] / DPI), dpi=DPI)
+    ax.plot(job['timestamps'], job['power_values'], linewidth=0.8, color='tab:blue')
+    for start, end in job['windows']:
+        ax.axvspan(np.datetime64(start), np.datetime64(end), color='tab:orange', alpha=0.15)
+
+    ax.set_title(f"{job['name']} ({job['period_key']})")
+    ax.set_xlabel('Time (UTC)')
+    ax.set_ylabel('Power (W)')
+    ax.grid(True, alpha=0.3)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(job['path'])
+    plt.close(fig)
+    return job['path']
+
+
+def build_plot_job(period_key: str, results: Dict, output_dir: str, width_px: int = DEFAULT_WIDTH_PX,
+                   height_px: int = DEFAULT_HEIGHT_PX, method: str = 'lttb') -> Optional[Dict]:
+    """
+    Prepare a decimated plot job for one workload result
+
+    Returns None if the result carries no raw series (errors, streaming mode,
+    sidecar output).
+    """
+    raw_data = results.get('raw_data') or {}
+    if 'error' in results or not raw_data.get('power_values'):
+        return None
+
+    timestamps = np.array(raw_data['timestamps'], dtype='datetime64[us]')
+    power = np.asarray(raw_data['power_values'], dtype=np.float64)
+
+    # Workloads with separate active windows may be unsorted across cycles
+    order = np.argsort(timestamps, kind='stable')
+    timestamps, power = timestamps[order], power[order]
+
+    x, y = decimate(timestamps.astype(np.int64).astype(np.float64), power, width_px, method)
+
+    windows = [(c['start'], c['end']) for c in results.get('cycle_details', [])]
+    return {
+        'period_key': period_key,
+        'name': results.get('name', period_key),
+        'timestamps': x.astype(np.int64).astype('datetime64[us]'),
+        'power_values': y,
+        'windows': windows,
+        'width_px': width_px,
+        'height_px': height_px,
+        'path': os.path.join(output_dir, f"plot_{period_key}.png")
+    }
+
+
+def render_workload_plots(all_results: Dict, output_dir: str = 'plots', width_px: int = DEFAULT_WIDTH_PX,
+                          method: str = 'lttb', max_workers: Optional[int] = None) -> List[str]:
+    """
+    Render one decimated figure per workload in parallel
+
+    Args:
+        all_results: Workload results as produced by EnergyDataAnalyzer
+        output_dir: Directory for the PNG files
+        width_px: Figure width; the series is decimated to this resolution
+        method: 'lttb' or 'minmax'
+        max_workers: Number of worker processes (default: one per figure, capped by CPUs)
+
+    Returns:
+        List of written file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [job for job in (build_plot_job(key, results, output_dir, width_px, method=method)
+                            for key, results in all_results.items()) if job]
+    if not jobs:
+        return []
+
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    start = time.perf_counter()
+    if workers == 1:
+        paths = [_render_figure(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(_render_figure, jobs))
+    print(f"   🖼️  Rendered {len(paths)} figures in {time.perf_counter() - start:.2f}s ({workers} worker(s))")
+    return paths
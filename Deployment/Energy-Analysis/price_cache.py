@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+EPEX Price Cache
+================
+
+Read-through cache for EPEXSpotPrices, keyed by (tariff, UTC delivery day).
+This is the single access path for price curves: export_epex_data.py and
+energy_cost.py read prices only through PriceCache.
+
+- Finalized days (before today, UTC) never change once published, so they
+  are stored permanently as one small .npz file per day
+  (~/.cache/energyops/prices/<tariff>/<YYYY-MM-DD>.npz)
+- Only complete days are stored (slots covering all 1440 minutes, e.g. 96
+  slots of 15 minutes); empty or partial days (e.g. after a collector outage)
+  are revalidated like today, so a later backfill is picked up
+- Today and tomorrow (day-ahead prices) are always revalidated against DynamoDB
+- Consecutive missing days are fetched with one paginated query
+- Range exports pass remember=False so finalized days go to disk only and
+  do not accumulate in the in-process memory tier
+- Hits, misses and revalidations are counted for hit-rate reporting
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import boto3
+import numpy as np
+from boto3.dynamodb.conditions import Key
+
+from deployment_modules import MISSING_INT, PriceBatch
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'energyops', 'prices')
+
+DAY_MS = 86400 * 1000
+DAY_MINUTES = 1440
+
+
+def _day_start_ms(day: date) -> int:
+    return int(datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _is_complete(prices: Dict[str, np.ndarray]) -> bool:
+    """True if the day's slots cover all 1440 minutes (slot count == 1440 / interval_minutes)"""
+    intervals = prices['interval_minutes']
+    return len(intervals) > 0 and int(intervals.sum(dtype=np.int64)) == DAY_MINUTES
+
+
+def _empty_day() -> Dict[str, np.ndarray]:
+    return {
+        'timestamps_ms': np.zeros(0, dtype=np.int64),
+        'prices_cent_kwh': np.zeros(0, dtype=np.float64),
+        'interval_minutes': np.zeros(0, dtype=np.int16)
+    }
+
+
+class PriceCache:
+    """Read-through (tariff, day) cache in front of the EPEXSpotPrices table"""
+
+    def __init__(self, table_name: str = 'EPEXSpotPrices', cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 dynamodb=None):
+        """
+        Initialize the price cache
+
+        Args:
+            table_name: Name of the EPEX price table
+            cache_dir: Directory of the permanent day files (None: memory only)
+            dynamodb: Optional boto3 DynamoDB resource (used by the calling thread;
+                      worker threads open their own session)
+        """
+        self.table_name = table_name
+        self.cache_dir = cache_dir
+        self._owner_thread = threading.get_ident()
+        self._owner_table = (dynamodb or boto3.resource('dynamodb')).Table(table_name)
+        self._thread_local = threading.local()
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'file_hits': 0, 'misses': 0, 'revalidations': 0, 'queries': 0,
+                      'read_units': 0.0}
+
+    def _table(self):
+        """Table handle for the calling thread (boto3 resources are not thread-safe)"""
+        if threading.get_ident() == self._owner_thread:
+            return self._owner_table
+        if not hasattr(self._thread_local, 'table'):
+            self._thread_local.table = boto3.session.Session().resource('dynamodb').Table(self.table_name)
+        return self._thread_local.table
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _day_path(self, tariff: str, day: date) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, tariff, f"{day.isoformat()}.npz")
+
+    def _read_file(self, tariff: str, day: date) -> Optional[Dict[str, np.ndarray]]:
+        path = self._day_path(tariff, day)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable price cache file {path}: {e}")
+            return None
+
+    def _write_file(self, tariff: str, day: date, prices: Dict[str, np.ndarray]) -> None:
+        path = self._day_path(tariff, day)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp.npz"
+            np.savez(temporary, **prices)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Could not write price cache file {path}: {e}")
+
+    def _query_days(self, tariff: str, first: date, last: date) -> Dict[date, Dict[str, np.ndarray]]:
+        """Fetch [first, last] with one paginated query and split the result by UTC day"""
+        query_kwargs = {
+            'KeyConditionExpression': Key('tariff').eq(tariff) &
+                                      Key('timestamp').between(_day_start_ms(first),
+                                                               _day_start_ms(last) + DAY_MS - 1),
+            'ProjectionExpression': '#ts, price, interval_minutes',
+            'ExpressionAttributeNames': {'#ts': 'timestamp'},
+            'ScanIndexForward': True,
+            'ReturnConsumedCapacity': 'TOTAL'
+        }
+        batch = PriceBatch()
+        table = self._table()
+        while True:
+            response = table.query(**query_kwargs)
+            self._count('queries')
+            self._count('read_units', float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)))
+            batch.extend_items(response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        timestamps = np.array(batch.timestamp, dtype=np.int64)
+        prices = np.nan_to_num(np.array(batch.price, dtype=np.float64), nan=0.0)
+        intervals = np.array(batch.interval_minutes, dtype=np.int64)
+        intervals = np.where(intervals == MISSING_INT, 15, intervals).astype(np.int16)
+
+        days = {}
+        bounds = _day_start_ms(first) + np.arange((last - first).days + 2) * DAY_MS
+        cuts = np.searchsorted(timestamps, bounds)
+        for i in range(len(bounds) - 1):
+            days[first + timedelta(days=i)] = {
+                'timestamps_ms': timestamps[cuts[i]:cuts[i + 1]],
+                'prices_cent_kwh': prices[cuts[i]:cuts[i + 1]],
+                'interval_minutes': intervals[cuts[i]:cuts[i + 1]]
+            }
+        return days
+
+    def missing_days(self, tariff: str, first: date, last: date) -> List[date]:
+        """Days in [first, last] that get_days would query from DynamoDB (no statistics are counted)"""
+        today = datetime.now(timezone.utc).date()
+        missing = []
+        day = first
+        while day <= last:
+            if day >= today or ((tariff, day) not in self._memory and
+                                not (self._day_path(tariff, day) and os.path.exists(self._day_path(tariff, day)))):
+                missing.append(day)
+            day += timedelta(days=1)
+        return missing
+
+    def get_days(self, tariff: str, first: date, last: date,
+                 remember: bool = True) -> Dict[date, Dict[str, np.ndarray]]:
+        """
+        Prices of every UTC day in [first, last], each as a dict of arrays
+
+        Args:
+            tariff: Tariff partition key
+            first: First UTC day
+            last: Last UTC day, inclusive
+            remember: Keep file hits and fetched days in the memory tier
+                      (False for one-pass range exports)
+
+        Returns:
+            Dict day -> {'timestamps_ms', 'prices_cent_kwh', 'interval_minutes'}
+        """
+        today = datetime.now(timezone.utc).date()
+        result = {}
+        missing = []
+
+        day = first
+        while day <= last:
+            if day >= today:
+                # Today/tomorrow may still change: always revalidate
+                self._count('revalidations')
+                missing.append(day)
+            elif (tariff, day) in self._memory:
+                self._count('memory_hits')
+                result[day] = self._memory[(tariff, day)]
+            else:
+                cached = self._read_file(tariff, day)
+                if cached is not None:
+                    self._count('file_hits')
+                    if remember:
+                        with self._lock:
+                            self._memory[(tariff, day)] = cached
+                    result[day] = cached
+                else:
+                    self._count('misses')
+                    missing.append(day)
+            day += timedelta(days=1)
+
+        # Fetch runs of consecutive missing days with one query each
+        runs = []
+        for day in missing:
+            if runs and (day - runs[-1][1]).days == 1:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        for run_first, run_last in runs:
+            for day, prices in self._query_days(tariff, run_first, run_last).items():
+                result[day] = prices
+                if day < today and _is_complete(prices):
+                    if remember:
+                        with self._lock:
+                            self._memory[(tariff, day)] = prices
+                    self._write_file(tariff, day, prices)
+
+        return dict(sorted(result.items()))
+
+    def get_range(self, tariff: str, start_day: str, end_day: str,
+                  remember: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Concatenated price curve for an inclusive range of UTC days (YYYY-MM-DD)
+
+        remember=False leaves the memory tier untouched (see get_days).
+
+        Returns:
+            Dict of sorted arrays: 'timestamps_ms', 'prices_cent_kwh', 'interval_minutes'
+        """
+        first = datetime.strptime(start_day, '%Y-%m-%d').date()
+        last = datetime.strptime(end_day, '%Y-%m-%d').date()
+        if last < first:
+            raise ValueError("End day must not be before start day")
+        days = list(self.get_days(tariff, first, last, remember).values()) or [_empty_day()]
+        return {name: np.concatenate([day[name] for day in days]) for name in days[0]}
+
+    def get_batch(self, tariff: str, start_day: str, end_day: Optional[str] = None) -> PriceBatch:
+        """Price curve as a PriceBatch (tariff, timestamp, price and interval_minutes columns)"""
+        curve = self.get_range(tariff, start_day, end_day or start_day)
+        return PriceBatch.from_columns(tariff=tariff, timestamp=curve['timestamps_ms'],
+                                       price=curve['prices_cent_kwh'], interval_minutes=curve['interval_minutes'])
+
+    def hit_rate(self) -> float:
+        """Share of day lookups served from memory or file (revalidations count as lookups)"""
+        hits = self.stats['memory_hits'] + self.stats['file_hits']
+        lookups = hits + self.stats['misses'] + self.stats['revalidations']
+        return hits / lookups if lookups else 0.0
+
+    def report(self) -> str:
+        """One-line cache summary"""
+        s = self.stats
+        return (f"Price cache: {self.hit_rate() * 100:.1f}% hit rate "
+                f"({s['memory_hits']} memory, {s['file_hits']} file, {s['misses']} miss, "
+                f"{s['revalidations']} revalidated day(s); {s['queries']} DynamoDB page(s), "
+                f"{s['read_units']:.1f} RCU)")
+
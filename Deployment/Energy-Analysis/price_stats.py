@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Vectorized Price Statistics
+===========================
+
+Price statistics for export_epex_data.py computed on a single NumPy array of
+prices in Euro cent per kWh. Statistics in EUR/kWh and EUR/MWh are derived by
+scaling the cent/kWh results, since every statistic used here (min, max,
+mean, median, standard deviation, range) is linear in the unit.
+
+Group-bys (local day, ISO week, month, year) are computed in one pass per
+grouping: the group key of every price comes from one datetime64 array, and
+count/sum/min/max/std/median come from reduceat over the group boundaries.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+from interval_join import LOCAL_TIMEZONE, to_local_datetime64
+
+# Scale factor from cent/kWh and rounding used by convert_price_units
+UNITS = {
+    'cent_kwh': (1.0, 3),
+    'eur_kwh': (0.01, 5),
+    'eur_mwh': (10.0, 2)
+}
+
+GROUPINGS = ('day', 'week', 'month', 'year')
+
+
+def describe(prices_cent_kwh: np.ndarray) -> Dict[str, float]:
+    """Unrounded min/max/mean/median/sample std of a price array (cent/kWh)"""
+    prices = np.asarray(prices_cent_kwh, dtype=np.float64)
+    return {
+        'min_price': float(prices.min()),
+        'max_price': float(prices.max()),
+        'avg_price': float(prices.mean()),
+        'median_price': float(np.median(prices)),
+        'std_dev': float(prices.std(ddof=1)) if prices.size > 1 else 0.0
+    }
+
+
+def scale_stats(stats: Dict[str, float], unit: str) -> Dict[str, float]:
+    """Convert cent/kWh statistics to another unit and round like convert_price_units"""
+    factor, decimals = UNITS[unit]
+    return {name: round(value * factor, decimals) for name, value in stats.items()}
+
+
+def price_statistics(prices_cent_kwh: np.ndarray) -> Dict[str, Dict]:
+    """
+    Statistics in all units plus the price range, as used by analyze_price_data
+
+    Returns:
+        Dict with price_stats_cent_kwh, price_stats_eur_kwh, price_stats_eur_mwh, price_range
+    """
+    stats = describe(prices_cent_kwh)
+    variation = stats['max_price'] - stats['min_price']
+    return {
+        'price_stats_cent_kwh': scale_stats(stats, 'cent_kwh'),
+        'price_stats_eur_kwh': scale_stats(stats, 'eur_kwh'),
+        'price_stats_eur_mwh': scale_stats(stats, 'eur_mwh'),
+        'price_range': {
+            'variation_cent_kwh': round(variation, 3),
+            'variation_eur_mwh': round(variation * 10, 2),
+            'variation_percent': round(variation / stats['avg_price'] * 100, 1) if stats['avg_price'] > 0 else 0
+        }
+    }
+
+
+def group_keys(local_times: np.ndarray, by: str) -> np.ndarray:
+    """
+    Group key (datetime64) of every local time
+
+    'day' -> local day, 'week' -> Monday of the ISO week, 'month' -> month, 'year' -> year
+    """
+    days = local_times.astype('datetime64[D]')
+    if by == 'day':
+        return days
+    if by == 'week':
+        # 1970-01-01 was a Thursday: shift so that weeks start on Monday
+        weekday = (days.astype(np.int64) + 3) % 7
+        return days - weekday.astype('timedelta64[D]')
+    if by == 'month':
+        return local_times.astype('datetime64[M]')
+    if by == 'year':
+        return local_times.astype('datetime64[Y]')
+    raise ValueError(f"Unknown grouping '{by}', expected one of {GROUPINGS}")
+
+
+def grouped_statistics(keys: np.ndarray, prices_cent_kwh: np.ndarray) -> Dict[str, Dict]:
+    """
+    Per-group statistics in cent/kWh for prices sorted by key
+
+    Args:
+        keys: Non-decreasing group keys (one per price)
+        prices_cent_kwh: Prices in the same order
+
+    Returns:
+        Dict of group label -> {'data_points', 'min_price', 'max_price', 'avg_price', 'median_price', 'std_dev'}
+    """
+    prices = np.asarray(prices_cent_kwh, dtype=np.float64)
+    if prices.size == 0:
+        return {}
+    boundaries = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(boundaries, prices.size))
+
+    sums = np.add.reduceat(prices, boundaries)
+    means = sums / counts
+    deviations = prices - np.repeat(means, counts)
+    squares = np.add.reduceat(deviations * deviations, boundaries)
+    std = np.sqrt(np.divide(squares, counts - 1, out=np.zeros(len(counts)), where=counts > 1))
+
+    # Median: sort prices within each group, then read the middle element(s)
+    group_ids = np.repeat(np.arange(len(counts)), counts)
+    ordered = prices[np.lexsort((prices, group_ids))]
+    lower = boundaries + (counts - 1) // 2
+    upper = boundaries + counts // 2
+    medians = (ordered[lower] + ordered[upper]) / 2
+
+    minimum = np.minimum.reduceat(prices, boundaries)
+    maximum = np.maximum.reduceat(prices, boundaries)
+
+    labels = np.datetime_as_string(keys[boundaries])
+    return {
+        str(label): {
+            'data_points': int(counts[i]),
+            'min_price': float(minimum[i]),
+            'max_price': float(maximum[i]),
+            'avg_price': float(means[i]),
+            'median_price': float(medians[i]),
+            'std_dev': float(std[i])
+        }
+        for i, label in enumerate(labels)
+    }
+
+
+def period_statistics(timestamps_ms: np.ndarray, prices_cent_kwh: np.ndarray,
+                      groupings: Iterable[str] = GROUPINGS, unit: str = 'cent_kwh',
+                      tz: str = LOCAL_TIMEZONE) -> Dict[str, Dict]:
+    """
+    Day/week/month/year statistics of a price curve
+
+    Local times are computed once and shared by all groupings.
+
+    Args:
+        timestamps_ms: Sorted delivery interval starts (epoch milliseconds)
+        prices_cent_kwh: Prices in Euro cent per kWh
+        groupings: Any of 'day', 'week', 'month', 'year'
+        unit: Output unit ('cent_kwh', 'eur_kwh', 'eur_mwh')
+        tz: Timezone defining the calendar periods
+
+    Returns:
+        Dict grouping -> {group label -> rounded statistics}
+    """
+    local_times = to_local_datetime64(timestamps_ms, tz)
+    result = {}
+    for by in groupings:
+        groups = grouped_statistics(group_keys(local_times, by), prices_cent_kwh)
+        result[by] = {
+            label: dict(scale_stats({k: v for k, v in stats.items() if k != 'data_points'}, unit),
+                        data_points=stats['data_points'])
+            for label, stats in groups.items()
+        }
+    return result
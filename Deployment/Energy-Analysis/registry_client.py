@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Device Registry Client
+======================
+
+Reads the DeviceRegistry table maintained by the Lambda functions
+(see Deployment/Lambda/device_registry.py). Listing the devices of a data
+table is a single Query on one small partition instead of a table scan.
+
+Results are cached client-side with a TTL, both in memory and in a small
+local JSON file, so repeated script runs do not re-read the registry.
+
+The Lambdas only register keys they ingest; devices that only have
+historical data are added by Scripts/backfillRegistry.py.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'energyops', 'device_registry.json')
+
+
+def covers_day(entry: Dict, day: str) -> bool:
+    """True if a registry entry's first_seen/last_seen span includes the UTC day (YYYY-MM-DD)"""
+    first_seen, last_seen = entry.get('first_seen'), entry.get('last_seen')
+    return bool(first_seen and last_seen) and first_seen[:10] <= day <= last_seen[:10]
+
+
+class DeviceRegistryClient:
+    """Read device/tariff registry entries with a client-side TTL cache"""
+
+    def __init__(self, table_name: str = 'DeviceRegistry', ttl_seconds: int = 300,
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH, dynamodb=None):
+        """
+        Initialize the registry client
+
+        Args:
+            table_name: Name of the registry table
+            ttl_seconds: How long cached registry reads stay valid
+            cache_path: Local cache file (None disables the file cache)
+            dynamodb: Optional boto3 DynamoDB resource to reuse
+        """
+        self.dynamodb = dynamodb or boto3.resource('dynamodb')
+        self.table = self.dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+        self.cache_path = cache_path
+        self._memory_cache = {}
+
+    def _read_file_cache(self) -> Dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_file_cache(self, source: str, entries: List[Dict]) -> None:
+        if not self.cache_path:
+            return
+        cache = self._read_file_cache()
+        cache[source] = {'fetched_at': time.time(), 'entries': entries}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"Could not write registry cache: {e}")
+
+    def _fresh(self, cached: Optional[Dict]) -> bool:
+        return bool(cached) and time.time() - cached['fetched_at'] < self.ttl_seconds
+
+    def list_keys(self, source: str, refresh: bool = False) -> List[Dict]:
+        """
+        List registry entries for a data table, most recently seen first
+
+        Args:
+            source: Name of the data table (e.g. 'SensorData', 'EPEXSpotPrices')
+            refresh: Bypass the TTL cache
+
+        Returns:
+            List of dicts with key_id, first_seen and last_seen
+        """
+        if not refresh:
+            cached = self._memory_cache.get(source)
+            if not self._fresh(cached):
+                cached = self._read_file_cache().get(source)
+            if self._fresh(cached):
+                self._memory_cache[source] = cached
+                return cached['entries']
+
+        entries = []
+        query_kwargs = {'KeyConditionExpression': Key('source').eq(source)}
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response['Items']:
+                entries.append({
+                    'key_id': item['key_id'],
+                    'first_seen': item.get('first_seen'),
+                    'last_seen': item.get('last_seen')
+                })
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        entries.sort(key=lambda entry: entry['last_seen'] or '', reverse=True)
+
+        cached = {'fetched_at': time.time(), 'entries': entries}
+        self._memory_cache[source] = cached
+        self._write_file_cache(source, entries)
+        return entries
+
+    def try_list_keys(self, source: str) -> List[Dict]:
+        """Like list_keys, but returns [] if the registry is missing or unreadable"""
+        try:
+            return self.list_keys(source)
+        except ClientError as e:
+            print(f"Device registry unavailable ({e.response['Error']['Code']}), falling back to scan")
+            return []
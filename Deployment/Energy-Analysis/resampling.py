@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Regular-Grid Resampling
+=======================
+
+Vectorized resampler shared by evaluate_energy_data.py and export_epex_data.py.
+Turns irregular series (Tasmota samples, energyLIVE readings) into regular
+1 s / 1 min / 15 min grids aligned to UTC epoch boundaries, so every grid
+slot of '15min' coincides with an EPEX quarter-hour delivery slot.
+
+Aggregations:
+- mean:           plain mean of the samples inside a slot
+- time_weighted:  mean of the sample-and-hold signal over the slot (each
+                  sample holds until the next one, at most max_hold seconds)
+- last:           last sample inside a slot
+- counter_delta:  increase of a cumulative counter (e.g. total_energy) inside
+                  a slot; a decreasing counter is treated as a reset
+
+Gap policies for slots without data: 'nan', 'zero', 'ffill', 'interpolate'.
+
+All operations are O(n + slots) NumPy array operations (bincount,
+searchsorted, cumulative sums); there are no per-slot Python loops.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+FREQUENCIES = {
+    '1s': 1,
+    '1min': 60,
+    '15min': 900,
+    '1h': 3600
+}
+
+AGGREGATIONS = ('mean', 'time_weighted', 'last', 'counter_delta')
+GAP_POLICIES = ('nan', 'zero', 'ffill', 'interpolate')
+
+
+def to_epoch_seconds(timestamps) -> np.ndarray:
+    """
+    Convert timestamps to float epoch seconds
+
+    Accepts ISO strings (SensorData sort keys), datetime64 values, epoch
+    seconds or epoch milliseconds (EPEX/energyLIVE 'timestamp' numbers).
+    """
+    values = np.asarray(timestamps)
+    is_numeric = values.dtype.kind in 'fiu' or (
+        values.dtype == object and values.size > 0 and not isinstance(values.flat[0], str))
+    if is_numeric:
+        numbers = values.astype(np.float64)
+        # Epoch milliseconds are > 1e11 for any date after 1973
+        if numbers.size and np.nanmax(np.abs(numbers)) > 1e11:
+            numbers = numbers / 1000.0
+        return numbers
+    return values.astype('datetime64[us]').astype(np.int64) / 1e6
+
+
+def _step_seconds(freq: Union[str, int, float]) -> float:
+    if isinstance(freq, str):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency '{freq}', expected one of {list(FREQUENCIES)}")
+        return float(FREQUENCIES[freq])
+    if freq <= 0:
+        raise ValueError("Frequency must be positive")
+    return float(freq)
+
+
+def make_grid(start: float, end: float, step: float) -> np.ndarray:
+    """Slot start times (epoch seconds) covering [start, end), aligned to multiples of step"""
+    first = np.floor(start / step) * step
+    count = max(int(np.ceil((end - first) / step)), 1)
+    return first + np.arange(count) * step
+
+
+def _fill_gaps(values: np.ndarray, empty: np.ndarray, gap_policy: str, limit: Optional[int]) -> np.ndarray:
+    if gap_policy == 'nan' or not empty.any():
+        values[empty] = np.nan
+        return values
+    if gap_policy == 'zero':
+        values[empty] = 0.0
+        return values
+
+    filled = np.flatnonzero(~empty)
+    if filled.size == 0:
+        values[:] = np.nan
+        return values
+
+    positions = np.arange(len(values))
+    if gap_policy == 'ffill':
+        source = np.maximum.accumulate(np.where(~empty, positions, -1))
+        valid = source >= 0
+        if limit is not None:
+            valid &= (positions - source) <= limit
+        result = np.full(len(values), np.nan)
+        result[valid] = values[source[valid]]
+        return result
+    if gap_policy == 'interpolate':
+        result = np.interp(positions, filled, values[filled])
+        # Do not extrapolate beyond the first/last slot with data
+        result[:filled[0]] = np.nan
+        result[filled[-1] + 1:] = np.nan
+        return result
+    raise ValueError(f"Unknown gap policy '{gap_policy}', expected one of {GAP_POLICIES}")
+
+
+def resample(timestamps, values, freq: Union[str, int, float] = '15min', how: str = 'mean',
+             gap_policy: str = 'nan', start=None, end=None, max_hold: Optional[float] = None,
+             fill_limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resample an irregular series onto a regular UTC-aligned grid
+
+    Args:
+        timestamps: Sample times (ISO strings, datetime64, epoch s or ms), sorted ascending
+        values: Sample values
+        freq: '1s', '1min', '15min', '1h' or a step in seconds
+        how: One of 'mean', 'time_weighted', 'last', 'counter_delta'
+        gap_policy: One of 'nan', 'zero', 'ffill', 'interpolate' for slots without data
+        start: Grid start (same formats as timestamps; default: first sample)
+        end: Grid end, exclusive (default: just after the last sample)
+        max_hold: time_weighted only: longest time a sample is held (default: 3 x median interval)
+        fill_limit: ffill only: maximum number of consecutive slots to fill
+
+    Returns:
+        Tuple of (slot start times in epoch seconds, resampled values)
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}', expected one of {AGGREGATIONS}")
+
+    step = _step_seconds(freq)
+    t = to_epoch_seconds(timestamps)
+    v = np.asarray(values, dtype=np.float64)
+    if t.shape != v.shape:
+        raise ValueError("timestamps and values must have the same length")
+
+    grid_start = float(to_epoch_seconds([start])[0]) if start is not None else (t[0] if t.size else 0.0)
+    grid_end = float(to_epoch_seconds([end])[0]) if end is not None else (t[-1] + step if t.size else step)
+    grid = make_grid(grid_start, grid_end, step)
+    slots = len(grid)
+
+    if t.size == 0:
+        return grid, _fill_gaps(np.zeros(slots), np.ones(slots, dtype=bool), gap_policy, fill_limit)
+
+    slot_index = np.floor((t - grid[0]) / step).astype(np.int64)
+    inside = (slot_index >= 0) & (slot_index < slots)
+
+    if how == 'mean':
+        idx = slot_index[inside]
+        counts = np.bincount(idx, minlength=slots)
+        sums = np.bincount(idx, weights=v[inside], minlength=slots)
+        empty = counts == 0
+        result = np.divide(sums, counts, out=np.zeros(slots), where=~empty)
+
+    elif how == 'last':
+        idx = slot_index[inside]
+        vals = v[inside]
+        result = np.zeros(slots)
+        empty = np.ones(slots, dtype=bool)
+        if idx.size:
+            # Samples are sorted, so the last sample of a slot is where the slot index changes
+            last = np.flatnonzero(np.diff(idx, append=idx[-1] + 1))
+            result[idx[last]] = vals[last]
+            empty[idx[last]] = False
+
+    elif how == 'counter_delta':
+        increments = np.diff(v)
+        resets = increments < 0
+        increments[resets] = v[1:][resets]  # Counter restarted from zero
+        idx = slot_index[1:]
+        keep = inside[1:]
+        counts = np.bincount(idx[keep], minlength=slots)
+        result = np.bincount(idx[keep], weights=increments[keep], minlength=slots)
+        empty = counts == 0
+
+    else:  # time_weighted
+        if max_hold is None:
+            max_hold = 3 * float(np.median(np.diff(t))) if t.size > 1 else step
+        hold = np.minimum(np.diff(t, append=t[-1] + max_hold), max_hold)
+
+        # Cumulative integral of the held signal and of the held time at every sample
+        value_integral = np.concatenate(([0.0], np.cumsum(v * hold)))
+        time_integral = np.concatenate(([0.0], np.cumsum(hold)))
+
+        def integrate(points):
+            i = np.searchsorted(t, points, side='right') - 1
+            before = i < 0
+            i = np.clip(i, 0, None)
+            elapsed = np.clip(np.minimum(points - t[i], hold[i]), 0, None)
+            f_value = np.where(before, 0.0, value_integral[i] + v[i] * elapsed)
+            f_time = np.where(before, 0.0, time_integral[i] + elapsed)
+            return f_value, f_time
+
+        edges = np.append(grid, grid[-1] + step)
+        f_value, f_time = integrate(edges)
+        covered = np.diff(f_time)
+        empty = covered <= 1e-9
+        result = np.divide(np.diff(f_value), covered, out=np.zeros(slots), where=~empty)
+
+    return grid, _fill_gaps(result, empty, gap_policy, fill_limit)
+
+
+def grid_to_iso(grid: np.ndarray) -> np.ndarray:
+    """Format slot start times (epoch seconds) as UTC ISO strings"""
+    return np.datetime_as_string(np.round(grid).astype(np.int64).astype('datetime64[s]'))
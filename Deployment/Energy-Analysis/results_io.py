@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Analysis Results I/O
+====================
+
+Writes energy_analysis_results.json with the raw power series moved into a
+NumPy sidecar directory (one uncompressed .npy file per array) and reopens
+such results lazily.
+
+The JSON summary keeps every aggregate. Each workload's 'raw_data' entry is
+replaced by a reference to the sidecar directory and the array keys inside
+it. Cycle details keep a [start, stop) slice into the workload series instead
+of their own copy of the power values.
+
+The .npy files are opened with np.load(mmap_mode='r'): a series is memory
+mapped, so reading one cycle only pages in that slice. Members of an .npz
+archive cannot be memory mapped (np.load ignores mmap_mode for archives and
+reads a whole member on access), which is why the sidecar is not one file.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+SIDECAR_FORMAT = 'npy'
+
+
+def _series_keys(period_key: str) -> Tuple[str, str]:
+    return f"{period_key}__timestamps", f"{period_key}__power_values"
+
+
+def timestamps_to_array(timestamps) -> np.ndarray:
+    """Convert ISO timestamp strings (SensorData sort keys) to datetime64[us]"""
+    return np.array(timestamps, dtype='datetime64[us]')
+
+
+def write_results_with_sidecar(json_output: Dict, json_path: str = 'energy_analysis_results.json',
+                               sidecar_path: Optional[str] = None) -> str:
+    """
+    Write the analysis JSON with raw series stored in a .npy sidecar directory
+
+    Args:
+        json_output: Complete results document (as built by export_results_to_files)
+        json_path: Path of the slim JSON summary
+        sidecar_path: Path of the sidecar directory (default: <json_path stem>_raw)
+
+    Returns:
+        Path of the sidecar directory
+    """
+    if sidecar_path is None:
+        sidecar_path = os.path.splitext(json_path)[0] + '_raw'
+
+    arrays = {}
+    slim_results = {}
+
+    for period_key, results in json_output.get('workload_results', {}).items():
+        results = dict(results)
+        raw_data = results.pop('raw_data', None)
+
+        if raw_data:
+            ts_key, power_key = _series_keys(period_key)
+            arrays[ts_key] = timestamps_to_array(raw_data['timestamps'])
+            arrays[power_key] = np.asarray(raw_data['power_values'], dtype=np.float64)
+            results['raw_data'] = {
+                'format': SIDECAR_FORMAT,
+                'sidecar': os.path.basename(sidecar_path),
+                'timestamps_key': ts_key,
+                'power_values_key': power_key,
+                'data_points': len(raw_data['power_values'])
+            }
+
+        # Cycle power values are a consecutive slice of the workload series
+        if raw_data and 'cycle_details' in results:
+            offset = 0
+            cycles = []
+            for cycle in results['cycle_details']:
+                cycle = dict(cycle)
+                values = cycle.pop('power_values', None)
+                count = len(values) if values is not None else cycle.get('data_points', 0)
+                cycle['raw_slice'] = [offset, offset + count]
+                offset += count
+                cycles.append(cycle)
+            results['cycle_details'] = cycles
+
+        slim_results[period_key] = results
+
+    slim_output = dict(json_output)
+    slim_output['workload_results'] = slim_results
+
+    os.makedirs(sidecar_path, exist_ok=True)
+    for key, values in arrays.items():
+        np.save(os.path.join(sidecar_path, f"{key}.npy"), values, allow_pickle=False)
+    with open(json_path, 'w') as f:
+        json.dump(slim_output, f, indent=2, default=str)
+
+    return sidecar_path
+
+
+def aggregates_only(workload_results: Dict) -> Dict:
+    """
+    Shallow copies of the workload results without raw series
+
+    Drops 'raw_data' and per-cycle 'power_values' so summary, CSV and LaTeX
+    generators only ever see aggregates.
+    """
+    aggregates = {}
+    for period_key, results in workload_results.items():
+        results = {key: value for key, value in results.items() if key != 'raw_data'}
+        if 'cycle_details' in results:
+            results['cycle_details'] = [
+                {key: value for key, value in cycle.items() if key != 'power_values'}
+                for cycle in results['cycle_details']
+            ]
+        aggregates[period_key] = results
+    return aggregates
+
+
+class AnalysisResults:
+    """
+    Lazily reopened analysis results
+
+    Only the slim JSON summary is parsed on open. Sidecar series are memory
+    mapped on first access, so only the pages that are read come from disk.
+    """
+
+    def __init__(self, json_path: str = 'energy_analysis_results.json'):
+        self.json_path = json_path
+        with open(json_path) as f:
+            self.summary = json.load(f)
+        self._sidecars = {}
+
+    @property
+    def workload_results(self) -> Dict:
+        return self.summary.get('workload_results', {})
+
+    def _sidecar_path(self, name: str) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(self.json_path)), name)
+
+    def _open_array(self, name: str, key: str) -> np.ndarray:
+        if (name, key) not in self._sidecars:
+            path = os.path.join(self._sidecar_path(name), f"{key}.npy")
+            self._sidecars[(name, key)] = np.load(path, mmap_mode='r', allow_pickle=False)
+        return self._sidecars[(name, key)]
+
+    def raw_series(self, period_key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (timestamps, power_values) arrays for a workload period
+
+        Results written inline (legacy JSON) are converted on access.
+        """
+        raw_data = self.workload_results[period_key].get('raw_data')
+        if not raw_data:
+            raise KeyError(f"No raw data stored for {period_key}")
+
+        if raw_data.get('format') == SIDECAR_FORMAT:
+            name = raw_data['sidecar']
+            return (self._open_array(name, raw_data['timestamps_key']),
+                    self._open_array(name, raw_data['power_values_key']))
+
+        return timestamps_to_array(raw_data['timestamps']), np.asarray(raw_data['power_values'], dtype=np.float64)
+
+    def cycle_series(self, period_key: str, cycle_number: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (timestamps, power_values) for one cycle (1-based) of a cyclic workload"""
+        cycles = self.workload_results[period_key]['cycle_details']
+        cycle = cycles[cycle_number - 1]
+        timestamps, power_values = self.raw_series(period_key)
+
+        if 'raw_slice' in cycle:
+            start, stop = cycle['raw_slice']
+        else:
+            # Legacy inline results: derive the slice from the per-cycle value lists
+            start = sum(len(c.get('power_values', [])) for c in cycles[:cycle_number - 1])
+            stop = start + len(cycle.get('power_values', []))
+        return timestamps[start:stop], power_values[start:stop]
+
+    def close(self) -> None:
+        self._sidecars = {}  # Memory maps are released with their last reference
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_results(json_path: str = 'energy_analysis_results.json') -> AnalysisResults:
+    """Open analysis results without parsing the raw series"""
+    return AnalysisResults(json_path)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Workload Segmentation
+=====================
+
+Detects load plateaus and transitions directly from a power series, so the
+active windows of a workload no longer have to be copied by hand from the
+schedule_stress.sh / schedule_fio_stress.sh schedules.
+
+Method:
+- Binary segmentation with an L2 (mean shift) cost. Prefix sums make the cost
+  of every candidate split of a segment one vectorized NumPy expression.
+- Plain binary segmentation costs O(n * k) for k change points: on cyclic
+  data each split peels off one plateau and the rest is searched again. The
+  search therefore runs independently in windows of WINDOW_SEGMENTS * min_size
+  samples. Change points close to a window edge are dropped, and every
+  segment that crosses an edge is searched again. Each window holds at most
+  WINDOW_SEGMENTS segments, so the whole search is O(n * WINDOW_SEGMENTS),
+  linear in n.
+- Splits are accepted while the cost reduction exceeds a BIC-style penalty
+  based on a robust (MAD of first differences) noise estimate.
+- Segments whose mean lies clearly above the idle baseline are classified as
+  active and merged into windows.
+
+Detected windows are emitted as ('YYYY-MM-DDTHH:MM:SS', ...) tuples in UTC,
+the same format as the 'active_periods' entries in EnergyDataAnalyzer.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resampling import to_epoch_seconds  # One timestamp parser for both modules
+
+MAD_TO_SIGMA = 1.4826
+WINDOW_SEGMENTS = 64  # Search window length in units of min_size
+
+
+def estimate_noise(power: np.ndarray) -> float:
+    """Robust noise standard deviation from the MAD of first differences"""
+    if len(power) < 3:
+        return 0.0
+    diffs = np.diff(power)
+    mad = np.median(np.abs(diffs - np.median(diffs)))
+    return float(MAD_TO_SIGMA * mad / np.sqrt(2))
+
+
+def _binary_segmentation(csum: np.ndarray, a: int, b: int, min_size: int, penalty: float,
+                         limit: int) -> List[int]:
+    """Change points of x[a:b] by binary segmentation on the prefix sums of x"""
+    change_points = []
+    stack = [(a, b)]
+    while stack and len(change_points) < limit:
+        a, b = stack.pop()
+        if b - a < 2 * min_size:
+            continue
+
+        splits = np.arange(a + min_size, b - min_size + 1)
+        left = csum[splits] - csum[a]
+        right = csum[b] - csum[splits]
+        total = csum[b] - csum[a]
+        gain = left * left / (splits - a) + right * right / (b - splits) - total * total / (b - a)
+
+        best = int(np.argmax(gain))
+        if gain[best] <= penalty:
+            continue
+
+        k = int(splits[best])
+        change_points.append(k)
+        stack.append((a, k))
+        stack.append((k, b))
+
+    return change_points
+
+
+def detect_change_points(power: np.ndarray, min_size: int = 6, penalty: Optional[float] = None,
+                         max_change_points: int = 10000) -> List[int]:
+    """
+    Detect mean-shift change points by windowed binary segmentation
+
+    Args:
+        power: Power series (W)
+        min_size: Minimum number of samples per segment
+        penalty: Minimum cost reduction for a split (default: 3 * sigma^2 * log(n))
+        max_change_points: Upper bound on the number of change points
+
+    Returns:
+        Sorted sample indices at which a new segment starts
+    """
+    x = np.asarray(power, dtype=np.float64)
+    n = len(x)
+    if n < 2 * min_size:
+        return []
+
+    if penalty is None:
+        sigma = max(estimate_noise(x), 1e-6)
+        penalty = 3.0 * sigma * sigma * np.log(n)
+
+    # Centering keeps the prefix sums well conditioned for long series
+    csum = np.concatenate(([0.0], np.cumsum(x - x.mean())))
+
+    window = WINDOW_SEGMENTS * min_size
+    edges = list(range(window, n, window))
+    change_points = []
+    for a, b in zip([0] + edges, edges + [n]):
+        change_points += _binary_segmentation(csum, a, b, min_size, penalty,
+                                              max_change_points - len(change_points))
+
+    # Near a window edge the truncated window misplaces or misses change
+    # points: drop those and search each segment that crosses an edge again
+    if edges:
+        edge_array = np.array(edges)
+        change_points = [k for k in sorted(change_points)
+                         if np.min(np.abs(edge_array - k)) > 2 * min_size]
+        bounds = [0] + change_points + [n]
+        positions = np.searchsorted(bounds, edges, side='right')
+        for i in sorted(set(positions.tolist())):
+            change_points += _binary_segmentation(csum, bounds[i - 1], bounds[i], min_size, penalty,
+                                                  max_change_points - len(change_points))
+
+    return sorted(change_points)
+
+
+def segment_series(timestamps, power, min_duration_s: float = 60.0,
+                   penalty: Optional[float] = None) -> List[Dict]:
+    """
+    Split a power series into plateaus
+
+    Args:
+        timestamps: ISO strings, datetime64 values or epoch seconds (sorted)
+        power: Power values (W)
+        min_duration_s: Minimum plateau length in seconds
+        penalty: Optional split penalty passed to detect_change_points
+
+    Returns:
+        List of segments with start/end index, epoch bounds and mean power
+    """
+    t = to_epoch_seconds(timestamps)
+    x = np.asarray(power, dtype=np.float64)
+    if len(x) == 0:
+        return []
+
+    interval = float(np.median(np.diff(t))) if len(t) > 1 else 1.0
+    min_size = max(2, int(round(min_duration_s / max(interval, 1e-3))))
+
+    bounds = [0] + detect_change_points(x, min_size=min_size, penalty=penalty) + [len(x)]
+    sums = np.add.reduceat(x, bounds[:-1])
+    counts = np.diff(bounds)
+
+    return [
+        {
+            'start_index': start,
+            'end_index': end,
+            'start_epoch': float(t[start]),
+            'end_epoch': float(t[end - 1]),
+            'mean_power': float(total / count),
+            'samples': int(count)
+        }
+        for start, end, total, count in zip(bounds[:-1], bounds[1:], sums, counts)
+    ]
+
+
+def detect_active_windows(timestamps, power, baseline_w: Optional[float] = None,
+                          threshold_w: Optional[float] = None, min_duration_s: float = 60.0,
+                          merge_gap_s: float = 0.0, penalty: Optional[float] = None) -> List[Dict]:
+    """
+    Detect windows in which the load is clearly above the idle baseline
+
+    Args:
+        timestamps: ISO strings, datetime64 values or epoch seconds (sorted)
+        power: Power values (W)
+        baseline_w: Idle power (default: 10th percentile of the series)
+        threshold_w: Required increase over baseline
+                     (default: max(6 * noise sigma, 15% of baseline))
+        min_duration_s: Minimum plateau length in seconds
+        merge_gap_s: Merge active windows separated by at most this many seconds
+        penalty: Optional split penalty passed to detect_change_points
+
+    Returns:
+        List of windows with 'start'/'end' ISO strings (UTC), mean power and samples
+    """
+    t = to_epoch_seconds(timestamps)
+    x = np.asarray(power, dtype=np.float64)
+    segments = segment_series(t, x, min_duration_s=min_duration_s, penalty=penalty)
+    if not segments:
+        return []
+    interval = float(np.median(np.diff(t))) if len(t) > 1 else 0.0
+
+    if baseline_w is None:
+        baseline_w = float(np.percentile(x, 10))
+    if threshold_w is None:
+        threshold_w = max(6 * estimate_noise(x), 0.15 * baseline_w)
+
+    windows = []
+    for segment in segments:
+        if segment['mean_power'] < baseline_w + threshold_w:
+            continue
+
+        previous = windows[-1] if windows else None
+        if previous and (previous['end_index'] == segment['start_index'] or
+                         segment['start_epoch'] - previous['end_epoch'] <= merge_gap_s):
+            samples = previous['samples'] + segment['samples']
+            previous['mean_power'] = (previous['mean_power'] * previous['samples'] +
+                                      segment['mean_power'] * segment['samples']) / samples
+            previous['samples'] = samples
+            previous['end_index'] = segment['end_index']
+            previous['end_epoch'] = segment['end_epoch']
+        else:
+            windows.append(dict(segment))
+
+    for window in windows:
+        # Round outwards so the string bounds include the first and last sample
+        window['start'] = format_epoch(math.floor(window['start_epoch']))
+        window['end'] = format_epoch(math.ceil(window['end_epoch']))
+        # The last sample represents one sampling interval of load
+        window['duration_minutes'] = round((window['end_epoch'] + interval - window['start_epoch']) / 60, 1)
+        window['mean_power'] = round(window['mean_power'], 2)
+
+    return windows
+
+
+def format_epoch(epoch_seconds: float) -> str:
+    """Format epoch seconds as the UTC ISO string used in test_periods"""
+    return str(np.datetime64(int(epoch_seconds), 's'))
+
+
+def windows_to_active_periods(windows: Sequence[Dict]) -> List[Tuple[str, str]]:
+    """Convert detected windows to EnergyDataAnalyzer 'active_periods' tuples"""
+    return [(window['start'], window['end']) for window in windows]
+
+
+def build_test_period(name: str, windows: Sequence[Dict], description: str = '') -> Dict:
+    """
+    Build a test_periods entry from detected windows
+
+    One window becomes a 'single' pattern, several windows a 'cyclic' pattern
+    with cycle length and pause taken from the median detected values.
+    """
+    if not windows:
+        raise ValueError("At least one detected window is required")
+
+    start_epoch = windows[0]['start_epoch']
+    end_epoch = windows[-1]['end_epoch']
+    period = {
+        'name': name,
+        'start': windows[0]['start'],
+        'end': windows[-1]['end'],
+        'duration_minutes': max(1, int(round((end_epoch - start_epoch) / 60))),
+        'description': description or f"Detected automatically ({len(windows)} active window(s))",
+        'pattern': 'cyclic' if len(windows) > 1 else 'single',
+        'active_periods': windows_to_active_periods(windows)
+    }
+
+    if len(windows) > 1:
+        durations = [w['end_epoch'] - w['start_epoch'] for w in windows]
+        pauses = [b['start_epoch'] - a['end_epoch'] for a, b in zip(windows[:-1], windows[1:])]
+        period.update({
+            'cycle_duration': max(1, int(round(float(np.median(durations)) / 60))),
+            'cycle_pause': max(0, int(round(float(np.median(pauses)) / 60))),
+            'cycles': len(windows)
+        })
+
+    return period
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Streaming Statistics Helpers
+============================
+
+Online accumulators used by the streaming mode of evaluate_energy_data.py.
+Every accumulator keeps a fixed amount of state, so memory stays constant no
+matter how many readings are pushed through it.
+
+- RunningStats: count, mean, variance (Welford), min and max
+- P2Quantile: streaming quantile estimate (P-square algorithm, Jain & Chlamtac)
+- PowerAccumulator: RunningStats plus a set of quantile sketches and time bounds
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import math
+import sys
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+class RunningStats:
+    """Welford mean/variance with min/max tracking"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def from_array(cls, values) -> 'RunningStats':
+        """Build an accumulator from a whole batch of values at once (vectorized)"""
+        values = np.asarray(values, dtype=np.float64)
+        stats = cls()
+        if values.size:
+            stats.count = int(values.size)
+            stats.mean = float(values.mean())
+            stats._m2 = float(((values - stats.mean) ** 2).sum())
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+        return stats
+
+    def add(self, value: float) -> None:
+        """Add a single value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Merge another accumulator into this one (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (same definition as statistics.variance)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (same definition as statistics.stdev)"""
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate using the P-square algorithm
+
+    Keeps five markers regardless of the number of observations. The estimate
+    is exact for up to five values and converges quickly for larger streams.
+    """
+
+    __slots__ = ('p', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, p: float):
+        if not 0 < p < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self._heights = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """Add a single value"""
+        q = self._heights
+
+        # Collect the first five observations as initial marker heights
+        if len(q) < 5:
+            q.append(value)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        n = self._positions
+
+        # Find the cell containing the value and adjust the extreme markers
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the three middle markers if they drifted from their desired position
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current quantile estimate (None if no values were added)"""
+        q = self._heights
+        if not q:
+            return None
+        if len(q) < 5:
+            ordered = sorted(q)
+            return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+        return q[2]
+
+
+class PowerAccumulator:
+    """Constant-memory summary of a power series (W)"""
+
+    def __init__(self, quantiles: Iterable[float] = (0.5, 0.95)):
+        self.stats = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def add(self, timestamp: str, power_w: float) -> None:
+        """Add a single (timestamp, power) reading"""
+        self.stats.add(power_w)
+        for sketch in self.quantiles.values():
+            sketch.add(power_w)
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def quantile_summary(self) -> Dict[str, float]:
+        """Quantile estimates keyed like 'p50_w', 'p95_w'"""
+        return {
+            f"p{int(round(p * 100))}_w": round(sketch.value, 2)
+            for p, sketch in self.quantiles.items()
+            if sketch.value is not None
+        }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Workload Phase Markers
+======================
+
+Reads the run records written by Scripts/workload_runner.py and turns them into
+EnergyDataAnalyzer test periods, so the analysis uses the exact start/end of
+every active phase instead of hand-copied schedules.
+
+Each run record holds the phases of one workload run (UTC markers with
+microseconds) and the tool throughput of every active phase:
+- stress-ng: bogo_ops, bogo_ops_per_s
+- fio: total_ios, io_bytes, iops, bw_kib_s
+
+Energy per operation is computed per active phase as mean power x exact phase
+duration (J = W x s) divided by the operations of that phase.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import glob
+import json
+import os
+import statistics
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PATTERNS = {'cpu': 'cyclic', 'io': 'cyclic', 'update': 'single', 'idle': 'continuous'}
+
+
+def load_runs(path: str) -> List[Dict]:
+    """
+    Load run records from a results file or a results directory
+
+    Args:
+        path: A <run_id>.json file or the runner's --results-dir
+
+    Returns:
+        Run records sorted by start time (runs without a finished active phase are skipped)
+    """
+    paths = sorted(glob.glob(os.path.join(path, '*.json'))) if os.path.isdir(path) else [path]
+    runs = []
+    for run_path in paths:
+        with open(run_path) as f:
+            record = json.load(f)
+        if any(p['phase'] == 'active' and p.get('end') for p in record.get('phases', [])):
+            runs.append(record)
+    return sorted(runs, key=lambda record: record['started'])
+
+
+def phase_seconds(phase: Dict) -> float:
+    """Exact duration of a phase from its markers"""
+    return (datetime.fromisoformat(phase['end']) - datetime.fromisoformat(phase['start'])).total_seconds()
+
+
+def run_to_test_period(record: Dict) -> Dict:
+    """
+    Build an EnergyDataAnalyzer test_periods entry from a run record
+
+    Several active phases become a 'cyclic' pattern (cycle length and pause from
+    the measured phases), one active phase a 'single' pattern; idle runs stay
+    'continuous'. The per-phase tool metrics are kept in 'operations'.
+    """
+    phases = [p for p in record['phases'] if p.get('end')]
+    active = [p for p in phases if p['phase'] == 'active']
+    pauses = [p for p in phases if p['phase'] == 'pause']
+
+    pattern = PATTERNS.get(record['workload'], 'single')
+    if pattern == 'cyclic' and len(active) < 2:
+        pattern = 'single'
+    start, end = phases[0]['start'], phases[-1]['end']
+    period = {
+        'name': record.get('name', record['workload']),
+        'start': start,
+        'end': end,
+        'duration_minutes': round((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds() / 60, 2),
+        'description': f"{record['workload']} run {record['run_id']} on {record.get('host', 'unknown host')} "
+                       f"({len(active)} active phase(s), status {record['status']})",
+        'pattern': pattern,
+        'active_periods': [(p['start'], p['end']) for p in active],
+        'operations': [p.get('metrics') or {} for p in active],
+        'marker_run': record['run_id']
+    }
+    if pattern == 'cyclic':
+        period.update({
+            'cycle_duration': round(statistics.mean(phase_seconds(p) for p in active) / 60, 4),
+            'cycle_pause': round(statistics.mean(phase_seconds(p) for p in pauses) / 60, 2) if pauses else 0,
+            'cycles': len(active)
+        })
+    return period
+
+
+def runs_to_test_periods(runs: List[Dict]) -> Dict[str, Dict]:
+    """Build test_periods (keyed by run id) from run records"""
+    return {record['run_id']: run_to_test_period(record) for record in runs}
+
+
+def energy_per_operation(results: Dict, period: Dict) -> Optional[Dict]:
+    """
+    Joules per bogo-op / per IO for an analyzed marker period
+
+    Cyclic results use each cycle's mean power and exact duration; other
+    patterns use the total energy of the period. Only phases with both power
+    data and tool metrics are counted.
+
+    Args:
+        results: Result of EnergyDataAnalyzer.analyze_workload_period
+        period: The marker test period (with 'operations')
+
+    Returns:
+        Dictionary with energy, operation totals and J/op values, or None if
+        no phase has throughput metrics
+    """
+    operations = period.get('operations', [])
+    if 'error' in results or not any(operations):
+        return None
+
+    phases = []
+    if results.get('cycle_details'):
+        for cycle in results['cycle_details']:
+            metrics = operations[cycle['period'] - 1]
+            if not metrics:
+                continue
+            seconds = (datetime.fromisoformat(cycle['end']) - datetime.fromisoformat(cycle['start'])).total_seconds()
+            phases.append({'cycle': cycle['period'], 'seconds': seconds, 'avg_power_w': cycle['avg_power'],
+                           'energy_j': cycle['avg_power'] * seconds, 'metrics': metrics})
+    else:
+        seconds = sum((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+                      for start, end in period['active_periods'])
+        merged = {}
+        for metrics in operations:
+            for key in ('bogo_ops', 'total_ios', 'io_bytes'):
+                if key in metrics:
+                    merged[key] = merged.get(key, 0) + metrics[key]
+        avg_power = results['power_stats']['average_w']
+        phases.append({'cycle': 1, 'seconds': seconds, 'avg_power_w': avg_power,
+                       'energy_j': avg_power * seconds, 'metrics': merged})
+
+    if not phases:
+        return None
+
+    summary = {
+        'energy_j': round(sum(p['energy_j'] for p in phases), 1),
+        'active_seconds': round(sum(p['seconds'] for p in phases), 3),
+        'phases': len(phases)
+    }
+    for key, label in (('bogo_ops', 'j_per_bogo_op'), ('total_ios', 'j_per_io'), ('io_bytes', 'j_per_mib')):
+        measured = [p for p in phases if key in p['metrics']]
+        total = sum(p['metrics'][key] for p in measured)
+        if not total:
+            continue
+        energy = sum(p['energy_j'] for p in measured)
+        scale = 1024 * 1024 if key == 'io_bytes' else 1
+        summary[key] = total
+        summary[label] = energy / (total / scale)
+        for p in measured:
+            p[label] = p['energy_j'] / (p['metrics'][key] / scale) if p['metrics'][key] else None
+
+    summary['per_phase'] = [{k: (round(v, 3) if k == 'energy_j' else v) for k, v in p.items() if k != 'metrics'}
+                            for p in phases]
+    return summary
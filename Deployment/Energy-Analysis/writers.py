@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Streaming Table Writers
+=======================
+
+Chunked tabular output shared by evaluate_energy_data.py and
+export_epex_data.py. Rows or column batches are written as they are produced
+(e.g. one DynamoDB page or one month of prices at a time), so an export never
+needs the whole table in memory and no DataFrame is built.
+
+Formats:
+- csv:     plain CSV, flushed after every batch
+- parquet: Parquet, one row group per chunk (requires pyarrow)
+- arrow:   Arrow IPC file / Feather v2, one record batch per chunk (requires pyarrow)
+
+pyarrow is optional and only imported when a columnar format is requested.
+
+Author: Generated for G1-S2-INENI Project
+"""
+
+import csv
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+
+def _import_pyarrow():
+    """Import pyarrow on demand with a helpful error if it is missing"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow output requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+class TableWriter:
+    """Base class: buffers rows and hands them to the format in chunks"""
+
+    def __init__(self, path: str, columns: List[str], chunk_rows: int = 65536):
+        """
+        Initialize the writer
+
+        Args:
+            path: Output file path
+            columns: Column names, in output order
+            chunk_rows: Rows buffered before a chunk is written
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffer = []
+
+    def write_row(self, row: Sequence) -> None:
+        """Append one row (values in column order)"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        """Append several rows (values in column order)"""
+        for row in rows:
+            self.write_row(row)
+
+    def write_records(self, records: Iterable[Dict]) -> None:
+        """Append dict rows keyed by column name (missing keys become empty/null)"""
+        for record in records:
+            self.write_row([record.get(column) for column in self.columns])
+
+    def write_columns(self, batch: Dict[str, Sequence]) -> None:
+        """Append a columnar batch (dict of equally long arrays/lists keyed by column name)"""
+        self.flush()
+        values = [np.asarray(batch[column]).tolist() for column in self.columns]
+        self._write_chunk(list(zip(*values)))
+
+    def flush(self) -> None:
+        """Write buffered rows"""
+        if self._buffer:
+            rows, self._buffer = self._buffer, []
+            self._write_chunk(rows)
+
+    def _write_chunk(self, rows: List[Sequence]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and close the file"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvTableWriter(TableWriter):
+    """CSV writer that flushes every chunk to disk"""
+
+    def __init__(self, path: str, columns: List[str], chunk_rows: int = 65536):
+        super().__init__(path, columns, chunk_rows)
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_chunk(self, rows: List[Sequence]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class ArrowTableWriter(TableWriter):
+    """Parquet or Arrow IPC writer; the schema is taken from the first chunk"""
+
+    def __init__(self, path: str, columns: List[str], chunk_rows: int = 65536, fmt: str = 'parquet'):
+        super().__init__(path, columns, chunk_rows)
+        self._pa = _import_pyarrow()
+        self._fmt = fmt
+        self._writer = None
+
+    def write_columns(self, batch: Dict[str, Sequence]) -> None:
+        """Append a columnar batch without converting it to rows"""
+        self.flush()
+        self._write_table({column: np.asarray(batch[column]) for column in self.columns})
+
+    def _write_chunk(self, rows: List[Sequence]) -> None:
+        self._write_table({column: [row[i] for row in rows] for i, column in enumerate(self.columns)})
+
+    def _write_table(self, data: Dict[str, Sequence]) -> None:
+        pa = self._pa
+        if self._writer is None:
+            table = pa.Table.from_pydict(data)
+            if self._fmt == 'parquet':
+                self._writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, table.schema)
+        else:
+            table = pa.Table.from_pydict(data, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+
+    def close(self) -> None:
+        super().close()
+        if self._writer is None:
+            # No rows: still produce a readable, empty file
+            pa = self._pa
+            schema = pa.schema([(column, pa.null()) for column in self.columns])
+            self._writer = (pa.parquet.ParquetWriter(self.path, schema) if self._fmt == 'parquet'
+                            else pa.ipc.new_file(self.path, schema))
+        self._writer.close()
+
+
+def output_path(stem: str, fmt: str = 'csv') -> str:
+    """File name for a stem and format, e.g. ('epex_prices_15min', 'parquet') -> 'epex_prices_15min.parquet'"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {list(FORMATS)}")
+    return stem + FORMATS[fmt]
+
+
+def open_table_writer(stem: str, columns: List[str], fmt: str = 'csv',
+                      chunk_rows: int = 65536) -> TableWriter:
+    """
+    Open a streaming table writer
+
+    Args:
+        stem: Output path without extension
+        columns: Column names
+        fmt: 'csv', 'parquet' or 'arrow'
+        chunk_rows: Rows per chunk (row group / record batch)
+
+    Returns:
+        TableWriter (use as a context manager)
+    """
+    path = output_path(stem, fmt)
+    if fmt == 'csv':
+        return CsvTableWriter(path, columns, chunk_rows)
+    return ArrowTableWriter(path, columns, chunk_rows, fmt)
+
+
+def write_table(stem: str, records: List[Dict], columns: Optional[List[str]] = None,
+                fmt: str = 'csv') -> Optional[str]:
+    """Write a small list of dict rows in one call; returns the path (None if there are no rows)"""
+    if not records:
+        return None
+    columns = columns or list(records[0])
+    with open_table_writer(stem, columns, fmt) as writer:
+        writer.write_records(records)
+    return writer.path
@@ -0,0 +1,207 @@
+"""
+Streaming anomaly detection on the power readings of process-mqtt.py
+
+Every current_power reading passes through per-device detectors as it is
+ingested, so a power spike or a dead power supply is reported within one
+message instead of days later by evaluate_energy_data.py:
+
+- EWMA mean and variance (weight ANOMALY_ALPHA per reading, i.e. a memory of
+  about 1/alpha readings)
+- Spike: the reading is more than ANOMALY_Z standard deviations from the
+  EWMA mean (after ANOMALY_WARMUP readings) and at least ANOMALY_MIN_DELTA_W
+  away from it, so a quiet idle baseline does not alarm on a few watts. One
+  event per excursion; the next one needs the z-score back below the threshold
+- Flatline: the same power (within ANOMALY_FLATLINE_TOLERANCE_W) for
+  ANOMALY_FLATLINE_SECONDS. A live meter jitters; a stuck sensor or a dead
+  PSU reporting 0 W does not. One event per run
+
+Each detector update is a few float operations on a __slots__ object kept in
+warm container memory (a few microseconds per message, benchmark
+lambda.anomaly_detection). The state is checkpointed to a small item in the
+AnomalyState table at most every ANOMALY_CHECKPOINT_SECONDS per device, and
+read back with one GetItem when a container sees a device for the first
+time, so a new container does not start the warmup again. Events go to the
+AnomalyEvents table, keyed by device and reading timestamp (two containers
+reporting the same reading write the same item). Like the registry and
+coverage updates, failures are logged and never fail the ingest.
+ANOMALY_DETECTION=0 turns the detectors off.
+"""
+
+import math
+import os
+import time
+from datetime import datetime
+
+from dynamodb_client import get_client
+
+ENABLED = os.environ.get('ANOMALY_DETECTION', '1') != '0'
+EVENTS_TABLE = os.environ.get('ANOMALY_EVENTS_TABLE', 'AnomalyEvents')
+STATE_TABLE = os.environ.get('ANOMALY_STATE_TABLE', 'AnomalyState')
+
+ALPHA = float(os.environ.get('ANOMALY_ALPHA', '0.05'))
+Z_THRESHOLD = float(os.environ.get('ANOMALY_Z', '4'))
+MIN_DELTA_W = float(os.environ.get('ANOMALY_MIN_DELTA_W', '20'))
+WARMUP = int(os.environ.get('ANOMALY_WARMUP', '30'))
+FLATLINE_SECONDS = float(os.environ.get('ANOMALY_FLATLINE_SECONDS', '1800'))
+FLATLINE_TOLERANCE_W = float(os.environ.get('ANOMALY_FLATLINE_TOLERANCE_W', '0'))
+CHECKPOINT_SECONDS = float(os.environ.get('ANOMALY_CHECKPOINT_SECONDS', '600'))
+
+METRIC = 'current_power'  # Sort key of the state items (the monitored attribute)
+
+_Z_SQUARED = Z_THRESHOLD * Z_THRESHOLD
+_MIN_DELTA_SQUARED = MIN_DELTA_W * MIN_DELTA_W
+
+_states = {}  # device_id -> DetectorState
+
+
+class DetectorState:
+    """EWMA, spike and flatline state of one device"""
+
+    __slots__ = ('count', 'mean', 'var', 'in_spike', 'run_value', 'run_start', 'run_reported',
+                 'last_seen', 'checkpointed')
+
+    # Numeric attributes of the state item, in item order
+    NUMBERS = ('count', 'mean', 'var', 'run_value', 'run_start', 'last_seen')
+    FLAGS = ('in_spike', 'run_reported')
+
+    def __init__(self, checkpointed=0.0):
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.in_spike = False
+        self.run_value = 0.0
+        self.run_start = 0.0
+        self.run_reported = False
+        self.last_seen = 0.0
+        self.checkpointed = checkpointed
+
+    @classmethod
+    def from_typed_item(cls, item, checkpointed):
+        state = cls(checkpointed)
+        for name in cls.NUMBERS:
+            if name in item:
+                setattr(state, name, float(item[name]['N']))
+        for name in cls.FLAGS:
+            if name in item:
+                setattr(state, name, item[name]['BOOL'])
+        state.count = int(state.count)
+        return state
+
+    def to_typed_item(self, device_id):
+        item = {'device_id': {'S': device_id}, 'metric': {'S': METRIC}}
+        for name in self.NUMBERS:
+            item[name] = {'N': repr(getattr(self, name))}
+        for name in self.FLAGS:
+            item[name] = {'BOOL': getattr(self, name)}
+        item['updated_at'] = {'S': datetime.utcnow().isoformat()}
+        return item
+
+
+def _load_state(device_id, now):
+    """Checkpointed state of device_id, or a fresh state"""
+    try:
+        item = get_client().get_item(
+            TableName=STATE_TABLE,
+            Key={'device_id': {'S': device_id}, 'metric': {'S': METRIC}}
+        ).get('Item')
+        if item:
+            return DetectorState.from_typed_item(item, now)
+    except Exception as e:
+        print(f"Anomaly state load failed for {device_id}: {str(e)}")
+    return DetectorState(now)
+
+
+def _checkpoint(device_id, state, now):
+    state.checkpointed = now  # Also on failure: retry after the next interval, not on every message
+    try:
+        get_client().put_item(TableName=STATE_TABLE, Item=state.to_typed_item(device_id))
+    except Exception as e:
+        print(f"Anomaly state checkpoint failed for {device_id}: {str(e)}")
+
+
+def _event_details(state, **details):
+    details['ewma_mean'] = state.mean
+    details['ewma_std'] = math.sqrt(state.var)
+    return details
+
+
+def _write_event(device_id, timestamp, kind, power, details):
+    print(f"Anomaly ({kind}) for {device_id} at {timestamp}: {power}W, "
+          f"EWMA {details['ewma_mean']:.1f}W +/- {details['ewma_std']:.1f}W")
+    item = {
+        'device_id': {'S': device_id},
+        'timestamp': {'S': timestamp},
+        'type': {'S': kind},
+        'power': {'N': repr(float(power))},
+        'detected_at': {'S': datetime.utcnow().isoformat()}
+    }
+    for name, value in details.items():
+        item[name] = {'N': repr(float(value))}
+    try:
+        get_client().put_item(TableName=EVENTS_TABLE, Item=item)
+    except Exception as e:
+        print(f"Anomaly event write failed for {device_id}/{timestamp}: {str(e)}")
+
+
+def observe(device_id, timestamp, power, now=None):
+    """
+    Feed one reading to the detectors of device_id
+
+    Args:
+        device_id: Device identifier (SensorData partition key)
+        timestamp: SensorData sort key of the reading (key of any event)
+        power: current_power in W
+        now: Arrival time (epoch seconds; default: time.time())
+
+    Returns:
+        'spike', 'flatline' or None
+    """
+    if not ENABLED:
+        return None
+    if now is None:
+        now = time.time()
+    state = _states.get(device_id)
+    if state is None:
+        state = _states[device_id] = _load_state(device_id, now)
+
+    kind = details = None
+
+    # Spike: z-score against the mean and variance before this reading
+    diff = power - state.mean
+    if state.count >= WARMUP:
+        squared = diff * diff
+        if squared >= _MIN_DELTA_SQUARED and squared > _Z_SQUARED * state.var:
+            if not state.in_spike:
+                state.in_spike = True
+                kind = 'spike'
+                # Baseline before this reading; z_score is left out while the variance is still 0
+                details = (_event_details(state, z_score=diff / math.sqrt(state.var)) if state.var > 0
+                           else _event_details(state))
+        else:
+            state.in_spike = False
+
+    # EWMA mean and variance (incremental form, one pass)
+    if state.count:
+        increment = ALPHA * diff
+        state.mean += increment
+        state.var = (1 - ALPHA) * (state.var + diff * increment)
+    else:
+        state.mean = power
+    state.count += 1
+
+    # Flatline: a run of equal readings (a gap in the telemetry ends the run)
+    if abs(power - state.run_value) > FLATLINE_TOLERANCE_W or now - state.last_seen > FLATLINE_SECONDS:
+        state.run_value = power
+        state.run_start = now
+        state.run_reported = False
+    elif not state.run_reported and now - state.run_start >= FLATLINE_SECONDS:
+        state.run_reported = True
+        kind = 'flatline'
+        details = _event_details(state, flatline_seconds=now - state.run_start)
+    state.last_seen = now
+
+    if kind:
+        _write_event(device_id, timestamp, kind, power, details)
+    if now - state.checkpointed >= CHECKPOINT_SECONDS:
+        _checkpoint(device_id, state, now)
+    return kind
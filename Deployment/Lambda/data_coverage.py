@@ -0,0 +1,76 @@
+"""
+Per-device data coverage updates shared by the Lambda functions
+
+Keeps one item per device per UTC hour in the DataCoverage table that
+records which minutes of the hour (0-59) received telemetry. Analysis scripts
+read a whole month of coverage with one Query before spending capacity on
+data queries (see Energy-Analysis/coverage.py).
+
+DynamoDB has no bitwise update operator, so ingest records minutes with an
+atomic number-set ADD (idempotent, no read-modify-write). An UpdateItem is
+billed on the size of the whole item, so the set is bounded by the hour: at
+most 60 small numbers, well under 1 KB, so every update costs one write unit.
+(A per-day set grows to ~4 KB by the evening, about 5 units per update.)
+
+Cost per device is at most one UpdateItem per minute: the last marked minute
+is remembered in warm container memory and repeated messages within the same
+minute are skipped.
+"""
+
+import os
+
+from dynamodb_client import get_client
+
+COVERAGE_TABLE = os.environ.get('COVERAGE_TABLE', 'DataCoverage')
+
+_last_marked = {}  # device_id -> (hour, minute) of the last coverage write
+
+
+def minute_of_hour(timestamp):
+    """
+    Split a 'YYYY-MM-DDTHH:MM:SS[.ffffff]' timestamp into (hour, minute of hour)
+
+    The hour is the item's sort key ('YYYY-MM-DDTHH'). Plain string slicing
+    keeps this in the sub-microsecond range per message.
+
+    Raises:
+        ValueError: If the hour or minute field is not a valid number
+    """
+    hour, minute = int(timestamp[11:13]), int(timestamp[14:16])
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Invalid hour/minute in timestamp: {timestamp}")
+    return timestamp[:13], minute
+
+
+def mark_minute(device_id, timestamp):
+    """
+    Record that device_id delivered data in the minute of timestamp
+
+    Args:
+        device_id: Device identifier (SensorData partition key)
+        timestamp: SensorData sort key ('YYYY-MM-DDTHH:MM:SS.ffffff')
+
+    Returns:
+        True if the coverage item was written, False otherwise
+    """
+    try:
+        hour, minute = minute_of_hour(timestamp)
+    except (TypeError, ValueError):
+        return False
+
+    if _last_marked.get(device_id) == (hour, minute):
+        return False
+
+    try:
+        get_client().update_item(
+            TableName=COVERAGE_TABLE,
+            Key={'device_id': {'S': device_id}, 'hour': {'S': hour}},
+            UpdateExpression='ADD minutes :m',
+            ExpressionAttributeValues={':m': {'NS': [str(minute)]}}
+        )
+        _last_marked[device_id] = (hour, minute)
+        return True
+    except Exception as e:
+        # Coverage is auxiliary and must never fail the ingest
+        print(f"Coverage update failed for {device_id}/{hour}: {str(e)}")
+        return False
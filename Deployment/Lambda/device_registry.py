@@ -0,0 +1,70 @@
+"""
+Device registry updates shared by the Lambda functions
+
+Keeps one small item per partition key of each data table (Tasmota device in
+SensorData, energyLIVE interface in EnergyLiveData, tariff in EPEXSpotPrices)
+with first-seen/last-seen timestamps. Analysis scripts discover devices with
+a single Query on this table instead of scanning the data tables.
+
+Updates are cheap:
+- One conditional UpdateItem that only moves last_seen forwards and sets
+  first_seen once (if_not_exists)
+- Per warm container, each key is refreshed at most every
+  REGISTRY_REFRESH_SECONDS, so high-frequency ingest does not double its writes
+- Registry errors are logged and never fail the ingest itself
+"""
+
+import os
+import time
+from datetime import datetime
+
+from dynamodb_client import get_client, is_condition_failure
+
+REGISTRY_TABLE = os.environ.get('REGISTRY_TABLE', 'DeviceRegistry')
+REFRESH_SECONDS = int(os.environ.get('REGISTRY_REFRESH_SECONDS', '300'))
+
+_last_refresh = {}  # (source, key_id) -> monotonic time of last registry write
+
+
+def register_key(source, key_id, seen_at, force=False, first_seen_at=None):
+    """
+    Record that data for key_id was written to the source table
+
+    Args:
+        source: Name of the data table (e.g. 'SensorData')
+        key_id: Partition key value (device_id or tariff)
+        seen_at: ISO timestamp of the data point (UTC)
+        force: Skip the in-container refresh throttle
+        first_seen_at: Earliest ISO timestamp of the written batch, used for
+                       first_seen of a new key (default: seen_at)
+
+    Returns:
+        True if the registry item was written, False otherwise
+    """
+    cache_key = (source, key_id)
+    now = time.monotonic()
+    if not force and now - _last_refresh.get(cache_key, -REFRESH_SECONDS) < REFRESH_SECONDS:
+        return False
+
+    try:
+        get_client().update_item(
+            TableName=REGISTRY_TABLE,
+            Key={'source': {'S': source}, 'key_id': {'S': key_id}},
+            UpdateExpression='SET first_seen = if_not_exists(first_seen, :first), '
+                             'last_seen = :ts, updated_at = :now',
+            ConditionExpression='attribute_not_exists(last_seen) OR last_seen < :ts',
+            ExpressionAttributeValues={
+                ':ts': {'S': seen_at},
+                ':first': {'S': first_seen_at or seen_at},
+                ':now': {'S': datetime.utcnow().isoformat()}
+            }
+        )
+        _last_refresh[cache_key] = now
+        return True
+    except Exception as e:
+        if is_condition_failure(e):
+            # Registry already has a newer last_seen
+            _last_refresh[cache_key] = now
+        else:
+            print(f"Registry update failed for {source}/{key_id}: {str(e)}")
+        return False
@@ -0,0 +1,33 @@
+"""
+Shared low-level DynamoDB client for the Lambda functions
+
+The handlers, the device registry and the coverage index all write through
+one botocore client that is created on first use:
+- The low-level client skips the boto3 resource layer (its models, factories
+  and Decimal (de)serialization), about 70 ms of cold start; records.py builds
+  the typed items ({'S': ...} / {'N': ...}) directly
+- boto3 itself (about 250 ms of imports) is only imported when the first
+  write happens, so an invocation that writes nothing never loads it
+- One client per container instead of one resource per module
+
+Errors are plain botocore ClientErrors; is_condition_failure() recognizes a
+failed ConditionExpression by its error code, without loading the client's
+modeled exception classes.
+"""
+
+_client = None
+
+
+def get_client():
+    """The container's DynamoDB client (created on first call)"""
+    global _client
+    if _client is None:
+        import boto3  # Deferred until the first write (see module docstring)
+        _client = boto3.client('dynamodb')
+    return _client
+
+
+def is_condition_failure(error):
+    """True if error is a ClientError for a failed ConditionExpression"""
+    response = getattr(error, 'response', None)
+    return isinstance(response, dict) and response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
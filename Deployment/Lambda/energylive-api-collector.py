@@ -1,14 +1,15 @@
 import json
-import boto3
 import requests
 import os
 from datetime import datetime
-from decimal import Decimal
 import time
+from device_registry import register_key
+from dynamodb_client import get_client
+from records import MeterMeasurement
+from stage_timer import instrumented, stage
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('EnergyLiveData')
+# DynamoDB client is created on the first write (dynamodb_client.py)
+table_name = 'EnergyLiveData'
 
 # OBIS code mapping
 OBIS_CODES = {
@@ -34,6 +35,7 @@ OBIS_CODES = {
     }
 }
 
+@instrumented('energylive-api-collector')
 def lambda_handler(event, context):
     """
     Lambda function to fetch data from energyLIVE API and store in DynamoDB
@@ -63,11 +65,13 @@ def lambda_handler(event, context):
         print(f"Fetching data from energyLIVE API for device: {device_uid}")
         
         # Make API request
-        response = requests.get(api_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        with stage('http'):
+            response = requests.get(api_url, headers=headers, timeout=30)
+            response.raise_for_status()
         
         # Parse JSON response
-        measurements = response.json()
+        with stage('parse'):
+            measurements = response.json()
         
         if not measurements:
             print("No measurements received from API")
@@ -76,56 +80,61 @@ def lambda_handler(event, context):
                 'body': json.dumps('No measurements to process')
             }
         
+        # DynamoDB client (created by the first invocation of a container)
+        with stage('client_init'):
+            dynamodb = get_client()
+        
         # Process and store each measurement
         stored_count = 0
+        latest_iso_timestamp = None
         base_timestamp = int(time.time() * 1000)  # Current time in milliseconds
         
         for idx, measurement in enumerate(measurements):
             try:
-                # Extract measurement data
-                obis_code = measurement.get('measurement')
-                timestamp = measurement.get('timestamp')
-                value = measurement.get('value')
-                
-                if not all([obis_code, timestamp, value is not None]):
-                    print(f"Skipping incomplete measurement: {measurement}")
-                    continue
+                with stage('convert'):
+                    # Extract measurement data
+                    obis_code = measurement.get('measurement')
+                    timestamp = measurement.get('timestamp')
+                    value = measurement.get('value')
                 
-                # Get OBIS code information
-                obis_info = OBIS_CODES.get(obis_code, {
-                    'name': obis_code,
-                    'description': f'Unknown measurement ({obis_code})',
-                    'unit': 'unknown'
-                })
+                    if not all([obis_code, timestamp, value is not None]):
+                        print(f"Skipping incomplete measurement: {measurement}")
+                        continue
                 
-                # Convert timestamp to ISO format for better readability
-                dt = datetime.fromtimestamp(timestamp / 1000)  # Convert from ms to seconds
-                iso_timestamp = dt.isoformat()
+                    # Get OBIS code information
+                    obis_info = OBIS_CODES.get(obis_code, {
+                        'name': obis_code,
+                        'description': f'Unknown measurement ({obis_code})',
+                        'unit': 'unknown'
+                    })
                 
-                # Create a unique timestamp by adding microseconds
-                # This ensures each measurement has a unique sort key
-                unique_timestamp = timestamp + (idx * 100)  # Add 100ms per measurement
+                    # Convert timestamp to ISO format for better readability
+                    dt = datetime.fromtimestamp(timestamp / 1000)  # Convert from ms to seconds
+                    iso_timestamp = dt.isoformat()
                 
-                # Convert float to Decimal for DynamoDB
-                decimal_value = Decimal(str(value))
+                    # Create a unique timestamp by adding microseconds
+                    # This ensures each measurement has a unique sort key
+                    unique_timestamp = timestamp + (idx * 100)  # Add 100ms per measurement
                 
-                # Create item for DynamoDB
-                item = {
-                    'device_id': device_uid,
-                    'timestamp': unique_timestamp,  # Use unique timestamp as sort key
-                    'iso_timestamp': iso_timestamp,
-                    'obis_code': obis_code,
-                    'measurement_name': obis_info['name'],
-                    'description': obis_info['description'],
-                    'unit': obis_info['unit'],
-                    'value': decimal_value,
-                    'collection_time': datetime.now().isoformat(),
-                    'ttl': int((datetime.now().timestamp() + (365 * 24 * 60 * 60)))  # 1 year TTL
-                }
+                    # Create item for DynamoDB (typed attributes for the low-level client)
+                    item = MeterMeasurement(
+                        device_id=device_uid,
+                        timestamp=unique_timestamp,  # Use unique timestamp as sort key
+                        iso_timestamp=iso_timestamp,
+                        obis_code=obis_code,
+                        measurement_name=obis_info['name'],
+                        description=obis_info['description'],
+                        unit=obis_info['unit'],
+                        value=value,
+                        collection_time=datetime.now().isoformat(),
+                        ttl=int((datetime.now().timestamp() + (365 * 24 * 60 * 60)))  # 1 year TTL
+                    ).to_typed_item()
                 
                 # Store in DynamoDB
-                table.put_item(Item=item)
+                with stage('dynamodb_write'):
+                    dynamodb.put_item(TableName=table_name, Item=item)
                 stored_count += 1
+                latest_iso_timestamp = max(latest_iso_timestamp or iso_timestamp, iso_timestamp)
                 
                 print(f"Stored measurement: {obis_info['description']} = {value} {obis_info['unit']} at {iso_timestamp}")
                 
@@ -135,6 +144,11 @@ def lambda_handler(event, context):
         
         print(f"Successfully stored {stored_count} measurements")
         
+        # Keep the device registry current
+        if latest_iso_timestamp:
+            with stage('registry'):
+                register_key(table_name, device_uid, latest_iso_timestamp)
+        
         return {
             'statusCode': 200,
             'body': json.dumps({
@@ -1,15 +1,29 @@
 import json
-import boto3
 import requests
 import os
 from datetime import datetime, timezone
-from decimal import Decimal
-import dateutil.parser
+from device_registry import register_key
+from dynamodb_client import get_client, is_condition_failure
+from records import PriceEntry
+from stage_timer import instrumented, stage
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('EPEXSpotPrices')
+# DynamoDB client is created on the first write (dynamodb_client.py)
+table_name = 'EPEXSpotPrices'
 
+def parse_date(date_str):
+    """
+    Parse a smartENERGY date string ('2025-06-01T00:15:00+02:00')
+    
+    datetime.fromisoformat handles the API's ISO 8601 format in about a
+    microsecond; anything else falls back to dateutil (imported only then).
+    """
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        import dateutil.parser
+        return dateutil.parser.parse(date_str)
+
+@instrumented('epex-spot-collector')
 def lambda_handler(event, context):
     """
     Lambda function to fetch EPEX Spot prices from smartENERGY API and store in DynamoDB
@@ -30,11 +44,13 @@ def lambda_handler(event, context):
         print(f"Fetching EPEX Spot prices from smartENERGY API")
         
         # Make API request
-        response = requests.get(api_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        with stage('http'):
+            response = requests.get(api_url, headers=headers, timeout=30)
+            response.raise_for_status()
         
         # Parse JSON response
-        price_data = response.json()
+        with stage('parse'):
+            price_data = response.json()
         
         if not price_data or 'data' not in price_data:
             print("No price data received from API")
@@ -50,63 +66,79 @@ def lambda_handler(event, context):
         
         print(f"Processing {tariff} prices in {unit} with {interval}-minute intervals")
         
+        # DynamoDB client (created by the first invocation of a container)
+        with stage('client_init'):
+            dynamodb = get_client()
+        
         # Process and store each price entry
         stored_count = 0
+        earliest_timestamp_ms = latest_timestamp_ms = None
         for price_entry in price_data['data']:
             try:
-                # Extract price data
-                date_str = price_entry.get('date')
-                value = price_entry.get('value')
-                
-                if not all([date_str, value is not None]):
-                    print(f"Skipping incomplete price entry: {price_entry}")
-                    continue
+                with stage('convert'):
+                    # Extract price data
+                    date_str = price_entry.get('date')
+                    value = price_entry.get('value')
                 
-                # Parse the date string to datetime object
-                dt = dateutil.parser.parse(date_str)
+                    if not all([date_str, value is not None]):
+                        print(f"Skipping incomplete price entry: {price_entry}")
+                        continue
                 
-                # Convert to Unix timestamp (milliseconds) for consistency with energyLIVE data
-                timestamp_ms = int(dt.timestamp() * 1000)
+                    # Parse the date string to datetime object
+                    dt = parse_date(date_str)
                 
-                # Create ISO timestamp for readability
-                iso_timestamp = dt.isoformat()
+                    # Convert to Unix timestamp (milliseconds) for consistency with energyLIVE data
+                    timestamp_ms = int(dt.timestamp() * 1000)
+                    earliest_timestamp_ms = min(earliest_timestamp_ms or timestamp_ms, timestamp_ms)
+                    latest_timestamp_ms = max(latest_timestamp_ms or timestamp_ms, timestamp_ms)
                 
-                # Convert price to Decimal for DynamoDB
-                decimal_value = Decimal(str(value))
+                    # Create ISO timestamp for readability
+                    iso_timestamp = dt.isoformat()
                 
-                # Create item for DynamoDB
-                item = {
-                    'tariff': tariff,
-                    'timestamp': timestamp_ms,  # Primary sort key
-                    'iso_timestamp': iso_timestamp,
-                    'date_local': date_str,  # Original date string with timezone
-                    'price': decimal_value,
-                    'unit': unit,
-                    'interval_minutes': interval,
-                    'collection_time': datetime.now().isoformat(),
-                    'ttl': int((datetime.now().timestamp() + (365 * 24 * 60 * 60)))  # 1 year TTL
-                }
+                    # Create item for DynamoDB (typed attributes for the low-level client)
+                    item = PriceEntry(
+                        tariff=tariff,
+                        timestamp=timestamp_ms,  # Primary sort key
+                        iso_timestamp=iso_timestamp,
+                        date_local=date_str,  # Original date string with timezone
+                        price=value,
+                        unit=unit,
+                        interval_minutes=interval,
+                        collection_time=datetime.now().isoformat(),
+                        ttl=int((datetime.now().timestamp() + (365 * 24 * 60 * 60)))  # 1 year TTL
+                    ).to_typed_item()
                 
                 # Store in DynamoDB (use conditional write to avoid duplicates)
-                table.put_item(
-                    Item=item,
-                    ConditionExpression='attribute_not_exists(#ts)',
-                    ExpressionAttributeNames={'#ts': 'timestamp'}
-                )
+                with stage('dynamodb_write'):
+                    dynamodb.put_item(
+                        TableName=table_name,
+                        Item=item,
+                        ConditionExpression='attribute_not_exists(#ts)',
+                        ExpressionAttributeNames={'#ts': 'timestamp'}
+                    )
                 stored_count += 1
                 
                 print(f"Stored price: {value} {unit} for {iso_timestamp}")
                 
-            except boto3.client('dynamodb').exceptions.ConditionalCheckFailedException:
-                # Item already exists, skip
-                print(f"Price for {date_str} already exists, skipping")
-                continue
             except Exception as e:
-                print(f"Error processing price entry {price_entry}: {str(e)}")
+                if is_condition_failure(e):
+                    # Item already exists, skip
+                    print(f"Price for {date_str} already exists, skipping")
+                else:
+                    print(f"Error processing price entry {price_entry}: {str(e)}")
                 continue
         
         print(f"Successfully stored {stored_count} new price entries")
         
+        # Keep the tariff registry current (delivery time of the latest price, UTC;
+        # a new tariff starts at its earliest price, not at tomorrow's last slot)
+        if latest_timestamp_ms is not None:
+            earliest_utc = datetime.fromtimestamp(earliest_timestamp_ms / 1000, tz=timezone.utc)
+            latest_utc = datetime.fromtimestamp(latest_timestamp_ms / 1000, tz=timezone.utc)
+            with stage('registry'):
+                register_key(table_name, tariff, latest_utc.strftime('%Y-%m-%dT%H:%M:%S'),
+                             first_seen_at=earliest_utc.strftime('%Y-%m-%dT%H:%M:%S'))
+        
         return {
             'statusCode': 200,
             'body': json.dumps({
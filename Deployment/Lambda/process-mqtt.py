@@ -1,14 +1,18 @@
 import json
-import boto3
 import os
 from datetime import datetime
-from decimal import Decimal
+from anomaly_detection import observe
+from device_registry import register_key
+from data_coverage import mark_minute
+from dynamodb_client import get_client
+from records import SensorReading
+from stage_timer import instrumented, stage
+from timestamp_format import ensure_microsecond_timestamp
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+# DynamoDB client is created on the first write (dynamodb_client.py)
 table_name = os.environ.get('DYNAMODB_TABLE', 'SensorData')
-table = dynamodb.Table(table_name)
 
+@instrumented('process-mqtt')
 def lambda_handler(event, context):
     """
     Process Tasmota MQTT messages containing energy data
@@ -20,19 +24,20 @@ def lambda_handler(event, context):
     print(f"Received event: {json.dumps(event, default=str)}")
     
     try:
-        # Extract topic to get device name
-        topic = event.get('topic', '')
-        device_name = extract_device_name(topic)
-        
-        # Get timestamps
-        device_time = event.get('Time', '')
-        aws_timestamp_raw = event.get('aws_timestamp', datetime.now())
-        
-        # Ensure timestamp always has microseconds format for SQL compatibility
-        aws_timestamp = ensure_microsecond_timestamp(aws_timestamp_raw)
-        
-        # Extract energy data if present
-        energy_data = event.get('ENERGY', {})
+        with stage('parse'):
+            # Extract topic to get device name
+            topic = event.get('topic', '')
+            device_name = extract_device_name(topic)
+            
+            # Get timestamps
+            device_time = event.get('Time', '')
+            aws_timestamp_raw = event.get('aws_timestamp', datetime.now())
+            
+            # Ensure timestamp always has microseconds format for SQL compatibility
+            aws_timestamp = ensure_microsecond_timestamp(aws_timestamp_raw)
+            
+            # Extract energy data if present
+            energy_data = event.get('ENERGY', {})
         
         if not energy_data:
             print("No ENERGY data found in message, skipping...")
@@ -41,31 +46,26 @@ def lambda_handler(event, context):
                 'body': json.dumps('No energy data to process')
             }
         
-        # Convert float values to Decimal for DynamoDB
-        item = {
-            'device_id': device_name,
-            'timestamp': aws_timestamp,  # Timestamp with microseconds format: YYYY-MM-DDTHH:MM:SS.ffffff
-            'device_time': device_time,
-            'total_energy': convert_to_decimal(energy_data.get('Total', 0)),
-            'today_energy': convert_to_decimal(energy_data.get('Today', 0)),
-            'yesterday_energy': convert_to_decimal(energy_data.get('Yesterday', 0)),
-            'current_power': convert_to_decimal(energy_data.get('Power', 0)),
-            'apparent_power': convert_to_decimal(energy_data.get('ApparentPower', 0)),
-            'reactive_power': convert_to_decimal(energy_data.get('ReactivePower', 0)),
-            'power_factor': convert_to_decimal(energy_data.get('Factor', 0)),
-            'voltage': convert_to_decimal(energy_data.get('Voltage', 0)),
-            'current': convert_to_decimal(energy_data.get('Current', 0)),
-            'period': convert_to_decimal(energy_data.get('Period', 0)),
-            'total_start_time': energy_data.get('TotalStartTime', '')
-        }
+        # Numbers are written as DynamoDB number strings when the item is built
+        with stage('convert'):
+            reading = SensorReading.from_tasmota(device_name, aws_timestamp, device_time, energy_data,
+                                                 event.get('ANALOG'))
+            item = reading.to_typed_item()
         
-        # Add analog data if present
-        analog_data = event.get('ANALOG', {})
-        if analog_data:
-            item['analog_a0'] = convert_to_decimal(analog_data.get('A0', 0))
+        # Store in DynamoDB (the first write of a container also creates the client)
+        with stage('client_init'):
+            dynamodb = get_client()
+        with stage('dynamodb_write'):
+            dynamodb.put_item(TableName=table_name, Item=item)
         
-        # Store in DynamoDB
-        response = table.put_item(Item=item)
+        # Keep the device registry and coverage index current (throttled per warm container)
+        with stage('registry'):
+            register_key(table_name, device_name, aws_timestamp)
+            mark_minute(device_name, aws_timestamp)
+        
+        # Spike/flatline detectors on the power reading (state in warm container memory)
+        with stage('anomaly'):
+            observe(device_name, aws_timestamp, reading.current_power)
         
         print(f"Successfully stored data for device: {device_name}")
         
@@ -74,8 +74,8 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'message': 'Energy data processed successfully',
                 'device': device_name,
-                'power': float(energy_data.get('Power', 0)),
-                'total_energy': float(energy_data.get('Total', 0))
+                'power': reading.current_power,
+                'total_energy': reading.total_energy
             })
         }
         
@@ -98,43 +98,3 @@ def extract_device_name(topic):
         return 'unknown_device'
     except:
         return 'unknown_device'
-
-def ensure_microsecond_timestamp(timestamp_input):
-    """
-    Ensure timestamp is in microsecond format: YYYY-MM-DDTHH:MM:SS.ffffff
-    Accepts various input formats and normalizes them
-    """
-    try:
-        if isinstance(timestamp_input, (int, float)):
-            # Unix timestamp (milliseconds)
-            dt = datetime.fromtimestamp(timestamp_input / 1000)
-        elif isinstance(timestamp_input, str):
-            # ISO string - try to parse it
-            try:
-                dt = datetime.fromisoformat(timestamp_input.replace('Z', '+00:00'))
-            except:
-                # If parsing fails, use current time
-                dt = datetime.now()
-        elif isinstance(timestamp_input, datetime):
-            # Already a datetime object
-            dt = timestamp_input
-        else:
-            # Fallback to current time
-            dt = datetime.now()
-        
-        # Return formatted string with microseconds
-        return dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
-    except:
-        # Ultimate fallback
-        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
-
-def convert_to_decimal(value):
-    """
-    Convert numeric values to Decimal for DynamoDB compatibility
-    """
-    try:
-        if value is None:
-            return Decimal('0')
-        return Decimal(str(value))
-    except:
-        return Decimal('0')
\ No newline at end of file
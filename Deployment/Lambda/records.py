@@ -0,0 +1,441 @@
+"""
+Compact record types shared by the Lambdas, scripts and analysis
+
+Readings, prices and meter measurements move through the code as __slots__
+records (one reading) or columnar batches (many readings) instead of boto3
+dicts of Decimal values:
+
+- SensorReading / SensorBatch: SensorData items (Tasmota readings)
+- PriceEntry / PriceBatch: EPEXSpotPrices items
+- MeterMeasurement / MeasurementBatch: EnergyLiveData items (OBIS registers)
+
+Numbers are held as float (int for epoch-ms keys, intervals and TTLs) and are
+converted only when an item is written (Decimal for resource items, number
+strings for the typed items the Lambdas write). Batches keep numeric
+columns in array.array and string columns in lists, so np.asarray(column) is
+a zero-copy float64/int64 view (copy it with np.array before extending the
+batch again).
+
+Converters exist for both DynamoDB item formats:
+- resource items (boto3.resource Table): {'current_power': Decimal('172.5')}
+- typed items (boto3.client, DynamoDB JSON): {'current_power': {'N': '172.5'}};
+  numbers are parsed straight from their string form, without Decimal
+
+Attributes missing from an item (projections, optional fields such as
+analog_a0) are None on records, and None / NaN / MISSING_INT in batch
+columns; they are left out again when items are written.
+
+Only the standard library is used, so the module is packaged with the Lambda
+functions; the analysis scripts and benchmarks import it from this directory
+(as the maintenance scripts do with timestamp_format.py).
+"""
+
+from array import array
+from decimal import Decimal
+
+STRING, FLOAT, INT = 'S', 'F', 'I'
+ARRAY_TYPES = {FLOAT: 'd', INT: 'q'}
+
+NAN = float('nan')
+MISSING_INT = -2 ** 63  # Missing value of integer batch columns
+
+# SensorData attribute -> Tasmota ENERGY field
+TASMOTA_ENERGY_FIELDS = {
+    'total_energy': 'Total',
+    'today_energy': 'Today',
+    'yesterday_energy': 'Yesterday',
+    'current_power': 'Power',
+    'apparent_power': 'ApparentPower',
+    'reactive_power': 'ReactivePower',
+    'power_factor': 'Factor',
+    'voltage': 'Voltage',
+    'current': 'Current',
+    'period': 'Period'
+}
+
+
+def _number(value) -> float:
+    """Tasmota value as float; missing or unparsable values become 0 (as stored before)"""
+    try:
+        return 0.0 if value is None else float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(repr(value))
+
+
+class Record:
+    """Base class of the slotted record types; FIELDS lists (attribute, kind) in item order"""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, **values):
+        unknown = values.keys() - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no field(s) {sorted(unknown)}")
+        for name, kind in self.FIELDS:
+            value = values.get(name)
+            if value is not None and kind is not STRING:
+                value = float(value) if kind is FLOAT else int(value)
+            setattr(self, name, value)
+
+    @classmethod
+    def from_item(cls, item: dict) -> 'Record':
+        """Record from a resource item (Decimal numbers)"""
+        return cls(**{name: item[name] for name, _ in cls.FIELDS if name in item})
+
+    @classmethod
+    def from_typed_item(cls, item: dict) -> 'Record':
+        """Record from a typed item ({'S': ...} / {'N': ...} values)"""
+        return cls(**{name: next(iter(item[name].values())) for name, _ in cls.FIELDS if name in item})
+
+    def to_item(self) -> dict:
+        """Resource item for Table.put_item (numbers as Decimal, missing attributes left out)"""
+        item = {}
+        for name, kind in self.FIELDS:
+            value = getattr(self, name)
+            if value is None or value != value:
+                continue
+            item[name] = _decimal(value) if kind is FLOAT else value
+        return item
+
+    def to_typed_item(self) -> dict:
+        """Typed item for the low-level client (PutItem, BatchWriteItem)"""
+        item = {}
+        for name, kind in self.FIELDS:
+            value = getattr(self, name)
+            if value is None or value != value:
+                continue
+            item[name] = {'S': value} if kind is STRING else {'N': repr(value)}
+        return item
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__
+                           if getattr(self, name) is not None)
+        return f"{type(self).__name__}({fields})"
+
+
+class SensorReading(Record):
+    """One SensorData item (Tasmota SENSOR message as stored by process-mqtt.py)"""
+
+    FIELDS = (
+        ('device_id', STRING),
+        ('timestamp', STRING),
+        ('device_time', STRING),
+        *((name, FLOAT) for name in TASMOTA_ENERGY_FIELDS),
+        ('total_start_time', STRING),
+        ('analog_a0', FLOAT)
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+    @classmethod
+    def from_tasmota(cls, device_id: str, timestamp: str, device_time: str, energy: dict,
+                     analog: dict = None) -> 'SensorReading':
+        """
+        Reading from the parts of a Tasmota SENSOR message
+
+        Args:
+            device_id: Device name from the MQTT topic
+            timestamp: Normalized sort key (YYYY-MM-DDTHH:MM:SS.ffffff, UTC)
+            device_time: Device-local 'Time' of the message
+            energy: The message's ENERGY object
+            analog: The message's ANALOG object, if any
+        """
+        reading = cls.__new__(cls)
+        reading.device_id = device_id
+        reading.timestamp = timestamp
+        reading.device_time = device_time
+        for name, field in TASMOTA_ENERGY_FIELDS.items():
+            setattr(reading, name, _number(energy.get(field, 0)))
+        reading.total_start_time = energy.get('TotalStartTime', '')
+        reading.analog_a0 = _number(analog.get('A0', 0)) if analog else None
+        return reading
+
+
+class PriceEntry(Record):
+    """One EPEXSpotPrices item (price slot as stored by epex-spot-collector.py)"""
+
+    FIELDS = (
+        ('tariff', STRING),
+        ('timestamp', INT),
+        ('iso_timestamp', STRING),
+        ('date_local', STRING),
+        ('price', FLOAT),
+        ('unit', STRING),
+        ('interval_minutes', INT),
+        ('collection_time', STRING),
+        ('ttl', INT)
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class MeterMeasurement(Record):
+    """One EnergyLiveData item (OBIS register value as stored by energylive-api-collector.py)"""
+
+    FIELDS = (
+        ('device_id', STRING),
+        ('timestamp', INT),
+        ('iso_timestamp', STRING),
+        ('obis_code', STRING),
+        ('measurement_name', STRING),
+        ('description', STRING),
+        ('unit', STRING),
+        ('value', FLOAT),
+        ('collection_time', STRING),
+        ('ttl', INT)
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+def _missing(kind: str):
+    return None if kind is STRING else NAN if kind is FLOAT else MISSING_INT
+
+
+def _int_column(values: list) -> array:
+    try:
+        return array('q', [MISSING_INT if v is None else int(v) for v in values])
+    except ValueError:
+        # Typed items may carry integral numbers as '15.0'
+        return array('q', [MISSING_INT if v is None else int(Decimal(v)) for v in values])
+
+
+class Batch:
+    """
+    Base class of the columnar batches
+
+    One column per record field, named like the field: a list for strings,
+    array('d') for floats, array('q') for integers.
+    """
+
+    __slots__ = ()
+    RECORD = Record
+
+    def __init__(self):
+        for name, kind in self.RECORD.FIELDS:
+            setattr(self, name, [] if kind is STRING else array(ARRAY_TYPES[kind]))
+
+    def __len__(self):
+        return len(getattr(self, self.RECORD.FIELDS[0][0]))
+
+    def __getitem__(self, index: int) -> Record:
+        record = self.RECORD.__new__(self.RECORD)
+        for name, kind in self.RECORD.FIELDS:
+            value = getattr(self, name)[index]
+            if value != value or (kind is INT and value == MISSING_INT):
+                value = None
+            setattr(record, name, value)
+        return record
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @classmethod
+    def from_items(cls, items, require=()) -> 'Batch':
+        """Batch from resource items (see extend_items)"""
+        batch = cls()
+        batch.extend_items(items, require)
+        return batch
+
+    @classmethod
+    def from_typed_items(cls, items, require=()) -> 'Batch':
+        """Batch from typed items (see extend_typed_items)"""
+        batch = cls()
+        batch.extend_typed_items(items, require)
+        return batch
+
+    @classmethod
+    def from_records(cls, records) -> 'Batch':
+        batch = cls()
+        for record in records:
+            batch.append(record)
+        return batch
+
+    @classmethod
+    def from_columns(cls, length: int = None, **columns) -> 'Batch':
+        """
+        Batch from column sequences (lists, arrays, NumPy arrays)
+
+        Columns not given are filled with missing values; a scalar string
+        column value (e.g. tariff='EPEXSPOTAT') is repeated.
+        """
+        batch = cls()
+        if length is None:
+            length = next((len(v) for v in columns.values() if not isinstance(v, str)), 0)
+        for name, kind in cls.RECORD.FIELDS:
+            values = columns.get(name)
+            column = getattr(batch, name)
+            if values is None:
+                column.extend([None] * length if kind is STRING else array(ARRAY_TYPES[kind], [_missing(kind)]) * length)
+                continue
+            if isinstance(values, str):
+                values = [values] * length
+            elif len(values) != length:
+                raise ValueError(f"Column {name} has {len(values)} values, expected {length}")
+            if kind is STRING:
+                column.extend(values)
+            elif hasattr(values, 'astype'):
+                # NumPy array: copied as bytes instead of converted value by value
+                column.frombytes(values.astype(ARRAY_TYPES[kind]).tobytes())
+            else:
+                column.extend(array(ARRAY_TYPES[kind], values))
+        return batch
+
+    def append(self, record: Record) -> None:
+        for name, kind in self.RECORD.FIELDS:
+            value = getattr(record, name)
+            getattr(self, name).append(_missing(kind) if value is None else value)
+
+    def extend(self, other: 'Batch') -> None:
+        for name, _ in self.RECORD.FIELDS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def _extend_values(self, items: list, value_of) -> None:
+        present = set().union(*items) if items else set()
+        for name, kind in self.RECORD.FIELDS:
+            column = getattr(self, name)
+            if name not in present:
+                column.extend(array(ARRAY_TYPES[kind], [_missing(kind)]) * len(items)
+                              if kind is not STRING else [None] * len(items))
+                continue
+            values = value_of(items, name)
+            if kind is STRING:
+                column.extend(values)
+            elif kind is FLOAT:
+                column.extend(array('d', [NAN if v is None else float(v) for v in values]))
+            else:
+                column.extend(_int_column(values))
+
+    def extend_items(self, items, require=()) -> int:
+        """
+        Append resource items (e.g. one query page of Table.query)
+
+        Args:
+            items: Item dicts with Decimal numbers
+            require: Attributes an item must have to be appended
+
+        Returns:
+            Number of items appended
+        """
+        items = [item for item in items if all(name in item for name in require)] if require else list(items)
+        self._extend_values(items, lambda items, name: [item.get(name) for item in items])
+        return len(items)
+
+    def extend_typed_items(self, items, require=()) -> int:
+        """Append typed items (e.g. one page of client.query); see extend_items"""
+        items = [item for item in items if all(name in item for name in require)] if require else list(items)
+
+        def value_of(items, name):
+            return [next(iter(value.values())) if value is not None else None
+                    for value in (item.get(name) for item in items)]
+        self._extend_values(items, value_of)
+        return len(items)
+
+    def _has_missing(self, name: str, kind: str) -> bool:
+        column = getattr(self, name)
+        if kind is STRING:
+            return None in column
+        if kind is INT:
+            return MISSING_INT in column
+        total = sum(column)  # NaN if any value is NaN (or on inf - inf, which only costs the slow path)
+        return total != total
+
+    def _item_columns(self, typed: bool):
+        """Attribute names and value columns (None where missing); all-missing columns are dropped"""
+        names, columns, complete = [], [], True
+        for name, kind in self.RECORD.FIELDS:
+            column = getattr(self, name)
+            missing = self._has_missing(name, kind)
+            if kind is STRING:
+                values = [None if v is None else {'S': v} for v in column] if typed else column
+            elif kind is FLOAT:
+                # Readings repeat values (voltage, factor, rounded power), so each
+                # distinct value is converted once; NaN is never a key and maps to None
+                numbers = {v: repr(v) for v in set(column) if v == v}
+                if typed:
+                    values = [None if v not in numbers else {'N': numbers[v]} for v in column]
+                else:
+                    decimals = {v: Decimal(text) for v, text in numbers.items()}
+                    values = [decimals.get(v) for v in column]
+            else:
+                values = [None if v == MISSING_INT else ({'N': str(v)} if typed else v) for v in column]
+            if missing and all(v is None for v in values):
+                continue
+            names.append(name)
+            columns.append(values)
+            complete = complete and not missing
+        return names, columns, complete
+
+    def _rows_to_items(self, typed: bool) -> list:
+        names, columns, complete = self._item_columns(typed)
+        if complete:
+            return [dict(zip(names, row)) for row in zip(*columns)]
+        return [{name: value for name, value in zip(names, row) if value is not None} for row in zip(*columns)]
+
+    def to_items(self) -> list:
+        """Resource items for Table.put_item / batch_writer (numbers as Decimal)"""
+        return self._rows_to_items(typed=False)
+
+    def to_typed_items(self) -> list:
+        """Typed items for the low-level client (BatchWriteItem)"""
+        return self._rows_to_items(typed=True)
+
+    def to_dicts(self) -> list:
+        """Plain dicts (str/float/int) for JSON output, missing attributes left out"""
+        return [{name: getattr(record, name) for name in record.__slots__ if getattr(record, name) is not None}
+                for record in self]
+
+    def columns(self, names=None) -> dict:
+        """Columns by name, e.g. for writers.TableWriter.write_columns"""
+        return {name: getattr(self, name) for name in (names or self.RECORD.__slots__)}
+
+    def present(self, name: str) -> 'Batch':
+        """Rows where attribute 'name' is present (the batch itself if it never is missing)"""
+        kind = dict(self.RECORD.FIELDS)[name]
+        if not self._has_missing(name, kind):
+            return self
+        column = getattr(self, name)
+        if kind is STRING:
+            keep = [i for i, v in enumerate(column) if v is not None]
+        elif kind is FLOAT:
+            keep = [i for i, v in enumerate(column) if v == v]
+        else:
+            keep = [i for i, v in enumerate(column) if v != MISSING_INT]
+        return self.take(keep)
+
+    def take(self, indices) -> 'Batch':
+        """New batch with the rows at 'indices', in that order"""
+        batch = type(self)()
+        for name, kind in self.RECORD.FIELDS:
+            column = getattr(self, name)
+            values = [column[i] for i in indices]
+            getattr(batch, name).extend(values if kind is STRING else array(ARRAY_TYPES[kind], values))
+        return batch
+
+
+class SensorBatch(Batch):
+    """Columnar SensorData readings"""
+
+    __slots__ = SensorReading.__slots__
+    RECORD = SensorReading
+
+
+class PriceBatch(Batch):
+    """Columnar EPEXSpotPrices slots"""
+
+    __slots__ = PriceEntry.__slots__
+    RECORD = PriceEntry
+
+
+class MeasurementBatch(Batch):
+    """Columnar EnergyLiveData measurements"""
+
+    __slots__ = MeterMeasurement.__slots__
+    RECORD = MeterMeasurement
@@ -0,0 +1,159 @@
+"""
+Per-stage timing of the Lambda hot paths, emitted as CloudWatch Embedded Metric Format
+
+Handlers are wrapped with @instrumented and mark their stages with
+'with stage(...)'. Stage times of one invocation are summed per stage (a
+collector writes many price slots, each one a 'dynamodb_write') and printed
+as a single EMF log line when the handler returns, e.g.
+
+    {"_aws": {"Timestamp": ..., "CloudWatchMetrics": [{"Namespace": "energy-monitoring",
+      "Dimensions": [["Function"]], "Metrics": [{"Name": "http_ms", "Unit": "Milliseconds"}, ...]}]},
+     "Function": "epex-spot-collector", "http_ms": 182.4, "dynamodb_write_ms": 95.1, "total_ms": 301.7,
+     "dynamodb_write_count": 96, "ColdStart": false, "RequestId": "...", "StatusCode": 200}
+
+CloudWatch turns the line into metrics without any PutMetricData call; the
+stage counts, cold-start flag, request id and status code are plain log properties
+(searchable in Logs Insights, no metric cost). Scripts/stage_metrics.py
+aggregates these lines into p50/p95/p99 per stage. Time outside every stage
+(total_ms minus the stage sum) shows up there as 'unstaged'.
+
+Overhead is two perf_counter_ns calls per stage and one log line per
+invocation, about 15 microseconds for a four-stage handler (lambda.stage_timer
+benchmark) against milliseconds for one DynamoDB write, so it stays on in
+production. STAGE_METRICS=0 disables it; stage() then returns a shared no-op
+context manager.
+"""
+
+import functools
+import json
+import json.encoder
+import os
+import time
+
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'energy-monitoring')
+ENABLED = os.environ.get('STAGE_METRICS', '1') != '0'
+
+_current = None   # StageTimer of the running invocation
+_cold_start = True
+_emf_prefixes = {}  # stage names -> serialized '_aws' metadata up to the timestamp
+_quote = json.encoder.encode_basestring_ascii
+
+
+class StageTimer:
+    """Stage durations (ns) and counts of one invocation"""
+
+    __slots__ = ('function', 'durations', 'counts', 'started')
+
+    def __init__(self, function):
+        self.function = function
+        self.durations = {}
+        self.counts = {}
+        self.started = time.perf_counter_ns()
+
+    def add(self, name, duration_ns):
+        self.durations[name] = self.durations.get(name, 0) + duration_ns
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def emf_line(self, status_code=None, cold_start=False, request_id=None):
+        """The EMF log line of this invocation (total_ms covers the whole handler)"""
+        total_ns = time.perf_counter_ns() - self.started
+        stages = tuple(self.durations)
+        prefix = _emf_prefixes.get(stages)
+        if prefix is None:
+            # The metric definitions only depend on the stage set; serialize them once
+            metadata = {
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Function']],
+                    'Metrics': [{'Name': f"{name}_ms", 'Unit': 'Milliseconds'} for name in (*stages, 'total')]
+                }]
+            }
+            prefix = _emf_prefixes[stages] = '{"_aws":' + json.dumps(metadata, separators=(',', ':'))[:-1] + ',"Timestamp":'
+
+        # Values are numbers, booleans and escaped strings; formatting them directly
+        # is several times cheaper than a JSON encoder call
+        parts = [prefix, str(int(time.time() * 1000)), '},"Function":', _quote(self.function)]
+        for name, duration_ns in self.durations.items():
+            parts.append(f',"{name}_ms":{duration_ns / 1e6:.3f}')
+        parts.append(f',"total_ms":{total_ns / 1e6:.3f}')
+        for name, count in self.counts.items():
+            if count > 1:
+                parts.append(f',"{name}_count":{count}')
+        parts.append(',"ColdStart":true' if cold_start else ',"ColdStart":false')
+        if request_id:
+            parts.append(f',"RequestId":{_quote(request_id)}')
+        if isinstance(status_code, int):
+            parts.append(f',"StatusCode":{status_code}')
+        parts.append('}')
+        return ''.join(parts)
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Failed stages are timed too (e.g. a conditional put that finds a duplicate)
+        self.timer.add(self.name, time.perf_counter_ns() - self.started)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name):
+    """
+    Time a block as stage 'name' of the running invocation
+
+    Outside an @instrumented handler (or with STAGE_METRICS=0) this is a no-op.
+    """
+    timer = _current
+    if timer is None:
+        return _NO_STAGE
+    return _Stage(timer, name)
+
+
+def instrumented(function):
+    """
+    Decorator for lambda_handler: time the invocation and emit one EMF line
+
+    Args:
+        function: Function dimension of the metrics (e.g. 'process-mqtt')
+    """
+    def decorate(handler):
+        if not ENABLED:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _current, _cold_start
+            timer = _current = StageTimer(function)
+            result = None
+            try:
+                result = handler(event, context)
+                return result
+            finally:
+                _current = None
+                cold_start, _cold_start = _cold_start, False
+                status_code = result.get('statusCode') if isinstance(result, dict) else None
+                request_id = getattr(context, 'aws_request_id', None)
+                print(timer.emf_line(status_code, cold_start, request_id))
+        return wrapper
+    return decorate
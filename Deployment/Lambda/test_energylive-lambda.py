@@ -12,14 +12,11 @@ from unittest.mock import patch, MagicMock
 def mock_aws_services():
     """Mock AWS services for local testing"""
     
-    # Mock DynamoDB
-    mock_table = MagicMock()
-    mock_table.put_item.return_value = {'ResponseMetadata': {'HTTPStatusCode': 200}}
+    # Mock DynamoDB (low-level client, created by dynamodb_client.get_client)
+    mock_client = MagicMock()
+    mock_client.put_item.return_value = {'ResponseMetadata': {'HTTPStatusCode': 200}}
     
-    mock_dynamodb = MagicMock()
-    mock_dynamodb.Table.return_value = mock_table
-    
-    return mock_table, mock_dynamodb
+    return mock_client
 
 def test_lambda_function():
     """Test the Lambda function with mock data"""
@@ -58,11 +55,11 @@ def test_lambda_function():
     mock_response.raise_for_status.return_value = None
     
     # Mock AWS services
-    mock_table, mock_dynamodb = mock_aws_services()
+    mock_client = mock_aws_services()
     
     # Import and test the function with mocks
     with patch('requests.get', return_value=mock_response), \
-         patch('boto3.resource', return_value=mock_dynamodb):
+         patch('boto3.client', return_value=mock_client):
         
         # Import the function after setting up mocks
         from energylive_api_collector import lambda_handler
@@ -75,13 +72,13 @@ def test_lambda_function():
         print(json.dumps(result, indent=2))
         
         # Verify DynamoDB calls
-        print(f"\nDynamoDB put_item called {mock_table.put_item.call_count} times")
+        print(f"\nDynamoDB put_item called {mock_client.put_item.call_count} times")
         
         # Print the items that would be stored
         print("\nItems that would be stored in DynamoDB:")
-        for call in mock_table.put_item.call_args_list:
-            item = call[1]['Item']  # Get the Item from kwargs
-            print(f"- {item['measurement_type']}: {item['value']} at {item['iso_timestamp']}")
+        for call in mock_client.put_item.call_args_list:
+            item = call[1]['Item']  # Get the typed Item from kwargs
+            print(f"- {item['measurement_name']['S']}: {item['value']['N']} at {item['iso_timestamp']['S']}")
         
         return result
 
@@ -101,9 +98,9 @@ def test_error_handling():
     if 'DEVICE_UID' in os.environ:
         del os.environ['DEVICE_UID']
     
-    mock_table, mock_dynamodb = mock_aws_services()
+    mock_client = mock_aws_services()
     
-    with patch('boto3.resource', return_value=mock_dynamodb):
+    with patch('boto3.client', return_value=mock_client):
         from energylive_api_collector import lambda_handler
         
         result = lambda_handler({}, {})
@@ -123,7 +120,7 @@ def test_error_handling():
     mock_response.raise_for_status.side_effect = Exception("API Error")
     
     with patch('requests.get', return_value=mock_response), \
-         patch('boto3.resource', return_value=mock_dynamodb):
+         patch('boto3.client', return_value=mock_client):
         
         result = lambda_handler({}, {})
         print(f"Result: {result}")
@@ -0,0 +1,41 @@
+"""
+SensorData timestamp format shared by the MQTT Lambda and maintenance scripts
+
+The SensorData sort key is always stored with microseconds
+(YYYY-MM-DDTHH:MM:SS.ffffff) for SQL query compatibility. process-mqtt.py
+normalizes incoming timestamps with ensure_microsecond_timestamp; the bulk
+migration in Scripts/migrateTimestamps.py rewrites historical keys with the
+same function.
+"""
+
+from datetime import datetime
+
+
+def ensure_microsecond_timestamp(timestamp_input):
+    """
+    Ensure timestamp is in microsecond format: YYYY-MM-DDTHH:MM:SS.ffffff
+    Accepts various input formats and normalizes them
+    """
+    try:
+        if isinstance(timestamp_input, (int, float)):
+            # Unix timestamp (milliseconds)
+            dt = datetime.fromtimestamp(timestamp_input / 1000)
+        elif isinstance(timestamp_input, str):
+            # ISO string - try to parse it
+            try:
+                dt = datetime.fromisoformat(timestamp_input.replace('Z', '+00:00'))
+            except:
+                # If parsing fails, use current time
+                dt = datetime.now()
+        elif isinstance(timestamp_input, datetime):
+            # Already a datetime object
+            dt = timestamp_input
+        else:
+            # Fallback to current time
+            dt = datetime.now()
+        
+        # Return formatted string with microseconds
+        return dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    except:
+        # Ultimate fallback
+        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
@@ -0,0 +1,146 @@
+# This script backfills the DeviceRegistry table (Lambda/device_registry.py)
+# from the data already stored in a data table. The Lambdas only register keys
+# they ingest, so devices and tariffs that only have historical data are
+# missing from the registry until this has run once per table.
+#
+# Runs on the parallel maintenance engine (table_maintenance.py): the scan
+# reads only the primary keys, and every batch of keys moves first_seen back
+# and last_seen forward for its partition keys with conditional UpdateItems
+# (the same attributes the Lambdas write). Updates are idempotent, so an
+# interrupted run resumes from the checkpoint and a repeated run changes
+# nothing. Per partition key only bounds that extend what this run already
+# wrote are sent, so a scan costs about one registry update per batch.
+#
+# Numeric sort keys (epoch milliseconds in EPEXSpotPrices and EnergyLiveData,
+# read as Decimal) are registered as the UTC ISO string the collectors write
+# (YYYY-MM-DDTHH:MM:SS), so first_seen/last_seen compare and slice the same
+# way for every source table.
+#
+# Without --apply it only counts the scanned keys (dry run).
+#
+# Usage:
+#   python backfillRegistry.py                                  # dry run on SensorData
+#   python backfillRegistry.py --apply
+#   python backfillRegistry.py --apply --table EPEXSpotPrices
+#   python backfillRegistry.py --endpoint-url http://localhost:8000   # DynamoDB Local
+
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+from table_maintenance import MaintenancePlugin, call_with_retry, consumed_units, maintenance_parser, run_maintenance
+
+
+def registry_timestamp(sort_value):
+    """
+    Registry timestamp of a sort key value
+
+    ISO strings are used as they are; epoch milliseconds become the UTC
+    'YYYY-MM-DDTHH:MM:SS' string of Lambda/epex-spot-collector.py.
+    Returns None for other types.
+    """
+    if isinstance(sort_value, str):
+        return sort_value
+    if isinstance(sort_value, (int, Decimal)) and not isinstance(sort_value, bool):
+        return datetime.fromtimestamp(int(sort_value) / 1000, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    return None
+
+
+class RegistryBackfill(MaintenancePlugin):
+    """Registers every partition key of the scanned table with its first/last sort key"""
+
+    name = 'backfill-registry'
+
+    def __init__(self, registry_table='DeviceRegistry'):
+        """
+        Initialize the backfill
+
+        Args:
+            registry_table: Name of the registry table
+        """
+        self.registry_table = registry_table
+        self.written = {}  # key_id -> [first_seen, last_seen] already written by this run
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def match(self, item):
+        return registry_timestamp(item.get(self.sort_key_name)) is not None
+
+    def requests(self, item):
+        return []  # Registry updates are sent per batch in act(), not per item
+
+    def _update(self, client, source, key_id, attribute, value, condition, rate):
+        if rate:
+            rate.acquire()
+        try:
+            response = call_with_retry(
+                client.update_item, rate=rate,
+                TableName=self.registry_table,
+                Key={'source': source, 'key_id': key_id},
+                UpdateExpression=f'SET {attribute} = :ts, updated_at = :now',
+                ConditionExpression=f'attribute_not_exists({attribute}) OR {attribute} {condition} :ts',
+                ExpressionAttributeValues={':ts': value, ':now': datetime.utcnow().isoformat()},
+                ReturnConsumedCapacity='TOTAL'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            response = e.response  # Registry already has an earlier/later timestamp
+        if rate:
+            rate.record(consumed_units(response))
+        with self._lock:
+            self.updates += 1
+
+    def act(self, table, items, rate=None):
+        bounds = {}
+        for item in items:
+            key_id, seen_at = item[self.partition_key_name], registry_timestamp(item[self.sort_key_name])
+            first, last = bounds.get(key_id, (seen_at, seen_at))
+            bounds[key_id] = (min(first, seen_at), max(last, seen_at))
+
+        client = table.meta.client
+        for key_id, (first, last) in bounds.items():
+            with self._lock:
+                written = self.written.setdefault(key_id, [None, None])
+                send_first = written[0] is None or first < written[0]
+                send_last = written[1] is None or last > written[1]
+            if send_first:
+                self._update(client, table.name, key_id, 'first_seen', first, '>', rate)
+            if send_last:
+                self._update(client, table.name, key_id, 'last_seen', last, '<', rate)
+            with self._lock:
+                if send_first and (written[0] is None or first < written[0]):
+                    written[0] = first
+                if send_last and (written[1] is None or last > written[1]):
+                    written[1] = last
+        return len(items)
+
+
+def main():
+    parser = maintenance_parser('Backfill DeviceRegistry from the data in a table',
+                                checkpoint='backfillRegistry.checkpoint.json',
+                                apply_help='Write registry entries (default: dry run)', workers='Registry update',
+                                confirm=False, check_plan=False)
+    parser.add_argument('--registry-table', default='DeviceRegistry', help='Registry table name')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Scanned keys per registry update batch')
+    args = parser.parse_args()
+
+    plugin = RegistryBackfill(args.registry_table)
+
+    def report(result):
+        print(f"Registered {len(plugin.written)} {plugin.partition_key_name} value(s) of {args.table} "
+              f"in {args.registry_table} ({plugin.updates} updates)")
+        for key_id, (first_seen, last_seen) in sorted(plugin.written.items()):
+            print(f"  {key_id}: {first_seen} - {last_seen}")
+
+    run_maintenance(
+        args, plugin,
+        report=report,
+        dry_run_hint='run again with --apply to register the keys',
+        batch_size=args.batch_size
+    )
+
+if __name__ == '__main__':
+    main()
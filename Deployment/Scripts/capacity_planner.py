@@ -0,0 +1,317 @@
+# Read/write capacity planning for maintenance and analysis jobs.
+#
+# Predicts the capacity units a job will consume before it runs, from a small
+# sample of the table instead of a full pass:
+# - Scans (table_maintenance.py): item count and size from DescribeTable plus a
+#   sample of items from random scan segments; the sample also gives the share
+#   of items a plugin matches and the write units of its requests
+# - Queries (evaluate_energy_data.py, export_epex_data.py): the key range is cut
+#   into strata, each stratum is sampled with one small query, and the item
+#   density (items per second of sort key) is extrapolated to the whole range
+#
+# Capacity rules (https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/read-write-operations.html):
+# - Eventually consistent reads: 0.5 RCU per 4 KB read per request, based on
+#   the full item size even if a ProjectionExpression is used
+# - Writes/deletes: 1 WCU per 1 KB of item size, per item
+#
+# Wall-clock time is predicted at a chosen rate (units per second), by default
+# the table's max request units from terraform/dynamodb.tf. After the job,
+# compare() reports the prediction next to the actual ConsumedCapacity.
+
+import math
+import random
+from datetime import datetime
+
+from boto3.dynamodb.conditions import Key
+
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+PAGE_BYTES = 1024 * 1024  # Query/scan page limit
+
+# On-demand throughput caps per table (max_read_request_units, max_write_request_units)
+# from terraform/dynamodb.tf
+TABLE_LIMITS = {
+    'SensorData': (200, 10),
+    'EnergyLiveData': (100, 50),
+    'EPEXSpotPrices': (10, 10),
+    'DeviceRegistry': (10, 10),
+    'DataCoverage': (10, 10)
+}
+
+# Sort key codecs: (key -> epoch seconds, epoch seconds -> key)
+ISO_KEYS = (lambda key: datetime.fromisoformat(key).timestamp(),
+            lambda seconds: datetime.fromtimestamp(seconds).strftime('%Y-%m-%dT%H:%M:%S'))
+MILLISECOND_KEYS = (lambda key: int(key) / 1000,
+                    lambda seconds: int(seconds * 1000))
+
+
+def attribute_size(value):
+    """Approximate DynamoDB storage size of an attribute value in bytes"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (int, float)) or type(value).__name__ == 'Decimal':
+        # Numbers: about 1 byte per two significant digits plus 1
+        digits = len(str(value).lstrip('-').replace('.', '').lstrip('0')) or 1
+        return (digits + 1) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(len(name.encode('utf-8')) + attribute_size(item) + 1 for name, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(attribute_size(item) + 1 for item in value)
+    if isinstance(value, (set, frozenset)):
+        return sum(attribute_size(item) for item in value)
+    return len(str(value))
+
+
+def item_size(item):
+    """Approximate DynamoDB item size in bytes (attribute names plus values)"""
+    return sum(len(name.encode('utf-8')) + attribute_size(value) for name, value in item.items())
+
+
+def read_units(total_bytes, pages=1):
+    """Eventually consistent read units for reading total_bytes in the given number of requests"""
+    if total_bytes <= 0:
+        return 0.5 * pages
+    return max(math.ceil(total_bytes / READ_UNIT_BYTES), pages) * 0.5
+
+
+def write_units(size_bytes):
+    """Write units of one put/delete of an item of the given size"""
+    return max(1, math.ceil(size_bytes / WRITE_UNIT_BYTES))
+
+
+class CapacityEstimate:
+    """Predicted items and read/write units of a job"""
+
+    def __init__(self, label, items=0, read_units=0.0, write_units=0.0, item_bytes=0.0, notes=None,
+                 sampling_units=0.0):
+        """
+        Initialize the estimate
+
+        Args:
+            label: What is estimated (e.g. 'scan SensorData')
+            items: Predicted number of items read
+            read_units: Predicted read capacity units
+            write_units: Predicted write capacity units
+            item_bytes: Average item size in bytes
+            notes: List of caveats printed with the report
+            sampling_units: Read units spent on sampling for this estimate
+        """
+        self.label = label
+        self.items = items
+        self.read_units = read_units
+        self.write_units = write_units
+        self.item_bytes = item_bytes
+        self.notes = list(notes or [])
+        self.sampling_units = sampling_units
+
+    def add(self, other):
+        """Accumulate another estimate (e.g. one per workload period)"""
+        total_items = self.items + other.items
+        if total_items:
+            self.item_bytes = (self.item_bytes * self.items + other.item_bytes * other.items) / total_items
+        self.items = total_items
+        self.read_units += other.read_units
+        self.write_units += other.write_units
+        self.sampling_units += other.sampling_units
+        self.notes.extend(note for note in other.notes if note not in self.notes)
+        return self
+
+    def seconds(self, read_rate, write_rate=None):
+        """Capacity-bound wall-clock time; reads and writes are paced in parallel"""
+        read_seconds = self.read_units / read_rate if read_rate else 0.0
+        write_seconds = self.write_units / write_rate if write_rate and self.write_units else 0.0
+        return max(read_seconds, write_seconds)
+
+    def report(self, read_rate, write_rate=None, table_name=None):
+        """Multi-line plan summary at the given rates (units per second)"""
+        lines = [
+            f"Capacity plan: {self.label}",
+            f"   Items read: ~{self.items:,.0f} (avg {self.item_bytes:.0f} bytes)",
+            f"   Read units: ~{self.read_units:,.1f} RCU at {read_rate:g} RCU/s"
+        ]
+        if self.write_units:
+            lines.append(f"   Write units: ~{self.write_units:,.1f} WCU at {write_rate:g} WCU/s")
+        lines.append(f"   Predicted time: ~{format_duration(self.seconds(read_rate, write_rate))} (capacity-bound)")
+        limits = TABLE_LIMITS.get(table_name)
+        if limits:
+            if read_rate > limits[0]:
+                lines.append(f"   WARNING: {read_rate:g} RCU/s exceeds the {table_name} cap of {limits[0]} RCU/s: expect throttling")
+            if self.write_units and write_rate and write_rate > limits[1]:
+                lines.append(f"   WARNING: {write_rate:g} WCU/s exceeds the {table_name} cap of {limits[1]} WCU/s: expect throttling")
+            if read_rate >= limits[0] * 0.5 or (self.write_units and write_rate and write_rate >= limits[1] * 0.5):
+                lines.append("   WARNING: Rate uses half or more of the table cap: live ingest may be throttled meanwhile")
+        lines.extend(f"   Note: {note}" for note in self.notes)
+        lines.append(f"   Sampling for this plan consumed {self.sampling_units:.1f} RCU")
+        return '\n'.join(lines)
+
+    def compare(self, actual_read_units, actual_write_units=0.0, actual_seconds=None):
+        """Multi-line comparison of the prediction with the consumed capacity"""
+        def deviation(predicted, actual):
+            if not predicted:
+                return 'n/a'
+            return f"{(actual - predicted) / predicted * 100:+.0f}%"
+
+        lines = [
+            f"Capacity plan vs. actual ({self.label}):",
+            f"   Read units: predicted {self.read_units:,.1f}, consumed {actual_read_units:,.1f} "
+            f"({deviation(self.read_units, actual_read_units)})"
+        ]
+        if self.write_units or actual_write_units:
+            lines.append(f"   Write units: predicted {self.write_units:,.1f}, consumed {actual_write_units:,.1f} "
+                         f"({deviation(self.write_units, actual_write_units)})")
+        if actual_seconds is not None:
+            lines.append(f"   Elapsed: {format_duration(actual_seconds)}")
+        return '\n'.join(lines)
+
+
+def format_duration(seconds):
+    """Human-readable duration, e.g. '2h 05m', '3m 20s', '12.5s'"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def default_rates(table_name):
+    """Default planning rates: the table's caps from terraform/dynamodb.tf"""
+    return TABLE_LIMITS.get(table_name, (100, 10))
+
+
+def sample_items(table, sample_size=300, total_segments=64, segments=8, seed=None):
+    """
+    Read a sample of whole items spread over the key space
+
+    Reads the first items of a few random parallel-scan segments.
+
+    Returns:
+        Tuple (items, consumed read units)
+    """
+    chosen = random.Random(seed).sample(range(total_segments), min(segments, total_segments))
+    per_segment = max(1, sample_size // len(chosen))
+    items = []
+    consumed = 0.0
+    for segment in chosen:
+        response = table.scan(Segment=segment, TotalSegments=total_segments, Limit=per_segment,
+                              ReturnConsumedCapacity='TOTAL')
+        items.extend(response['Items'])
+        consumed += float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+    return items, consumed
+
+
+def estimate_scan(table, match=None, requests=None, sample_size=300, write=True):
+    """
+    Estimate a full parallel scan, optionally with writes for matching items
+
+    Args:
+        table: Table handle
+        match: Optional function item -> bool (e.g. plugin.match)
+        requests: Optional function item -> write requests (e.g. plugin.requests)
+        sample_size: Number of items to sample
+        write: Include write units (False for dry runs)
+
+    Returns:
+        CapacityEstimate
+    """
+    description = table.meta.client.describe_table(TableName=table.name)['Table']
+    item_count = int(description.get('ItemCount', 0))
+    table_bytes = int(description.get('TableSizeBytes', 0))
+    sample, sample_units = sample_items(table, sample_size)
+
+    notes = ["ItemCount/TableSizeBytes come from DescribeTable and are refreshed only about every 6 hours"]
+    sizes = [item_size(item) for item in sample]
+    average = sum(sizes) / len(sizes) if sizes else (table_bytes / item_count if item_count else 0.0)
+    if not item_count and sample:
+        notes.append("DescribeTable reports no items yet: only the sampled items are counted")
+        item_count = len(sample)
+    if not table_bytes:
+        table_bytes = item_count * average
+
+    # Pages are at most 1 MB; each page is rounded up to a 4 KB unit
+    estimate = CapacityEstimate(f"scan {table.name}", items=item_count,
+                                read_units=read_units(table_bytes, max(1, math.ceil(table_bytes / PAGE_BYTES))),
+                                item_bytes=average, notes=notes, sampling_units=sample_units)
+
+    if match and sample:
+        matched = [item for item in sample if match(item)]
+        share = len(matched) / len(sample)
+        estimate.notes.append(f"{len(matched)} of {len(sample)} sampled items match "
+                              f"(~{share * item_count:,.0f} items in the table)")
+        if not matched:
+            # Rule of three: with no hits in n samples, the share is below 3/n with 95% confidence
+            estimate.notes.append(f"No sampled item matched: up to ~{3 / len(sample) * item_count:,.0f} "
+                                  f"items may still match")
+        if write and requests and matched:
+            units_per_item = sum(
+                sum(write_units(item_size(request['PutRequest']['Item'])) if 'PutRequest' in request
+                    else write_units(size)
+                    for request in requests(item))
+                for item, size in ((item, item_size(item)) for item in matched)
+            ) / len(matched)
+            estimate.write_units = share * item_count * units_per_item
+    return estimate
+
+
+def estimate_query(table, partition_key_name, partition_value, sort_key_name, start, end,
+                   codec=ISO_KEYS, strata=4, limit=100):
+    """
+    Estimate a paginated query over a sort key range [start, end]
+
+    The range is cut into `strata` parts; each part is read with one query of
+    at most `limit` items. Parts that fit into one query are counted exactly,
+    the others are extrapolated from the sampled item density.
+
+    Args:
+        table: Table handle
+        partition_key_name: Name of the partition key (e.g. 'device_id')
+        partition_value: Partition key value
+        sort_key_name: Name of the sort key (e.g. 'timestamp')
+        start: First sort key of the range
+        end: Last sort key of the range
+        codec: Sort key codec (ISO_KEYS or MILLISECOND_KEYS)
+        strata: Number of sampled parts
+        limit: Items read per sample query
+
+    Returns:
+        CapacityEstimate (read units only)
+    """
+    to_seconds, from_seconds = codec
+    start_s, end_s = to_seconds(start), to_seconds(end)
+    bounds = [start_s + (end_s - start_s) * i / strata for i in range(strata + 1)]
+
+    count = 0.0
+    sizes = []
+    sample_units = 0.0
+    exact = True
+    for i in range(strata):
+        low = start if i == 0 else from_seconds(bounds[i])
+        high = end if i == strata - 1 else from_seconds(bounds[i + 1])
+        response = table.query(
+            KeyConditionExpression=Key(partition_key_name).eq(partition_value) & Key(sort_key_name).between(low, high),
+            Limit=limit,
+            ReturnConsumedCapacity='TOTAL'
+        )
+        items = response['Items']
+        sample_units += float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+        sizes.extend(item_size(item) for item in items)
+        if 'LastEvaluatedKey' not in response:
+            count += len(items)
+            continue
+        exact = False
+        first = to_seconds(items[0][sort_key_name])
+        last = to_seconds(items[-1][sort_key_name])
+        density = (len(items) - 1) / (last - first) if last > first else float(len(items))
+        count += density * (bounds[i + 1] - max(bounds[i], first)) + 1
+
+    average = sum(sizes) / len(sizes) if sizes else 0.0
+    total_bytes = count * average
+    notes = [] if exact else ["Item count extrapolated from sampled key density"]
+    return CapacityEstimate(f"query {table.name}", items=count,
+                            read_units=read_units(total_bytes, max(1, math.ceil(total_bytes / PAGE_BYTES))),
+                            item_bytes=average, notes=notes, sampling_units=sample_units)
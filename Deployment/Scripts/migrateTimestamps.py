@@ -0,0 +1,181 @@
+# This script migrates SensorData items whose timestamp has no microseconds
+# (YYYY-MM-DDTHH:MM:SS) to the normalized key format written by the MQTT Lambda
+# (YYYY-MM-DDTHH:MM:SS.ffffff, see Lambda/timestamp_format.py) instead of
+# deleting them, so historical readings are preserved.
+#
+# Each matching item is rewritten by a chain of per-item transforms. The new
+# keys are read first (BatchGetItem): the MQTT Lambda already writes
+# ...:SS.000000 keys, so a different item at a normalized key is never
+# overwritten; the old item is kept and the collision is reported. A target
+# that already holds the identical rewritten item (put by an interrupted run)
+# only needs the delete. BatchWriteItem is not atomic, so per batch all puts
+# are sent first and retried until fully processed; only then are the old keys
+# deleted. If a put cannot be written the batch fails before any delete, so no
+# reading is lost. Runs on the parallel maintenance engine
+# (table_maintenance.py) with the same batching, AIMD pacing and checkpointing
+# as deleteTimestamps.py. Every migrated item costs one put and one delete, so
+# at the same --max-wcu budget a migration takes about twice as long as the
+# delete-only cleanup.
+#
+# Without --apply it only counts and shows the planned rewrites (dry run).
+#
+# Usage:
+#   python migrateTimestamps.py                              # dry run
+#   python migrateTimestamps.py --apply                      # migrate (asks for confirmation)
+#   python migrateTimestamps.py --apply --transform microseconds --transform mymodule:my_transform
+#   python migrateTimestamps.py --apply --plan                # predict capacity and time only
+#   python migrateTimestamps.py --endpoint-url http://localhost:8000   # DynamoDB Local
+
+import importlib
+import os
+import sys
+import threading
+from datetime import datetime
+
+from table_maintenance import MaintenancePlugin, batch_get, batch_write, maintenance_parser, run_maintenance
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Lambda'))
+from timestamp_format import ensure_microsecond_timestamp  # noqa: E402
+
+
+def normalize_timestamp_key(item, partition_key_name, sort_key_name):
+    """
+    Rewrite a sort key without microseconds into the Lambda's microsecond format
+
+    Only keys that parse as ISO timestamps are rewritten (ensure_microsecond_timestamp
+    falls back to the current time for unparsable input, which must never
+    become a key here); other items are left alone.
+    """
+    timestamp = item[sort_key_name]
+    if not isinstance(timestamp, str) or len(timestamp) != 19:
+        return item
+    try:
+        datetime.fromisoformat(timestamp)
+    except ValueError:
+        return item
+    return dict(item, **{sort_key_name: ensure_microsecond_timestamp(timestamp)})
+
+
+# Built-in transforms: function(item, partition_key_name, sort_key_name) -> new item
+TRANSFORMS = {
+    'microseconds': normalize_timestamp_key
+}
+
+
+def load_transform(spec):
+    """Resolve a transform name from TRANSFORMS or a 'module:function' reference"""
+    if spec in TRANSFORMS:
+        return TRANSFORMS[spec]
+    if ':' not in spec:
+        raise ValueError(f"Unknown transform '{spec}', expected one of {list(TRANSFORMS)} or module:function")
+    module_name, function_name = spec.split(':', 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class TimestampMigration(MaintenancePlugin):
+    """Rewrites items through a chain of transforms: put the new item, delete the old key"""
+
+    name = 'migrate-timestamps'
+
+    def __init__(self, transforms=None):
+        """
+        Initialize the migration
+
+        Args:
+            transforms: List of functions (item, partition_key_name, sort_key_name) -> item;
+                        applied in order (default: microseconds)
+        """
+        self.transforms = transforms or [normalize_timestamp_key]
+        self.collisions = []  # (old key, new key) pairs skipped because the new key holds another item
+        self._lock = threading.Lock()
+
+    def projection(self):
+        return None  # Whole items are rewritten
+
+    def transform(self, item):
+        """Apply all transforms to an item"""
+        for transform in self.transforms:
+            item = transform(item, self.partition_key_name, self.sort_key_name)
+        return item
+
+    def match(self, item):
+        return self.transform(item) != item
+
+    def requests(self, item):
+        new_item = self.transform(item)
+        old_key = {self.partition_key_name: item[self.partition_key_name],
+                   self.sort_key_name: item[self.sort_key_name]}
+        new_key = {name: new_item[name] for name in old_key}
+        if new_key == old_key:
+            # Attributes changed but the key did not: an overwrite is enough
+            return [{'PutRequest': {'Item': new_item}}]
+        return [{'PutRequest': {'Item': new_item}}, {'DeleteRequest': {'Key': old_key}}]
+
+    def _key(self, item):
+        return item[self.partition_key_name], item[self.sort_key_name]
+
+    def act(self, table, items, rate=None):
+        rewrites = [(item, self.transform(item)) for item in items]
+        targets = [{self.partition_key_name: new_item[self.partition_key_name],
+                    self.sort_key_name: new_item[self.sort_key_name]}
+                   for item, new_item in rewrites if self._key(new_item) != self._key(item)]
+        existing = {self._key(found): found for found in batch_get(table, targets)}
+
+        puts, deletes, claimed, migrated = [], [], set(), 0
+        for item, new_item in rewrites:
+            old_key, new_key = self._key(item), self._key(new_item)
+            if new_key != old_key:
+                target = existing.get(new_key)
+                if new_key in claimed or (target is not None and target != new_item):
+                    # Another reading already has the normalized key: keep both, report it
+                    with self._lock:
+                        self.collisions.append((old_key, new_key))
+                    continue
+                claimed.add(new_key)
+                deletes.append({'DeleteRequest': {'Key': dict(zip((self.partition_key_name, self.sort_key_name),
+                                                                   old_key))}})
+                if target is not None:
+                    migrated += 1  # Put by an interrupted earlier run: only the delete is left
+                    continue
+            puts.append({'PutRequest': {'Item': new_item}})
+            migrated += 1
+
+        # BatchWriteItem is not atomic: batch_write raises UnprocessedItemsError
+        # before the deletes are sent if any put is still unprocessed after its retries
+        batch_write(table, puts, rate)
+        batch_write(table, deletes, rate)
+        return migrated
+
+def main():
+    parser = maintenance_parser('Migrate SensorData items to microsecond timestamps',
+                                checkpoint='migrateTimestamps.checkpoint.json',
+                                apply_help='Write the migrated items (default: dry run)')
+    parser.add_argument('--transform', action='append',
+                        help=f"Transform to apply (repeatable): {', '.join(TRANSFORMS)} or module:function "
+                             f"(default: microseconds)")
+    args = parser.parse_args()
+
+    plugin = TimestampMigration([load_transform(spec) for spec in args.transform or ['microseconds']])
+
+    def describe(item):
+        return (f"{item[plugin.sort_key_name]} -> {plugin.transform(item)[plugin.sort_key_name]} "
+                f"({item[plugin.partition_key_name]})")
+
+    def report(result):
+        print(f"Successfully migrated {result['processed']} items")
+        if plugin.collisions:
+            print(f"Kept {len(plugin.collisions)} item(s) whose normalized key already holds another item:")
+            for (key_id, old_timestamp), (_, new_timestamp) in plugin.collisions[:5]:
+                print(f"  {old_timestamp} -> {new_timestamp} ({key_id})")
+
+    run_maintenance(
+        args, plugin,
+        confirm_prompt=f"Rewrite all matching items in {args.table}?",
+        found='items to migrate',
+        describe_sample=describe,
+        report=report,
+        dry_run_hint='run again with --apply to migrate these items'
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# Per-stage latency report for the Lambda handlers.
+#
+# The handlers print one CloudWatch Embedded Metric Format line per invocation
+# (Lambda/stage_timer.py): the milliseconds spent in each stage (http, parse,
+# convert, dynamodb_write, registry) plus total_ms. This script collects those
+# lines and prints p50/p95/p99, mean and max per function and stage, and each
+# stage's share of the summed handler time. 'unstaged' is total_ms minus the
+# stage sum (logging, exception handling, anything not wrapped in a stage).
+#
+# Sources:
+# - Log files: saved Lambda output or 'aws logs tail' / 'aws logs filter-log-events'
+#   output (plain lines or the JSON with an 'events' list)
+# - CloudWatch Logs directly (--since), by default the three handler log groups
+#   named after terraform's project_name
+#
+# Usage:
+#   python stage_metrics.py --since 24h
+#   python stage_metrics.py --since 7d --log-group /aws/lambda/energy-monitoring-epex-collector --by-cold-start
+#   python stage_metrics.py lambda_output.log --json stage_report.json
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from collections import defaultdict
+
+import boto3
+
+DEFAULT_PROJECT = 'energy-monitoring'
+# Function name suffixes from terraform/lambda.tf
+FUNCTION_SUFFIXES = ('mqtt-processor', 'epex-collector', 'energylive-collector')
+PERCENTILES = (50, 95, 99)
+EMF_MARKER = '{"_aws"'
+
+
+def parse_line(line):
+    """The EMF document in a log line, or None"""
+    start = line.find(EMF_MARKER)
+    if start < 0:
+        return None
+    try:
+        return json.loads(line[start:])
+    except ValueError:
+        return None
+
+
+def read_files(paths):
+    """EMF documents from log files ('-' reads stdin)"""
+    documents = []
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path)
+        try:
+            text = f.read()
+        finally:
+            if f is not sys.stdin:
+                f.close()
+        lines = text.splitlines()
+        if text.lstrip().startswith('{') and '"events"' in text[:200]:
+            # aws logs filter-log-events --output json
+            try:
+                lines = [event['message'] for event in json.loads(text).get('events', [])]
+            except ValueError:
+                pass
+        documents.extend(document for document in map(parse_line, lines) if document)
+    return documents
+
+
+def parse_since(text):
+    """'30m', '24h', '7d' -> milliseconds ago"""
+    match = re.fullmatch(r'(\d+)([mhd])', text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration '{text}' (use e.g. 30m, 24h, 7d)")
+    return int(match.group(1)) * {'m': 60, 'h': 3600, 'd': 86400}[match.group(2)] * 1000
+
+
+def fetch_logs(log_groups, since_ms, region=None):
+    """EMF documents from CloudWatch Logs (filter_log_events, all pages)"""
+    logs = boto3.client('logs', region_name=region)
+    start_time = int(time.time() * 1000) - since_ms
+    documents = []
+    for log_group in log_groups:
+        count = 0
+        paginator = logs.get_paginator('filter_log_events')
+        try:
+            for page in paginator.paginate(logGroupName=log_group, startTime=start_time,
+                                           filterPattern='"CloudWatchMetrics"'):
+                for event in page['events']:
+                    document = parse_line(event['message'])
+                    if document:
+                        documents.append(document)
+                        count += 1
+        except logs.exceptions.ResourceNotFoundException:
+            print(f"⚠️  Log group {log_group} not found")
+            continue
+        print(f"📥 {log_group}: {count} invocations")
+    return documents
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def aggregate(documents, by_cold_start=False):
+    """
+    Stage statistics per function
+
+    Args:
+        documents: EMF documents from the handlers
+        by_cold_start: Report cold and warm invocations separately
+
+    Returns:
+        {group: {'invocations': n, 'stages': {stage: statistics}}}, where group is
+        the function name (plus ' (cold)'/' (warm)') and stages include 'total'
+        and 'unstaged'
+    """
+    samples = defaultdict(lambda: defaultdict(list))
+    invocations = defaultdict(int)
+    for document in documents:
+        function = document.get('Function', 'unknown')
+        if by_cold_start:
+            function += ' (cold)' if document.get('ColdStart') else ' (warm)'
+        invocations[function] += 1
+        stage_sum = 0.0
+        for key, value in document.items():
+            if key.endswith('_ms') and isinstance(value, (int, float)):
+                stage = key[:-3]
+                samples[function][stage].append(float(value))
+                if stage != 'total':
+                    stage_sum += value
+        if 'total_ms' in document:
+            samples[function]['unstaged'].append(max(0.0, document['total_ms'] - stage_sum))
+
+    report = {}
+    for function in sorted(samples):
+        stages = samples[function]
+        total_ms = sum(stages.get('total', [])) or None
+        statistics = {}
+        for stage, values in stages.items():
+            values.sort()
+            entry = {
+                'invocations': len(values),
+                'mean_ms': sum(values) / len(values),
+                'max_ms': values[-1]
+            }
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = percentile(values, p)
+            entry['share'] = sum(values) / total_ms if total_ms else None
+            statistics[stage] = entry
+        report[function] = {'invocations': invocations[function], 'stages': statistics}
+    return report
+
+
+def print_report(report):
+    for function, entry in report.items():
+        stages = entry['stages']
+        print(f"\n📊 {function}: {entry['invocations']} invocations")
+        print(f"   {'Stage':<16} {'n':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'max ms':>9} {'share':>7}")
+        # Stages by descending share; total last
+        order = sorted((stage for stage in stages if stage != 'total'),
+                       key=lambda stage: -(stages[stage]['share'] or 0))
+        for stage in order + (['total'] if 'total' in stages else []):
+            s = stages[stage]
+            share = f"{s['share'] * 100:6.1f}%" if s['share'] is not None else '      -'
+            print(f"   {stage:<16} {s['invocations']:>7} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+                  f"{s['p99_ms']:>9.2f} {s['mean_ms']:>9.2f} {s['max_ms']:>9.2f} {share:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage latency percentiles from the Lambda EMF log lines')
+    parser.add_argument('files', nargs='*', help="Log files to read ('-' for stdin)")
+    parser.add_argument('--since', type=parse_since, help='Fetch from CloudWatch Logs, e.g. 30m, 24h, 7d')
+    parser.add_argument('--log-group', action='append',
+                        help='Log group to fetch (repeatable; default: the three handler log groups)')
+    parser.add_argument('--project-name', default=DEFAULT_PROJECT,
+                        help=f'terraform project_name for the default log groups (default: {DEFAULT_PROJECT})')
+    parser.add_argument('--region', help='AWS region (default: from the AWS configuration)')
+    parser.add_argument('--by-cold-start', action='store_true', help='Report cold and warm invocations separately')
+    parser.add_argument('--json', metavar='PATH', help='Also write the report as JSON')
+    args = parser.parse_args()
+
+    if not args.files and args.since is None:
+        parser.error('give log files or --since')
+
+    documents = read_files(args.files)
+    if args.since is not None:
+        log_groups = args.log_group or [f"/aws/lambda/{args.project_name}-{suffix}" for suffix in FUNCTION_SUFFIXES]
+        documents.extend(fetch_logs(log_groups, args.since, args.region))
+
+    if not documents:
+        print("No stage metrics found (are the handlers deployed with stage_timer.py?)")
+        return
+
+    report = aggregate(documents, args.by_cold_start)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Report saved to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
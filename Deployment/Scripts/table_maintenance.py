@@ -0,0 +1,754 @@
+# Reusable maintenance engine for DynamoDB tables (e.g. SensorData).
+#
+# Scans a table with DynamoDB parallel scan (Segment/TotalSegments): one scan
+# worker per segment, all feeding a bounded queue that a pool of action
+# workers drains. Matching items are handed to the action stage in batches
+# while the scan is still running, so memory stays flat (at most queue_size
+# batches in flight) and throughput scales with the number of segments.
+#
+# What to look for and what to do with it is a plugin (see MaintenancePlugin);
+# deleteTimestamps.py is the timestamp cleanup plugin.
+#
+# Writes go out as BatchWriteItem requests of up to 25 with UnprocessedItems
+# retries. Scans and writes are paced by AIMD rate controllers fed with
+# ReturnConsumedCapacity (additive increase while DynamoDB keeps up,
+# multiplicative decrease on throttling/unprocessed items). Progress per scan
+# segment is checkpointed to a JSON file so an interrupted run resumes where
+# it stopped.
+#
+# maintenance_parser/run_maintenance are the shared command line of the plugin
+# scripts (dry run unless --apply, confirmation, --plan/--check-plan, resume
+# from checkpoint and the final report).
+#
+# Runs against DynamoDB Local for testing:
+#   python deleteTimestamps.py --endpoint-url http://localhost:8000
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from capacity_planner import estimate_scan
+
+THROTTLING_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException',
+                     'RequestLimitExceeded')
+
+BATCH_WRITE_LIMIT = 25  # Maximum requests per BatchWriteItem call
+BATCH_GET_LIMIT = 100  # Maximum keys per BatchGetItem call
+
+
+class UnprocessedItemsError(Exception):
+    """Raised when BatchWriteItem keeps returning UnprocessedItems after all retries"""
+
+
+def table_factory(table_name, endpoint_url=None, region_name=None):
+    """
+    Return a function that creates a new Table handle
+
+    boto3 resources are not thread-safe, so every worker thread calls the
+    factory once and keeps its own handle (own session).
+    """
+    def create():
+        session = boto3.session.Session()
+        return session.resource('dynamodb', endpoint_url=endpoint_url, region_name=region_name).Table(table_name)
+    return create
+
+
+def key_schema(table):
+    """Return (partition_key_name, sort_key_name) of a table"""
+    description = table.meta.client.describe_table(TableName=table.name)
+    partition_key_name = sort_key_name = None
+    for key in description['Table']['KeySchema']:
+        if key['KeyType'] == 'HASH':
+            partition_key_name = key['AttributeName']
+        elif key['KeyType'] == 'RANGE':
+            sort_key_name = key['AttributeName']
+    return partition_key_name, sort_key_name
+
+
+def call_with_retry(function, max_retries=6, base_delay=0.5, rate=None, **kwargs):
+    """Call a DynamoDB operation with exponential backoff on throttling (reported to rate, if given)"""
+    for attempt in range(max_retries):
+        try:
+            return function(**kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] in THROTTLING_ERRORS and attempt < max_retries - 1:
+                if rate:
+                    rate.record(0, throttled=True)
+                time.sleep(base_delay * (2 ** attempt))
+            else:
+                raise
+
+
+def error_message(error):
+    """Short description of an exception raised by a scan or an action"""
+    if isinstance(error, ClientError):
+        return error.response['Error']['Message']
+    if isinstance(error, UnprocessedItemsError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def consumed_units(response):
+    """Capacity units reported by ReturnConsumedCapacity (dict or list form)"""
+    consumed = response.get('ConsumedCapacity') or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(entry.get('CapacityUnits', 0)) for entry in consumed)
+
+
+class RateController:
+    """
+    AIMD pacing of capacity units per second, shared by all threads
+
+    Every call waits until the capacity consumed by earlier calls has been
+    "paid" at the current rate. Clean responses raise the rate additively
+    (by `increase` units/s per second of work), throttling or unprocessed
+    items cut it multiplicatively.
+    """
+
+    def __init__(self, initial=5.0, minimum=1.0, maximum=10.0, increase=1.0, decrease=0.5):
+        """
+        Initialize the controller
+
+        Args:
+            initial: Starting rate in capacity units per second
+            minimum: Lower bound of the rate
+            maximum: Upper bound of the rate (e.g. the table's max request units)
+            increase: Additive increase in units/s per second of clean operation
+            decrease: Multiplicative factor applied on throttling
+        """
+        self.rate = min(max(initial, minimum), maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.units = 0.0
+        self.throttles = 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the budget of previous calls is paid off"""
+        with self._lock:
+            delay = self._next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, units, throttled=False):
+        """Charge consumed units and adapt the rate"""
+        with self._lock:
+            now = time.monotonic()
+            self.units += units
+            self._next = max(now, self._next) + units / self.rate
+            if throttled:
+                self.throttles += 1
+                self.rate = max(self.minimum, self.rate * self.decrease)
+            else:
+                self.rate = min(self.maximum, self.rate + self.increase * units / self.rate)
+
+
+def batch_write(table, requests, rate=None, max_retries=8, base_delay=0.5):
+    """
+    Send write requests with BatchWriteItem in chunks of 25
+
+    UnprocessedItems are retried with exponential backoff; consumed capacity
+    and unprocessed items are reported to the rate controller.
+
+    Args:
+        table: Table handle (its client accepts plain Python values)
+        requests: List of {'PutRequest': ...} / {'DeleteRequest': ...} dicts
+        rate: Optional RateController for write capacity
+
+    Returns:
+        Number of requests written
+    """
+    client = table.meta.client
+    written = 0
+    for start in range(0, len(requests), BATCH_WRITE_LIMIT):
+        pending = requests[start:start + BATCH_WRITE_LIMIT]
+        for attempt in range(max_retries):
+            if rate:
+                rate.acquire()
+            response = call_with_retry(client.batch_write_item, rate=rate,
+                                       RequestItems={table.name: pending},
+                                       ReturnConsumedCapacity='TOTAL')
+            unprocessed = response.get('UnprocessedItems', {}).get(table.name, [])
+            written += len(pending) - len(unprocessed)
+            if rate:
+                rate.record(consumed_units(response), throttled=bool(unprocessed))
+            if not unprocessed:
+                break
+            pending = unprocessed
+            time.sleep(base_delay * (2 ** attempt))
+        else:
+            raise UnprocessedItemsError(f"{len(pending)} request(s) still unprocessed after {max_retries} attempts")
+    return written
+
+
+def batch_get(table, keys, max_retries=8, base_delay=0.5):
+    """
+    Read items by primary key with BatchGetItem in chunks of 100
+
+    UnprocessedKeys are retried with exponential backoff.
+
+    Args:
+        table: Table handle (its client accepts plain Python values)
+        keys: List of primary key dicts
+
+    Returns:
+        List of the items that exist (in no particular order)
+    """
+    client = table.meta.client
+    items = []
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        pending = keys[start:start + BATCH_GET_LIMIT]
+        for attempt in range(max_retries):
+            response = call_with_retry(client.batch_get_item, RequestItems={table.name: {'Keys': pending}})
+            items.extend(response.get('Responses', {}).get(table.name, []))
+            pending = response.get('UnprocessedKeys', {}).get(table.name, {}).get('Keys', [])
+            if not pending:
+                break
+            time.sleep(base_delay * (2 ** attempt))
+        else:
+            raise UnprocessedItemsError(f"{len(pending)} key(s) still unprocessed after {max_retries} attempts")
+    return items
+
+
+def write_groups(table, groups, rate=None):
+    """
+    Send groups of write requests, never splitting a group across BatchWriteItem calls
+
+    Used when the requests of one item belong in the same call. BatchWriteItem
+    is not atomic, so requests that depend on each other (e.g. a put that must
+    succeed before a delete) need separate batch_write calls instead.
+
+    Args:
+        table: Table handle
+        groups: List of request lists (each at most 25 requests)
+        rate: Optional RateController for write capacity
+
+    Returns:
+        Number of requests written
+    """
+    written = 0
+    chunk = []
+    for group in groups:
+        if len(chunk) + len(group) > BATCH_WRITE_LIMIT:
+            written += batch_write(table, chunk, rate)
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        written += batch_write(table, chunk, rate)
+    return written
+
+
+class Checkpoint:
+    """
+    Resumable scan progress: per segment the last key whose items are fully processed
+
+    Stored as JSON (keys in DynamoDB JSON) and replaced atomically on save.
+    """
+
+    def __init__(self, path, signature):
+        """
+        Initialize the checkpoint
+
+        Args:
+            path: Checkpoint file path
+            signature: Dict identifying the run (table, plugin, segments); a
+                       checkpoint written for another run is rejected
+        """
+        self.path = path
+        self.signature = signature
+        self.segments = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load an existing checkpoint; returns True if one was found"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            data = json.load(f)
+        if data['signature'] != self.signature:
+            raise ValueError(f"Checkpoint {self.path} belongs to another run ({data['signature']}); "
+                             f"remove it or choose another checkpoint file")
+        deserializer = TypeDeserializer()
+        self.segments = {
+            int(segment): {
+                'done': state['done'],
+                'key': ({name: deserializer.deserialize(value) for name, value in state['key'].items()}
+                        if state['key'] else None)
+            }
+            for segment, state in data['segments'].items()
+        }
+        self.stats = data.get('stats', {})
+        return True
+
+    def save(self, segments, stats):
+        """Write the segment states and counters atomically"""
+        serializer = TypeSerializer()
+        data = {
+            'signature': self.signature,
+            'segments': {
+                str(segment): {
+                    'done': state['done'],
+                    'key': ({name: serializer.serialize(value) for name, value in state['key'].items()}
+                            if state['key'] else None)
+                }
+                for segment, state in segments.items()
+            },
+            'stats': stats,
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with self._lock:
+            temporary = f"{self.path}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temporary, self.path)
+
+    def remove(self):
+        """Delete the checkpoint file after a complete run"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MaintenancePlugin:
+    """
+    Base class for maintenance plugins
+
+    Subclasses choose the attributes to read, which items match and what to
+    do with a batch of matching items.
+    """
+
+    name = 'maintenance'
+
+    def setup(self, partition_key_name, sort_key_name):
+        """Called once with the table's key names before scanning starts"""
+        self.partition_key_name = partition_key_name
+        self.sort_key_name = sort_key_name
+
+    def projection(self):
+        """Attribute names to read (default: primary key only; None reads whole items)"""
+        return [self.partition_key_name, self.sort_key_name]
+
+    def match(self, item):
+        """Return True if the item should be acted on"""
+        raise NotImplementedError
+
+    def requests(self, item):
+        """Write requests ({'PutRequest': ...} / {'DeleteRequest': ...}) for one matching item"""
+        raise NotImplementedError
+
+    def act(self, table, items, rate=None):
+        """
+        Process a batch of matching items (default: BatchWriteItem of their
+        requests; the requests of one item always share a call)
+
+        Returns:
+            Number of items processed successfully
+        """
+        write_groups(table, [self.requests(item) for item in items], rate)
+        return len(items)
+
+    def finish(self):
+        """Called once after all batches have been processed"""
+
+
+class SegmentedScanEngine:
+    """Parallel scan -> bounded queue -> concurrent action stage"""
+
+    def __init__(self, create_table, plugin, total_segments=8, action_workers=4,
+                 batch_size=BATCH_WRITE_LIMIT, queue_size=64, dry_run=False, page_size=None,
+                 log_every=10000, read_rate=None, write_rate=None, checkpoint_path=None,
+                 checkpoint_interval=5.0):
+        """
+        Initialize the engine
+
+        Args:
+            create_table: Function returning a new Table handle (see table_factory)
+            plugin: MaintenancePlugin instance
+            total_segments: Number of parallel scan segments (one thread each)
+            action_workers: Number of threads running plugin.act
+            batch_size: Matching items per action batch
+            queue_size: Maximum number of batches waiting for the action stage
+            dry_run: Scan and match only; never call plugin.act
+            page_size: Optional scan Limit per page
+            log_every: Print progress every N scanned items
+            read_rate: RateController for scans (default: up to 200 RCU/s)
+            write_rate: RateController for writes (default: up to 10 WCU/s)
+            checkpoint_path: JSON file for resumable progress (None: no checkpoint)
+            checkpoint_interval: Minimum seconds between checkpoint writes
+        """
+        self.create_table = create_table
+        self.plugin = plugin
+        self.total_segments = total_segments
+        self.action_workers = action_workers
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.page_size = page_size
+        self.log_every = log_every
+        # Defaults follow the SensorData on-demand limits in terraform/dynamodb.tf
+        self.read_rate = read_rate or RateController(initial=50, minimum=5, maximum=200, increase=10)
+        self.write_rate = write_rate or RateController(initial=5, minimum=1, maximum=10, increase=1)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint = None
+        self.resumed = False
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.samples = []
+        self.errors = []
+        self.stats = {'scanned': 0, 'matched': 0, 'processed': 0, 'pages': 0}
+        self._lock = threading.Lock()
+        self._next_log = log_every
+        self._last_save = 0.0
+        self._stop = threading.Event()  # Set after a failed batch: stop and leave the rest to a resumed run
+        # Per segment: resume key, done flag and pages whose batches are still in flight
+        self._segments = {}
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+            if self.stats['scanned'] >= self._next_log:
+                self._next_log += self.log_every
+                print(f"Scanned {self.stats['scanned']} items, matched {self.stats['matched']}, "
+                      f"processed {self.stats['processed']} "
+                      f"(read {self.read_rate.rate:.0f}/s, write {self.write_rate.rate:.1f} units/s)...")
+
+    def _register_page(self, segment, page, last_key, batch_count):
+        with self._lock:
+            state = self._segments[segment]
+            state['pages'][page] = [batch_count, last_key]
+            self._advance(segment)
+
+    def _batch_done(self, segment, page, success):
+        with self._lock:
+            state = self._segments[segment]
+            if not success:
+                state['failed'] = True
+            state['pages'][page][0] -= 1
+            self._advance(segment)
+
+    def _advance(self, segment):
+        """Move the segment's resume key past every fully processed leading page (lock held)"""
+        state = self._segments[segment]
+        if state['failed']:
+            return
+        while state['next_page'] in state['pages'] and state['pages'][state['next_page']][0] == 0:
+            last_key = state['pages'].pop(state['next_page'])[1]
+            state['next_page'] += 1
+            state['key'] = last_key
+            state['done'] = last_key is None
+
+    def _save_checkpoint(self, force=False):
+        if not self.checkpoint or self.dry_run:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._last_save < self.checkpoint_interval:
+                return
+            self._last_save = time.monotonic()
+            segments = {segment: {'done': state['done'], 'key': state['key']}
+                        for segment, state in self._segments.items()}
+            stats = dict(self.stats)
+        self.checkpoint.save(segments, stats)
+
+    def _scan_segment(self, segment):
+        table = self.create_table()
+        scan_kwargs = {
+            'Segment': segment,
+            'TotalSegments': self.total_segments,
+            'ReturnConsumedCapacity': 'TOTAL'
+        }
+        projection = self.plugin.projection()
+        if projection:
+            names = {f'#a{i}': name for i, name in enumerate(projection)}
+            scan_kwargs['ProjectionExpression'] = ', '.join(names)
+            scan_kwargs['ExpressionAttributeNames'] = names
+        if self.page_size:
+            scan_kwargs['Limit'] = self.page_size
+        if self._segments[segment]['key']:
+            scan_kwargs['ExclusiveStartKey'] = self._segments[segment]['key']
+
+        page = 0
+        while not self._stop.is_set():
+            self.read_rate.acquire()
+            response = call_with_retry(table.scan, rate=self.read_rate, **scan_kwargs)
+            self.read_rate.record(consumed_units(response))
+            matched = [item for item in response['Items'] if self.plugin.match(item)]
+            self._count(scanned=len(response['Items']), matched=len(matched), pages=1)
+
+            if matched and len(self.samples) < 5:
+                with self._lock:
+                    self.samples.extend(matched[:5 - len(self.samples)])
+
+            # Batches never span pages, so a page's last key can be checkpointed
+            # as soon as all of its batches are processed
+            batches = [] if self.dry_run else [matched[i:i + self.batch_size]
+                                               for i in range(0, len(matched), self.batch_size)]
+            last_key = response.get('LastEvaluatedKey')
+            self._register_page(segment, page, last_key, len(batches))
+            for batch in batches:
+                self.queue.put((segment, page, batch))  # Blocks while the action stage is behind
+            self._save_checkpoint()
+
+            if last_key is None:
+                break
+            scan_kwargs['ExclusiveStartKey'] = last_key
+            page += 1
+
+    def _act_worker(self):
+        try:
+            table = self.create_table()
+        except Exception as e:
+            with self._lock:
+                self.errors.append(error_message(e))
+            self._stop.set()
+            table = None  # Every queued batch is marked failed below
+        while True:
+            task = self.queue.get()
+            if task is None:
+                return
+            segment, page, batch = task
+            if self._stop.is_set() or table is None:
+                self._batch_done(segment, page, False)
+                continue
+            try:
+                self._count(processed=self.plugin.act(table, batch, self.write_rate))
+                self._batch_done(segment, page, True)
+            except Exception as e:
+                # Any failure (ClientError, BotoCoreError, plugin errors) stops the
+                # run; the worker keeps draining the queue so the scanners never block
+                message = error_message(e)
+                with self._lock:
+                    self.errors.append(message)
+                print(f"Action failed for a batch of {len(batch)} items: {message}; stopping")
+                self._stop.set()
+                self._batch_done(segment, page, False)
+            try:
+                self._save_checkpoint()
+            except OSError as e:
+                print(f"Could not save checkpoint: {e}")
+
+    def plan(self, sample_size=300):
+        """
+        Estimate the capacity of a run from a sample, without scanning the table
+
+        Returns:
+            CapacityEstimate (read units of the full scan, write units of the
+            plugin's requests unless this is a dry run)
+        """
+        table = self.create_table()
+        self.plugin.setup(*key_schema(table))
+        return estimate_scan(table, self.plugin.match, self.plugin.requests, sample_size, write=not self.dry_run)
+
+    def run(self):
+        """
+        Run the scan and action stages to completion
+
+        Returns:
+            Dict with scanned/matched/processed counts, pages, consumed read/write
+            units, throttle events, errors and elapsed seconds
+        """
+        started = time.perf_counter()
+        table = self.create_table()
+        self.plugin.setup(*key_schema(table))
+
+        segments = {segment: {'done': False, 'key': None} for segment in range(self.total_segments)}
+        if self.checkpoint_path and not self.dry_run:
+            self.checkpoint = Checkpoint(self.checkpoint_path, {
+                'table': table.name, 'plugin': self.plugin.name, 'total_segments': self.total_segments
+            })
+            if self.checkpoint.load():
+                self.resumed = True
+                segments.update(self.checkpoint.segments)
+                for key in self.stats:
+                    self.stats[key] = self.checkpoint.stats.get(key, 0)
+        self._segments = {
+            segment: dict(state, pages={}, next_page=0, failed=False)
+            for segment, state in segments.items()
+        }
+
+        actors = [threading.Thread(target=self._act_worker, daemon=True) for _ in range(self.action_workers)]
+        for actor in actors:
+            actor.start()
+
+        scanners = []
+        scan_errors = []
+
+        def scan(segment):
+            try:
+                self._scan_segment(segment)
+            except Exception as e:
+                scan_errors.append(f"segment {segment}: {error_message(e)}")
+                self._stop.set()
+
+        for segment, state in self._segments.items():
+            if state['done']:
+                continue
+            scanner = threading.Thread(target=scan, args=(segment,), daemon=True)
+            scanner.start()
+            scanners.append(scanner)
+        try:
+            for scanner in scanners:
+                scanner.join()
+        except KeyboardInterrupt:
+            print("Interrupted: saving checkpoint...")
+            self._save_checkpoint(force=True)
+            raise
+
+        for _ in actors:
+            self.queue.put(None)
+        for actor in actors:
+            actor.join()
+        self.plugin.finish()
+
+        errors = scan_errors + self.errors
+        if self.checkpoint:
+            if not errors and all(state['done'] for state in self._segments.values()):
+                self.checkpoint.remove()
+            else:
+                self._save_checkpoint(force=True)
+
+        result = dict(self.stats)
+        result['read_units'] = round(self.read_rate.units, 1)
+        result['write_units'] = round(self.write_rate.units, 1)
+        result['throttles'] = self.read_rate.throttles + self.write_rate.throttles
+        result['errors'] = errors
+        result['elapsed_seconds'] = round(time.perf_counter() - started, 2)
+        return result
+
+
+def maintenance_parser(description, checkpoint, apply_help, workers='Write', confirm=True, check_plan=True):
+    """
+    Argument parser with the options shared by the maintenance scripts
+
+    Args:
+        description: Script description
+        checkpoint: Default checkpoint file
+        apply_help: Help text of --apply
+        workers: Name of the action workers in the help texts (e.g. 'Delete')
+        confirm: Add --yes (the script asks for confirmation before --apply)
+        check_plan: Add --check-plan (the plugin's requests are predictable)
+
+    Returns:
+        argparse.ArgumentParser (scripts add their own options before parsing)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--table', default='SensorData', help='Table name')
+    parser.add_argument('--apply', action='store_true', help=apply_help)
+    if confirm:
+        parser.add_argument('--yes', action='store_true', help='Do not ask for confirmation')
+    parser.add_argument('--segments', type=int, default=8, help='Parallel scan segments')
+    parser.add_argument('--workers', type=int, default=4, help=f'{workers} workers')
+    parser.add_argument('--queue-size', type=int, default=64,
+                        help=f'Maximum batches waiting for the {workers.lower()} workers')
+    parser.add_argument('--max-rcu', type=float, default=200, help='Maximum read capacity units per second')
+    parser.add_argument('--max-wcu', type=float, default=10, help='Maximum write capacity units per second')
+    parser.add_argument('--checkpoint', default=checkpoint, help='Checkpoint file for resuming an interrupted run')
+    parser.add_argument('--plan', action='store_true',
+                        help='Only predict read/write units and time from a sample, then exit')
+    if check_plan:
+        parser.add_argument('--check-plan', action='store_true',
+                            help='Predict capacity first and compare it with the consumed capacity afterwards')
+    parser.add_argument('--endpoint-url', help='DynamoDB endpoint (e.g. http://localhost:8000 for DynamoDB Local)')
+    parser.add_argument('--region', help='AWS region')
+    return parser
+
+
+def run_maintenance(args, plugin, confirm_prompt=None, found=None, describe_sample=str, report=None,
+                    dry_run_hint='run again with --apply to process these items', batch_size=BATCH_WRITE_LIMIT):
+    """
+    Shared main() of the maintenance scripts: schema check, confirmation, plan, run and report
+
+    Exits with status 1 on a missing key schema or on errors (progress stays
+    in the checkpoint, so the same command resumes).
+
+    Args:
+        args: Parsed arguments of maintenance_parser
+        plugin: MaintenancePlugin instance
+        confirm_prompt: Question asked before --apply (None: no confirmation)
+        found: Label of the matched items, e.g. 'items to migrate' (None: not printed)
+        describe_sample: Function item -> line for the first matched items
+        report: Function (result) -> None printing the outcome of --apply
+        dry_run_hint: What to do after a dry run with matches
+        batch_size: Matching items per action batch
+
+    Returns:
+        Result dict of SegmentedScanEngine.run, or None if nothing was run
+    """
+    create_table = table_factory(args.table, args.endpoint_url, args.region)
+
+    print("Checking table schema...")
+    partition_key_name, sort_key_name = key_schema(create_table())
+    if not partition_key_name or not sort_key_name:
+        print("ERROR: Could not find partition key or sort key")
+        exit(1)
+    print(f"Partition key: {partition_key_name}")
+    print(f"Sort key: {sort_key_name}")
+    plugin.setup(partition_key_name, sort_key_name)
+
+    if confirm_prompt and args.apply and not args.yes and not args.plan:
+        confirm = input(f"{confirm_prompt} (yes/no): ")
+        if confirm.lower() != 'yes':
+            print("Cancelled")
+            return None
+
+    engine = SegmentedScanEngine(
+        create_table, plugin,
+        total_segments=args.segments,
+        action_workers=args.workers,
+        batch_size=batch_size,
+        queue_size=args.queue_size,
+        dry_run=not args.apply,
+        read_rate=RateController(initial=min(50, args.max_rcu), minimum=1, maximum=args.max_rcu, increase=10),
+        write_rate=RateController(initial=args.max_wcu / 2, minimum=1, maximum=args.max_wcu, increase=1),
+        checkpoint_path=args.checkpoint
+    )
+    estimate = None
+    if args.plan or getattr(args, 'check_plan', False):
+        estimate = engine.plan()
+        print(estimate.report(args.max_rcu, args.max_wcu, args.table))
+        if args.plan:
+            return None
+
+    print(f"Scanning {args.table} with {args.segments} segments"
+          f"{'' if args.apply else ' (dry run)'}...")
+    try:
+        result = engine.run()
+    except ClientError as e:
+        print(f"ERROR: {e.response['Error']['Message']}")
+        exit(1)
+
+    if engine.resumed:
+        print(f"Resumed from checkpoint {args.checkpoint} (counts include the earlier run)")
+    print(f"Total items scanned: {result['scanned']} ({result['pages']} pages, {result['elapsed_seconds']} s)")
+    print(f"Consumed capacity: {result['read_units']} RCU, {result['write_units']} WCU "
+          f"({result['throttles']} throttling events)")
+    if found:
+        print(f"Found {result['matched']} {found}")
+        if engine.samples:
+            print("First items found:")
+            for item in engine.samples:
+                print(f"  {describe_sample(item)}")
+    if args.apply:
+        if report:
+            report(result)
+    elif result['matched']:
+        print(f"Dry run: {dry_run_hint}")
+    if estimate:
+        print(estimate.compare(result['read_units'], result['write_units'], result['elapsed_seconds']))
+    for error in result['errors']:
+        print(f"ERROR: {error}")
+    if result['errors']:
+        print(f"Progress was saved to {args.checkpoint}: run the same command again to resume")
+        exit(1)
+    return result
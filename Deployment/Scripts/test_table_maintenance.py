@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Local tests for the maintenance engine (table_maintenance.py).
+Runs the engine, the timestamp cleanup and the migration plugin against the in-memory
+DynamoDB stand-in of the benchmarks (Benchmarks/standins.py), no AWS needed.
+
+Usage:
+    python test_table_maintenance.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Benchmarks'))
+from standins import MemoryTable  # noqa: E402
+
+from deleteTimestamps import MissingMicrosecondsCleanup  # noqa: E402
+from migrateTimestamps import TimestampMigration  # noqa: E402
+from table_maintenance import RateController, SegmentedScanEngine  # noqa: E402
+
+
+def sensor_table(devices=3, items_per_device=100):
+    """SensorData stand-in where every second item has no microseconds"""
+    items = []
+    for device in range(devices):
+        for i in range(items_per_device):
+            timestamp = f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00"
+            items.append({
+                'device_id': f"device-{device}",
+                'timestamp': timestamp if i % 2 == 0 else f"{timestamp}.000001",
+                'power': i
+            })
+    return MemoryTable('SensorData', 'device_id', 'timestamp').load(items)
+
+
+def unpaced():
+    """Rate controller that never waits (the stand-in has no capacity limits)"""
+    return RateController(initial=1e6, minimum=1e6, maximum=1e6)
+
+
+def make_engine(table, plugin, **kwargs):
+    options = dict(total_segments=4, action_workers=2, page_size=10, batch_size=5, log_every=10 ** 9,
+                   read_rate=unpaced(), write_rate=unpaced())
+    options.update(kwargs)
+    return SegmentedScanEngine(lambda: table, plugin, **options)
+
+
+def run_with_timeout(engine, timeout=30):
+    """Run the engine in a thread; a hung run fails the test instead of blocking it"""
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(engine.run()), daemon=True)
+    runner.start()
+    runner.join(timeout)
+    assert not runner.is_alive(), "engine.run() did not return"
+    return result
+
+
+def remaining_without_microseconds(table):
+    return [timestamp for partition in table.items.values() for timestamp in partition if len(timestamp) == 19]
+
+
+class FailingCleanup(MissingMicrosecondsCleanup):
+    """Cleanup whose act() raises a non-ClientError from the given call on"""
+
+    def __init__(self, fail_from_call=1, error=ConnectionError):
+        self.fail_from_call = fail_from_call
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def act(self, table, items, rate=None):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call >= self.fail_from_call:
+            raise self.error("connection reset by peer")
+        return super().act(table, items, rate)
+
+
+class FailingMatch(MissingMicrosecondsCleanup):
+    """Cleanup whose match() raises while scanning"""
+
+    def match(self, item):
+        raise ValueError("unexpected item")
+
+
+def test_matching_and_batch_deletes():
+    """Only items without microseconds are matched and deleted"""
+    table = sensor_table()
+    result = run_with_timeout(make_engine(table, MissingMicrosecondsCleanup()))
+
+    assert result['errors'] == []
+    assert result['scanned'] == 300
+    assert result['matched'] == result['processed'] == 150
+    assert remaining_without_microseconds(table) == []
+    assert len(table) == 150
+
+
+def test_dry_run_changes_nothing():
+    """A dry run counts matches without writing"""
+    table = sensor_table()
+    result = run_with_timeout(make_engine(table, MissingMicrosecondsCleanup(), dry_run=True))
+
+    assert result['matched'] == 150
+    assert result['processed'] == 0
+    assert len(table) == 300
+
+
+def test_resume_from_checkpoint():
+    """A failed run keeps its checkpoint; the next run resumes behind the last processed page"""
+    table = sensor_table()
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint = os.path.join(directory, 'cleanup.checkpoint.json')
+
+        failed = run_with_timeout(make_engine(table, FailingCleanup(fail_from_call=3), total_segments=1,
+                                              action_workers=1, checkpoint_path=checkpoint))
+        assert failed['errors'] and 'ConnectionError' in failed['errors'][0]
+        assert os.path.exists(checkpoint)
+        assert 0 < len(remaining_without_microseconds(table)) < 150
+
+        scans_before = table.scans
+        engine = make_engine(table, MissingMicrosecondsCleanup(), total_segments=1, action_workers=1,
+                             checkpoint_path=checkpoint)
+        resumed = run_with_timeout(engine)
+        assert engine.resumed
+        assert resumed['errors'] == []
+        assert remaining_without_microseconds(table) == []
+        # The first two pages were processed before the failure and are not scanned again
+        assert table.scans - scans_before < 30
+        assert not os.path.exists(checkpoint)
+
+
+def test_action_failure_stops_the_run():
+    """A non-ClientError in act() is reported and never leaves the scanners blocked on a full queue"""
+    table = sensor_table()
+    result = run_with_timeout(make_engine(table, FailingCleanup(fail_from_call=1), queue_size=1))
+
+    assert result['errors']
+    assert all('ConnectionError' in error for error in result['errors'])
+    assert result['processed'] == 0
+    assert len(table) == 300
+
+
+def test_scan_failure_is_reported():
+    """An exception in a scanner thread ends the run with an error instead of a silent partial scan"""
+    table = sensor_table()
+    result = run_with_timeout(make_engine(table, FailingMatch()))
+
+    assert result['errors']
+    assert all('ValueError: unexpected item' in error for error in result['errors'])
+    assert len(table) == 300
+
+
+def test_migration_keeps_colliding_items():
+    """Migrated items move to the normalized key; an existing different item at that key is never overwritten"""
+    table = sensor_table(devices=1, items_per_device=10)
+    # The Lambda already wrote a reading at the normalized key of 00:02:00
+    table.load([{'device_id': 'device-0', 'timestamp': '2024-01-01T00:02:00.000000', 'power': 999}])
+    plugin = TimestampMigration()
+    result = run_with_timeout(make_engine(table, plugin, total_segments=1))
+
+    readings = table.items['device-0']
+    assert result['errors'] == []
+    assert result['processed'] == 4
+    assert plugin.collisions == [(('device-0', '2024-01-01T00:02:00'), ('device-0', '2024-01-01T00:02:00.000000'))]
+    assert readings['2024-01-01T00:02:00.000000']['power'] == 999
+    assert readings['2024-01-01T00:02:00']['power'] == 2
+    assert readings['2024-01-01T00:04:00.000000']['power'] == 4
+    assert '2024-01-01T00:04:00' not in readings
+
+
+if __name__ == "__main__":
+    tests = [test_matching_and_batch_deletes, test_dry_run_changes_nothing, test_resume_from_checkpoint,
+             test_action_failure_stops_the_run, test_scan_failure_is_reported, test_migration_keeps_colliding_items]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
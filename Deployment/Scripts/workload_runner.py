@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# Workload benchmark runner for energy consumption testing.
+#
+# Runs the same workload cycles as schedule_stress.sh (stress-ng),
+# schedule_fio_stress.sh (fio) and schedule_update_stress.sh (apt), but instead
+# of queueing shell scripts with 'at' and reading times from log files, it
+# records exact phase markers (UTC start/end of every active and pause phase)
+# and the tools' throughput (stress-ng bogo-ops, fio IOPS/bandwidth) in a local
+# results store: one JSON file per run in --results-dir, rewritten after every
+# phase so markers survive an interrupted run.
+#
+# The energy analysis reads the markers directly:
+#   python ../Energy-Analysis/evaluate_energy_data.py --markers workload_results/
+# and reports joules per bogo-op / per IO next to the power statistics.
+#
+# Usage:
+#   python workload_runner.py cpu                               # 4 x (15 min stress-ng + 15 min pause)
+#   python workload_runner.py cpu --at 16:45 --cycles 6 --duration 1800 --pause 600
+#   python workload_runner.py io --directory /mnt/fio-test
+#   python workload_runner.py update --type large-package
+#   python workload_runner.py idle --duration 3600
+#   python workload_runner.py list
+#
+# Start it inside tmux/screen or with nohup so it survives logging out.
+
+import argparse
+import glob
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_RESULTS_DIR = 'workload_results'
+
+# fio configuration of schedule_fio_stress.sh (maximum mixed random I/O)
+FIO_ARGS = [
+    '--name=max_io_stress', '--ioengine=libaio', '--direct=1', '--rw=randrw', '--rwmixread=70',
+    '--bs=4k,64k,1m', '--bsrange=4k-1m', '--size=8G', '--numjobs=4', '--iodepth=32', '--time_based',
+    '--group_reporting', '--filename_format=fio_test_$jobnum.$filenum', '--fallocate=none',
+    '--create_serialize=0', '--file_service_type=roundrobin', '--norandommap',
+    '--random_generator=tausworthe64', '--thread'
+]
+
+# apt steps of schedule_update_stress.sh per update type
+UPDATE_TYPES = {
+    'standard': [
+        ('apt update', ['sudo', 'apt', 'update']),
+        ('apt upgrade', ['sudo', 'DEBIAN_FRONTEND=noninteractive', 'apt', 'upgrade', '-y'])
+    ],
+    'repository-only': [
+        ('apt update', ['sudo', 'apt', 'update'])
+    ],
+    'large-package': [
+        ('apt update', ['sudo', 'apt', 'update']),
+        ('install docker.io', ['sudo', 'DEBIAN_FRONTEND=noninteractive', 'apt', 'install', '-y', 'docker.io'])
+    ],
+    'development-tools': [
+        ('apt update', ['sudo', 'apt', 'update']),
+        ('install build-essential', ['sudo', 'DEBIAN_FRONTEND=noninteractive', 'apt', 'install', '-y',
+                                     'build-essential'])
+    ],
+    'security-only': [
+        ('apt update', ['sudo', 'apt', 'update']),
+        ('security upgrades', None)  # Package list is resolved at run time
+    ],
+    'autoremove': [
+        ('apt autoremove', ['sudo', 'apt', 'autoremove', '-y']),
+        ('apt autoclean', ['sudo', 'apt', 'autoclean'])
+    ]
+}
+
+# stress-ng --metrics-brief line: "stress-ng: info:  [pid] cpu  123456  60.00  ...  2057.60  ..."
+STRESS_NG_METRICS = re.compile(
+    r'\]\s+([A-Za-z][\w-]*)\s+(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)(?:\s+([\d.]+))?'
+)
+
+
+def utc_now():
+    """Current UTC time in the SensorData key format (YYYY-MM-DDTHH:MM:SS.ffffff)"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')
+
+
+def parse_stress_ng_metrics(output):
+    """
+    Bogo-op totals from stress-ng --metrics-brief output
+
+    Returns:
+        Dict with bogo_ops, real_time_s, bogo_ops_per_s and per-stressor values
+        (empty if no metrics line was found)
+    """
+    stressors = {}
+    for line in output.splitlines():
+        if 'stress-ng' not in line or ('info' not in line and 'metrc' not in line):
+            continue
+        match = STRESS_NG_METRICS.search(line)
+        if not match or match.group(1) == 'stressor':
+            continue
+        stressors[match.group(1)] = {
+            'bogo_ops': int(match.group(2)),
+            'real_time_s': float(match.group(3)),
+            'bogo_ops_per_s': float(match.group(6))
+        }
+    if not stressors:
+        return {}
+    return {
+        'bogo_ops': sum(s['bogo_ops'] for s in stressors.values()),
+        'real_time_s': max(s['real_time_s'] for s in stressors.values()),
+        'bogo_ops_per_s': round(sum(s['bogo_ops_per_s'] for s in stressors.values()), 2),
+        'stressors': stressors
+    }
+
+
+def parse_fio_json(text):
+    """
+    IOPS, bandwidth and IO totals from fio --output-format=json (group reporting)
+
+    Returns:
+        Dict with total_ios, io_bytes, iops, bandwidth and per-direction values
+        (empty if the output is not fio JSON)
+    """
+    start = text.find('{')
+    if start < 0:
+        return {}
+    try:
+        data = json.loads(text[start:])
+    except ValueError:
+        return {}
+    jobs = data.get('jobs', [])
+    if not jobs:
+        return {}
+    result = {'total_ios': 0, 'io_bytes': 0, 'iops': 0.0, 'bw_kib_s': 0.0}
+    for direction in ('read', 'write'):
+        stats = {'total_ios': 0, 'io_bytes': 0, 'iops': 0.0, 'bw': 0.0}
+        for job in jobs:
+            values = job.get(direction, {})
+            stats['total_ios'] += int(values.get('total_ios', 0))
+            stats['io_bytes'] += int(values.get('io_bytes', 0))
+            stats['iops'] += float(values.get('iops', 0))
+            stats['bw'] += float(values.get('bw', 0))  # KiB/s
+        result[f'{direction}_iops'] = round(stats['iops'], 2)
+        result[f'{direction}_bw_kib_s'] = round(stats['bw'], 2)
+        result['total_ios'] += stats['total_ios']
+        result['io_bytes'] += stats['io_bytes']
+        result['iops'] += stats['iops']
+        result['bw_kib_s'] += stats['bw']
+    result['iops'] = round(result['iops'], 2)
+    result['bw_kib_s'] = round(result['bw_kib_s'], 2)
+    return result
+
+
+class WorkloadRun:
+    """One workload run with its phase markers, stored as <results_dir>/<run_id>.json"""
+
+    def __init__(self, workload, config, results_dir=DEFAULT_RESULTS_DIR, name=None):
+        """
+        Initialize the run record
+
+        Args:
+            workload: 'cpu', 'io', 'update' or 'idle'
+            config: Run parameters (cycles, durations, tool options)
+            results_dir: Results store directory
+            name: Descriptive name used by the analysis (default: derived from workload)
+        """
+        started = datetime.now(timezone.utc)
+        self.results_dir = results_dir
+        self.run_id = f"{workload}_{started.strftime('%Y%m%dT%H%M%SZ')}"
+        self.log_dir = os.path.join(results_dir, self.run_id)
+        self.record = {
+            'run_id': self.run_id,
+            'workload': workload,
+            'name': name or workload,
+            'host': platform.node(),
+            'config': config,
+            'status': 'running',
+            'started': started.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+            'finished': None,
+            'phases': []
+        }
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.save()
+
+    @property
+    def path(self):
+        return os.path.join(self.results_dir, f"{self.run_id}.json")
+
+    def save(self):
+        """Write the record atomically"""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(self.record, f, indent=2)
+        os.replace(temporary, self.path)
+
+    def log_path(self, name):
+        return os.path.join(self.log_dir, name)
+
+    def run_phase(self, phase, cycle, command=None, seconds=None, log_name=None, parse=None):
+        """
+        Run one phase and record its markers
+
+        Args:
+            phase: 'active' or 'pause' (update steps use 'active' with a label)
+            cycle: Cycle number (1-based)
+            command: Command to run (None: sleep for `seconds`)
+            seconds: Pause length
+            log_name: File in the run's log directory receiving the tool output
+            parse: Function output text -> metrics dict
+
+        Returns:
+            The recorded phase dict
+        """
+        entry = {'phase': phase, 'cycle': cycle, 'start': utc_now(), 'end': None}
+        if command:
+            entry['command'] = ' '.join(command)
+        self.record['phases'].append(entry)
+        self.save()
+
+        if command is None:
+            time.sleep(seconds)
+        else:
+            log_path = self.log_path(log_name or f"{phase}_{cycle}.log")
+            with open(log_path, 'w') as log:
+                process = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT)
+            entry['exit_code'] = process.returncode
+            if parse:
+                with open(log_path) as log:
+                    entry['metrics'] = parse(log.read())
+
+        entry['end'] = utc_now()
+        self.save()
+        return entry
+
+    def finish(self, status='completed'):
+        self.record['status'] = status
+        self.record['finished'] = utc_now()
+        self.save()
+
+
+def wait_until(target_time):
+    """Sleep until the next local HH:MM (replaces scheduling with 'at')"""
+    now = datetime.now()
+    hour, minute = (int(part) for part in target_time.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    print(f"⏰ Waiting until {target:%Y-%m-%d %H:%M} ({(target - now).total_seconds() / 60:.0f} minutes)...")
+    time.sleep((target - now).total_seconds())
+
+
+def require_tool(command, package):
+    if not shutil.which(command):
+        print(f"❌ {command} not found. Install it with: sudo apt install -y {package}")
+        sys.exit(1)
+
+
+def run_cycles(run, cycles, pause, active):
+    """Run active phases separated by pauses (no pause after the last cycle)"""
+    for i in range(1, cycles + 1):
+        print(f"📊 Cycle {i}/{cycles} - starting at {datetime.now():%H:%M:%S}")
+        entry = active(i)
+        metrics = entry.get('metrics') or {}
+        summary = ', '.join(f"{key}={value}" for key, value in metrics.items() if not isinstance(value, dict))
+        print(f"✅ Cycle {i}/{cycles} completed (exit code {entry.get('exit_code')}){': ' + summary if summary else ''}")
+        if i < cycles:
+            print(f"⏸️  Pausing for {pause}s ({pause // 60} minutes)...")
+            run.run_phase('pause', i, seconds=pause)
+
+
+def run_cpu(args):
+    require_tool('stress-ng', 'stress-ng')
+    cpus = args.cpus or os.cpu_count()
+    config = {'cycles': args.cycles, 'duration_s': args.duration, 'pause_s': args.pause, 'cpus': cpus}
+    run = WorkloadRun('cpu', config, args.results_dir, args.name or 'CPU Stress Test (stress-ng)')
+    print(f"🚀 stress-ng --cpu {cpus}: {args.cycles} cycles of {args.duration}s stress + {args.pause}s pause "
+          f"({run.path})")
+    run_cycles(run, args.cycles, args.pause, lambda i: run.run_phase(
+        'active', i,
+        command=['stress-ng', '--cpu', str(cpus), '--timeout', f"{args.duration}s", '--metrics-brief'],
+        log_name=f"stress-ng_cycle_{i}.log", parse=parse_stress_ng_metrics))
+    return run
+
+
+def run_io(args):
+    require_tool('fio', 'fio')
+    if not os.path.ismount(args.directory):
+        print(f"❌ Error: {args.directory} is not mounted!")
+        sys.exit(1)
+    config = {'cycles': args.cycles, 'duration_s': args.duration, 'pause_s': args.pause,
+              'directory': args.directory, 'fio_args': FIO_ARGS}
+    run = WorkloadRun('io', config, args.results_dir, args.name or 'I/O Stress Test (fio)')
+    print(f"🚀 fio on {args.directory}: {args.cycles} cycles of {args.duration}s I/O + {args.pause}s pause "
+          f"({run.path})")
+
+    def active(i):
+        entry = run.run_phase(
+            'active', i,
+            command=['fio', '--output-format=json', f"--runtime={args.duration}",
+                     f"--directory={args.directory}"] + FIO_ARGS,
+            log_name=f"fio_cycle_{i}.json", parse=parse_fio_json)
+        # Clean up test files after each cycle to save space
+        for path in glob.glob(os.path.join(args.directory, 'fio_test_*')):
+            os.remove(path)
+        return entry
+
+    run_cycles(run, args.cycles, args.pause, active)
+    return run
+
+
+def security_upgrade_command():
+    listing = subprocess.run(['apt', 'list', '--upgradable'], capture_output=True, text=True).stdout
+    packages = [line.split('/')[0] for line in listing.splitlines() if 'security' in line.lower()]
+    if not packages:
+        return None
+    return ['sudo', 'DEBIAN_FRONTEND=noninteractive', 'apt', 'upgrade', '-y', '--only-upgrade'] + packages
+
+
+def run_update(args):
+    if subprocess.run(['sudo', '-n', 'apt', '--version'], capture_output=True).returncode != 0:
+        print("❌ Error: No sudo access for apt commands")
+        sys.exit(1)
+    run = WorkloadRun('update', {'update_type': args.type}, args.results_dir,
+                      args.name or f"System Update ({args.type})")
+    print(f"🚀 System update test '{args.type}' ({run.path})")
+    for step, (label, command) in enumerate(UPDATE_TYPES[args.type], start=1):
+        if command is None:
+            command = security_upgrade_command()
+            if command is None:
+                print("   No security updates available")
+                continue
+        print(f"📦 Phase {step}: {label}")
+        entry = run.run_phase('active', step, command=command, log_name=f"update_step_{step}.log")
+        entry['label'] = label
+        run.save()
+    return run
+
+
+def run_idle(args):
+    run = WorkloadRun('idle', {'duration_s': args.duration}, args.results_dir, args.name or 'Idle State')
+    print(f"💤 Idle baseline for {args.duration}s ({run.path})")
+    run.run_phase('active', 1, seconds=args.duration)
+    return run
+
+
+def list_runs(args):
+    paths = sorted(glob.glob(os.path.join(args.results_dir, '*.json')))
+    if not paths:
+        print(f"No runs in {args.results_dir}")
+        return
+    for path in paths:
+        with open(path) as f:
+            record = json.load(f)
+        active = [p for p in record['phases'] if p['phase'] == 'active']
+        print(f"{record['run_id']}: {record['name']} [{record['status']}] "
+              f"{record['started'][:19]} - {(record['finished'] or '')[:19]}, {len(active)} active phase(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run energy test workloads and record exact phase markers')
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR, help='Results store directory')
+    subparsers = parser.add_subparsers(dest='workload', required=True)
+
+    def add_run_options(sub, cycles=4, duration=900, pause=900):
+        sub.add_argument('--at', help='Start at this local time (HH:MM)')
+        sub.add_argument('--name', help='Descriptive name used by the analysis')
+        if cycles:
+            sub.add_argument('--cycles', type=int, default=cycles, help=f'Number of cycles (default: {cycles})')
+            sub.add_argument('--pause', type=int, default=pause, help=f'Pause between cycles in seconds (default: {pause})')
+        sub.add_argument('--duration', type=int, default=duration, help=f'Active seconds per cycle (default: {duration})')
+
+    cpu = subparsers.add_parser('cpu', help='stress-ng CPU cycles (schedule_stress.sh)')
+    add_run_options(cpu)
+    cpu.add_argument('--cpus', type=int, help='stress-ng CPU workers (default: all logical CPUs)')
+    cpu.set_defaults(handler=run_cpu)
+
+    io = subparsers.add_parser('io', help='fio I/O cycles (schedule_fio_stress.sh)')
+    add_run_options(io)
+    io.add_argument('--directory', default='/mnt/fio-test', help='Mounted test disk (default: /mnt/fio-test)')
+    io.set_defaults(handler=run_io)
+
+    update = subparsers.add_parser('update', help='System update test (schedule_update_stress.sh)')
+    update.add_argument('--at', help='Start at this local time (HH:MM)')
+    update.add_argument('--name', help='Descriptive name used by the analysis')
+    update.add_argument('--type', choices=list(UPDATE_TYPES), default='standard', help='Update type')
+    update.set_defaults(handler=run_update)
+
+    idle = subparsers.add_parser('idle', help='Idle baseline (no load)')
+    add_run_options(idle, cycles=0, duration=3600)
+    idle.set_defaults(handler=run_idle)
+
+    subparsers.add_parser('list', help='List recorded runs').set_defaults(handler=list_runs)
+
+    args = parser.parse_args()
+    if args.workload == 'list':
+        list_runs(args)
+        return
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    if args.at:
+        wait_until(args.at)
+
+    run = None
+    try:
+        run = args.handler(args)
+        run.finish()
+        print(f"🏁 Run {run.run_id} completed: markers in {run.path}")
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted")
+        if run is None:
+            # The handler was interrupted: mark the newest running record
+            for path in sorted(glob.glob(os.path.join(args.results_dir, f"{args.workload}_*.json")), reverse=True):
+                with open(path) as f:
+                    record = json.load(f)
+                if record['status'] == 'running':
+                    record['status'] = 'interrupted'
+                    record['finished'] = utc_now()
+                    with open(path, 'w') as f:
+                        json.dump(record, f, indent=2)
+                    print(f"   Markers recorded so far are in {path}")
+                break
+        else:
+            run.finish('interrupted')
+
+
+if __name__ == '__main__':
+    main()
@@ -170,4 +170,152 @@ resource "aws_dynamodb_table" "sensor_data" {
     Name        = "SensorData"
     Description = "Stores power consumption data from IoT devices"
   }
-} 
\ No newline at end of file
+} 
+
+# =============================================================================
+# DEVICE REGISTRY TABLE
+# =============================================================================
+# Small table listing every device/tariff seen by the collectors, so analysis
+# scripts can discover partition keys with one Query instead of table scans
+
+# DynamoDB table for the device/tariff registry
+resource "aws_dynamodb_table" "device_registry" {
+  name           = "DeviceRegistry"
+  billing_mode   = "PAY_PER_REQUEST"  # Use on-demand billing like the data tables
+
+  # Primary key for registry entries
+  hash_key  = "source"   # Partition key: data table name (SensorData, EnergyLiveData, EPEXSpotPrices)
+  range_key = "key_id"   # Sort key: device_id or tariff in that table
+
+  # Define key attributes
+  attribute {
+    name = "source"
+    type = "S"  # String type for table name
+  }
+
+  attribute {
+    name = "key_id"
+    type = "S"  # String type for device identifier or tariff
+  }
+
+  # Registry traffic is tiny (throttled conditional updates and single queries)
+  on_demand_throughput {
+    max_read_request_units  = 10
+    max_write_request_units = 10
+  }
+
+  tags = {
+    Name        = "DeviceRegistry"
+    Description = "Registry of devices and tariffs with first/last seen timestamps"
+  }
+}
+
+# =============================================================================
+# DATA COVERAGE TABLE
+# =============================================================================
+# Per-device, per-hour record of which minutes received telemetry, so analyses
+# can check a month of coverage with one Query before querying SensorData.
+# Hour items keep the minute sets small (one write unit per update)
+
+# DynamoDB table for the telemetry coverage index
+resource "aws_dynamodb_table" "data_coverage" {
+  name           = "DataCoverage"
+  billing_mode   = "PAY_PER_REQUEST"  # Use on-demand billing like the data tables
+
+  # Primary key for coverage entries
+  hash_key  = "device_id"   # Partition key: identifies the IoT device
+  range_key = "hour"        # Sort key: UTC hour (YYYY-MM-DDTHH)
+
+  # Define key attributes
+  attribute {
+    name = "device_id"
+    type = "S"  # String type for device identifier
+  }
+
+  attribute {
+    name = "hour"
+    type = "S"  # String type for ISO date and hour
+  }
+
+  # At most one small update per device per minute from ingest
+  on_demand_throughput {
+    max_read_request_units  = 10
+    max_write_request_units = 10
+  }
+
+  tags = {
+    Name        = "DataCoverage"
+    Description = "Per-device per-hour minute coverage of sensor telemetry"
+  }
+}
+
+# =============================================================================
+# ANOMALY TABLES
+# =============================================================================
+# Spike/flatline events detected by the MQTT processor while ingesting, and
+# the checkpointed detector state (EWMA mean/variance, current flat run) per
+# device so a new Lambda container continues where the last one stopped
+
+# DynamoDB table for detected anomaly events
+resource "aws_dynamodb_table" "anomaly_events" {
+  name           = "AnomalyEvents"
+  billing_mode   = "PAY_PER_REQUEST"  # Use on-demand billing like the data tables
+
+  # Primary key for anomaly events
+  hash_key  = "device_id"   # Partition key: identifies the IoT device
+  range_key = "timestamp"   # Sort key: SensorData timestamp of the anomalous reading
+
+  # Define key attributes
+  attribute {
+    name = "device_id"
+    type = "S"  # String type for device identifier
+  }
+
+  attribute {
+    name = "timestamp"
+    type = "S"  # String type for ISO timestamp
+  }
+
+  # Events are rare (one per spike or flat run)
+  on_demand_throughput {
+    max_read_request_units  = 10
+    max_write_request_units = 10
+  }
+
+  tags = {
+    Name        = "AnomalyEvents"
+    Description = "Power spikes and flatlines detected during ingest"
+  }
+}
+
+# DynamoDB table for the anomaly detector checkpoints
+resource "aws_dynamodb_table" "anomaly_state" {
+  name           = "AnomalyState"
+  billing_mode   = "PAY_PER_REQUEST"  # Use on-demand billing like the data tables
+
+  # Primary key for detector state
+  hash_key  = "device_id"   # Partition key: identifies the IoT device
+  range_key = "metric"      # Sort key: monitored attribute (current_power)
+
+  # Define key attributes
+  attribute {
+    name = "device_id"
+    type = "S"  # String type for device identifier
+  }
+
+  attribute {
+    name = "metric"
+    type = "S"  # String type for attribute name
+  }
+
+  # One checkpoint per device every ANOMALY_CHECKPOINT_SECONDS, one read per cold container
+  on_demand_throughput {
+    max_read_request_units  = 10
+    max_write_request_units = 10
+  }
+
+  tags = {
+    Name        = "AnomalyState"
+    Description = "Checkpointed per-device anomaly detector state"
+  }
+}
@@ -58,6 +58,10 @@ resource "aws_iam_policy" "lambda_dynamodb_policy" {
           aws_dynamodb_table.energy_live_data.arn,  # EnergyLiveData table
           aws_dynamodb_table.epex_spot_prices.arn,  # EPEXSpotPrices table
           aws_dynamodb_table.sensor_data.arn,       # SensorData table
+          aws_dynamodb_table.device_registry.arn,   # DeviceRegistry table
+          aws_dynamodb_table.data_coverage.arn,     # DataCoverage table
+          aws_dynamodb_table.anomaly_events.arn,    # AnomalyEvents table
+          aws_dynamodb_table.anomaly_state.arn,     # AnomalyState table
           "${aws_dynamodb_table.energy_live_data.arn}/index/*"  # All indexes on EnergyLiveData
         ]
       }
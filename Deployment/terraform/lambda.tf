@@ -59,8 +59,10 @@ resource "aws_lambda_function" "energylive_collector" {
   # These provide configuration without hardcoding values in the code
   environment {
     variables = {
-      API_KEY    = var.energylive_api_key    # energyLIVE API authentication key
-      DEVICE_UID = var.energylive_device_uid # Smart meter device identifier
+      API_KEY           = var.energylive_api_key    # energyLIVE API authentication key
+      DEVICE_UID        = var.energylive_device_uid # Smart meter device identifier
+      REGISTRY_TABLE    = aws_dynamodb_table.device_registry.name  # Device registry for discovery
+      METRICS_NAMESPACE = var.project_name                      # Namespace of the per-stage timing metrics
     }
   }
 
@@ -95,8 +97,13 @@ resource "aws_lambda_function" "epex_collector" {
   timeout         = var.lambda_timeout      # Maximum execution time
   memory_size     = var.lambda_memory_size  # Memory allocation
 
-  # This function doesn't need environment variables as it uses public APIs
   # EPEX Spot data is publicly available without authentication
+  environment {
+    variables = {
+      REGISTRY_TABLE    = aws_dynamodb_table.device_registry.name  # Tariff registry for discovery
+      METRICS_NAMESPACE = var.project_name                      # Namespace of the per-stage timing metrics
+    }
+  }
 
   # Ensure dependencies are created before this function
   depends_on = [
@@ -132,7 +139,12 @@ resource "aws_lambda_function" "mqtt_processor" {
   # Environment variables for MQTT processing
   environment {
     variables = {
-      DYNAMODB_TABLE = aws_dynamodb_table.sensor_data.name  # DynamoDB table for storing IoT sensor data
+      DYNAMODB_TABLE       = aws_dynamodb_table.sensor_data.name  # DynamoDB table for storing IoT sensor data
+      REGISTRY_TABLE       = aws_dynamodb_table.device_registry.name  # Device registry for discovery
+      COVERAGE_TABLE       = aws_dynamodb_table.data_coverage.name    # Per-minute telemetry coverage index
+      ANOMALY_EVENTS_TABLE = aws_dynamodb_table.anomaly_events.name   # Detected spikes and flatlines
+      ANOMALY_STATE_TABLE  = aws_dynamodb_table.anomaly_state.name    # Detector checkpoints
+      METRICS_NAMESPACE    = var.project_name                      # Namespace of the per-stage timing metrics
     }
   }
 
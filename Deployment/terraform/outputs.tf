@@ -45,6 +45,26 @@ output "dynamodb_tables" {
       name = aws_dynamodb_table.sensor_data.name
       arn  = aws_dynamodb_table.sensor_data.arn
     }
+    # DeviceRegistry table for device/tariff discovery
+    device_registry = {
+      name = aws_dynamodb_table.device_registry.name
+      arn  = aws_dynamodb_table.device_registry.arn
+    }
+    # DataCoverage table for telemetry minute coverage
+    data_coverage = {
+      name = aws_dynamodb_table.data_coverage.name
+      arn  = aws_dynamodb_table.data_coverage.arn
+    }
+    # AnomalyEvents table for spikes/flatlines detected during ingest
+    anomaly_events = {
+      name = aws_dynamodb_table.anomaly_events.name
+      arn  = aws_dynamodb_table.anomaly_events.arn
+    }
+    # AnomalyState table for the anomaly detector checkpoints
+    anomaly_state = {
+      name = aws_dynamodb_table.anomaly_state.name
+      arn  = aws_dynamodb_table.anomaly_state.arn
+    }
   }
 }
 